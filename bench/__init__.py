@@ -0,0 +1 @@
+"""Microbenchmarks for the webhook hot path."""
@@ -0,0 +1,433 @@
+"""Command-line entry point: python -m bench <command>, see --help."""
+
+import argparse
+import asyncio
+import json
+import sys
+import tempfile
+from pathlib import Path
+
+from bench.compare import MIN_DELTA_US
+from bench.compare import compare
+from bench.compare import format_report
+from bench.encoding import format_encoding_report
+from bench.encoding import run_encoding
+from bench.load import ARRIVALS
+from bench.load import CHANNELS
+from bench.load import LoadConfig
+from bench.load import format_load_report
+from bench.load import run_load
+from bench.replay import format_replay_report
+from bench.replay import load_captures
+from bench.replay import replay
+from bench.shards import format_shards_report
+from bench.shards import run_shards
+from bench.startup import run_startup
+from bench.startup import sample
+from bench.startup import slowest_imports
+
+BASELINES_DIR = Path(__file__).parent / "baselines"
+DEFAULT_BASELINE = BASELINES_DIR / "baseline.json"
+STARTUP_BASELINE = BASELINES_DIR / "startup.json"
+
+
+def load_results(
+    path: Path,
+) -> dict:
+    with path.open(encoding="utf-8") as results:
+        return json.load(results)
+
+
+def report(
+    baseline_path: Path,
+    current: dict,
+    threshold: float,
+    include_missing: bool = True,
+    min_delta_us: float = MIN_DELTA_US,
+) -> int:
+    """Print a comparison report and return the process exit code."""
+    comparisons = compare(
+        load_results(baseline_path),
+        current,
+        threshold,
+        include_missing,
+        min_delta_us,
+    )
+    print(format_report(comparisons))
+    regressions = [row.name for row in comparisons if row.status == "REGRESSION"]
+    if regressions:
+        print(f"\n{len(regressions)} regression(s): {', '.join(regressions)}")
+        return 1
+    return 0
+
+
+def load_test(
+    args: argparse.Namespace,
+) -> int:
+    """Run the load generator over HTTP or against the in-process ASGI app."""
+    config = LoadConfig(
+        players=args.players,
+        rounds=args.rounds,
+        arrival=args.arrival,
+        ramp_seconds=args.ramp_seconds,
+        think_ms=args.think_ms,
+        channel=args.channel,
+        languages=args.languages.split(","),
+        status_callbacks=args.status_callbacks,
+        seed=args.seed,
+    )
+    if args.url:
+        report = asyncio.run(run_load(config, args.url, timeout=args.timeout))
+    else:
+        import httpx
+
+        from bench.environment import benchmark_database
+
+        with (
+            tempfile.TemporaryDirectory() as directory,
+            benchmark_database(
+                llm_latency=args.llm_latency,
+                llm_latency_ms=args.llm_latency_ms,
+                database_name=f"{directory}/load.sqlite3",
+                word_prefetch=not args.no_prefetch,
+            ),
+        ):
+            from django.core.asgi import get_asgi_application
+
+            # Django's handler takes a MutableMapping scope, httpx types a dict
+            transport = httpx.ASGITransport(
+                app=get_asgi_application(),  # type: ignore[arg-type]
+            )
+            report = asyncio.run(
+                run_load(config, "http://testserver", transport, args.timeout),
+            )
+
+    print(format_load_report(report))
+    if args.output:
+        args.output.parent.mkdir(parents=True, exist_ok=True)
+        args.output.write_text(f"{json.dumps(report, indent=2)}\n", encoding="utf-8")
+    return 0
+
+
+def replay_capture(
+    args: argparse.Namespace,
+) -> int:
+    """Replay captured webhook traffic against a running instance."""
+    entries = load_captures(args.captures)
+    report = asyncio.run(replay(entries, args.url, args.speed, args.timeout))
+    previous = load_results(args.compare) if args.compare else None
+    print(format_replay_report(report, previous))
+    if args.output:
+        args.output.parent.mkdir(parents=True, exist_ok=True)
+        args.output.write_text(f"{json.dumps(report, indent=2)}\n", encoding="utf-8")
+    return 0
+
+
+def startup(
+    args: argparse.Namespace,
+) -> int:
+    """Measure worker startup time and memory."""
+    results = run_startup(repeat=args.repeat)
+    if args.importtime:
+        print("\nSlowest imports (self time):")
+        for microseconds, module in slowest_imports(sample(importtime=True)[1]):
+            print(f"{microseconds / 1000:>10.1f} ms  {module}")
+    if args.output:
+        args.output.parent.mkdir(parents=True, exist_ok=True)
+        args.output.write_text(f"{json.dumps(results, indent=2)}\n", encoding="utf-8")
+    if args.compare:
+        print()
+        return report(
+            args.compare,
+            results,
+            args.threshold,
+            min_delta_us=args.min_delta_us,
+        )
+    return 0
+
+
+def languages(
+    args: argparse.Namespace,
+) -> int:
+    """Compare language selection reprompt rates on the sample corpus."""
+    from bench.environment import benchmark_database
+
+    with benchmark_database():
+        from bench.languages import evaluate
+        from bench.languages import format_language_report
+
+        report = evaluate()
+    print(format_language_report(report))
+    if args.output:
+        args.output.parent.mkdir(parents=True, exist_ok=True)
+        args.output.write_text(f"{json.dumps(report, indent=2)}\n", encoding="utf-8")
+    return 0
+
+
+def shards(
+    args: argparse.Namespace,
+) -> int:
+    """Compare game write throughput over different numbers of shards."""
+    report = run_shards(
+        [int(count) for count in args.shard_counts.split(",")],
+        writers=args.writers,
+        games=args.games,
+    )
+    print(format_shards_report(report))
+    if args.output:
+        args.output.parent.mkdir(parents=True, exist_ok=True)
+        args.output.write_text(f"{json.dumps(report, indent=2)}\n", encoding="utf-8")
+    return 0
+
+
+def encoding(
+    args: argparse.Namespace,
+) -> int:
+    """Measure session table size and lookups before and after coded columns."""
+    report = run_encoding(rows=args.rows, lookups=args.lookups)
+    print(format_encoding_report(report))
+    if args.output:
+        args.output.parent.mkdir(parents=True, exist_ok=True)
+        args.output.write_text(f"{json.dumps(report, indent=2)}\n", encoding="utf-8")
+    return 0
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(prog="python -m bench")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    run_parser = subparsers.add_parser("run", help="Run the benchmarks")
+    run_parser.add_argument("--output", type=Path, help="Write results to this file")
+    run_parser.add_argument(
+        "--scale",
+        type=float,
+        default=1.0,
+        help="Multiply every case's iteration count",
+    )
+    run_parser.add_argument(
+        "--rounds",
+        type=int,
+        default=5,
+        help="Rounds each case's iterations are split into, across cases",
+    )
+    run_parser.add_argument(
+        "--only",
+        action="append",
+        help="Run only cases starting with this prefix (may be repeated)",
+    )
+    run_parser.add_argument(
+        "--compare",
+        type=Path,
+        nargs="?",
+        const=DEFAULT_BASELINE,
+        help="Compare against a baseline (default: bench/baselines/baseline.json)",
+    )
+    run_parser.add_argument("--threshold", type=float, default=0.1)
+    run_parser.add_argument(
+        "--min-delta-us",
+        type=float,
+        default=MIN_DELTA_US,
+        help="Ignore timing changes smaller than this many microseconds",
+    )
+
+    compare_parser = subparsers.add_parser("compare", help="Compare two result files")
+    compare_parser.add_argument("baseline", type=Path)
+    compare_parser.add_argument("current", type=Path)
+    compare_parser.add_argument("--threshold", type=float, default=0.1)
+    compare_parser.add_argument(
+        "--min-delta-us",
+        type=float,
+        default=MIN_DELTA_US,
+        help="Ignore timing changes smaller than this many microseconds",
+    )
+
+    load_parser = subparsers.add_parser(
+        "load",
+        help="Simulate concurrent players playing full games",
+    )
+    load_parser.add_argument(
+        "--url",
+        help="Server to load, e.g. http://localhost:8000; in-process if omitted",
+    )
+    load_parser.add_argument("--players", type=int, default=50)
+    load_parser.add_argument("--rounds", type=int, default=3, help="Games per player")
+    load_parser.add_argument("--arrival", choices=ARRIVALS, default="poisson")
+    load_parser.add_argument(
+        "--ramp-seconds",
+        type=float,
+        default=10.0,
+        help="Window over which players arrive",
+    )
+    load_parser.add_argument(
+        "--think-ms",
+        type=float,
+        default=500.0,
+        help="Mean pause between a player's messages",
+    )
+    load_parser.add_argument(
+        "--channel",
+        choices=CHANNELS,
+        default="mixed",
+        help="SMS webhook, test command endpoint, or alternate per player",
+    )
+    load_parser.add_argument("--languages", default="es,fr,ko")
+    load_parser.add_argument(
+        "--status-callbacks",
+        action="store_true",
+        help="Follow each SMS reply with a delivery status callback",
+    )
+    load_parser.add_argument("--seed", type=int, default=0)
+    load_parser.add_argument("--timeout", type=float, default=30.0)
+    load_parser.add_argument(
+        "--llm-latency",
+        choices=("fixed", "lognormal", "heavy_tail"),
+        default="lognormal",
+        help="Fake LLM latency distribution for in-process runs",
+    )
+    load_parser.add_argument(
+        "--llm-latency-ms",
+        type=float,
+        default=800.0,
+        help="Fake LLM median latency for in-process runs",
+    )
+    load_parser.add_argument(
+        "--no-prefetch",
+        action="store_true",
+        help="Disable next-word prefetch in-process",
+    )
+    load_parser.add_argument("--output", type=Path, help="Write the report here")
+
+    replay_parser = subparsers.add_parser(
+        "replay",
+        help="Replay captured webhook traffic against an instance",
+    )
+    replay_parser.add_argument(
+        "captures",
+        type=Path,
+        nargs="+",
+        help="Capture files or directories (WEBHOOK_CAPTURE_DIR)",
+    )
+    replay_parser.add_argument("--url", required=True, help="Instance to replay to")
+    replay_parser.add_argument(
+        "--speed",
+        type=float,
+        default=1.0,
+        help="Replay N times faster than captured",
+    )
+    replay_parser.add_argument("--timeout", type=float, default=30.0)
+    replay_parser.add_argument(
+        "--compare",
+        type=Path,
+        help="Previous replay report to compare against",
+    )
+    replay_parser.add_argument("--output", type=Path, help="Write the report here")
+
+    startup_parser = subparsers.add_parser(
+        "startup",
+        help="Measure import time and memory of a fresh worker",
+    )
+    startup_parser.add_argument("--repeat", type=int, default=5)
+    startup_parser.add_argument(
+        "--importtime",
+        action="store_true",
+        help="Also list the slowest imports",
+    )
+    startup_parser.add_argument("--output", type=Path, help="Write results here")
+    startup_parser.add_argument(
+        "--compare",
+        type=Path,
+        nargs="?",
+        const=STARTUP_BASELINE,
+        help="Compare against a baseline (default: bench/baselines/startup.json)",
+    )
+    startup_parser.add_argument("--threshold", type=float, default=0.1)
+    startup_parser.add_argument(
+        "--min-delta-us",
+        type=float,
+        default=MIN_DELTA_US,
+        help="Ignore timing changes smaller than this many microseconds",
+    )
+
+    languages_parser = subparsers.add_parser(
+        "languages",
+        help="Measure language selection reprompt rates on a sample corpus",
+    )
+    languages_parser.add_argument("--output", type=Path, help="Write results here")
+
+    shards_parser = subparsers.add_parser(
+        "shards",
+        help="Measure game write throughput by number of database shards",
+    )
+    shards_parser.add_argument("--shard-counts", default="1,2,4")
+    shards_parser.add_argument(
+        "--writers",
+        type=int,
+        default=4,
+        help="Concurrent writer processes",
+    )
+    shards_parser.add_argument("--games", type=int, default=200, help="Per writer")
+    shards_parser.add_argument("--output", type=Path, help="Write results here")
+
+    encoding_parser = subparsers.add_parser(
+        "encoding",
+        help="Measure session table size and lookups before and after 0005",
+    )
+    encoding_parser.add_argument("--rows", type=int, default=200_000)
+    encoding_parser.add_argument(
+        "--lookups",
+        type=int,
+        default=2_000,
+        help="Active session lookups timed before and after",
+    )
+    encoding_parser.add_argument("--output", type=Path, help="Write results here")
+
+    args = parser.parse_args()
+    if args.command == "encoding":
+        return encoding(args)
+    if args.command == "shards":
+        return shards(args)
+    if args.command == "languages":
+        return languages(args)
+    if args.command == "startup":
+        return startup(args)
+    if args.command == "replay":
+        return replay_capture(args)
+    if args.command == "load":
+        return load_test(args)
+    if args.command == "compare":
+        return report(
+            args.baseline,
+            load_results(args.current),
+            args.threshold,
+            min_delta_us=args.min_delta_us,
+        )
+
+    from bench.environment import benchmark_database
+
+    with benchmark_database():
+        from bench.cases import build_cases
+        from bench.runner import run_cases
+
+        results = run_cases(
+            build_cases(),
+            scale=args.scale,
+            only=args.only,
+            rounds=args.rounds,
+        )
+
+    if args.output:
+        args.output.parent.mkdir(parents=True, exist_ok=True)
+        args.output.write_text(f"{json.dumps(results, indent=2)}\n", encoding="utf-8")
+    if args.compare:
+        return report(
+            args.compare,
+            results,
+            args.threshold,
+            include_missing=not args.only,
+            min_delta_us=args.min_delta_us,
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,180 @@
+"""Benchmark cases for the webhook hot path.
+
+Import only after Django is set up, see bench.environment.
+"""
+
+from collections.abc import Callable
+from dataclasses import dataclass
+from urllib.parse import parse_qs
+from urllib.parse import urlencode
+
+from django.test import Client
+
+from charades.game.logic import handle_player_command
+from charades.game.models import GameSession
+from charades.game.models import Player
+from charades.game.schemas import TwilioIncomingMessageSchema
+from charades.game.utils import MESSAGES
+from charades.game.utils import VOICE_MESSAGES
+from charades.game.utils import create_twiml_response
+from charades.game.utils import create_voice_response
+
+BENCH_PHONE_NUMBER = "+12065559000"
+
+
+@dataclass
+class Case:
+    """A benchmark case.
+
+    Attributes:
+        name: Unique name, used as the key in result files
+        run: The code being measured
+        setup: Untimed code run before every iteration
+        iterations: Number of timed iterations
+    """
+
+    name: str
+    run: Callable[[], object]
+    setup: Callable[[], object] | None = None
+    iterations: int = 1000
+
+
+def incoming_sms_payload(
+    body: str,
+) -> dict[str, str]:
+    """Build a Twilio incoming SMS webhook payload."""
+    return {
+        "MessageSid": "SM00000000000000000000000000000000",
+        "AccountSid": "AC00000000000000000000000000000000",
+        "From": BENCH_PHONE_NUMBER,
+        "To": "+12065550000",
+        "Body": body,
+        "NumMedia": "0",
+        "NumSegments": "1",
+        "SmsMessageSid": "SM00000000000000000000000000000000",
+        "SmsSid": "SM00000000000000000000000000000000",
+        "SmsStatus": "received",
+        "FromCity": "SEATTLE",
+        "FromState": "WA",
+        "FromCountry": "US",
+        "ApiVersion": "2010-04-01",
+    }
+
+
+def seed_players(
+    count: int = 200,
+) -> Player:
+    """Create players with completed games so stats and ranks have data.
+
+    Returns:
+        Player: The opted-in player used by the command benchmarks
+    """
+    for i in range(count):
+        player = Player.objects.create(phone_number=f"+1206700{i:04d}", is_active=True)
+        for j, language in enumerate(["es", "ko", "fr"]):
+            session = GameSession.objects.create(
+                player=player,
+                word="apple",
+                language=language,
+            )
+            session.complete(
+                score=(i * 7 + j * 13) % 101,
+                description="una fruta roja",
+                feedback="Good",
+            )
+
+    player, _ = Player.objects.get_or_create(phone_number=BENCH_PHONE_NUMBER)
+    player.opt_in()
+    return player
+
+
+def start_game(
+    player: Player,
+) -> None:
+    """Give the player an active game to describe."""
+    player.end_active_sessions()
+    GameSession.objects.create(player=player, word="apple", language="es")
+
+
+def build_cases() -> list[Case]:
+    """Seed the database and build every benchmark case."""
+    player = seed_players()
+    client = Client()
+    payload = incoming_sms_payload("stats")
+    body = urlencode(payload)
+    params = {key: values[0] for key, values in parse_qs(body).items()}
+
+    def command(text: str) -> Callable[[], object]:
+        return lambda: handle_player_command(BENCH_PHONE_NUMBER, text)
+
+    def post_sms(text: str) -> Callable[[], object]:
+        data = urlencode(incoming_sms_payload(text))
+        return lambda: client.post(
+            "/api/webhooks/twilio/incoming",
+            data=data,
+            content_type="application/x-www-form-urlencoded",
+        )
+
+    return [
+        Case("form_parse", lambda: parse_qs(body), iterations=20000),
+        Case(
+            "schema_validation",
+            lambda: TwilioIncomingMessageSchema(**params),
+            iterations=20000,
+        ),
+        Case(
+            "create_twiml_response",
+            lambda: create_twiml_response(MESSAGES["how_to_play"]),
+            iterations=5000,
+        ),
+        Case(
+            "create_voice_response",
+            lambda: create_voice_response(
+                VOICE_MESSAGES["how_to_play"],
+                gather_speech=True,
+            ),
+            iterations=5000,
+        ),
+        Case(
+            "command.opt_in",
+            command("langgang"),
+            setup=lambda: Player.objects.filter(pk=player.pk).update(is_active=False),
+        ),
+        Case(
+            "command.opt_out",
+            command("optout"),
+            setup=player.opt_in,
+        ),
+        Case("command.stats", command("stats"), setup=player.opt_in),
+        Case("command.rank", command("rank"), setup=player.opt_in),
+        Case("command.top", command("top es"), setup=player.opt_in),
+        Case("command.language", command("es"), setup=player.opt_in),
+        Case(
+            "command.description",
+            command("una fruta roja y dulce"),
+            setup=lambda: start_game(player),
+        ),
+        Case(
+            "command.unrecognized",
+            command("hello there"),
+            setup=player.end_active_sessions,
+        ),
+        Case(
+            "incoming_message.stats",
+            post_sms("stats"),
+            setup=player.opt_in,
+            iterations=500,
+        ),
+        Case(
+            "incoming_message.language",
+            post_sms("es"),
+            setup=player.opt_in,
+            iterations=500,
+        ),
+        Case(
+            "incoming_message.description",
+            post_sms("una fruta roja y dulce"),
+            setup=lambda: start_game(player),
+            iterations=500,
+        ),
+    ]
@@ -0,0 +1,125 @@
+"""Compare benchmark results against a baseline."""
+
+from dataclasses import dataclass
+
+# Timing changes smaller than this are noise, however large relative to the
+# case: a few microseconds of scheduling jitter are 10% of the fastest cases
+MIN_DELTA_US = 20.0
+
+
+@dataclass
+class Comparison:
+    """How one case moved between two runs."""
+
+    name: str
+    baseline_us: float | None
+    current_us: float | None
+    baseline_queries: int | None
+    current_queries: int | None
+    threshold: float
+    baseline_rss_kb: int | None = None
+    current_rss_kb: int | None = None
+    min_delta_us: float = 0.0
+
+    @property
+    def ratio(self) -> float | None:
+        if not self.baseline_us or self.current_us is None:
+            return None
+        return self.current_us / self.baseline_us
+
+    @property
+    def status(self) -> str:
+        if self.baseline_us is None:
+            return "new"
+        if self.current_us is None:
+            return "missing"
+        if (
+            self.baseline_queries is not None
+            and self.current_queries is not None
+            and self.current_queries > self.baseline_queries
+        ):
+            return "REGRESSION"
+        if (
+            self.baseline_rss_kb
+            and self.current_rss_kb is not None
+            and self.current_rss_kb > self.baseline_rss_kb * (1 + self.threshold)
+        ):
+            return "REGRESSION"
+        ratio = self.ratio
+        if ratio is None:
+            return "ok"
+        delta = self.current_us - self.baseline_us
+        if ratio > 1 + self.threshold and delta > self.min_delta_us:
+            return "REGRESSION"
+        if ratio < 1 - self.threshold and -delta > self.min_delta_us:
+            return "improved"
+        return "ok"
+
+
+def compare(
+    baseline: dict,
+    current: dict,
+    threshold: float,
+    include_missing: bool = True,
+    min_delta_us: float = MIN_DELTA_US,
+) -> list[Comparison]:
+    """Compare median timings and query counts case by case.
+
+    A case regresses when its median slows by more than threshold and by
+    more than min_delta_us, when it makes more queries than in the baseline,
+    or when its peak memory, if recorded, grows by more than threshold.
+
+    Args:
+        baseline: Result document from bench.runner.run_cases
+        current: Result document from bench.runner.run_cases
+        threshold: Allowed relative slowdown, e.g. 0.1 for 10%
+        include_missing: Also list baseline cases absent from the current run
+        min_delta_us: Allowed absolute slowdown in microseconds
+
+    Returns:
+        list: One Comparison per case in either run
+    """
+    names = list(current["results"])
+    if include_missing:
+        names += [
+            name for name in baseline["results"] if name not in current["results"]
+        ]
+    comparisons = []
+    for name in names:
+        old = baseline["results"].get(name, {})
+        new = current["results"].get(name, {})
+        comparisons.append(
+            Comparison(
+                name=name,
+                baseline_us=old.get("median_us"),
+                current_us=new.get("median_us"),
+                baseline_queries=old.get("queries"),
+                current_queries=new.get("queries"),
+                threshold=threshold,
+                baseline_rss_kb=old.get("max_rss_kb"),
+                current_rss_kb=new.get("max_rss_kb"),
+                min_delta_us=min_delta_us,
+            ),
+        )
+    return comparisons
+
+
+def format_report(
+    comparisons: list[Comparison],
+) -> str:
+    """Format comparisons as a plain-text table."""
+    lines = [
+        f"{'case':<32} {'baseline us':>12} {'current us':>12} {'change':>8}"
+        f" {'queries':>9}  status",
+    ]
+    for row in comparisons:
+        baseline = f"{row.baseline_us:.1f}" if row.baseline_us is not None else "-"
+        current = f"{row.current_us:.1f}" if row.current_us is not None else "-"
+        ratio = row.ratio
+        change = f"{(ratio - 1) * 100:+.1f}%" if ratio is not None else "-"
+        queries = f"{row.baseline_queries}->{row.current_queries}"
+        lines.append(
+            f"{row.name:<32} {baseline:>12} {current:>12} {change:>8}"
+            f" {queries:>9}  {row.status}",
+        )
+    return "\n".join(lines)
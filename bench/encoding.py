@@ -0,0 +1,164 @@
+"""Coded column benchmark: GameSession size and lookups before and after 0005.
+
+Migration 0005 stores a session's status and language as small integer
+codes instead of strings. A fresh SQLite database is migrated to 0004 and
+filled with synthetic sessions, then the size of the session table and its
+indexes (from SQLite's dbstat table) and the latency of the hot lookups are
+measured, the database is migrated to 0005 and vacuumed, and both are
+measured again.
+"""
+
+import json
+import os
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+from bench.metadata import run_metadata
+
+SRC_DIR = Path(__file__).parent.parent / "src"
+
+MEASURE = """
+import json
+import random
+import sys
+import time
+import django
+django.setup()
+from django.core.management import call_command
+from django.db import connection
+
+rows, lookups = int(sys.argv[1]), int(sys.argv[2])
+players = max(rows // 20, 1)
+random.seed(0)
+
+
+def sizes():
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT name, SUM(pgsize) FROM dbstat WHERE name IN"
+            " (SELECT name FROM sqlite_master WHERE tbl_name = 'game_gamesession')"
+            " GROUP BY name",
+        )
+        pages = dict(cursor.fetchall())
+    table = pages.pop("game_gamesession")
+    return {"table_bytes": table, "index_bytes": sum(pages.values())}
+
+
+def timed(sql, params):
+    with connection.cursor() as cursor:
+        start = time.perf_counter()
+        for values in params:
+            cursor.execute(sql, values)
+            cursor.fetchall()
+        return round((time.perf_counter() - start) / len(params) * 1e6, 1)
+
+
+def latencies(active):
+    player_ids = [[random.randint(1, players), active] for _ in range(lookups)]
+    return {
+        "active_lookup_us": timed(
+            "SELECT id, word, language FROM game_gamesession"
+            " WHERE player_id = %s AND status = %s",
+            player_ids,
+        ),
+        "status_count_us": timed(
+            "SELECT COUNT(*) FROM game_gamesession WHERE status = %s",
+            [[active]] * 20,
+        ),
+        "language_breakdown_us": timed(
+            "SELECT language, COUNT(*) FROM game_gamesession GROUP BY language",
+            [[]] * 5,
+        ),
+    }
+
+
+call_command("migrate", "game", "0004", verbosity=0)
+with connection.cursor() as cursor:
+    cursor.executemany(
+        "INSERT INTO game_player (phone_number, is_active, created_at)"
+        " VALUES (%s, 1, '2025-01-01')",
+        [[f"+1555{player:07d}"] for player in range(players)],
+    )
+    cursor.executemany(
+        "INSERT INTO game_gamesession (player_id, word, language, status,"
+        " score, started_at) VALUES (%s, 'gato', %s, %s, 80, '2025-01-01')",
+        [
+            [
+                random.randint(1, players),
+                random.choice(["es", "es", "fr", "de", "ko", "ja"]),
+                random.choices(["completed", "timeout", "active"], [90, 8, 2])[0],
+            ]
+            for _ in range(rows)
+        ],
+    )
+    cursor.execute("VACUUM")
+before = {**sizes(), **latencies("active")}
+
+start = time.perf_counter()
+call_command("migrate", "game", verbosity=0)
+migrate_seconds = time.perf_counter() - start
+with connection.cursor() as cursor:
+    cursor.execute("VACUUM")
+after = {**sizes(), **latencies(1)}
+
+print(json.dumps({
+    "rows": rows,
+    "migrate_seconds": round(migrate_seconds, 3),
+    "before": before,
+    "after": after,
+}))
+"""
+
+
+def run_encoding(
+    rows: int = 200_000,
+    lookups: int = 2_000,
+) -> dict:
+    """Measure the session table before and after coding its columns.
+
+    Args:
+        rows: Synthetic sessions created
+        lookups: Active session lookups timed per phase
+
+    Returns:
+        dict: Report with sizes and latencies before and after
+    """
+    with tempfile.TemporaryDirectory() as directory:
+        env = {
+            **os.environ,
+            "DJANGO_SETTINGS_MODULE": "charades.config.settings",
+            "PYTHONPATH": str(SRC_DIR),
+            "DATABASE_DIR": directory,
+        }
+        env.pop("DATABASE_SHARD_COUNT", None)
+        env.pop("DATABASE_REPLICA_NAME", None)
+        result = subprocess.run(
+            [sys.executable, "-c", MEASURE, str(rows), str(lookups)],
+            env=env,
+            check=True,
+            capture_output=True,
+            text=True,
+        )
+    return {
+        **run_metadata(),
+        **json.loads(result.stdout),
+    }
+
+
+def format_encoding_report(
+    report: dict,
+) -> str:
+    """Format a coded column benchmark report as a table."""
+    before, after = report["before"], report["after"]
+    lines = [
+        f"{report['rows']} sessions, migrated in {report['migrate_seconds']:.1f}s",
+        f"{'':>22} {'before':>12} {'after':>12} {'change':>8}",
+    ]
+    for key in before:
+        change = after[key] / before[key] - 1 if before[key] else 0.0
+        lines.append(
+            f"{key:>22} {before[key]:>12} {after[key]:>12} {change:>+7.0%}",
+        )
+    return "\n".join(lines)
@@ -0,0 +1,64 @@
+"""Django environment for benchmarks: fake LLM and a throwaway database."""
+
+import os
+import sys
+from collections.abc import Iterator
+from contextlib import contextmanager
+from pathlib import Path
+
+# Add src directory to Python path, as test/conftest.py does
+sys.path.append(str(Path(__file__).parent.parent / "src"))
+
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "charades.config.settings")
+
+
+@contextmanager
+def benchmark_database(
+    llm_latency: str = "fixed",
+    llm_latency_ms: float = 0,
+    database_name: str | None = None,
+    word_prefetch: bool = False,
+) -> Iterator[None]:
+    """Set up Django with a migrated test database for the duration.
+
+    LLM calls always go to the fake provider. By default they respond
+    instantly so LLM latency stays out of the measurements.
+
+    Args:
+        llm_latency: Fake provider latency distribution
+        llm_latency_ms: Fake provider latency, or median latency
+        database_name: Test database name; a file keeps SQLite usable from
+            the threads the ASGI handler runs views in
+        word_prefetch: Prefetch next words on background threads, which
+            needs database_name as well
+    """
+    os.environ["LLM_PRIMARY_PROVIDER"] = "fake"
+    os.environ["LLM_FALLBACK_PROVIDER"] = "fake"
+    os.environ["FAKE_LLM_LATENCY"] = llm_latency
+    os.environ["FAKE_LLM_LATENCY_MS"] = str(llm_latency_ms)
+    os.environ["FAKE_LLM_FAILURE_RATE"] = "0"
+    os.environ["FAKE_LLM_MALFORMED_RATE"] = "0"
+
+    import django
+
+    django.setup()
+
+    from django.conf import settings
+    from django.db import connection
+    from django.test.utils import setup_test_environment
+    from django.test.utils import teardown_test_environment
+
+    # Ledger inserts run inline so they are counted, rather than racing a
+    # background thread for the database
+    settings.LLM_LEDGER_BACKGROUND = False
+    settings.WORD_PREFETCH = {**settings.WORD_PREFETCH, "enabled": word_prefetch}
+    if database_name is not None:
+        connection.settings_dict["TEST"]["NAME"] = database_name
+
+    setup_test_environment()
+    old_name = connection.creation.create_test_db(verbosity=0, autoclobber=True)
+    try:
+        yield
+    finally:
+        connection.creation.destroy_test_db(old_name, verbosity=0)
+        teardown_test_environment()
@@ -0,0 +1,140 @@
+"""Reprompt rate of language selection, before and after the matcher.
+
+A reprompt is a language request that isn't recognized, so the player gets
+the how-to-play message and has to try again; on a call that is another
+full speech round trip. The corpus below mixes exact names, codes, filler
+words, native names, punctuation from speech recognition and misspellings,
+plus messages that name no language and must not match.
+
+Import only after Django is set up.
+"""
+
+from charades.game.languages import language_matcher
+
+# (channel, message, expected language code or None)
+CORPUS: list[tuple[str, str, str | None]] = [
+    ("sms", "es", "ES"),
+    ("sms", "KO", "KO"),
+    ("sms", "fr ", "FR"),
+    ("sms", "Spanish", "ES"),
+    ("sms", "spanish please", "ES"),
+    ("sms", "español", "ES"),
+    ("sms", "espanol", "ES"),
+    ("sms", "korean!", "KO"),
+    ("sms", "Japanese pls", "JA"),
+    ("sms", "let's do french", "FR"),
+    ("sms", "deutsch", "DE"),
+    ("sms", "portugese", "PT"),
+    ("sms", "chinese", "ZH"),
+    ("sms", "mandarin", "ZH"),
+    ("sms", "한국어", "KO"),
+    ("sms", "日本語", "JA"),
+    ("sms", "hello", None),
+    ("sms", "help", None),
+    ("sms", "what is this", None),
+    ("sms", "ok", None),
+    ("voice", "Spanish.", "ES"),
+    ("voice", "spanish", "ES"),
+    ("voice", "Korean.", "KO"),
+    ("voice", "Korean?", "KO"),
+    ("voice", "Spanish please.", "ES"),
+    ("voice", "I want to play in French.", "FR"),
+    ("voice", "French, please.", "FR"),
+    ("voice", "Um, German.", "DE"),
+    ("voice", "Español.", "ES"),
+    ("voice", "Italiano.", "IT"),
+    ("voice", "Japanese.", "JA"),
+    ("voice", "Japan.", "JA"),
+    ("voice", "Korea.", "KO"),
+    ("voice", "Russian!", "RU"),
+    ("voice", "Portuguese.", "PT"),
+    ("voice", "Farsi.", "FA"),
+    ("voice", "Persian.", "FA"),
+    ("voice", "Bengali.", "BN"),
+    ("voice", "Bangla.", "BN"),
+    ("voice", "Chinese.", "ZH"),
+    ("voice", "Mandarin.", "ZH"),
+    ("voice", "English.", "EN"),
+    ("voice", "Englisch.", "EN"),
+    ("voice", "Spanich.", "ES"),
+    ("voice", "Koreans.", "KO"),
+    ("voice", "Italian language.", "IT"),
+    ("voice", "Let's do Russian.", "RU"),
+    ("voice", "Hello?", None),
+    ("voice", "What?", None),
+    ("voice", "I don't know.", None),
+    ("voice", "Can you repeat that?", None),
+]
+
+LEGACY_VOICE_NAMES = {
+    "english": "EN",
+    "korean": "KO",
+    "spanish": "ES",
+    "french": "FR",
+    "german": "DE",
+    "italian": "IT",
+    "japanese": "JA",
+    "portuguese": "PT",
+    "russian": "RU",
+    "bengali": "BN",
+    "persian": "FA",
+    "chinese": "ZH",
+}
+
+
+def legacy_match(
+    channel: str,
+    message: str,
+) -> str | None:
+    """Language matching as done before the shared matcher."""
+    if channel == "voice":
+        return LEGACY_VOICE_NAMES.get(message.lower().strip().strip("."))
+    message = message.strip().lower()
+    if len(message) == 2 and message.upper() in language_matcher.codes.values():
+        return message.upper()
+    return None
+
+
+def evaluate() -> dict:
+    """Score the legacy and current matchers on the corpus.
+
+    Returns:
+        dict: Per matcher and channel, the reprompt rate among messages that
+            name a language, and counts of wrong matches
+    """
+    report: dict[str, dict[str, dict[str, float]]] = {}
+    for matcher in ("legacy", "current"):
+        report[matcher] = {}
+        for channel in ("sms", "voice"):
+            cases = [case for case in CORPUS if case[0] == channel]
+            requests = [case for case in cases if case[2] is not None]
+            reprompts = wrong = 0
+            for _, message, expected in cases:
+                if matcher == "legacy":
+                    code = legacy_match(channel, message)
+                else:
+                    code = language_matcher.match(message)
+                if expected is not None and code is None:
+                    reprompts += 1
+                elif code != expected:
+                    wrong += 1
+            report[matcher][channel] = {
+                "language_requests": len(requests),
+                "reprompt_rate": round(reprompts / len(requests), 3),
+                "wrong_matches": wrong,
+            }
+    return report
+
+
+def format_language_report(
+    report: dict,
+) -> str:
+    """Format the evaluation as a plain-text table."""
+    lines = [f"{'matcher':<10} {'channel':<8} {'reprompt rate':>14} {'wrong':>6}"]
+    for matcher, channels in report.items():
+        for channel, stats in channels.items():
+            lines.append(
+                f"{matcher:<10} {channel:<8} {stats['reprompt_rate']:>14.1%}"
+                f" {stats['wrong_matches']:>6}",
+            )
+    return "\n".join(lines)
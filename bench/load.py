@@ -0,0 +1,390 @@
+"""Concurrent virtual-player load generator.
+
+Each virtual player runs full game loops the way a phone would: opt in with
+`langgang`, pick a language, describe the word, and repeat. Players talk
+either through the Twilio SMS webhook, using Twilio's form-encoded payload,
+or through the `/api/test/player-command` JSON endpoint.
+
+Only httpx is needed here, so load can be driven over HTTP from a machine
+without Django. In-process runs go through httpx's ASGI transport, see
+bench.__main__.
+"""
+
+import asyncio
+import math
+import random
+import time
+import uuid
+from collections import defaultdict
+from dataclasses import dataclass
+from dataclasses import field
+
+import httpx
+
+ARRIVALS = ("burst", "uniform", "poisson")
+CHANNELS = ("sms", "command", "mixed")
+
+SMS_PATH = "/api/webhooks/twilio/incoming"
+STATUS_PATH = "/api/webhooks/twilio/status"
+COMMAND_PATH = "/api/test/player-command"
+
+TWILIO_NUMBER = "+12065550000"
+
+DESCRIPTIONS = [
+    "you find it in the kitchen",
+    "it is big and you can see it from far away",
+    "children like to play with it",
+    "people use it every day",
+    "it is round and has a bright color",
+    "you need it when it rains",
+]
+
+
+@dataclass
+class LoadConfig:
+    """Shape of a load run.
+
+    Attributes:
+        players: Number of virtual players
+        rounds: Games each player plays
+        arrival: How player start times are spread, one of ARRIVALS
+        ramp_seconds: Window over which players arrive
+        think_ms: Mean pause between a player's messages
+        channel: Endpoint players use, one of CHANNELS
+        languages: Language codes players choose from
+        status_callbacks: Follow each SMS reply with a delivery status callback
+        seed: Seed for arrivals, think times and player choices
+    """
+
+    players: int = 50
+    rounds: int = 3
+    arrival: str = "poisson"
+    ramp_seconds: float = 10.0
+    think_ms: float = 500.0
+    channel: str = "mixed"
+    languages: list[str] = field(default_factory=lambda: ["es", "fr", "ko"])
+    status_callbacks: bool = False
+    seed: int = 0
+
+
+def arrival_offsets(
+    count: int,
+    arrival: str,
+    ramp_seconds: float,
+    rng: random.Random,
+) -> list[float]:
+    """Compute when each player starts, in seconds from the start of the run.
+
+    Args:
+        count: Number of players
+        arrival: 'burst' starts everyone at once, 'uniform' spaces players
+            evenly over the ramp and 'poisson' draws exponential gaps with
+            the same mean rate
+        ramp_seconds: Window over which players arrive
+        rng: Random generator for 'poisson' arrivals
+
+    Returns:
+        list: Start offset for each player
+    """
+    if arrival == "burst" or ramp_seconds <= 0 or count == 0:
+        return [0.0] * count
+    if arrival == "uniform":
+        return [i * ramp_seconds / count for i in range(count)]
+    if arrival == "poisson":
+        offsets = []
+        now = 0.0
+        for _ in range(count):
+            offsets.append(now)
+            now += rng.expovariate(count / ramp_seconds)
+        return offsets
+    raise ValueError(f"Unknown arrival distribution: {arrival}")
+
+
+def percentile(
+    values: list[float],
+    fraction: float,
+) -> float:
+    """Nearest-rank percentile of already sorted values."""
+    if not values:
+        return 0.0
+    return values[max(0, math.ceil(fraction * len(values)) - 1)]
+
+
+class LatencyRecorder:
+    """Collects request latencies and failures per endpoint."""
+
+    def __init__(self) -> None:
+        self.latencies: dict[str, list[float]] = defaultdict(list)
+        self.errors: dict[str, int] = defaultdict(int)
+        self.games_completed = 0
+
+    def record(
+        self,
+        endpoint: str,
+        seconds: float,
+        ok: bool,
+    ) -> None:
+        self.latencies[endpoint].append(seconds)
+        if not ok:
+            self.errors[endpoint] += 1
+
+    def report(
+        self,
+        duration: float,
+    ) -> dict:
+        """Summarize throughput and latency percentiles per endpoint.
+
+        Args:
+            duration: Wall-clock length of the run in seconds
+
+        Returns:
+            dict: Per-endpoint stats, plus 'all' for every request together
+        """
+        groups = dict(self.latencies)
+        groups["all"] = [
+            latency for latencies in self.latencies.values() for latency in latencies
+        ]
+        endpoints = {}
+        for endpoint, latencies in groups.items():
+            latencies = sorted(latencies)
+            errors = (
+                sum(self.errors.values())
+                if endpoint == "all"
+                else self.errors[endpoint]
+            )
+            endpoints[endpoint] = {
+                "requests": len(latencies),
+                "errors": errors,
+                "throughput_rps": round(len(latencies) / duration, 2)
+                if duration
+                else 0.0,
+                "p50_ms": round(percentile(latencies, 0.50) * 1000, 2),
+                "p95_ms": round(percentile(latencies, 0.95) * 1000, 2),
+                "p99_ms": round(percentile(latencies, 0.99) * 1000, 2),
+            }
+        return {
+            "duration_seconds": round(duration, 3),
+            "games_completed": self.games_completed,
+            "endpoints": endpoints,
+        }
+
+
+def twilio_sid(
+    prefix: str,
+) -> str:
+    """Generate a Twilio-style SID, e.g. SM followed by 32 hex digits."""
+    return f"{prefix}{uuid.uuid4().hex}"
+
+
+def incoming_sms_payload(
+    phone_number: str,
+    body: str,
+) -> dict[str, str]:
+    """Build the form payload Twilio posts for an incoming SMS."""
+    message_sid = twilio_sid("SM")
+    return {
+        "ToCountry": "US",
+        "ToState": "WA",
+        "SmsMessageSid": message_sid,
+        "NumMedia": "0",
+        "ToCity": "SEATTLE",
+        "FromZip": "98101",
+        "SmsSid": message_sid,
+        "FromState": "WA",
+        "SmsStatus": "received",
+        "FromCity": "SEATTLE",
+        "Body": body,
+        "FromCountry": "US",
+        "To": TWILIO_NUMBER,
+        "ToZip": "98101",
+        "NumSegments": "1",
+        "MessageSid": message_sid,
+        "AccountSid": "AC00000000000000000000000000000000",
+        "From": phone_number,
+        "ApiVersion": "2010-04-01",
+    }
+
+
+def message_status_payload(
+    phone_number: str,
+) -> dict[str, str]:
+    """Build the form payload Twilio posts when a reply is delivered."""
+    message_sid = twilio_sid("SM")
+    return {
+        "SmsSid": message_sid,
+        "SmsStatus": "delivered",
+        "MessageStatus": "delivered",
+        "To": phone_number,
+        "MessageSid": message_sid,
+        "AccountSid": "AC00000000000000000000000000000000",
+        "From": TWILIO_NUMBER,
+        "ApiVersion": "2010-04-01",
+    }
+
+
+class VirtualPlayer:
+    """One simulated phone playing the game."""
+
+    def __init__(
+        self,
+        client: httpx.AsyncClient,
+        recorder: LatencyRecorder,
+        config: LoadConfig,
+        phone_number: str,
+        channel: str,
+        rng: random.Random,
+    ) -> None:
+        self.client = client
+        self.recorder = recorder
+        self.config = config
+        self.phone_number = phone_number
+        self.channel = channel
+        self.rng = rng
+
+    async def _post(
+        self,
+        path: str,
+        **kwargs,
+    ) -> bool:
+        start = time.perf_counter()
+        try:
+            response = await self.client.post(path, **kwargs)
+            ok = response.status_code < 400
+        except httpx.HTTPError:
+            ok = False
+        self.recorder.record(path, time.perf_counter() - start, ok)
+        return ok
+
+    async def send(
+        self,
+        text: str,
+    ) -> bool:
+        """Send a message through the player's channel.
+
+        Returns:
+            bool: Whether the server answered without an error status
+        """
+        if self.channel == "command":
+            return await self._post(
+                COMMAND_PATH,
+                json={"phone_number": self.phone_number, "command": text},
+            )
+
+        ok = await self._post(
+            SMS_PATH,
+            data=incoming_sms_payload(self.phone_number, text),
+        )
+        if ok and self.config.status_callbacks:
+            await self._post(
+                STATUS_PATH,
+                data=message_status_payload(self.phone_number),
+            )
+        return ok
+
+    async def think(self) -> None:
+        if self.config.think_ms > 0:
+            await asyncio.sleep(self.rng.expovariate(1000 / self.config.think_ms))
+
+    async def play(
+        self,
+        start_offset: float,
+    ) -> None:
+        """Wait for the player's arrival, opt in and play every round."""
+        await asyncio.sleep(start_offset)
+        if not await self.send("langgang"):
+            return
+        for _ in range(self.config.rounds):
+            await self.think()
+            if not await self.send(self.rng.choice(self.config.languages)):
+                continue
+            await self.think()
+            if await self.send(self.rng.choice(DESCRIPTIONS)):
+                self.recorder.games_completed += 1
+
+
+async def run_load(
+    config: LoadConfig,
+    base_url: str,
+    transport: httpx.AsyncBaseTransport | None = None,
+    timeout: float = 30.0,
+) -> dict:
+    """Run every virtual player to completion and report latencies.
+
+    Args:
+        config: Shape of the run
+        base_url: Server to send requests to
+        transport: Custom transport, e.g. httpx.ASGITransport for in-process
+            runs; None sends real HTTP requests
+        timeout: Per-request timeout in seconds
+
+    Returns:
+        dict: Report from LatencyRecorder.report with the run's config
+    """
+    if config.arrival not in ARRIVALS:
+        raise ValueError(f"Unknown arrival distribution: {config.arrival}")
+    if config.channel not in CHANNELS:
+        raise ValueError(f"Unknown channel: {config.channel}")
+
+    rng = random.Random(config.seed)
+    offsets = arrival_offsets(config.players, config.arrival, config.ramp_seconds, rng)
+    recorder = LatencyRecorder()
+    # Every player may hold a connection, so don't let the pool queue them
+    limits = httpx.Limits(max_connections=config.players or None)
+    async with httpx.AsyncClient(
+        base_url=base_url,
+        transport=transport,
+        limits=limits,
+        timeout=timeout,
+    ) as client:
+        players = []
+        for i, offset in enumerate(offsets):
+            if config.channel == "mixed":
+                channel = CHANNELS[i % 2]
+            else:
+                channel = config.channel
+            player = VirtualPlayer(
+                client=client,
+                recorder=recorder,
+                config=config,
+                phone_number=f"+1206{7_000_000 + config.seed * config.players + i}",
+                channel=channel,
+                rng=random.Random(f"{config.seed}:{i}"),
+            )
+            players.append(player.play(offset))
+
+        start = time.perf_counter()
+        await asyncio.gather(*players)
+        duration = time.perf_counter() - start
+
+    report = recorder.report(duration)
+    report["config"] = {
+        "players": config.players,
+        "rounds": config.rounds,
+        "arrival": config.arrival,
+        "ramp_seconds": config.ramp_seconds,
+        "think_ms": config.think_ms,
+        "channel": config.channel,
+        "languages": config.languages,
+        "status_callbacks": config.status_callbacks,
+        "seed": config.seed,
+    }
+    return report
+
+
+def format_load_report(
+    report: dict,
+) -> str:
+    """Format a load report as a plain-text table."""
+    lines = [
+        f"{report['games_completed']} games in {report['duration_seconds']:.1f}s",
+        "",
+        f"{'endpoint':<32} {'requests':>9} {'errors':>7} {'req/s':>8}"
+        f" {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9}",
+    ]
+    for endpoint, stats in report["endpoints"].items():
+        lines.append(
+            f"{endpoint:<32} {stats['requests']:>9} {stats['errors']:>7}"
+            f" {stats['throughput_rps']:>8.1f} {stats['p50_ms']:>9.1f}"
+            f" {stats['p95_ms']:>9.1f} {stats['p99_ms']:>9.1f}",
+        )
+    return "\n".join(lines)
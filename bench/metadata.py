@@ -0,0 +1,29 @@
+"""Metadata stored with every benchmark result document."""
+
+import platform
+import subprocess
+from datetime import datetime
+from datetime import timezone
+
+
+def git_revision() -> str:
+    """Get the current commit hash, or an empty string outside git."""
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return ""
+
+
+def run_metadata() -> dict:
+    """Describe when, where and at which revision results were taken."""
+    return {
+        "created_at": datetime.now(timezone.utc).isoformat(),
+        "revision": git_revision(),
+        "python": platform.python_version(),
+        "machine": f"{platform.system()} {platform.machine()}",
+    }
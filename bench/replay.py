@@ -0,0 +1,256 @@
+"""Replay captured webhook traffic against a running instance.
+
+Captures are the .jsonl.gz files written by charades.game.capture. Requests
+are re-issued in arrival order with their original gaps divided by a speed
+factor, so `--speed 1` reproduces the captured load and `--speed 10` squeezes
+an hour of traffic into six minutes. The report compares latency and errors
+with what the capturing server saw, or with a previous replay report.
+
+Captured latencies are measured inside the server, while replay latencies
+include the network, so compare replays with each other when the difference
+matters. Disable capture on the target, or replays are captured too.
+"""
+
+import asyncio
+import base64
+import gzip
+import json
+import time
+import zlib
+from collections.abc import Iterator
+from pathlib import Path
+from typing import Any
+
+import httpx
+
+from bench.load import LatencyRecorder
+
+# Set by the client for the new connection rather than copied from the capture
+SKIPPED_HEADERS = frozenset(
+    ["host", "content-length", "connection", "transfer-encoding"],
+)
+
+
+def read_capture(
+    path: Path,
+) -> Iterator[dict[str, Any]]:
+    """Read entries from one capture file.
+
+    A file still being written, or left behind by a crashed worker, ends in
+    an incomplete gzip stream; entries before that point are still read.
+    """
+    with gzip.open(path, "rt", encoding="utf-8") as capture:
+        try:
+            for line in capture:
+                if line.endswith("\n"):
+                    yield json.loads(line)
+        except (EOFError, zlib.error):
+            return
+
+
+def load_captures(
+    paths: list[Path],
+) -> list[dict[str, Any]]:
+    """Read every capture file, or every file in a capture directory.
+
+    Returns:
+        list: Entries from all files in arrival order
+    """
+    files: list[Path] = []
+    for path in paths:
+        if path.is_dir():
+            files.extend(sorted(path.glob("*.jsonl.gz")))
+        else:
+            files.append(path)
+    entries = [entry for file in files for entry in read_capture(file)]
+    entries.sort(key=lambda entry: entry["arrived_at"])
+    return entries
+
+
+def request_body(
+    entry: dict[str, Any],
+) -> bytes:
+    if "body_base64" in entry:
+        return base64.b64decode(entry["body_base64"])
+    return entry.get("body", "").encode("utf-8")
+
+
+async def replay(
+    entries: list[dict[str, Any]],
+    base_url: str,
+    speed: float = 1.0,
+    timeout: float = 30.0,
+) -> dict:
+    """Re-issue captured requests, preserving their inter-arrival gaps.
+
+    Args:
+        entries: Capture entries in arrival order
+        base_url: Instance to replay against
+        speed: Divide captured gaps by this factor
+        timeout: Per-request timeout in seconds
+
+    Returns:
+        dict: Reports for the 'original' and 'replay' runs, and how far the
+            replayer fell behind schedule
+    """
+    original = LatencyRecorder()
+    replayed = LatencyRecorder()
+    status_mismatches = 0
+    max_lag = 0.0
+    if not entries:
+        return {
+            "original": original.report(0),
+            "replay": replayed.report(0),
+            "speed": speed,
+            "status_mismatches": 0,
+            "max_lag_ms": 0.0,
+        }
+
+    first_arrival = entries[0]["arrived_at"]
+    # Requests overlap as they did in production, so don't queue on the pool
+    limits = httpx.Limits(max_connections=None)
+    async with httpx.AsyncClient(
+        base_url=base_url,
+        limits=limits,
+        timeout=timeout,
+    ) as client:
+
+        async def send(entry: dict[str, Any]) -> None:
+            nonlocal status_mismatches
+            headers = {
+                name: value
+                for name, value in entry["headers"].items()
+                if name.lower() not in SKIPPED_HEADERS
+            }
+            url = entry["path"]
+            if entry.get("query"):
+                url = f"{url}?{entry['query']}"
+            start = time.perf_counter()
+            try:
+                response = await client.request(
+                    entry["method"],
+                    url,
+                    headers=headers,
+                    content=request_body(entry),
+                )
+                status = response.status_code
+            except httpx.HTTPError:
+                status = None
+            latency = time.perf_counter() - start
+            replayed.record(entry["path"], latency, status is not None and status < 400)
+            if status != entry["status"]:
+                status_mismatches += 1
+
+        tasks = []
+        start = time.perf_counter()
+        for entry in entries:
+            original.record(
+                entry["path"],
+                entry["latency_ms"] / 1000,
+                entry["status"] < 400,
+            )
+            due = (entry["arrived_at"] - first_arrival) / speed
+            delay = due - (time.perf_counter() - start)
+            if delay > 0:
+                await asyncio.sleep(delay)
+            else:
+                max_lag = max(max_lag, -delay)
+            tasks.append(asyncio.create_task(send(entry)))
+        await asyncio.gather(*tasks)
+        duration = time.perf_counter() - start
+
+    captured_span = entries[-1]["arrived_at"] - first_arrival
+    return {
+        "original": original.report(captured_span),
+        "replay": replayed.report(duration),
+        "speed": speed,
+        "status_mismatches": status_mismatches,
+        "max_lag_ms": round(max_lag * 1000, 2),
+    }
+
+
+def _change(
+    before: float,
+    after: float,
+) -> str:
+    if not before:
+        return "-"
+    return f"{(after / before - 1) * 100:+.1f}%"
+
+
+def format_diff(
+    before: dict,
+    after: dict,
+    before_label: str,
+    after_label: str,
+) -> str:
+    """Format per-endpoint latency and error differences between two runs.
+
+    Args:
+        before: 'endpoints' section of the earlier run's report
+        after: 'endpoints' section of the later run's report
+        before_label: Column label for the earlier run
+        after_label: Column label for the later run
+
+    Returns:
+        str: Plain-text table
+    """
+    lines = [f"{before_label} -> {after_label}"]
+    lines.append(
+        f"{'endpoint':<32} {'requests':>9} {'errors':>11}"
+        f" {'p50 ms':>24} {'p95 ms':>24} {'p99 ms':>24}",
+    )
+    for endpoint in after:
+        new = after[endpoint]
+        old = before.get(endpoint)
+        if old is None:
+            lines.append(
+                f"{endpoint:<32} {new['requests']:>9}  (not in {before_label})"
+            )
+            continue
+        columns = [f"{endpoint:<32} {new['requests']:>9}"]
+        columns.append(f"{old['errors']:>5}->{new['errors']:<5}")
+        for key in ("p50_ms", "p95_ms", "p99_ms"):
+            columns.append(
+                f"{old[key]:>7.1f}->{new[key]:<7.1f} {_change(old[key], new[key]):>7}",
+            )
+        lines.append(" ".join(columns))
+    return "\n".join(lines)
+
+
+def format_replay_report(
+    report: dict,
+    previous: dict | None = None,
+) -> str:
+    """Format a replay report, optionally against a previous replay.
+
+    Args:
+        report: Result of replay()
+        previous: Earlier replay report of the same capture
+
+    Returns:
+        str: Plain-text report
+    """
+    sections = [
+        f"Replayed {report['replay']['endpoints'].get('all', {}).get('requests', 0)}"
+        f" requests at {report['speed']}x in"
+        f" {report['replay']['duration_seconds']:.1f}s;"
+        f" max schedule lag {report['max_lag_ms']:.1f} ms;"
+        f" {report['status_mismatches']} status mismatches",
+        format_diff(
+            report["original"]["endpoints"],
+            report["replay"]["endpoints"],
+            "captured",
+            "replay",
+        ),
+    ]
+    if previous is not None:
+        sections.append(
+            format_diff(
+                previous["replay"]["endpoints"],
+                report["replay"]["endpoints"],
+                "previous replay",
+                "this replay",
+            ),
+        )
+    return "\n\n".join(sections)
@@ -0,0 +1,134 @@
+"""Run benchmark cases and collect timings and query counts."""
+
+import statistics
+import time
+
+from django.db import connection
+from django.db import reset_queries
+from django.test.utils import CaptureQueriesContext
+
+from bench.cases import Case
+from bench.metadata import run_metadata
+
+WARMUP_ITERATIONS = 20
+# Timed iterations are split into rounds, interleaved across cases, so a burst
+# of machine noise lands in one round of several cases rather than all of one
+ROUNDS = 5
+
+
+def prepare_case(
+    case: Case,
+) -> int:
+    """Warm a case up and count the queries one call makes.
+
+    Args:
+        case: The case to prepare
+
+    Returns:
+        int: Queries per call
+    """
+    for _ in range(WARMUP_ITERATIONS):
+        if case.setup:
+            case.setup()
+        case.run()
+
+    if case.setup:
+        case.setup()
+    # A full query log would make the capture below look empty
+    reset_queries()
+    with CaptureQueriesContext(connection) as queries:
+        case.run()
+    return len(queries.captured_queries)
+
+
+def time_case(
+    case: Case,
+    iterations: int,
+) -> list[float]:
+    """Time iterations of a case.
+
+    Args:
+        case: The case to time
+        iterations: Number of timed iterations
+
+    Returns:
+        list: Microseconds per iteration
+    """
+    samples = []
+    for _ in range(iterations):
+        if case.setup:
+            case.setup()
+        start = time.perf_counter_ns()
+        case.run()
+        samples.append((time.perf_counter_ns() - start) / 1000)
+    return samples
+
+
+def summarize(
+    rounds: list[list[float]],
+    queries: int,
+) -> dict:
+    """Summarize a case's timed rounds.
+
+    Args:
+        rounds: Microseconds per iteration, per round
+        queries: Queries per call
+
+    Returns:
+        dict: Timing percentiles in microseconds and queries per call; the
+            median is the median of the round medians
+    """
+    round_medians = [statistics.median(samples) for samples in rounds]
+    samples = sorted(sample for samples in rounds for sample in samples)
+    return {
+        "iterations": len(samples),
+        "rounds": len(rounds),
+        "median_us": round(statistics.median(round_medians), 3),
+        "round_medians_us": [round(median, 3) for median in round_medians],
+        "mean_us": round(statistics.fmean(samples), 3),
+        "p95_us": round(samples[int(0.95 * (len(samples) - 1))], 3),
+        "queries": queries,
+    }
+
+
+def run_cases(
+    cases: list[Case],
+    scale: float = 1.0,
+    only: list[str] | None = None,
+    rounds: int = ROUNDS,
+) -> dict:
+    """Run cases and wrap their results with run metadata.
+
+    Args:
+        cases: Cases to run
+        scale: Multiplier for every case's iteration count
+        only: Run only cases whose name starts with one of these prefixes
+        rounds: Rounds each case's iterations are split into
+
+    Returns:
+        dict: Result document, as stored in baseline files
+    """
+    cases = [
+        case
+        for case in cases
+        if not only or any(case.name.startswith(prefix) for prefix in only)
+    ]
+    queries = {case.name: prepare_case(case) for case in cases}
+    samples: dict[str, list[list[float]]] = {case.name: [] for case in cases}
+    for _ in range(rounds):
+        for case in cases:
+            iterations = max(1, int(case.iterations * scale) // rounds)
+            samples[case.name].append(time_case(case, iterations))
+
+    results = {}
+    for case in cases:
+        results[case.name] = summarize(samples[case.name], queries[case.name])
+        print(
+            f"{case.name:<32} {results[case.name]['median_us']:>12.1f} us"
+            f" {results[case.name]['queries']:>4} queries",
+        )
+
+    return {
+        **run_metadata(),
+        "results": results,
+    }
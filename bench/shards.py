@@ -0,0 +1,124 @@
+"""Shard write-scaling benchmark: game throughput by number of shards.
+
+For each shard count, a fresh set of SQLite files is migrated and several
+writer processes play games at once, each creating players and completing
+one game per player. SQLite allows one writer per file, so throughput with
+one shard is bounded by that lock, and spreading players over more files
+shows how far sharding lifts it. On a real deployment each shard would be
+its own database server.
+"""
+
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from bench.metadata import run_metadata
+
+SRC_DIR = Path(__file__).parent.parent / "src"
+
+MIGRATE = """
+import django
+django.setup()
+from django.conf import settings
+from django.core.management import call_command
+for alias in settings.DATABASE_SHARDS:
+    call_command("migrate", database=alias, verbosity=0)
+"""
+
+WRITER = """
+import sys
+import django
+django.setup()
+from django.db import connections
+for alias in connections:
+    connections[alias].settings_dict["OPTIONS"]["timeout"] = 60
+from charades.game.models import Player
+
+writer, games = int(sys.argv[1]), int(sys.argv[2])
+for game in range(games):
+    player, _ = Player.get_or_create_player(f"+1555{writer:03d}{game:04d}")
+    session = player.gamesession_set.create(word="gato", language="es")
+    session.complete(score=80, description="a small pet", feedback="Good")
+"""
+
+
+def run_shard_count(
+    shard_count: int,
+    writers: int,
+    games: int,
+) -> dict:
+    """Play games with several writer processes over a number of shards.
+
+    Args:
+        shard_count: Number of SQLite databases players are spread over
+        writers: Number of concurrent writer processes
+        games: Games played by each writer
+
+    Returns:
+        dict: Wall time and games per second
+    """
+    with tempfile.TemporaryDirectory() as directory:
+        env = {
+            **os.environ,
+            "DJANGO_SETTINGS_MODULE": "charades.config.settings",
+            "PYTHONPATH": str(SRC_DIR),
+            "DATABASE_DIR": directory,
+            "DATABASE_SHARD_COUNT": str(shard_count),
+        }
+        subprocess.run([sys.executable, "-c", MIGRATE], env=env, check=True)
+
+        start = time.perf_counter()
+        processes = [
+            subprocess.Popen(
+                [sys.executable, "-c", WRITER, str(writer), str(games)],
+                env=env,
+            )
+            for writer in range(writers)
+        ]
+        for process in processes:
+            if process.wait():
+                raise subprocess.CalledProcessError(process.returncode, WRITER)
+        seconds = time.perf_counter() - start
+
+    return {
+        "shards": shard_count,
+        "writers": writers,
+        "games": writers * games,
+        "seconds": round(seconds, 3),
+        "games_per_second": round(writers * games / seconds, 1),
+    }
+
+
+def run_shards(
+    shard_counts: list[int],
+    writers: int = 4,
+    games: int = 200,
+) -> dict:
+    """Measure game throughput for each shard count.
+
+    Returns:
+        dict: Report with one result per shard count
+    """
+    results = [run_shard_count(count, writers, games) for count in shard_counts]
+    return {
+        **run_metadata(),
+        "results": results,
+    }
+
+
+def format_shards_report(
+    report: dict,
+) -> str:
+    """Format a shard benchmark report as a table."""
+    results = report["results"]
+    lines = [f"{'shards':>6} {'writers':>8} {'games':>6} {'games/s':>9} {'speedup':>8}"]
+    for result in results:
+        speedup = result["games_per_second"] / results[0]["games_per_second"]
+        lines.append(
+            f"{result['shards']:>6} {result['writers']:>8} {result['games']:>6}"
+            f" {result['games_per_second']:>9.1f} {speedup:>7.2f}x",
+        )
+    return "\n".join(lines)
@@ -0,0 +1,122 @@
+"""Startup benchmark: import time and memory of a fresh worker process.
+
+Each sample runs a new interpreter that calls `django.setup()` and loads the
+URLconf, which imports the API, game logic and AI modules the way the first
+request would. Results use the same document format as bench.runner, so
+`python -m bench compare` works on them too.
+"""
+
+import json
+import os
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+
+from bench.metadata import run_metadata
+
+SRC_DIR = Path(__file__).parent.parent / "src"
+
+CHILD = """
+import json, resource, sys, time
+start = time.perf_counter()
+import django
+django.setup()
+setup_done = time.perf_counter()
+from django.urls import get_resolver
+get_resolver().url_patterns
+urls_done = time.perf_counter()
+print(json.dumps({
+    "django_setup": setup_done - start,
+    "url_conf": urls_done - setup_done,
+    "max_rss_kb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+    "sdks": sorted(name for name in ("anthropic", "openai") if name in sys.modules),
+}))
+"""
+
+
+def sample(
+    importtime: bool = False,
+) -> tuple[dict, str]:
+    """Start one fresh process and measure its startup.
+
+    Args:
+        importtime: Run the child with `-X importtime`
+
+    Returns:
+        tuple: (measurements, the child's import time log)
+    """
+    env = {
+        **os.environ,
+        "DJANGO_SETTINGS_MODULE": "charades.config.settings",
+        "PYTHONPATH": str(SRC_DIR),
+    }
+    command = [sys.executable]
+    if importtime:
+        command += ["-X", "importtime"]
+    completed = subprocess.run(
+        [*command, "-c", CHILD],
+        capture_output=True,
+        text=True,
+        env=env,
+        check=True,
+    )
+    return json.loads(completed.stdout.splitlines()[-1]), completed.stderr
+
+
+def slowest_imports(
+    log: str,
+    limit: int = 15,
+) -> list[tuple[int, str]]:
+    """Parse a `-X importtime` log into the slowest imports by self time.
+
+    Returns:
+        list: (microseconds, module) pairs, slowest first
+    """
+    imports = []
+    for line in log.splitlines():
+        if not line.startswith("import time:") or "[us]" in line:
+            continue
+        self_us, _, module = line.removeprefix("import time:").split("|")
+        imports.append((int(self_us), module.strip()))
+    imports.sort(reverse=True)
+    return imports[:limit]
+
+
+def run_startup(
+    repeat: int = 5,
+) -> dict:
+    """Measure startup in several fresh processes.
+
+    Args:
+        repeat: Number of processes to start
+
+    Returns:
+        dict: Result document, as stored in baseline files
+    """
+    samples = [sample()[0] for _ in range(repeat)]
+    results = {}
+    for stage in ("django_setup", "url_conf"):
+        timings = sorted(s[stage] * 1_000_000 for s in samples)
+        results[f"startup.{stage}"] = {
+            "iterations": repeat,
+            "median_us": round(statistics.median(timings), 3),
+            "mean_us": round(statistics.fmean(timings), 3),
+            "p95_us": round(timings[int(0.95 * (len(timings) - 1))], 3),
+            "queries": 0,
+        }
+    # Peak memory is a property of the whole process
+    results["startup.url_conf"]["max_rss_kb"] = int(
+        statistics.median(s["max_rss_kb"] for s in samples),
+    )
+    for name, result in results.items():
+        print(f"{name:<32} {result['median_us'] / 1000:>10.1f} ms")
+    print(
+        f"{'max RSS':<32} {results['startup.url_conf']['max_rss_kb'] / 1024:>10.1f} MB"
+    )
+    print(f"{'LLM SDKs imported':<32} {', '.join(samples[0]['sdks']) or 'none':>10}")
+
+    return {
+        **run_metadata(),
+        "results": results,
+    }
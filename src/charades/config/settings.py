@@ -11,6 +11,7 @@ https://docs.djangoproject.com/en/5.1/ref/settings/
 """
 
 from pathlib import Path
+import json
 import os
 from dotenv import load_dotenv
 
@@ -46,6 +47,77 @@ OPENAI_API_KEY = os.getenv("OPENAI_API_KEY", "")
 # Anthropic settings
 ANTHROPIC_API_KEY = os.getenv("ANTHROPIC_API_KEY", "")
 
+# LLM provider selection: "openai", "anthropic", "fake" or "replay"
+LLM_PRIMARY_PROVIDER = os.getenv("LLM_PRIMARY_PROVIDER", "openai")
+LLM_FALLBACK_PROVIDER = os.getenv("LLM_FALLBACK_PROVIDER", "anthropic")
+
+# LLM provider pool, as a JSON list in LLM_PROVIDERS. Each entry has a
+# "provider" and optionally "name", "model", "api_key" or "api_key_env" (an
+# environment variable holding the key), "weight" and "max_concurrency".
+# First attempts are spread by weight; failures fall back in list order and
+# weight 0 entries only serve fallbacks. max_concurrency caps calls per
+# process: with N workers, divide the provider's per-key limit by N.
+# Defaults to the providers above.
+LLM_PROVIDERS = json.loads(os.getenv("LLM_PROVIDERS", "null")) or [
+    {"provider": LLM_PRIMARY_PROVIDER, "weight": 1},
+    {"provider": LLM_FALLBACK_PROVIDER, "weight": 0},
+]
+LLM_PROVIDER_FAILURE_THRESHOLD = 3
+LLM_PROVIDER_COOLDOWN_SECONDS = 30.0
+LLM_PROVIDER_QUEUE_TIMEOUT = 10.0
+
+# Shared HTTP transport for provider SDKs; http2 needs the h2 package
+LLM_HTTP = {
+    "max_connections": int(os.getenv("LLM_HTTP_MAX_CONNECTIONS", "100")),
+    "max_keepalive_connections": int(os.getenv("LLM_HTTP_MAX_KEEPALIVE", "20")),
+    "keepalive_expiry": float(os.getenv("LLM_HTTP_KEEPALIVE_EXPIRY", "60")),
+    "connect_timeout": float(os.getenv("LLM_HTTP_CONNECT_TIMEOUT", "5")),
+    "read_timeout": float(os.getenv("LLM_HTTP_READ_TIMEOUT", "30")),
+    "write_timeout": float(os.getenv("LLM_HTTP_WRITE_TIMEOUT", "10")),
+    "pool_timeout": float(os.getenv("LLM_HTTP_POOL_TIMEOUT", "5")),
+    "http2": os.getenv("LLM_HTTP2", "False").lower() == "true",
+    # Connections opened per API host by warmup
+    "warm_connections": int(os.getenv("LLM_HTTP_WARM_CONNECTIONS", "2")),
+    # Timeout for the reachability probes made by the readiness endpoint
+    "probe_timeout": float(os.getenv("LLM_HTTP_PROBE_TIMEOUT", "2")),
+    # Seconds the readiness endpoint reuses a provider's last probe for
+    "probe_ttl": float(os.getenv("LLM_HTTP_PROBE_TTL", "15")),
+}
+
+# Fake provider settings, for load tests and offline benchmarks
+FAKE_LLM = {
+    # "fixed", "lognormal" or "heavy_tail"
+    "latency": os.getenv("FAKE_LLM_LATENCY", "fixed"),
+    "latency_ms": float(os.getenv("FAKE_LLM_LATENCY_MS", "200")),
+    "sigma": float(os.getenv("FAKE_LLM_SIGMA", "0.5")),
+    "tail_alpha": float(os.getenv("FAKE_LLM_TAIL_ALPHA", "1.5")),
+    "failure_rate": float(os.getenv("FAKE_LLM_FAILURE_RATE", "0")),
+    "malformed_rate": float(os.getenv("FAKE_LLM_MALFORMED_RATE", "0")),
+    "seed": int(os.getenv("FAKE_LLM_SEED", "0")),
+}
+
+# LLM cassette settings: set record_path to append every provider call to a
+# cassette, and select the "replay" provider to serve responses from path
+LLM_CASSETTE = {
+    "record_path": os.getenv("LLM_CASSETTE_RECORD_PATH", ""),
+    "path": os.getenv("LLM_CASSETTE_PATH", ""),
+    "replay_latency": os.getenv("LLM_CASSETTE_REPLAY_LATENCY", "True").lower()
+    == "true",
+}
+
+# LLM call ledger settings
+LLM_LEDGER_BACKGROUND = True
+LLM_LEDGER_BATCH_SIZE = 100
+LLM_LEDGER_FLUSH_SECONDS = 2.0
+
+# Webhook traffic capture, off unless dir is set; see charades.game.capture
+WEBHOOK_CAPTURE = {
+    "dir": os.getenv("WEBHOOK_CAPTURE_DIR", ""),
+    "path_prefix": "/api/webhooks/",
+    "max_bytes": int(os.getenv("WEBHOOK_CAPTURE_MAX_BYTES", str(64 * 1024 * 1024))),
+    "max_seconds": float(os.getenv("WEBHOOK_CAPTURE_MAX_SECONDS", "3600")),
+}
+
 # Game settings
 SUPPORTED_LANGUAGES = {
     "BN": "Bengali",
@@ -62,6 +134,71 @@ SUPPORTED_LANGUAGES = {
     "ZH": "Chinese",
 }
 
+# Reuse evaluations of near-duplicate descriptions of the same word, see
+# charades.game.description_cache
+DESCRIPTION_CACHE = {
+    "enabled": os.getenv("DESCRIPTION_CACHE_ENABLED", "True").lower() == "true",
+    # Jaccard similarity of character n-grams needed to reuse an evaluation
+    "threshold": float(os.getenv("DESCRIPTION_CACHE_THRESHOLD", "0.7")),
+    # Share of hits evaluated anyway, to measure the score deviation
+    "verify_rate": float(os.getenv("DESCRIPTION_CACHE_VERIFY_RATE", "0.05")),
+    "ngram": 3,
+    # Bands of two MinHash rows make descriptions 70% alike candidates
+    # with near certainty; candidates are then compared exactly
+    "num_perm": 64,
+    "bands": 32,
+    # Evaluations kept per word and language, and words kept, per process
+    "max_per_word": 200,
+    "max_words": 500,
+}
+
+# Daily challenge words, see charades.game.challenges
+DAILY_CHALLENGE = {
+    "cache": "default",
+    # Seconds a day's word is cached; the cache key includes the day
+    "ttl": 24 * 60 * 60,
+}
+
+# Next-word prefetch, see charades.game.prefetch
+WORD_PREFETCH = {
+    "enabled": os.getenv("WORD_PREFETCH_ENABLED", "True").lower() == "true",
+    "background": True,
+    "cache": "default",
+    # Seconds an unused prefetched word is kept, for its player or the pool
+    "ttl": int(os.getenv("WORD_PREFETCH_TTL", "900")),
+    # Recent sessions considered when predicting a player's next language
+    "history": 5,
+    "workers": int(os.getenv("WORD_PREFETCH_WORKERS", "4")),
+    # Seconds a game start waits for a prefetch still in progress
+    "wait_seconds": 10.0,
+    # Unused words kept per language for other players
+    "pool_size": 20,
+}
+
+# Voice evaluation off the webhook request path, see charades.game.voice
+VOICE_EVALUATION = {
+    "background": True,
+    "cache": "default",
+    "workers": int(os.getenv("VOICE_EVALUATION_WORKERS", "8")),
+    # Seconds of silence between checks for the result
+    "pause_seconds": 1,
+    # Seconds after which a caller is asked to describe their word again
+    "timeout_seconds": float(os.getenv("VOICE_EVALUATION_TIMEOUT", "45")),
+    # Seconds a result is kept for the result endpoint
+    "ttl": 300,
+}
+
+# Voice call state by CallSid, see charades.game.calls
+VOICE_CALL_STATE = {
+    "cache": "default",
+    # Seconds state is kept after its last change; calls rarely run longer
+    "ttl": int(os.getenv("VOICE_CALL_STATE_TTL", "3600")),
+}
+
+# Leaderboard settings
+LEADERBOARD_REFRESH_SECONDS = int(os.getenv("LEADERBOARD_REFRESH_SECONDS", "300"))
+LEADERBOARD_TOP_SIZE = 5
+
 
 # Application definition
 
@@ -77,11 +214,16 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    # First, so its timings cover every other middleware
+    "charades.game.metrics.MetricsMiddleware",
+    "charades.game.capture.TrafficCaptureMiddleware",
     "django.middleware.security.SecurityMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
     "django.middleware.csrf.CsrfViewMiddleware",
     "django.contrib.auth.middleware.AuthenticationMiddleware",
+    # After AuthenticationMiddleware: reading from replicas on request is staff-only
+    "charades.game.replicas.ReplicaRoutingMiddleware",
     "django.contrib.messages.middleware.MessageMiddleware",
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
 ]
@@ -110,10 +252,100 @@ ASGI_APPLICATION = "charades.config.asgi.application"
 # Database
 # https://docs.djangoproject.com/en/5.1/ref/settings/#databases
 
+DATABASE_DIR = Path(os.getenv("DATABASE_DIR", str(BASE_DIR)))
+
 DATABASES = {
     "default": {
         "ENGINE": "django.db.backends.sqlite3",
-        "NAME": BASE_DIR / "db.sqlite3",
+        "NAME": DATABASE_DIR / "db.sqlite3",
+    }
+}
+
+# Players and their games are spread over these databases by a hash of the
+# phone number, see charades.game.sharding. Each extra shard here is another
+# SQLite file; point them at other servers for real write scaling.
+DATABASE_SHARD_COUNT = int(os.getenv("DATABASE_SHARD_COUNT", "1"))
+for shard in range(1, DATABASE_SHARD_COUNT):
+    DATABASES[f"shard{shard}"] = {
+        "ENGINE": "django.db.backends.sqlite3",
+        "NAME": DATABASE_DIR / f"db-shard{shard}.sqlite3",
+    }
+DATABASE_SHARDS = list(DATABASES)
+# Ids allocated on each shard, so ids stay unique across shards
+SHARD_ID_SPAN = 10**12
+
+# Read replicas of each database, by primary alias. Admin pages and reporting
+# code read from them, see charades.game.replicas. DATABASE_REPLICA_NAME adds
+# one for the default database, e.g. a copy of its SQLite file kept up to date
+# by Litestream, or the file itself to try the routing out locally.
+DATABASE_REPLICAS: dict[str, list[str]] = {}
+if replica_name := os.getenv("DATABASE_REPLICA_NAME"):
+    DATABASES["replica"] = {
+        "ENGINE": "django.db.backends.sqlite3",
+        "NAME": replica_name,
+        # Tests read the default test database through it
+        "TEST": {"MIRROR": "default"},
+    }
+    DATABASE_REPLICAS["default"] = ["replica"]
+DATABASE_REPLICA_ROUTING = {
+    # Requests under these paths read from replicas unless they write
+    "paths": ["/admin/"],
+    # A browser that wrote keeps reading from primaries this long, so it sees
+    # its own changes despite replication lag
+    "sticky_seconds": int(os.getenv("DATABASE_REPLICA_STICKY_SECONDS", "10")),
+}
+DATABASE_ROUTERS = [
+    "charades.game.replicas.ReplicaRouter",
+    "charades.game.sharding.ShardRouter",
+]
+
+# Finished sessions older than this many days are moved out of the database
+# into compressed, date-partitioned files, see charades.game.archive
+SESSION_ARCHIVE = {
+    "dir": Path(os.getenv("SESSION_ARCHIVE_DIR", str(DATABASE_DIR / "archive"))),
+    "after_days": int(os.getenv("SESSION_ARCHIVE_AFTER_DAYS", "90")),
+    # Sessions copied, then deleted, per transaction
+    "chunk_size": 1000,
+}
+
+# Messages pushed to players outside a webhook reply, see
+# charades.game.outbound. Rate limits are per send_outbound process, so run
+# one per Twilio account; it sends from several threads.
+OUTBOUND_MESSAGES = {
+    # "twilio" sends with the TWILIO_* settings; "stub" only logs
+    "sender": os.getenv("OUTBOUND_SENDER", "stub"),
+    "workers": int(os.getenv("OUTBOUND_WORKERS", "8")),
+    # Messages per second across the account, and the burst allowed above it
+    "account_rate": float(os.getenv("OUTBOUND_ACCOUNT_RATE", "10")),
+    "account_burst": 10,
+    # Messages per second to any one number, and the burst allowed above it
+    "number_rate": float(os.getenv("OUTBOUND_NUMBER_RATE", "0.1")),
+    "number_burst": 3,
+    # Numbers whose buckets are remembered; older ones start full again
+    "max_numbers": 100_000,
+    # Sends tried before a message is failed, backing off exponentially
+    "max_attempts": 5,
+    "backoff_seconds": 30.0,
+    # Seconds a claimed message is left alone before another worker retries
+    # it, in case the worker sending it died
+    "lease_seconds": 300,
+    # Messages claimed per shard and database round trip
+    "batch_size": 100,
+    # Seconds an idle worker waits before looking for due messages again
+    "poll_seconds": 1.0,
+}
+
+
+# Cache
+# https://docs.djangoproject.com/en/5.1/ref/settings/#caches
+
+CACHES = {
+    "default": {
+        "BACKEND": os.getenv(
+            "CACHE_BACKEND",
+            "django.core.cache.backends.locmem.LocMemCache",
+        ),
+        "LOCATION": os.getenv("CACHE_LOCATION", "charades"),
     }
 }
 
@@ -19,8 +19,14 @@ from django.contrib import admin
 from django.urls import path
 
 from charades.game.api import api
+from charades.game.views import export_sessions
+from charades.game.views import metrics
+from charades.game.views import ready
 
 urlpatterns = [
     path("admin/", admin.site.urls),
     path("api/", api.urls),
+    path("exports/sessions", export_sessions, name="export_sessions"),
+    path("metrics", metrics, name="metrics"),
+    path("ready", ready, name="ready"),
 ]
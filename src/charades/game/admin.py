@@ -1,11 +1,103 @@
+import math
+from collections import Counter
+from collections import defaultdict
+from datetime import timedelta
+
 from django.contrib import admin
+from django.contrib.admin.views.main import ChangeList
+from django.db.models import Count
+from django.db.models import Q
+from django.db.models import QuerySet
+from django.db.models import Sum
+from django.db.models import Value
+from django.db.models.functions import Floor
+from django.db.models.functions import Greatest
+from django.db.models.functions import Log
+from django.db.models.functions import TruncDate
+from django.http import HttpRequest
+from django.template.response import TemplateResponse
+from django.utils import timezone
 
+from charades.game.models import DailyChallenge
 from charades.game.models import GameSession
+from charades.game.models import LLMCall
+from charades.game.models import OutboundMessage
 from charades.game.models import Player
+from charades.game.models import PlayerStats
+from charades.game.pagination import KeysetChangeList
+from charades.game.pagination import KeysetPaginator
+from charades.game.replicas import read_alias
+from charades.game.sharding import shards
+
+
+# Sorts after any other character, so a range from a prefix to the prefix
+# followed by it matches every string starting with the prefix
+PREFIX_END = "\U0010ffff"
+
+
+class LargeTableAdmin(admin.ModelAdmin):
+    """Admin for tables with tens of millions of rows.
+
+    Lists newest first, paged by keyset on an indexed timestamp without
+    exact counts, and search fields are matched by prefix as index range
+    scans instead of LIKE '%term%' scans. Subclasses filter by date with
+    DateFieldListFilter's fixed ranges rather than a date_hierarchy, which
+    reads the distinct years, months or days of the whole table.
+    """
+
+    # Indexed timestamp the list is ordered and paged by
+    keyset_field = "created_at"
+    paginator = KeysetPaginator
+    show_full_result_count = False
+
+    def get_changelist(
+        self,
+        request: HttpRequest,
+        **kwargs,
+    ) -> type[ChangeList]:
+        return KeysetChangeList
+
+    def get_paginator(
+        self,
+        request: HttpRequest,
+        queryset: QuerySet,
+        per_page: int,
+        orphans: int = 0,
+        allow_empty_first_page: bool = True,
+    ) -> KeysetPaginator:
+        return KeysetPaginator(
+            queryset,
+            per_page,
+            orphans,
+            allow_empty_first_page,
+            keyset_field=self.keyset_field,
+        )
+
+    def get_search_results(
+        self,
+        request: HttpRequest,
+        queryset: QuerySet,
+        search_term: str,
+    ) -> tuple[QuerySet, bool]:
+        term = search_term.strip()
+        if not term:
+            return queryset, False
+        prefixes = [term]
+        if term.isdigit():
+            # Phone numbers typed without the leading plus
+            prefixes.append(f"+{term}")
+        condition = Q()
+        for field in self.get_search_fields(request):
+            for prefix in prefixes:
+                condition |= Q(
+                    **{f"{field}__gte": prefix, f"{field}__lt": prefix + PREFIX_END},
+                )
+        # Only forward relations are searched, which never duplicate rows
+        return queryset.filter(condition), False
 
 
 @admin.register(Player)
-class PlayerAdmin(admin.ModelAdmin):
+class PlayerAdmin(LargeTableAdmin):
     list_display = [
         "phone_number",
         "is_active",
@@ -14,19 +106,26 @@ class PlayerAdmin(admin.ModelAdmin):
     ]
     list_filter = [
         "is_active",
+        ("created_at", admin.DateFieldListFilter),
     ]
     search_fields = [
         "phone_number",
     ]
+    search_help_text = "Phone number prefix, e.g. +1206"
     readonly_fields = [
         "created_at",
         "opted_in_at",
         "opted_out_at",
     ]
+    ordering = [
+        "-created_at",
+        "-id",
+    ]
 
 
 @admin.register(GameSession)
-class GameSessionAdmin(admin.ModelAdmin):
+class GameSessionAdmin(LargeTableAdmin):
+    keyset_field = "started_at"
     list_display = [
         "player",
         "word",
@@ -34,14 +133,255 @@ class GameSessionAdmin(admin.ModelAdmin):
         "score",
         "started_at",
     ]
+    list_select_related = [
+        "player",
+    ]
     list_filter = [
         "status",
+        ("started_at", admin.DateFieldListFilter),
     ]
     search_fields = [
         "player__phone_number",
-        "word__text",
+        "word",
+    ]
+    search_help_text = "Phone number or word prefix"
+    raw_id_fields = [
+        "player",
     ]
     readonly_fields = [
         "started_at",
         "completed_at",
     ]
+    ordering = [
+        "-started_at",
+        "-id",
+    ]
+
+
+@admin.register(DailyChallenge)
+class DailyChallengeAdmin(admin.ModelAdmin):
+    list_display = [
+        "day",
+        "language",
+        "word",
+        "created_at",
+    ]
+    list_filter = [
+        "language",
+    ]
+    ordering = [
+        "-day",
+        "language",
+    ]
+    date_hierarchy = "day"
+    readonly_fields = [
+        "created_at",
+    ]
+
+
+@admin.register(PlayerStats)
+class PlayerStatsAdmin(admin.ModelAdmin):
+    list_display = [
+        "player",
+        "language",
+        "games_played",
+        "best_score",
+        "current_streak",
+        "updated_at",
+    ]
+    list_select_related = [
+        "player",
+    ]
+    list_filter = [
+        "language",
+    ]
+    search_fields = [
+        "player__phone_number",
+    ]
+    readonly_fields = [
+        "games_played",
+        "total_score",
+        "best_score",
+        "current_streak",
+        "best_streak",
+        "last_played_on",
+        "updated_at",
+    ]
+
+
+@admin.register(OutboundMessage)
+class OutboundMessageAdmin(admin.ModelAdmin):
+    list_display = [
+        "to_number",
+        "status",
+        "attempts",
+        "next_attempt_at",
+        "sent_at",
+    ]
+    list_filter = [
+        "status",
+    ]
+    search_fields = [
+        "to_number",
+    ]
+    raw_id_fields = [
+        "player",
+    ]
+    readonly_fields = [
+        "attempts",
+        "claim",
+        "provider_id",
+        "error",
+        "created_at",
+        "sent_at",
+    ]
+
+
+# Latency histogram buckets grow by this ratio, so percentiles read from the
+# histogram are within 5% of the exact ones
+LATENCY_BUCKET_RATIO = 1.1
+
+
+def percentile(
+    histogram: dict[int, int],
+    fraction: float,
+) -> int:
+    """Get a nearest-rank percentile from a latency histogram.
+
+    Args:
+        histogram: Calls per bucket, bucket k holding latencies from
+            LATENCY_BUCKET_RATIO ** k up to LATENCY_BUCKET_RATIO ** (k + 1)
+        fraction: Percentile as a fraction, e.g. 0.95
+
+    Returns:
+        int: Geometric middle of the bucket holding the percentile, in ms
+    """
+    rank = max(1, math.ceil(fraction * sum(histogram.values())))
+    seen = 0
+    buckets = sorted(histogram)
+    for bucket in buckets:
+        seen += histogram[bucket]
+        if seen >= rank:
+            return round(LATENCY_BUCKET_RATIO ** (bucket + 0.5))
+    return round(LATENCY_BUCKET_RATIO ** (buckets[-1] + 0.5))
+
+
+@admin.register(LLMCall)
+class LLMCallAdmin(admin.ModelAdmin):
+    change_list_template = "admin/game/llmcall/change_list.html"
+    summary_days = 14
+    list_display = [
+        "created_at",
+        "operation",
+        "provider",
+        "model",
+        "outcome",
+        "latency_ms",
+        "prompt_tokens",
+        "completion_tokens",
+        "session",
+    ]
+    list_filter = [
+        "operation",
+        "provider",
+        "outcome",
+        ("created_at", admin.DateFieldListFilter),
+    ]
+    list_select_related = [
+        "session",
+    ]
+    raw_id_fields = [
+        "session",
+    ]
+
+    def has_add_permission(
+        self,
+        request: HttpRequest,
+    ) -> bool:
+        return False
+
+    def has_change_permission(
+        self,
+        request: HttpRequest,
+        obj: LLMCall | None = None,
+    ) -> bool:
+        return False
+
+    def has_delete_permission(
+        self,
+        request: HttpRequest,
+        obj: LLMCall | None = None,
+    ) -> bool:
+        return False
+
+    def daily_summary(self) -> list[dict]:
+        """Summarize latency percentiles and tokens per day and provider.
+
+        Counts and token sums are aggregated by the database, and latencies
+        into a histogram of logarithmic buckets, so only a few rows per day
+        and provider are read however many calls there were.
+        """
+        since = timezone.now() - timedelta(days=self.summary_days)
+        groups: dict[tuple, dict] = defaultdict(
+            lambda: {
+                "histogram": Counter(),
+                "prompt_tokens": 0,
+                "completion_tokens": 0,
+            },
+        )
+        # Calls linked to sessions are stored on the sessions' shards
+        for using in shards():
+            calls = (
+                LLMCall.objects.using(read_alias(using))
+                .filter(created_at__gte=since)
+                .annotate(day=TruncDate("created_at"))
+            )
+            for row in calls.values("day", "provider").annotate(
+                prompt=Sum("prompt_tokens"),
+                completion=Sum("completion_tokens"),
+            ):
+                group = groups[(row["day"], row["provider"])]
+                group["prompt_tokens"] += row["prompt"] or 0
+                group["completion_tokens"] += row["completion"] or 0
+            for row in (
+                calls.annotate(
+                    bucket=Floor(
+                        Log(
+                            Value(LATENCY_BUCKET_RATIO),
+                            Greatest("latency_ms", Value(1)),
+                        ),
+                    ),
+                )
+                .values("day", "provider", "bucket")
+                .annotate(calls=Count("id"))
+            ):
+                group = groups[(row["day"], row["provider"])]
+                group["histogram"][int(row["bucket"])] += row["calls"]
+
+        summary = []
+        for (day, provider), group in sorted(groups.items(), reverse=True):
+            histogram = group["histogram"]
+            summary.append(
+                {
+                    "day": day,
+                    "provider": provider,
+                    "calls": sum(histogram.values()),
+                    "p50_ms": percentile(histogram, 0.5),
+                    "p95_ms": percentile(histogram, 0.95),
+                    "prompt_tokens": group["prompt_tokens"],
+                    "completion_tokens": group["completion_tokens"],
+                },
+            )
+        return summary
+
+    def changelist_view(
+        self,
+        request: HttpRequest,
+        extra_context: dict | None = None,
+    ) -> TemplateResponse:
+        extra_context = {
+            **(extra_context or {}),
+            "daily_summary": self.daily_summary(),
+            "summary_days": self.summary_days,
+        }
+        return super().changelist_view(request, extra_context)  # type: ignore[return-value]
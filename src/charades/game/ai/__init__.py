@@ -1,15 +1,18 @@
 """AI module for language game interactions."""
 
-from charades.game.ai.anthropic import AnthropicProvider
-from charades.game.ai.manager import LLMProviderManager
-from charades.game.ai.openai import OpenAIProvider
+from django.conf import settings
 
-# Initialize providers
-openai_provider = OpenAIProvider()
-anthropic_provider = AnthropicProvider()
+from charades.game.ai.manager import LLMProviderManager
+from charades.game.ai.registry import build_entries
 
-# Create manager with OpenAI as primary and Anthropic as fallback
+# Create manager over the configured provider pool; SDKs are imported and
+# clients built on first use, or by warmup()
 llm_manager = LLMProviderManager(
-    primary=openai_provider,
-    fallback=anthropic_provider,
+    entries=build_entries(settings.LLM_PROVIDERS),
+    queue_timeout=settings.LLM_PROVIDER_QUEUE_TIMEOUT,
 )
+
+
+def warmup() -> None:
+    """Build the configured providers now rather than on the first request."""
+    llm_manager.warmup()
@@ -4,23 +4,49 @@ import json
 import logging
 from django.conf import settings
 from anthropic import Anthropic
+from anthropic.types import Message
 
 from charades.game.ai.base import LLMProvider
+from charades.game.ai.ledger import note_usage
 from charades.game.ai.models import EvaluationResponse
 from charades.game.ai.prompts import get_random_word_prompt
 from charades.game.ai.prompts import get_evaluation_prompt
+from charades.game.ai.transport import get_http_client
 
 logger = logging.getLogger(__name__)
 
 
+def _note_usage(response: Message) -> None:
+    note_usage(
+        model=response.model,
+        prompt_tokens=response.usage.input_tokens,
+        completion_tokens=response.usage.output_tokens,
+        cached_tokens=response.usage.cache_read_input_tokens,
+    )
+
+
 class AnthropicProvider(LLMProvider):
     """Anthropic implementation of LLM provider."""
 
-    def __init__(self) -> None:
-        """Initialize Anthropic client."""
+    name = "anthropic"
+
+    def __init__(
+        self,
+        api_key: str | None = None,
+        model: str | None = None,
+    ) -> None:
+        """Initialize Anthropic client.
+
+        Args:
+            api_key: API key, defaulting to settings.ANTHROPIC_API_KEY
+            model: Model to call, defaulting to 'claude-3-haiku-20240307'
+        """
+        self.model = model or "claude-3-haiku-20240307"
         self.client = Anthropic(
-            api_key=settings.ANTHROPIC_API_KEY,
+            api_key=api_key or settings.ANTHROPIC_API_KEY,
+            http_client=get_http_client(),
         )
+        self.base_url = str(self.client.base_url)
 
     def get_random_word(
         self,
@@ -42,11 +68,12 @@ class AnthropicProvider(LLMProvider):
 
         try:
             response = self.client.messages.create(
-                model="claude-3-haiku-20240307",
+                model=self.model,
                 max_tokens=10,
                 temperature=0.7,
                 messages=[{"role": "user", "content": prompt}],
             )
+            _note_usage(response)
             return response.content[0].text.strip()  # type: ignore
         except Exception as e:
             logger.error(f"Anthropic random word generation failed: {str(e)}")
@@ -76,11 +103,12 @@ class AnthropicProvider(LLMProvider):
 
         try:
             response = self.client.messages.create(
-                model="claude-3-haiku-20240307",
+                model=self.model,
                 max_tokens=1000,
                 system=prompt,
                 messages=[{"role": "user", "content": description}],
             )
+            _note_usage(response)
             result = response.content[0].text.strip()  # type: ignore
 
             # Parse and validate response
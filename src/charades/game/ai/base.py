@@ -7,6 +7,13 @@ from abc import abstractmethod
 class LLMProvider(ABC):
     """Abstract base class for LLM providers."""
 
+    # Short identifier used in logs and metrics
+    name: str
+
+    # API root the provider calls, for connection warmup and readiness checks;
+    # None for providers that make no network calls
+    base_url: str | None = None
+
     @abstractmethod
     def get_random_word(
         self,
@@ -0,0 +1,220 @@
+"""Record and replay LLM traffic through JSONL cassettes.
+
+A cassette is an append-only JSONL file with one entry per provider call:
+the operation, a hash of the prompt that identifies the request, the request
+arguments, the response or error, the observed latency and reported usage.
+`RecordingProvider` wraps any provider to write a cassette, and
+`ReplayProvider` serves responses from one without touching the network.
+"""
+
+import hashlib
+import json
+import threading
+import time
+from collections import defaultdict
+from collections.abc import Callable
+from dataclasses import asdict
+from pathlib import Path
+from typing import Any
+
+from django.conf import settings
+from django.utils import timezone
+
+from charades.game.ai.base import LLMProvider
+from charades.game.ai.ledger import current_usage
+from charades.game.ai.ledger import note_usage
+from charades.game.ai.prompts import get_evaluation_prompt
+from charades.game.ai.prompts import get_random_word_prompt
+
+
+class CassetteMissError(KeyError):
+    """Raised when a replayed request was never recorded."""
+
+
+class ReplayedProviderError(Exception):
+    """Replay of a call that failed when it was recorded."""
+
+
+def request_key(
+    operation: str,
+    language_code: str,
+    word: str | None = None,
+    description: str | None = None,
+) -> str:
+    """Hash the prompt a provider would send for a request.
+
+    Args:
+        operation: 'word_generation' or 'evaluation'
+        language_code: ISO 639-1 language code
+        word: The target word, for evaluations
+        description: The player's description, for evaluations
+
+    Returns:
+        str: Hex digest identifying the request
+    """
+    language_name = settings.SUPPORTED_LANGUAGES[language_code.upper()]
+    if operation == "evaluation":
+        prompt = f"{get_evaluation_prompt(word or '', language_name)}\n{description}"
+    else:
+        prompt = get_random_word_prompt(language_name)
+    return hashlib.sha256(f"{operation}\n{prompt}".encode("utf-8")).hexdigest()
+
+
+class RecordingProvider(LLMProvider):
+    """Wraps a provider and appends every call it makes to a cassette."""
+
+    def __init__(
+        self,
+        inner: LLMProvider,
+        path: str | Path,
+    ) -> None:
+        """Initialize the recorder.
+
+        Args:
+            inner: Provider whose calls are recorded
+            path: Cassette file, created or appended to
+        """
+        self.inner = inner
+        self.name = inner.name
+        self.base_url = inner.base_url
+        self.path = Path(path)
+        self._lock = threading.Lock()
+
+    def _record(
+        self,
+        operation: str,
+        key: str,
+        request: dict[str, Any],
+        call: Callable[[], Any],
+    ) -> Any:
+        start = time.perf_counter()
+        entry: dict[str, Any] = {
+            "operation": operation,
+            "key": key,
+            "provider": self.inner.name,
+            "request": request,
+            "recorded_at": timezone.now().isoformat(),
+        }
+        try:
+            result = call()
+            entry["response"] = result
+            return result
+        except Exception as e:
+            entry["error"] = str(e)
+            entry["error_type"] = type(e).__name__
+            raise
+        finally:
+            entry["latency_ms"] = round((time.perf_counter() - start) * 1000, 3)
+            usage = current_usage()
+            entry["usage"] = asdict(usage) if usage is not None else None
+            line = json.dumps(entry, ensure_ascii=False)
+            with self._lock, self.path.open("a", encoding="utf-8") as cassette:
+                cassette.write(f"{line}\n")
+
+    def get_random_word(
+        self,
+        language_code: str,
+    ) -> str:
+        """Get a random word from the wrapped provider and record it."""
+        return self._record(
+            operation="word_generation",
+            key=request_key("word_generation", language_code),
+            request={"language_code": language_code},
+            call=lambda: self.inner.get_random_word(language_code),
+        )
+
+    def evaluate_description(
+        self,
+        word: str,
+        description: str,
+        language: str,
+    ) -> tuple[int, str]:
+        """Evaluate a description with the wrapped provider and record it."""
+        score, feedback = self._record(
+            operation="evaluation",
+            key=request_key("evaluation", language, word, description),
+            request={"word": word, "description": description, "language": language},
+            call=lambda: self.inner.evaluate_description(word, description, language),
+        )
+        return score, feedback
+
+
+class ReplayProvider(LLMProvider):
+    """Serves recorded responses from a cassette.
+
+    Requests are matched by prompt hash. When the same request was recorded
+    several times, e.g. repeated word generation for one language, replays
+    cycle through the recordings in their original order.
+    """
+
+    name = "replay"
+
+    def __init__(
+        self,
+        path: str | Path | None = None,
+        replay_latency: bool | None = None,
+    ) -> None:
+        """Load a cassette, defaulting to settings.LLM_CASSETTE.
+
+        Args:
+            path: Cassette file to replay
+            replay_latency: Sleep for each call's recorded latency if True,
+                otherwise respond immediately
+        """
+        config = settings.LLM_CASSETTE
+        self.path = Path(path if path is not None else config["path"])
+        self.replay_latency = (
+            replay_latency if replay_latency is not None else config["replay_latency"]
+        )
+        self._entries: dict[str, list[dict[str, Any]]] = defaultdict(list)
+        with self.path.open(encoding="utf-8") as cassette:
+            for line in cassette:
+                if line.strip():
+                    entry = json.loads(line)
+                    self._entries[entry["key"]].append(entry)
+        self._cursors: dict[str, int] = defaultdict(int)
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return sum(len(entries) for entries in self._entries.values())
+
+    def _replay(
+        self,
+        key: str,
+    ) -> Any:
+        entries = self._entries.get(key)
+        if not entries:
+            raise CassetteMissError(key)
+        with self._lock:
+            entry = entries[self._cursors[key] % len(entries)]
+            self._cursors[key] += 1
+
+        if self.replay_latency:
+            time.sleep(entry["latency_ms"] / 1000)
+        if entry.get("usage"):
+            note_usage(**entry["usage"])
+        if "error" in entry:
+            # Keep parse failures distinguishable from other errors in the ledger
+            if entry.get("error_type") == "JSONDecodeError":
+                raise json.JSONDecodeError(entry["error"], "", 0)
+            raise ReplayedProviderError(f"{entry['error_type']}: {entry['error']}")
+        return entry["response"]
+
+    def get_random_word(
+        self,
+        language_code: str,
+    ) -> str:
+        """Replay a recorded random word for the language."""
+        return self._replay(request_key("word_generation", language_code))
+
+    def evaluate_description(
+        self,
+        word: str,
+        description: str,
+        language: str,
+    ) -> tuple[int, str]:
+        """Replay a recorded evaluation of the description."""
+        score, feedback = self._replay(
+            request_key("evaluation", language, word, description),
+        )
+        return score, feedback
@@ -0,0 +1,210 @@
+"""Fake LLM provider for load tests and offline benchmarks."""
+
+import hashlib
+import json
+import logging
+import math
+import random
+import threading
+import time
+
+from django.conf import settings
+
+from charades.game.ai.base import LLMProvider
+from charades.game.ai.ledger import note_usage
+from charades.game.ai.models import EvaluationResponse
+from charades.game.ai.prompts import get_evaluation_prompt
+from charades.game.ai.prompts import get_random_word_prompt
+
+logger = logging.getLogger(__name__)
+
+WORDS = [
+    "apple",
+    "bicycle",
+    "bridge",
+    "candle",
+    "cloud",
+    "garden",
+    "guitar",
+    "house",
+    "island",
+    "kitchen",
+    "lantern",
+    "mountain",
+    "notebook",
+    "orange",
+    "pillow",
+    "river",
+    "rocket",
+    "teacher",
+    "umbrella",
+    "window",
+]
+
+LATENCY_DISTRIBUTIONS = ("fixed", "lognormal", "heavy_tail")
+
+
+class FakeProviderError(Exception):
+    """Simulated provider failure."""
+
+
+def _stable_hash(*parts: str) -> int:
+    digest = hashlib.sha256("\x1f".join(parts).encode("utf-8")).digest()
+    return int.from_bytes(digest[:8], "big")
+
+
+class FakeProvider(LLMProvider):
+    """LLM provider that never touches the network.
+
+    Words and scores are derived from hashes of the inputs, so the same
+    request always gets the same answer. Latency, simulated failures and
+    malformed responses are drawn from a seeded random generator, which is
+    reproducible for a single-threaded run.
+    """
+
+    name = "fake"
+
+    def __init__(
+        self,
+        latency: str | None = None,
+        latency_ms: float | None = None,
+        sigma: float | None = None,
+        tail_alpha: float | None = None,
+        failure_rate: float | None = None,
+        malformed_rate: float | None = None,
+        seed: int | None = None,
+    ) -> None:
+        """Initialize the fake provider, defaulting to settings.FAKE_LLM.
+
+        Args:
+            latency: Latency distribution, one of LATENCY_DISTRIBUTIONS
+            latency_ms: Fixed latency, or the median for other distributions
+            sigma: Standard deviation of log latency for 'lognormal'
+            tail_alpha: Pareto shape for 'heavy_tail'; lower means heavier
+            failure_rate: Probability that a call raises FakeProviderError
+            malformed_rate: Probability that an evaluation returns bad JSON
+            seed: Seed for latency, failure and malformed response draws
+        """
+        config = settings.FAKE_LLM
+        self.latency = latency if latency is not None else config["latency"]
+        if self.latency not in LATENCY_DISTRIBUTIONS:
+            raise ValueError(f"Unknown latency distribution: {self.latency}")
+        self.latency_ms = latency_ms if latency_ms is not None else config["latency_ms"]
+        self.sigma = sigma if sigma is not None else config["sigma"]
+        self.tail_alpha = tail_alpha if tail_alpha is not None else config["tail_alpha"]
+        self.failure_rate = (
+            failure_rate if failure_rate is not None else config["failure_rate"]
+        )
+        self.malformed_rate = (
+            malformed_rate if malformed_rate is not None else config["malformed_rate"]
+        )
+        self.seed = seed if seed is not None else config["seed"]
+        self._random = random.Random(self.seed)
+        self._lock = threading.Lock()
+        self._word_counts: dict[str, int] = {}
+
+    def sample_latency_ms(self) -> float:
+        """Draw a latency from the configured distribution."""
+        with self._lock:
+            match self.latency:
+                case "lognormal":
+                    if self.latency_ms <= 0:
+                        return 0.0
+                    return self._random.lognormvariate(
+                        math.log(self.latency_ms),
+                        self.sigma,
+                    )
+                case "heavy_tail":
+                    # Scale the Pareto minimum so its median is latency_ms
+                    minimum = self.latency_ms / 2 ** (1 / self.tail_alpha)
+                    return minimum * self._random.paretovariate(self.tail_alpha)
+                case _:
+                    return self.latency_ms
+
+    def _roll(
+        self,
+        rate: float,
+    ) -> bool:
+        with self._lock:
+            return self._random.random() < rate
+
+    def _simulate_call(
+        self,
+        prompt: str,
+        completion: str,
+    ) -> None:
+        """Sleep for a sampled latency, report usage and maybe fail."""
+        time.sleep(self.sample_latency_ms() / 1000)
+        note_usage(
+            model="fake",
+            prompt_tokens=len(prompt) // 4,
+            completion_tokens=len(completion) // 4,
+        )
+        if self._roll(self.failure_rate):
+            raise FakeProviderError("Simulated provider failure")
+
+    def get_random_word(
+        self,
+        language_code: str,
+    ) -> str:
+        """Get a deterministic word for the language.
+
+        Successive calls for the same language cycle through the word list in
+        an order fixed by the seed.
+
+        Args:
+            language_code: ISO 639-1 language code (e.g., 'en' for English)
+
+        Returns:
+            str: Word from the fake vocabulary
+        """
+        language_code = language_code.upper()
+        language_name = settings.SUPPORTED_LANGUAGES[language_code]
+        with self._lock:
+            count = self._word_counts.get(language_code, 0)
+            self._word_counts[language_code] = count + 1
+        word = WORDS[
+            _stable_hash(str(self.seed), language_code, str(count)) % len(WORDS)
+        ]
+        self._simulate_call(get_random_word_prompt(language_name), word)
+        return word
+
+    def evaluate_description(
+        self,
+        word: str,
+        description: str,
+        language: str,
+    ) -> tuple[int, str]:
+        """Score a description deterministically from its content.
+
+        Args:
+            word: The target word being described
+            description: The player's description
+            language: ISO 639-1 language code (e.g., 'en' for English)
+
+        Returns:
+            tuple: (score 0-100, feedback string)
+
+        Raises:
+            FakeProviderError: On a simulated failure
+            json.JSONDecodeError: On a simulated malformed response
+        """
+        language_name = settings.SUPPORTED_LANGUAGES[language.upper()]
+        score = _stable_hash(word, description, language.upper()) % 101
+        result = json.dumps(
+            {
+                "score": score,
+                "feedback": f"Fake feedback for your description of '{word}'.",
+            },
+        )
+        if self._roll(self.malformed_rate):
+            result = result[: len(result) // 2]
+
+        self._simulate_call(get_evaluation_prompt(word, language_name), result)
+        try:
+            data = json.loads(result)
+        except json.JSONDecodeError as e:
+            logger.error(f"Failed to parse fake response: {str(e)}")
+            raise
+        evaluation = EvaluationResponse(**data)
+        return evaluation.score, evaluation.feedback
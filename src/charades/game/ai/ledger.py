@@ -0,0 +1,308 @@
+"""Ledger of LLM calls: token usage, latency and outcome per call.
+
+Providers report usage for the call in progress with `note_usage`, the
+provider manager turns each call into an `LLMCallRecord`, and game logic
+wraps its LLM work in `capture` so records are linked to a GameSession.
+Records are written in batches by a background thread, off the request path.
+"""
+
+import atexit
+import json
+import logging
+import queue
+import threading
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import asdict
+from dataclasses import dataclass
+from dataclasses import field
+from datetime import datetime
+
+from django.conf import settings
+from django.db import IntegrityError
+from django.db import close_old_connections
+from django.utils import timezone
+from pydantic import ValidationError
+
+from charades.game.metrics import LLM_CALL_SECONDS
+from charades.game.models import LLMCall
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class LLMUsage:
+    """Usage reported by a provider for a single call."""
+
+    model: str = ""
+    prompt_tokens: int | None = None
+    completion_tokens: int | None = None
+    cached_tokens: int | None = None
+
+
+@dataclass
+class LLMCallRecord:
+    """A completed LLM call waiting to be written to the ledger."""
+
+    operation: str
+    provider: str
+    latency_ms: int
+    outcome: str
+    model: str = ""
+    prompt_tokens: int | None = None
+    completion_tokens: int | None = None
+    cached_tokens: int | None = None
+    session_id: int | None = None
+    created_at: datetime = field(default_factory=timezone.now)
+    # Shard of the linked session; not a column
+    database: str | None = None
+
+
+class LLMCallCapture:
+    """Records collected while game logic performs LLM work."""
+
+    def __init__(
+        self,
+        session_id: int | None = None,
+    ) -> None:
+        """Initialize an empty capture.
+
+        Args:
+            session_id: GameSession the calls belong to, if already known
+        """
+        self.session_id = session_id
+        # Database the session is on, for sharded deployments
+        self.database: str | None = None
+        self.records: list[LLMCallRecord] = []
+
+
+_usage: ContextVar[LLMUsage | None] = ContextVar("llm_usage", default=None)
+_capture: ContextVar[LLMCallCapture | None] = ContextVar(
+    "llm_capture",
+    default=None,
+)
+
+
+def note_usage(
+    model: str,
+    prompt_tokens: int | None,
+    completion_tokens: int | None,
+    cached_tokens: int | None = None,
+) -> None:
+    """Report usage for the LLM call in progress.
+
+    Args:
+        model: Model reported by the provider
+        prompt_tokens: Input tokens billed
+        completion_tokens: Output tokens billed
+        cached_tokens: Input tokens served from the prompt cache
+    """
+    usage = _usage.get()
+    if usage is None:
+        return
+    usage.model = model
+    usage.prompt_tokens = prompt_tokens
+    usage.completion_tokens = completion_tokens
+    usage.cached_tokens = cached_tokens
+
+
+def current_usage() -> LLMUsage | None:
+    """Get the usage reported so far for the LLM call in progress."""
+    return _usage.get()
+
+
+@contextmanager
+def track_call(
+    operation: str,
+    provider: str,
+    fallback: bool = False,
+) -> Iterator[None]:
+    """Time an LLM call, add it to the ledger and observe its latency.
+
+    Args:
+        operation: Operation performed, e.g. 'evaluation'
+        provider: Name of the provider making the call
+        fallback: Whether the call is a fallback after the primary failed
+    """
+    usage = LLMUsage()
+    token = _usage.set(usage)
+    outcome = "fallback" if fallback else "success"
+    start = time.perf_counter()
+    try:
+        yield
+    except (json.JSONDecodeError, ValidationError):
+        outcome = "parse_failure"
+        raise
+    except Exception:
+        outcome = "error"
+        raise
+    finally:
+        _usage.reset(token)
+        elapsed = time.perf_counter() - start
+        LLM_CALL_SECONDS.labels(
+            operation=operation,
+            provider=provider,
+            outcome=outcome,
+        ).observe(elapsed)
+        record = LLMCallRecord(
+            operation=operation,
+            provider=provider,
+            latency_ms=round(elapsed * 1000),
+            outcome=outcome,
+            **asdict(usage),
+        )
+        capture = _capture.get()
+        if capture is not None:
+            capture.records.append(record)
+        else:
+            ledger_writer.submit([record])
+
+
+@contextmanager
+def capture(
+    session_id: int | None = None,
+) -> Iterator[LLMCallCapture]:
+    """Collect LLM calls made in a block and link them to a game session.
+
+    The session may be set on the yielded capture inside the block, for
+    sessions created after their word is generated. Records are submitted
+    when the block exits, even if it raises.
+
+    Args:
+        session_id: GameSession the calls belong to, if already known
+    """
+    calls = LLMCallCapture(session_id=session_id)
+    token = _capture.set(calls)
+    try:
+        yield calls
+    finally:
+        _capture.reset(token)
+        for record in calls.records:
+            record.session_id = calls.session_id
+            record.database = calls.database
+        if calls.records:
+            ledger_writer.submit(calls.records)
+
+
+def _columns(
+    record: LLMCallRecord,
+) -> dict:
+    columns = asdict(record)
+    del columns["database"]
+    return columns
+
+
+class LedgerWriter:
+    """Batches ledger records into bulk inserts on a background thread."""
+
+    def __init__(
+        self,
+        batch_size: int,
+        flush_interval: float,
+    ) -> None:
+        """Initialize the writer without starting its thread.
+
+        Args:
+            batch_size: Maximum records per insert
+            flush_interval: Maximum seconds a record waits before being written
+        """
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self._queue: queue.Queue[LLMCallRecord] = queue.Queue()
+        self._thread: threading.Thread | None = None
+        self._lock = threading.Lock()
+
+    def submit(
+        self,
+        records: list[LLMCallRecord],
+    ) -> None:
+        """Queue records for writing, or write them now if background is off."""
+        if not settings.LLM_LEDGER_BACKGROUND:
+            self.write(records)
+            return
+        for record in records:
+            self._queue.put(record)
+        self._ensure_thread()
+
+    def write(
+        self,
+        records: list[LLMCallRecord],
+    ) -> None:
+        """Insert records into the ledger table, next to their sessions."""
+        by_database: dict[str, list[LLMCallRecord]] = {}
+        for record in records:
+            database = record.database if record.session_id else None
+            by_database.setdefault(database or "default", []).append(record)
+        for database, batch in by_database.items():
+            self._write(database, batch)
+
+    def _write(
+        self,
+        database: str,
+        records: list[LLMCallRecord],
+    ) -> None:
+        try:
+            LLMCall.objects.using(database).bulk_create(
+                [LLMCall(**_columns(record)) for record in records],
+                batch_size=self.batch_size,
+            )
+        except IntegrityError:
+            # A linked session was rolled back; keep the calls without it
+            for record in records:
+                record.session_id = None
+            LLMCall.objects.using(database).bulk_create(
+                [LLMCall(**_columns(record)) for record in records],
+                batch_size=self.batch_size,
+            )
+
+    def flush(self) -> None:
+        """Write every queued record from the calling thread."""
+        batch: list[LLMCallRecord] = []
+        while True:
+            try:
+                batch.append(self._queue.get_nowait())
+            except queue.Empty:
+                break
+        if batch:
+            self.write(batch)
+
+    def _ensure_thread(self) -> None:
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive():
+                return
+            self._thread = threading.Thread(
+                target=self._run,
+                name="llm-ledger-writer",
+                daemon=True,
+            )
+            self._thread.start()
+
+    def _run(self) -> None:
+        while True:
+            batch = [self._queue.get()]
+            deadline = time.monotonic() + self.flush_interval
+            while len(batch) < self.batch_size:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(self._queue.get(timeout=remaining))
+                except queue.Empty:
+                    break
+            try:
+                self.write(batch)
+            except Exception as e:
+                logger.error(f"Failed to write {len(batch)} LLM ledger records: {e}")
+            finally:
+                close_old_connections()
+
+
+ledger_writer = LedgerWriter(
+    batch_size=settings.LLM_LEDGER_BATCH_SIZE,
+    flush_interval=settings.LLM_LEDGER_FLUSH_SECONDS,
+)
+
+# Don't lose the last partial batch when a worker shuts down
+atexit.register(ledger_writer.flush)
@@ -1,65 +1,224 @@
 """LLM provider manager implementation."""
 
 import logging
+import random
 from typing import Callable
 from typing import TypeVar
 
 from charades.game.ai.base import LLMProvider
+from charades.game.ai.ledger import track_call
+from charades.game.ai.registry import ProviderEntry
+from charades.game.metrics import LLM_FALLBACKS
+from charades.game.metrics import LLM_IN_FLIGHT
 
 logger = logging.getLogger(__name__)
 
 T = TypeVar("T")
 
 
+class LLMCapacityError(Exception):
+    """Raised when no provider has a free slot within the queue timeout."""
+
+
 class LLMProviderManager:
-    """Manager class for LLM providers with fallback support."""
+    """Spreads LLM calls over a pool of providers, with fallback.
+
+    Each call starts on a healthy entry with spare capacity, chosen at random
+    in proportion to entry weights. If it fails, the remaining entries are
+    tried in pool order. Entries with weight 0 only ever serve fallbacks.
+    """
 
     def __init__(
         self,
-        primary: LLMProvider,
-        fallback: LLMProvider,
+        primary: LLMProvider | None = None,
+        fallback: LLMProvider | None = None,
+        entries: list[ProviderEntry] | None = None,
+        queue_timeout: float = 10.0,
+        rng: random.Random | None = None,
     ) -> None:
-        """Initialize with primary and fallback providers.
+        """Initialize with a pool of provider entries.
+
+        Args:
+            primary: Shorthand for a pool of one primary provider...
+            fallback: ...and one fallback provider, used when entries is None
+            entries: Provider entries, in fallback order
+            queue_timeout: Seconds to wait for a slot when every entry is at
+                its concurrency cap
+            rng: Random generator for weighted selection
+        """
+        if entries is None:
+            if primary is None or fallback is None:
+                raise ValueError("Provide entries, or a primary and a fallback")
+            entries = [
+                ProviderEntry(name=primary.name, provider=primary),
+                ProviderEntry(name=fallback.name, provider=fallback, weight=0),
+            ]
+            # The same provider can serve as both, e.g. in tests
+            if entries[0].name == entries[1].name:
+                entries[1].name = f"{entries[1].name}-2"
+        if not entries:
+            raise ValueError("At least one LLM provider entry is required")
+        self.entries = entries
+        self.queue_timeout = queue_timeout
+        self._rng = rng or random.Random()
+
+    def _attempt_order(self) -> list[ProviderEntry]:
+        """Order entries for one call: a weighted first pick, then fallbacks.
+
+        Unhealthy entries go last, so they are still tried when nothing
+        else is left.
+        """
+        healthy = [entry for entry in self.entries if entry.is_healthy()]
+        unhealthy = [entry for entry in self.entries if not entry.is_healthy()]
+        candidates = [entry for entry in healthy if entry.weight > 0]
+        if not candidates:
+            return healthy + unhealthy
+        first = self._rng.choices(
+            candidates,
+            weights=[entry.weight for entry in candidates],
+        )[0]
+        return [first] + [entry for entry in healthy if entry is not first] + unhealthy
+
+    def _call(
+        self,
+        operation: str,
+        entry: ProviderEntry,
+        func: Callable[[LLMProvider], T],
+        fallback: bool = False,
+    ) -> T:
+        """Call a single entry, recording it in the LLM call ledger.
+
+        The caller must hold one of the entry's concurrency slots.
 
         Args:
-            primary: Primary LLM provider
-            fallback: Fallback LLM provider
+            operation: Name of the operation for logging and metrics
+            entry: Entry to call
+            func: Function performing the operation on the provider
+            fallback: Whether this call follows a failure on another entry
+
+        Returns:
+            T: Result from the provider
         """
-        self.primary = primary
-        self.fallback = fallback
+        LLM_IN_FLIGHT.labels(provider=entry.name).inc()
+        try:
+            with track_call(operation, entry.name, fallback=fallback):
+                result = func(entry.provider)
+        except Exception:
+            entry.record_failure()
+            raise
+        finally:
+            entry.release()
+            LLM_IN_FLIGHT.labels(provider=entry.name).dec()
+        entry.record_success()
+        return result
 
     def _try_with_fallback(
         self,
         operation: str,
-        primary_func: Callable[[], T],
-        fallback_func: Callable[[], T],
+        func: Callable[[LLMProvider], T],
     ) -> T:
-        """Try primary function with fallback to secondary function.
+        """Try entries in attempt order until one succeeds.
+
+        Entries at their concurrency cap are skipped. When every entry is
+        at its cap, the call waits for a slot on the first choice.
 
         Args:
-            operation: Name of the operation for logging
-            primary_func: Primary function to try first
-            fallback_func: Fallback function to try if primary fails
+            operation: Name of the operation for logging and metrics
+            func: Function performing the operation on a given provider
 
         Returns:
-            T: Result from either primary or fallback function
+            T: Result from the first entry to succeed
 
         Raises:
-            Exception: If both primary and fallback fail
+            Exception: The last entry's error if every entry fails
         """
-        try:
-            return primary_func()
-        except Exception as e:
-            logger.warning(
-                f"Primary provider failed for {operation}: {str(e)}, trying fallback",
+        order = self._attempt_order()
+        error: Exception | None = None
+        attempted = False
+        for entry in order:
+            if not entry.acquire():
+                continue
+            if attempted:
+                LLM_FALLBACKS.labels(operation=operation).inc()
+            try:
+                return self._call(operation, entry, func, fallback=attempted)
+            except Exception as e:
+                logger.warning(
+                    f"Provider {entry.name} failed for {operation}: {str(e)}",
+                )
+                attempted = True
+                error = e
+
+        if attempted:
+            assert error is not None
+            raise error
+
+        # Every entry was at its cap; queue for the preferred one
+        entry = order[0]
+        if not entry.acquire(timeout=self.queue_timeout):
+            raise LLMCapacityError(
+                f"No LLM provider capacity for {operation} after {self.queue_timeout}s",
+            )
+        return self._call(operation, entry, func)
+
+    def check_providers(
+        self,
+        timeout: float | None = None,
+        max_age: float = 0.0,
+    ) -> list[dict]:
+        """Probe every entry's API, building lazy providers as needed.
+
+        Args:
+            timeout: Seconds to wait for each probe
+            max_age: Reuse probes made up to this many seconds ago
+
+        Returns:
+            list: Name, URL, health and reachability of each entry, with the
+                error for entries whose provider could not be built
+        """
+        # Imported here so loading the manager doesn't import httpx
+        from charades.game.ai.transport import probe
+
+        results = []
+        for entry in self.entries:
+            result = {"name": entry.name, "healthy": entry.is_healthy()}
+            try:
+                url = entry.base_url
+            except Exception as e:
+                # e.g. a missing API key, raised when the SDK client is built
+                results.append({**result, "reachable": False, "error": str(e)})
+                continue
+            reachable, seconds = probe(url, timeout, max_age) if url else (True, 0.0)
+            result.update(
+                url=url,
+                reachable=reachable,
+                latency_ms=round(seconds * 1000, 1),
             )
-            return fallback_func()
+            results.append(result)
+        return results
+
+    def warmup(self) -> None:
+        """Build every provider in the pool and open connections to them."""
+        from charades.game.ai.transport import warm_connections
+
+        urls = []
+        for entry in self.entries:
+            try:
+                url = entry.base_url
+            except Exception as e:
+                logger.error(f"Could not build provider {entry.name}: {str(e)}")
+                continue
+            if url:
+                urls.append(url)
+        for url, reachable in warm_connections(urls).items():
+            if not reachable:
+                logger.warning(f"Could not warm connections to {url}")
 
     def get_random_word(
         self,
         language_code: str,
     ) -> str:
-        """Get random word using primary provider with fallback.
+        """Get random word from the provider pool.
 
         Args:
             language_code: ISO 639-1 language code (e.g., 'en' for English)
@@ -68,9 +227,8 @@ class LLMProviderManager:
             str: Random word in target language
         """
         return self._try_with_fallback(
-            operation="random word generation",
-            primary_func=lambda: self.primary.get_random_word(language_code),
-            fallback_func=lambda: self.fallback.get_random_word(language_code),
+            operation="word_generation",
+            func=lambda provider: provider.get_random_word(language_code),
         )
 
     def evaluate_description(
@@ -79,7 +237,7 @@ class LLMProviderManager:
         description: str,
         language: str,
     ) -> tuple[int, str]:
-        """Evaluate description using primary provider with fallback.
+        """Evaluate description with the provider pool.
 
         Args:
             word: The target word being described
@@ -90,13 +248,8 @@ class LLMProviderManager:
             tuple: (score 0-100, feedback string)
         """
         return self._try_with_fallback(
-            operation="description evaluation",
-            primary_func=lambda: self.primary.evaluate_description(
-                word,
-                description,
-                language,
-            ),
-            fallback_func=lambda: self.fallback.evaluate_description(
+            operation="evaluation",
+            func=lambda provider: provider.evaluate_description(
                 word,
                 description,
                 language,
@@ -4,23 +4,54 @@ import json
 import logging
 from django.conf import settings
 from openai import OpenAI
+from openai.types.chat import ChatCompletion
 
 from charades.game.ai.base import LLMProvider
+from charades.game.ai.ledger import note_usage
 from charades.game.ai.models import EvaluationResponse
 from charades.game.ai.prompts import get_random_word_prompt
 from charades.game.ai.prompts import get_evaluation_prompt
+from charades.game.ai.transport import get_http_client
 
 logger = logging.getLogger(__name__)
 
 
+def _note_usage(response: ChatCompletion) -> None:
+    usage = response.usage
+    if usage is None:
+        note_usage(model=response.model, prompt_tokens=None, completion_tokens=None)
+        return
+    details = usage.prompt_tokens_details
+    note_usage(
+        model=response.model,
+        prompt_tokens=usage.prompt_tokens,
+        completion_tokens=usage.completion_tokens,
+        cached_tokens=details.cached_tokens if details is not None else None,
+    )
+
+
 class OpenAIProvider(LLMProvider):
     """OpenAI implementation of LLM provider."""
 
-    def __init__(self) -> None:
-        """Initialize OpenAI client."""
+    name = "openai"
+
+    def __init__(
+        self,
+        api_key: str | None = None,
+        model: str | None = None,
+    ) -> None:
+        """Initialize OpenAI client.
+
+        Args:
+            api_key: API key, defaulting to settings.OPENAI_API_KEY
+            model: Model to call, defaulting to 'gpt-4'
+        """
+        self.model = model or "gpt-4"
         self.client = OpenAI(
-            api_key=settings.OPENAI_API_KEY,
+            api_key=api_key or settings.OPENAI_API_KEY,
+            http_client=get_http_client(),
         )
+        self.base_url = str(self.client.base_url)
 
     def get_random_word(
         self,
@@ -42,11 +73,12 @@ class OpenAIProvider(LLMProvider):
 
         try:
             response = self.client.chat.completions.create(
-                model="gpt-4",
+                model=self.model,
                 messages=[{"role": "system", "content": prompt}],
                 max_tokens=10,
                 temperature=0.7,
             )
+            _note_usage(response)
             return response.choices[0].message.content.strip()  # type: ignore
         except Exception as e:
             logger.error(f"OpenAI random word generation failed: {str(e)}")
@@ -76,12 +108,13 @@ class OpenAIProvider(LLMProvider):
 
         try:
             response = self.client.chat.completions.create(
-                model="gpt-4",
+                model=self.model,
                 messages=[
                     {"role": "system", "content": prompt},
                     {"role": "user", "content": description},
                 ],
             )
+            _note_usage(response)
             result = response.choices[0].message.content.strip()  # type: ignore
 
             # Parse and validate response
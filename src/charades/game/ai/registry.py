@@ -0,0 +1,258 @@
+"""Registry of LLM providers, imported and constructed on first use.
+
+Provider modules pull in their SDKs, and constructing a provider builds an
+HTTP client, so neither happens until a provider is needed. Processes that
+never call an LLM, like `manage.py migrate`, the admin or test collection,
+never pay for them.
+"""
+
+import os
+import threading
+import time
+from typing import Any
+
+from django.conf import settings
+from django.utils.module_loading import import_string
+
+from charades.game.ai.base import LLMProvider
+
+PROVIDERS: dict[str, str] = {
+    "anthropic": "charades.game.ai.anthropic.AnthropicProvider",
+    "fake": "charades.game.ai.fake.FakeProvider",
+    "openai": "charades.game.ai.openai.OpenAIProvider",
+    "replay": "charades.game.ai.cassette.ReplayProvider",
+}
+
+
+def get_provider_class(
+    name: str,
+) -> type[LLMProvider]:
+    """Import a provider class by name.
+
+    Args:
+        name: Key in PROVIDERS
+
+    Returns:
+        type: The provider class
+    """
+    return import_string(PROVIDERS[name])
+
+
+def build_provider(
+    name: str,
+    **options: Any,
+) -> LLMProvider:
+    """Construct a provider by name, recording its calls if configured.
+
+    Args:
+        name: Key in PROVIDERS
+        **options: Constructor arguments, e.g. api_key and model
+
+    Returns:
+        LLMProvider: The provider, wrapped in a RecordingProvider when
+            settings.LLM_CASSETTE has a record_path
+    """
+    provider = get_provider_class(name)(**options)
+    record_path = settings.LLM_CASSETTE["record_path"]
+    if record_path:
+        from charades.game.ai.cassette import RecordingProvider
+
+        return RecordingProvider(provider, record_path)
+    return provider
+
+
+class LazyProvider(LLMProvider):
+    """Stands in for a provider until its first call, then builds it."""
+
+    def __init__(
+        self,
+        name: str,
+        **options: Any,
+    ) -> None:
+        """Initialize without importing or constructing anything.
+
+        Args:
+            name: Key in PROVIDERS
+            **options: Constructor arguments for the provider
+        """
+        if name not in PROVIDERS:
+            raise ValueError(f"Unknown LLM provider: {name}")
+        self.name = name
+        self.options = options
+        self._provider: LLMProvider | None = None
+        self._lock = threading.Lock()
+
+    @property
+    def is_built(self) -> bool:
+        return self._provider is not None
+
+    @property
+    def provider(self) -> LLMProvider:
+        """The real provider, built on first access."""
+        if self._provider is None:
+            with self._lock:
+                if self._provider is None:
+                    self._provider = build_provider(self.name, **self.options)
+        return self._provider
+
+    def get_random_word(
+        self,
+        language_code: str,
+    ) -> str:
+        """Get a random word from the real provider."""
+        return self.provider.get_random_word(language_code)
+
+    def evaluate_description(
+        self,
+        word: str,
+        description: str,
+        language: str,
+    ) -> tuple[int, str]:
+        """Evaluate a description with the real provider."""
+        return self.provider.evaluate_description(word, description, language)
+
+
+class ProviderEntry:
+    """A provider in the manager's pool, with its share of traffic.
+
+    Entries track their own health: after `failure_threshold` consecutive
+    failures an entry is skipped for `cooldown_seconds`, unless every entry
+    is unhealthy.
+
+    Health and the concurrency cap are kept per process, so with N serving
+    workers up to N * max_concurrency calls to an entry can be in flight.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        provider: LLMProvider,
+        weight: float = 1.0,
+        max_concurrency: int | None = None,
+        failure_threshold: int = 3,
+        cooldown_seconds: float = 30.0,
+    ) -> None:
+        """Initialize the entry.
+
+        Args:
+            name: Label for logs, metrics and the call ledger
+            provider: Provider serving this entry's calls
+            weight: Relative share of first attempts; 0 serves only fallbacks
+            max_concurrency: Most calls in flight at once in this process,
+                None for no cap
+            failure_threshold: Consecutive failures before cooling down
+            cooldown_seconds: How long an unhealthy entry is skipped
+        """
+        if len(name) > 30:
+            raise ValueError(f"LLM provider entry name too long: {name}")
+        self.name = name
+        self.provider = provider
+        self.weight = weight
+        self.max_concurrency = max_concurrency
+        self.failure_threshold = failure_threshold
+        self.cooldown_seconds = cooldown_seconds
+        self._semaphore = (
+            threading.BoundedSemaphore(max_concurrency)
+            if max_concurrency is not None
+            else None
+        )
+        self._lock = threading.Lock()
+        self._failures = 0
+        self._unhealthy_until = 0.0
+
+    def __repr__(self) -> str:
+        return f"<ProviderEntry {self.name} weight={self.weight}>"
+
+    @property
+    def base_url(self) -> str | None:
+        """API root of the entry's provider, building it if it is lazy."""
+        provider = self.provider
+        if isinstance(provider, LazyProvider):
+            provider = provider.provider
+        return provider.base_url
+
+    def is_healthy(self) -> bool:
+        return time.monotonic() >= self._unhealthy_until
+
+    def acquire(
+        self,
+        timeout: float | None = None,
+    ) -> bool:
+        """Take a concurrency slot.
+
+        Args:
+            timeout: Seconds to wait for a slot; None returns immediately
+
+        Returns:
+            bool: Whether a slot was taken
+        """
+        if self._semaphore is None:
+            return True
+        if timeout is None:
+            return self._semaphore.acquire(blocking=False)
+        return self._semaphore.acquire(timeout=timeout)
+
+    def release(self) -> None:
+        if self._semaphore is not None:
+            self._semaphore.release()
+
+    def record_success(self) -> None:
+        with self._lock:
+            self._failures = 0
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self._failures += 1
+            if self._failures >= self.failure_threshold:
+                self._failures = 0
+                self._unhealthy_until = time.monotonic() + self.cooldown_seconds
+
+
+def build_entries(
+    config: list[dict[str, Any]],
+) -> list[ProviderEntry]:
+    """Build lazily constructed provider entries from settings.LLM_PROVIDERS.
+
+    Each item needs a "provider" key from PROVIDERS and may set "name",
+    "weight" and "max_concurrency". Names default to the provider, numbered
+    when a provider appears more than once. "api_key_env" names an environment
+    variable holding the API key. Remaining keys, e.g. "model" or "api_key",
+    are passed to the provider's constructor.
+
+    Args:
+        config: Entry definitions, in fallback order
+
+    Returns:
+        list: Entries in the same order
+    """
+    entries = []
+    seen: set[str] = set()
+    for item in config:
+        options = dict(item)
+        provider = options.pop("provider")
+        name = options.pop("name", None)
+        if name is None:
+            # Unnamed entries of the same provider are numbered
+            name = provider
+            number = 2
+            while name in seen:
+                name = f"{provider}-{number}"
+                number += 1
+        elif name in seen:
+            raise ValueError(f"Duplicate LLM provider entry name: {name}")
+        seen.add(name)
+        weight = options.pop("weight", 1.0)
+        max_concurrency = options.pop("max_concurrency", None)
+        if "api_key_env" in options:
+            options["api_key"] = os.environ.get(options.pop("api_key_env"), "")
+        entries.append(
+            ProviderEntry(
+                name=name,
+                provider=LazyProvider(provider, **options),
+                weight=weight,
+                max_concurrency=max_concurrency,
+                failure_threshold=settings.LLM_PROVIDER_FAILURE_THRESHOLD,
+                cooldown_seconds=settings.LLM_PROVIDER_COOLDOWN_SECONDS,
+            ),
+        )
+    return entries
@@ -0,0 +1,253 @@
+"""Shared HTTP transport for LLM provider clients.
+
+Every provider SDK is built on one httpx client per process, so calls to the
+same API share a keep-alive connection pool instead of each client keeping
+its own. Pool size, keep-alive expiry, timeouts and HTTP/2 come from
+settings.LLM_HTTP. `warm_connections` opens connections ahead of the first
+call, and `pool_state` and `probe` back the readiness endpoint.
+"""
+
+import importlib.util
+import logging
+import threading
+import time
+from collections.abc import Callable
+from collections.abc import Iterator
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any
+
+import httpx
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+_client: httpx.Client | None = None
+_transport: "TrackingTransport | None" = None
+_lock = threading.Lock()
+# Last probe of each URL: (monotonic time, reachable, seconds taken)
+_probes: dict[str, tuple[float, bool, float]] = {}
+
+
+def _http2_available() -> bool:
+    return importlib.util.find_spec("h2") is not None
+
+
+class _ClosingStream(httpx.SyncByteStream):
+    """Response body calling back once when it is closed."""
+
+    def __init__(
+        self,
+        stream: httpx.SyncByteStream,
+        on_close: Callable[[], None],
+    ) -> None:
+        self._stream = stream
+        self._on_close: Callable[[], None] | None = on_close
+
+    def __iter__(self) -> Iterator[bytes]:
+        yield from self._stream
+
+    def close(self) -> None:
+        try:
+            self._stream.close()
+        finally:
+            if self._on_close is not None:
+                self._on_close()
+                self._on_close = None
+
+
+class TrackingTransport(httpx.HTTPTransport):
+    """HTTP transport counting requests per origin, for `pool_state`.
+
+    A request is active from when it is sent until its response is closed,
+    so active requests are the connections the pool has lent out.
+    """
+
+    def __init__(
+        self,
+        **kwargs: Any,
+    ) -> None:
+        super().__init__(**kwargs)
+        self._lock = threading.Lock()
+        self.origins: dict[str, dict[str, int]] = {}
+
+    def counts(self) -> dict[str, dict[str, int]]:
+        """Get a copy of the active and total requests per origin."""
+        with self._lock:
+            return {origin: dict(counts) for origin, counts in self.origins.items()}
+
+    def _count(
+        self,
+        origin: str,
+        **changes: int,
+    ) -> None:
+        with self._lock:
+            counts = self.origins.setdefault(origin, {"active": 0, "requests": 0})
+            for key, change in changes.items():
+                counts[key] += change
+
+    def handle_request(
+        self,
+        request: httpx.Request,
+    ) -> httpx.Response:
+        origin = f"{request.url.scheme}://{request.url.netloc.decode('ascii')}"
+        self._count(origin, active=1, requests=1)
+        try:
+            response = super().handle_request(request)
+        except BaseException:
+            self._count(origin, active=-1)
+            raise
+        assert isinstance(response.stream, httpx.SyncByteStream)
+        response.stream = _ClosingStream(
+            response.stream,
+            lambda: self._count(origin, active=-1),
+        )
+        return response
+
+
+def build_transport() -> TrackingTransport:
+    """Build a connection pool from settings.LLM_HTTP.
+
+    HTTP/2 needs the optional h2 package; without it the pool falls back to
+    HTTP/1.1 with a warning.
+    """
+    config = settings.LLM_HTTP
+    http2 = config["http2"]
+    if http2 and not _http2_available():
+        logger.warning("LLM_HTTP2 is set but h2 is not installed; using HTTP/1.1")
+        http2 = False
+    return TrackingTransport(
+        http2=http2,
+        limits=httpx.Limits(
+            max_connections=config["max_connections"],
+            max_keepalive_connections=config["max_keepalive_connections"],
+            keepalive_expiry=config["keepalive_expiry"],
+        ),
+    )
+
+
+def build_http_client(
+    transport: httpx.BaseTransport | None = None,
+) -> httpx.Client:
+    """Build an httpx client with the timeouts in settings.LLM_HTTP.
+
+    Args:
+        transport: Connection pool to use, a new one by default
+    """
+    config = settings.LLM_HTTP
+    return httpx.Client(
+        transport=transport or build_transport(),
+        timeout=httpx.Timeout(
+            connect=config["connect_timeout"],
+            read=config["read_timeout"],
+            write=config["write_timeout"],
+            pool=config["pool_timeout"],
+        ),
+    )
+
+
+def get_http_client() -> httpx.Client:
+    """Get the process-wide client, building it on first use."""
+    global _client, _transport
+    if _client is None:
+        with _lock:
+            if _client is None:
+                _transport = build_transport()
+                _client = build_http_client(_transport)
+    return _client
+
+
+def probe(
+    url: str,
+    timeout: float | None = None,
+    max_age: float = 0.0,
+) -> tuple[bool, float]:
+    """Check that an API host answers, opening a pooled connection to it.
+
+    Any HTTP response counts as reachable; a bare request to an API root is
+    usually answered with 401 or 404, which still proves DNS, TCP and TLS work.
+
+    Args:
+        url: API base URL
+        timeout: Seconds to wait, defaulting to the client's timeouts
+        max_age: Reuse a probe of the URL made up to this many seconds ago
+
+    Returns:
+        tuple: (reachable, seconds taken)
+    """
+    start = time.perf_counter()
+    if max_age > 0:
+        with _lock:
+            probed_at, reachable, seconds = _probes.get(url, (None, False, 0.0))
+        if probed_at is not None and time.monotonic() - probed_at < max_age:
+            return reachable, seconds
+
+    try:
+        if timeout is None:
+            get_http_client().head(url)
+        else:
+            get_http_client().head(url, timeout=timeout)
+        reachable = True
+    except httpx.HTTPError as e:
+        logger.warning(f"LLM API {url} unreachable: {str(e)}")
+        reachable = False
+    seconds = time.perf_counter() - start
+    with _lock:
+        _probes[url] = (time.monotonic(), reachable, seconds)
+    return reachable, seconds
+
+
+def warm_connections(
+    urls: list[str],
+    connections_per_host: int | None = None,
+) -> dict[str, bool]:
+    """Open keep-alive connections to each API before taking traffic.
+
+    Probes run concurrently so each host gets several connections, rather
+    than one connection reused by sequential requests.
+
+    Args:
+        urls: API base URLs
+        connections_per_host: Connections to open per URL, defaulting to
+            settings.LLM_HTTP["warm_connections"]
+
+    Returns:
+        dict: Whether each URL was reachable
+    """
+    count: int = (
+        connections_per_host
+        if connections_per_host is not None
+        else settings.LLM_HTTP["warm_connections"]
+    )
+    urls = list(dict.fromkeys(urls))
+    if not urls or count <= 0:
+        return {}
+    jobs = [url for url in urls for _ in range(count)]
+    with ThreadPoolExecutor(max_workers=len(jobs)) as executor:
+        results = list(executor.map(lambda url: probe(url)[0], jobs))
+    reachable = {url: False for url in urls}
+    for url, ok in zip(jobs, results):
+        reachable[url] = reachable[url] or ok
+    return reachable
+
+
+def pool_state() -> dict:
+    """Describe the shared client's use of its connection pool.
+
+    Returns:
+        dict: Pool limits, and active and total requests overall and per
+            origin, or just 'initialized': False before the client is first
+            used
+    """
+    if _transport is None:
+        return {"initialized": False}
+
+    config = settings.LLM_HTTP
+    origins = _transport.counts()
+    return {
+        "initialized": True,
+        "http2": config["http2"] and _http2_available(),
+        "max_connections": config["max_connections"],
+        "max_keepalive_connections": config["max_keepalive_connections"],
+        "active": sum(counts["active"] for counts in origins.values()),
+        "origins": origins,
+    }
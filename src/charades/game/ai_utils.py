@@ -3,6 +3,8 @@
 import logging
 
 from charades.game.ai import llm_manager
+from charades.game.description_cache import description_cache
+from charades.game.metrics import stage
 
 logger = logging.getLogger(__name__)
 
@@ -18,7 +20,8 @@ def get_random_word(
     Returns:
         str: A random common noun in the specified language
     """
-    return llm_manager.get_random_word(language_code)
+    with stage("word_generation"):
+        return llm_manager.get_random_word(language_code)
 
 
 def evaluate_description(
@@ -28,6 +31,9 @@ def evaluate_description(
 ) -> tuple[int, str]:
     """Evaluate a player's description of a word.
 
+    Reuses the evaluation of a near-identical description of the same word
+    if one is cached, see charades.game.description_cache.
+
     Args:
         word: The target word being described
         description: The player's description
@@ -36,4 +42,10 @@ def evaluate_description(
     Returns:
         tuple: (score 0-100, feedback string)
     """
-    return llm_manager.evaluate_description(word, description, language)
+    with stage("evaluation"):
+        return description_cache.evaluate(
+            word,
+            description,
+            language,
+            lambda: llm_manager.evaluate_description(word, description, language),
+        )
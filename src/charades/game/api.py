@@ -1,23 +1,32 @@
 import logging
+import time
 from urllib.parse import parse_qs
 from django.conf import settings
 from django.http import HttpRequest
 from ninja import NinjaAPI
 
+from charades.game.ai import ledger
+from charades.game.calls import call_states
 from charades.game.logic import (
     handle_player_command,
-    handle_word_description,
     get_random_word,
 )
+from charades.game.languages import match_language
+from charades.game.metrics import VOICE_EVALUATION_SECONDS
+from charades.game.metrics import VOICE_RESULT_POLLS
+from charades.game.metrics import stage
+from charades.game.prefetch import prefetcher
 from charades.game.renderers import TwiMLRenderer
 from charades.game.schemas import TwilioIncomingMessageSchema
 from charades.game.schemas import TwilioMessageStatusSchema
 from charades.game.schemas import PlayerCommandSchema
 from charades.game.schemas import TwilioIncomingVoiceSchema
 from charades.game.utils import create_twiml_response
+from charades.game.utils import create_hold_response
 from charades.game.utils import create_voice_response
 from charades.game.utils import VOICE_MESSAGES
-from charades.game.models import Player
+from charades.game.voice import DONE
+from charades.game.voice import voice_evaluations
 
 logger = logging.getLogger(__name__)
 
@@ -42,8 +51,9 @@ def handle_incoming_message(
     4. Returns TwiML response to Twilio
     """
     # Parse the URL-encoded payload from request.body
-    body_str = request.body.decode("utf-8")
-    params = parse_qs(body_str)
+    with stage("form_parse"):
+        body_str = request.body.decode("utf-8")
+        params = parse_qs(body_str)
 
     # Convert the parsed params into our schema format
     # Note: parse_qs returns lists, so we take first item for each key
@@ -77,7 +87,8 @@ def handle_incoming_message(
 
     # Create and validate the schema
     try:
-        message = TwilioIncomingMessageSchema(**schema_data)
+        with stage("schema_validation"):
+            message = TwilioIncomingMessageSchema(**schema_data)
     except ValueError as e:
         return {
             "twiml": create_twiml_response(f"Invalid webhook payload: {str(e)}"),
@@ -114,8 +125,9 @@ def handle_message_status(
     3. Handles failed message retries if needed
     """
     # Parse the URL-encoded payload from request.body
-    body_str = request.body.decode("utf-8")
-    params = parse_qs(body_str)
+    with stage("form_parse"):
+        body_str = request.body.decode("utf-8")
+        params = parse_qs(body_str)
 
     # Convert the parsed params into our schema format
     # Note: parse_qs returns lists, so we take first item for each key
@@ -138,7 +150,8 @@ def handle_message_status(
 
     # Create and validate the schema
     try:
-        _ = TwilioMessageStatusSchema(**schema_data)
+        with stage("schema_validation"):
+            _ = TwilioMessageStatusSchema(**schema_data)
     except ValueError as e:
         return {
             "twiml": create_twiml_response(f"Invalid webhook payload: {str(e)}"),
@@ -163,13 +176,15 @@ def handle_voice_call(
 
     This endpoint:
     1. Validates the incoming webhook payload
-    2. Greets the caller
-    3. Prompts for language selection
-    4. Gathers speech input
+    2. Starts prefetching a returning caller's next word
+    3. Greets the caller
+    4. Prompts for language selection
+    5. Gathers speech input
     """
     # Parse the URL-encoded payload from request.body
-    body_str = request.body.decode("utf-8")
-    params = parse_qs(body_str)
+    with stage("form_parse"):
+        body_str = request.body.decode("utf-8")
+        params = parse_qs(body_str)
 
     # Convert the parsed params into our schema format
     schema_data = {
@@ -194,13 +209,17 @@ def handle_voice_call(
 
     # Create and validate the schema
     try:
-        _ = TwilioIncomingVoiceSchema(**schema_data)
+        with stage("schema_validation"):
+            _ = TwilioIncomingVoiceSchema(**schema_data)
     except ValueError as e:
         return {
             "twiml": create_voice_response(f"Invalid webhook payload: {str(e)}"),
             "code": 400,
         }
 
+    # Returning callers' next word is generated while the welcome plays
+    prefetcher.prefetch(schema_data["From"])
+
     return {
         "twiml": create_voice_response(
             VOICE_MESSAGES["welcome"],
@@ -224,10 +243,16 @@ def handle_voice_gather(
     2. Processes the speech recognition result
     3. Routes to appropriate game logic
     4. Returns TwiML response with next prompt
+
+    Descriptions are evaluated in the background; the caller hears a hold
+    message and is redirected to `handle_voice_result` for the score.
     """
+    start = time.perf_counter()
+
     # Parse the URL-encoded payload
-    body_str = request.body.decode("utf-8")
-    params = parse_qs(body_str)
+    with stage("form_parse"):
+        body_str = request.body.decode("utf-8")
+        params = parse_qs(body_str)
 
     # Get the speech result
     speech_result = params.get("SpeechResult", [None])[0]
@@ -240,9 +265,10 @@ def handle_voice_gather(
             "code": 200,
         }
 
-    # Get caller's phone number
+    # Get caller's phone number and the call
     phone_number = params.get("From", [None])[0]
-    if not phone_number:
+    call_sid = params.get("CallSid", [None])[0]
+    if not phone_number or not call_sid:
         return {
             "twiml": create_voice_response(
                 VOICE_MESSAGES["error_generic"],
@@ -251,31 +277,13 @@ def handle_voice_gather(
             "code": 400,
         }
 
-    # Convert speech to language code
-    speech_lower = speech_result.lower()
-    speech_lower = speech_lower.strip()
-    speech_lower = speech_lower.strip(".")
-    language_map = {
-        "english": "EN",
-        "korean": "KO",
-        "spanish": "ES",
-        "french": "FR",
-        "german": "DE",
-        "italian": "IT",
-        "japanese": "JA",
-        "portuguese": "PT",
-        "russian": "RU",
-        "bengali": "BN",
-        "persian": "FA",
-        "chinese": "ZH",
-    }
-    logger.critical(f"speech_lower: {speech_lower}")
-
-    language_code = language_map.get(speech_lower)
+    language_code = match_language(speech_result, channel="voice")
+    logger.debug(f"speech_result: {speech_result}, language: {language_code}")
 
-    # Get or create player
+    # Get the caller and their active game; only a call's first turn, and
+    # turns after a state change on another worker, read the database
     try:
-        player, _ = Player.get_or_create_player(phone_number)
+        call = call_states.load(call_sid, phone_number)
     except Exception as _:
         return {
             "twiml": create_voice_response(
@@ -284,42 +292,42 @@ def handle_voice_gather(
             ),
             "code": 400,
         }
-
-    # Check for active game
-    active_session = player.gamesession_set.filter(status="active").first()
-
-    if active_session:
-        # Handle word description
-        result = handle_word_description(player, speech_result)
-        # Convert SMS response to voice response
-        message = result["twiml"].replace("Score:", "").replace("\n", ". ")
+    player = call.player
+
+    if call.session_id is not None:
+        # Evaluate the description without keeping the caller in silence
+        voice_evaluations.start(call_sid, player, speech_result)
+        twiml = create_hold_response(
+            VOICE_MESSAGES["evaluating"],
+            pause_seconds=settings.VOICE_EVALUATION["pause_seconds"],
+        )
+        VOICE_EVALUATION_SECONDS.labels(phase="first_audio").observe(
+            time.perf_counter() - start,
+        )
         return {
-            "twiml": create_voice_response(message, gather_speech=True),
-            "code": result["code"],
+            "twiml": twiml,
+            "code": 200,
         }
     elif language_code:
-        # Get or create player
-        try:
-            player, _ = Player.get_or_create_player(phone_number)
-        except Exception as _:
-            return {
-                "twiml": create_voice_response(
-                    VOICE_MESSAGES["error_generic"],
-                    gather_speech=False,
-                ),
-                "code": 400,
-            }
-
-        # End any existing active sessions
-        player.end_active_sessions()
-
-        # Get a random word in the selected language
-        word = get_random_word(language_code)
-
-        # Create new game session
-        _ = player.gamesession_set.create(
-            word=word,
-            language=language_code.lower(),
+        with ledger.capture() as llm_calls:
+            # End any existing active sessions
+            player.end_active_sessions()
+
+            # Use the word prefetched for the player, or get a random one
+            word = prefetcher.take(player.pk, language_code) or get_random_word(
+                language_code,
+            )
+
+            # Create new game session
+            session = player.gamesession_set.create(
+                word=word,
+                language=language_code.lower(),
+            )
+            llm_calls.session_id = session.pk
+            llm_calls.database = session._state.db
+        call_states.set(
+            call_sid,
+            call.with_session(session.pk),
         )
 
         # Return voice response with the word
@@ -344,6 +352,83 @@ def handle_voice_gather(
         }
 
 
+@api.post(
+    "/webhooks/twilio/voice/result",
+    tags=["webhooks"],
+)
+def handle_voice_result(
+    request: HttpRequest,
+) -> dict:
+    """Speak the result of a voice description evaluation.
+
+    Twilio is redirected here by the hold response of `handle_voice_gather`.
+    This endpoint:
+    1. Looks up the evaluation for the call
+    2. If it is done, speaks the score and gathers the next language
+    3. If it is still running, pauses and redirects back here
+    4. If it is lost or taking too long, cancels it so its game stays
+       active and asks for the description again
+    """
+    # Parse the URL-encoded payload
+    with stage("form_parse"):
+        body_str = request.body.decode("utf-8")
+        params = parse_qs(body_str)
+
+    call_sid = params.get("CallSid", [None])[0]
+    state = voice_evaluations.get(call_sid) if call_sid else None
+    if call_sid is None or state is None:
+        VOICE_RESULT_POLLS.labels(outcome="missing").inc()
+        if call_sid is not None:
+            call_states.forget(call_sid)
+        return {
+            "twiml": create_voice_response(
+                VOICE_MESSAGES["evaluation_lost"],
+                gather_speech=True,
+            ),
+            "code": 200,
+        }
+
+    elapsed = time.time() - state["started_at"]
+    if state["status"] != DONE:
+        timeout = settings.VOICE_EVALUATION["timeout_seconds"]
+        # Unless the evaluation is already completing the game; then wait
+        if elapsed > timeout and voice_evaluations.cancel(
+            call_sid,
+            state["started_at"],
+        ):
+            VOICE_RESULT_POLLS.labels(outcome="timeout").inc()
+            call_states.forget(call_sid)
+            return {
+                "twiml": create_voice_response(
+                    VOICE_MESSAGES["evaluation_timeout"],
+                    gather_speech=True,
+                ),
+                "code": 200,
+            }
+        VOICE_RESULT_POLLS.labels(outcome="pending").inc()
+        return {
+            "twiml": create_hold_response(
+                pause_seconds=settings.VOICE_EVALUATION["pause_seconds"],
+            ),
+            "code": 200,
+        }
+
+    VOICE_RESULT_POLLS.labels(outcome="ready").inc()
+    voice_evaluations.finish(call_sid)
+    call = call_states.get(call_sid)
+    if state["code"] == 200 and call is not None:
+        call_states.set(call_sid, call.with_session(None))
+    else:
+        call_states.forget(call_sid)
+    VOICE_EVALUATION_SECONDS.labels(phase="delivered").observe(elapsed)
+    # Convert SMS response to voice response
+    message = state["twiml"].replace("Score:", "").replace("\n", ". ")
+    return {
+        "twiml": create_voice_response(message, gather_speech=True),
+        "code": state["code"],
+    }
+
+
 @api.post(
     "/test/player-command",
     tags=["testing"],
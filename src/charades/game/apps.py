@@ -1,6 +1,12 @@
 from django.apps import AppConfig
+from django.db.models.signals import post_migrate
 
 
 class GameConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "charades.game"
+
+    def ready(self) -> None:
+        from charades.game.sharding import reset_id_sequences_after_migrate
+
+        post_migrate.connect(reset_id_sequences_after_migrate, sender=self)
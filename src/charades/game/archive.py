@@ -0,0 +1,308 @@
+"""Archival of old finished game sessions to compressed files.
+
+Hot queries only touch active and recent sessions, so completed and timed
+out sessions older than settings.SESSION_ARCHIVE["after_days"] are moved out
+of the database into gzipped JSONL files, partitioned by the UTC day they
+started on:
+
+    <dir>/sessions/day=2026-01-02/<database>-<first id>-<last id>.jsonl.gz
+    <dir>/manifest.jsonl
+
+Sessions are moved in chunks, oldest id first. Each chunk is written to its
+part files, deleted from its shard, and only then recorded in the manifest,
+one JSON line per part file with its day, row count, id range, player ids
+and checksum. A crash leaves at worst part files missing from the manifest,
+whose rows may or may not have been deleted yet; the next run deletes any
+that remain and records the files. Readers only trust the manifest, so a
+session is never seen twice.
+
+`SessionArchive.sessions` reads archived sessions back by player or date
+without restoring them, opening only the partitions the manifest says can
+match. PlayerStats aggregates already include archived sessions, but
+`PlayerStats.rebuild` only sees sessions still in the database.
+"""
+
+import fcntl
+import gzip
+import hashlib
+import json
+import os
+from collections.abc import Iterator
+from contextlib import contextmanager
+from datetime import UTC
+from datetime import date
+from datetime import datetime
+from datetime import timedelta
+from itertools import groupby
+from pathlib import Path
+
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+
+from charades.game.exports import FIELDS
+from charades.game.exports import encode_jsonl
+from charades.game.models import GameSession
+from charades.game.sharding import shards
+
+ARCHIVED_STATUSES = ["completed", "timeout"]
+# The weekly leaderboard reads this week's sessions from the database
+MIN_AFTER_DAYS = 7
+
+_ID = FIELDS.index("id")
+_PLAYER_ID = FIELDS.index("player_id")
+_STARTED_AT = FIELDS.index("started_at")
+
+
+def _day(
+    started_at: datetime,
+) -> date:
+    return started_at.astimezone(UTC).date()
+
+
+class SessionArchive:
+    """A directory of archived sessions and its manifest."""
+
+    def __init__(
+        self,
+        directory: Path | str,
+    ) -> None:
+        self.directory = Path(directory)
+        self.manifest_path = self.directory / "manifest.jsonl"
+
+    def entries(self) -> Iterator[dict]:
+        """Manifest entries, one per part file, oldest first."""
+        if not self.manifest_path.exists():
+            return
+        with self.manifest_path.open(encoding="utf-8") as manifest:
+            for line in manifest:
+                if line.strip():
+                    yield json.loads(line)
+
+    @contextmanager
+    def _locked(self) -> Iterator[None]:
+        # One archiver at a time, across processes
+        self.directory.mkdir(parents=True, exist_ok=True)
+        with (self.directory / "archive.lock").open("w") as lock:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock, fcntl.LOCK_UN)
+
+    def archive(
+        self,
+        after_days: int,
+        chunk_size: int = 1000,
+        dry_run: bool = False,
+    ) -> int:
+        """Move finished sessions older than a number of days to the archive.
+
+        Args:
+            after_days: Archive sessions started more than this many days ago
+            chunk_size: Sessions copied, then deleted, per transaction
+            dry_run: Only count the sessions that would be archived
+
+        Returns:
+            int: Number of sessions archived, or that would be
+
+        Raises:
+            ValueError: If after_days would archive this week's sessions
+        """
+        if after_days < MIN_AFTER_DAYS:
+            raise ValueError(
+                f"Sessions younger than {MIN_AFTER_DAYS} days can't be archived",
+            )
+        cutoff = timezone.now() - timedelta(days=after_days)
+        archived = 0
+        with self._locked():
+            if not dry_run:
+                self._recover()
+            for using in shards():
+                candidates = GameSession.objects.using(using).filter(
+                    status__in=ARCHIVED_STATUSES,
+                    started_at__lt=cutoff,
+                )
+                if dry_run:
+                    archived += candidates.count()
+                    continue
+                last_id = 0
+                while rows := list(
+                    candidates.filter(pk__gt=last_id)
+                    .order_by("pk")
+                    .values_list(*FIELDS)[:chunk_size],
+                ):
+                    self._archive_chunk(using, rows)
+                    archived += len(rows)
+                    last_id = rows[-1][_ID]
+        return archived
+
+    def _archive_chunk(
+        self,
+        using: str,
+        rows: list[tuple],
+    ) -> None:
+        rows.sort(key=lambda row: (row[_STARTED_AT], row[_ID]))
+        entries = [
+            self._write_part(using, day, list(day_rows))
+            for day, day_rows in groupby(rows, key=lambda row: _day(row[_STARTED_AT]))
+        ]
+        with transaction.atomic(using=using):
+            GameSession.objects.using(using).filter(
+                pk__in=[row[_ID] for row in rows],
+            ).delete()
+        self._record(entries)
+
+    def _write_part(
+        self,
+        using: str,
+        day: date,
+        rows: list[tuple],
+    ) -> dict:
+        """Write one day's rows of a chunk to a part file.
+
+        Returns:
+            dict: The part's manifest entry, not yet recorded
+        """
+        ids = [row[_ID] for row in rows]
+        relative = (
+            Path("sessions")
+            / f"day={day.isoformat()}"
+            / f"{using}-{min(ids)}-{max(ids)}.jsonl.gz"
+        )
+        path = self.directory / relative
+        path.parent.mkdir(parents=True, exist_ok=True)
+        temporary = path.with_name(f".{path.name}.tmp")
+        with temporary.open("wb") as raw:
+            with gzip.GzipFile(fileobj=raw, mode="wb") as compressed:
+                for line in encode_jsonl(rows):
+                    compressed.write(line.encode())
+            raw.flush()
+            os.fsync(raw.fileno())
+        os.replace(temporary, path)
+        return self._entry(
+            relative,
+            using,
+            day,
+            ids,
+            {row[_PLAYER_ID] for row in rows},
+        )
+
+    def _entry(
+        self,
+        relative: Path,
+        using: str,
+        day: date,
+        ids: list[int],
+        player_ids: set[int],
+    ) -> dict:
+        return {
+            "file": relative.as_posix(),
+            "database": using,
+            "day": day.isoformat(),
+            "rows": len(ids),
+            "first_id": min(ids),
+            "last_id": max(ids),
+            "player_ids": sorted(player_ids),
+            "sha256": hashlib.sha256(
+                (self.directory / relative).read_bytes(),
+            ).hexdigest(),
+            "archived_at": timezone.now().isoformat(),
+        }
+
+    def _record(
+        self,
+        entries: list[dict],
+    ) -> None:
+        with self.manifest_path.open("a", encoding="utf-8") as manifest:
+            for entry in entries:
+                manifest.write(f"{json.dumps(entry)}\n")
+            manifest.flush()
+            os.fsync(manifest.fileno())
+
+    def _recover(self) -> int:
+        """Finish moves interrupted after writing their part files.
+
+        Returns:
+            int: Number of part files recovered
+        """
+        recorded = {entry["file"] for entry in self.entries()}
+        recovered = 0
+        for path in sorted(self.directory.glob("sessions/day=*/*.jsonl.gz")):
+            relative = path.relative_to(self.directory)
+            if relative.as_posix() in recorded:
+                continue
+            using = path.name.rsplit("-", 2)[0]
+            records = list(self._read_part(relative))
+            ids = [record["id"] for record in records]
+            with transaction.atomic(using=using):
+                GameSession.objects.using(using).filter(pk__in=ids).delete()
+            day = date.fromisoformat(relative.parent.name.removeprefix("day="))
+            player_ids = {record["player_id"] for record in records}
+            self._record([self._entry(relative, using, day, ids, player_ids)])
+            recovered += 1
+        return recovered
+
+    def _read_part(
+        self,
+        relative: str | Path,
+    ) -> Iterator[dict]:
+        with gzip.open(self.directory / relative, "rt", encoding="utf-8") as part:
+            for line in part:
+                record = json.loads(line)
+                for field in ("started_at", "completed_at"):
+                    if record[field] is not None:
+                        record[field] = datetime.fromisoformat(record[field])
+                yield record
+
+    def sessions(
+        self,
+        player_id: int | None = None,
+        since: date | None = None,
+        until: date | None = None,
+    ) -> Iterator[dict]:
+        """Read archived sessions, without restoring them.
+
+        Only partitions the manifest says can match are opened.
+
+        Args:
+            player_id: Only this player's sessions
+            since: Only sessions started on or after this UTC day
+            until: Only sessions started before this UTC day
+
+        Yields:
+            dict: Sessions as exported by charades.game.exports, with
+                started_at and completed_at parsed, in archive order
+        """
+        for entry in self.entries():
+            day = date.fromisoformat(entry["day"])
+            if since is not None and day < since:
+                continue
+            if until is not None and day >= until:
+                continue
+            if player_id is not None and player_id not in entry["player_ids"]:
+                continue
+            for record in self._read_part(entry["file"]):
+                if player_id is None or record["player_id"] == player_id:
+                    yield record
+
+    def verify(self) -> list[str]:
+        """Check every part file in the manifest against its checksum.
+
+        Returns:
+            list: Part files that are missing or don't match
+        """
+        bad = []
+        for entry in self.entries():
+            path = self.directory / entry["file"]
+            if (
+                not path.exists()
+                or hashlib.sha256(path.read_bytes()).hexdigest() != entry["sha256"]
+            ):
+                bad.append(entry["file"])
+        return bad
+
+
+def session_archive() -> SessionArchive:
+    """The archive configured in settings.SESSION_ARCHIVE."""
+    return SessionArchive(settings.SESSION_ARCHIVE["dir"])
@@ -0,0 +1,129 @@
+"""Per-call state for voice games, keyed by Twilio CallSid.
+
+Every <Gather> round trip in a call is a new webhook request. Rather than
+looking the caller and their active game up again on each one, the first
+turn of a call stores what later turns need: the player and the id of their
+active session. State lives in the Django cache, the one copy every worker
+reads and writes, so a turn on any worker sees the changes made by turns on
+the others and skips the database.
+
+State is only written when it changes, i.e. when a game starts or ends,
+and expires settings.VOICE_CALL_STATE["ttl"] seconds after the last change.
+Anything that leaves it uncertain, like an evaluation that failed or timed
+out, should `forget` the call so the next turn reloads it from the database.
+"""
+
+from dataclasses import dataclass
+from dataclasses import replace
+
+from django.conf import settings
+from django.core.cache import BaseCache
+from django.core.cache import caches
+
+from charades.game.models import Player
+
+
+@dataclass(frozen=True)
+class CallState:
+    """What a voice call's turns need to know about the caller."""
+
+    player_id: int
+    phone_number: str
+    session_id: int | None = None
+
+    @property
+    def player(self) -> Player:
+        """An unsaved Player standing in for the caller's row."""
+        return Player(pk=self.player_id, phone_number=self.phone_number)
+
+    def with_session(
+        self,
+        session_id: int | None,
+    ) -> "CallState":
+        """Copy of the state with the active session changed."""
+        return replace(self, session_id=session_id)
+
+
+class CallStateStore:
+    """Call state in the shared Django cache."""
+
+    @property
+    def cache(self) -> BaseCache:
+        return caches[settings.VOICE_CALL_STATE["cache"]]
+
+    @staticmethod
+    def key(
+        call_sid: str,
+    ) -> str:
+        return f"charades:voice:call:{call_sid}"
+
+    def get(
+        self,
+        call_sid: str,
+    ) -> CallState | None:
+        """Get a call's state.
+
+        Args:
+            call_sid: Twilio CallSid of the call
+
+        Returns:
+            CallState | None: The state, or None if the call is unknown
+        """
+        return self.cache.get(self.key(call_sid))
+
+    def set(
+        self,
+        call_sid: str,
+        state: CallState,
+    ) -> None:
+        """Store a call's state.
+
+        Args:
+            call_sid: Twilio CallSid of the call
+            state: The call's new state
+        """
+        self.cache.set(
+            self.key(call_sid),
+            state,
+            timeout=settings.VOICE_CALL_STATE["ttl"],
+        )
+
+    def forget(
+        self,
+        call_sid: str,
+    ) -> None:
+        """Drop a call's state, so its next turn reloads it from the database.
+
+        Args:
+            call_sid: Twilio CallSid of the call
+        """
+        self.cache.delete(self.key(call_sid))
+
+    def load(
+        self,
+        call_sid: str,
+        phone_number: str,
+    ) -> CallState:
+        """Get a call's state, loading it from the database on first use.
+
+        Args:
+            call_sid: Twilio CallSid of the call
+            phone_number: Caller's phone number in E.164 format
+
+        Returns:
+            CallState: The call's state
+        """
+        state = self.get(call_sid)
+        if state is not None and state.phone_number == phone_number:
+            return state
+
+        player, _ = Player.get_or_create_player(phone_number)
+        session = player.gamesession_set.filter(status="active").only("pk").first()
+        state = CallState(player_id=player.pk, phone_number=phone_number)
+        if session is not None:
+            state = state.with_session(session.pk)
+        self.set(call_sid, state)
+        return state
+
+
+call_states = CallStateStore()
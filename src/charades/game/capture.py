@@ -0,0 +1,176 @@
+"""Capture raw webhook traffic for later replay.
+
+When settings.WEBHOOK_CAPTURE["dir"] is set, `TrafficCaptureMiddleware`
+appends every request under the webhook path prefix to gzip-compressed JSONL
+files in that directory, one entry per request: arrival time, method, path,
+headers, body, and the status and latency the server answered with. Files
+rotate once they reach a size or age limit. `python -m bench replay` re-issues
+captured traffic against another instance.
+"""
+
+import atexit
+import base64
+import gzip
+import json
+import os
+import threading
+import time
+from collections.abc import Callable
+from datetime import datetime
+from datetime import timezone
+from pathlib import Path
+from typing import IO
+from typing import Any
+
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.http import HttpRequest
+from django.http import HttpResponse
+
+# Never written to disk; captured traffic may be shared for debugging
+EXCLUDED_HEADERS = frozenset(["Authorization", "Cookie", "Proxy-Authorization"])
+
+
+class CaptureWriter:
+    """Appends entries to rotating gzip-compressed JSONL files.
+
+    Each file is flushed after every entry so a reader can follow it while
+    it is being written.
+    """
+
+    def __init__(
+        self,
+        directory: str | Path,
+        max_bytes: int,
+        max_seconds: float,
+    ) -> None:
+        """Initialize the writer.
+
+        Args:
+            directory: Directory for capture files, created if missing
+            max_bytes: Rotate after this many uncompressed bytes
+            max_seconds: Rotate once a file is this old
+        """
+        self.directory = Path(directory)
+        self.max_bytes = max_bytes
+        self.max_seconds = max_seconds
+        self._lock = threading.Lock()
+        self._file: IO[str] | None = None
+        self._opened_at = 0.0
+        self._written = 0
+        self._sequence = 0
+
+    def _open(self) -> IO[str]:
+        self.directory.mkdir(parents=True, exist_ok=True)
+        stamp = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%S")
+        self._sequence += 1
+        name = f"webhooks-{stamp}-{os.getpid()}-{self._sequence:04d}.jsonl.gz"
+        path = self.directory / name
+        self._opened_at = time.monotonic()
+        self._written = 0
+        return gzip.open(path, "at", encoding="utf-8")
+
+    def _should_rotate(self) -> bool:
+        return (
+            self._written >= self.max_bytes
+            or time.monotonic() - self._opened_at >= self.max_seconds
+        )
+
+    def write(
+        self,
+        entry: dict[str, Any],
+    ) -> None:
+        """Append an entry, rotating to a new file when limits are reached."""
+        line = f"{json.dumps(entry, ensure_ascii=False)}\n"
+        with self._lock:
+            if self._file is not None and self._should_rotate():
+                self._file.close()
+                self._file = None
+            if self._file is None:
+                self._file = self._open()
+            self._file.write(line)
+            self._file.flush()
+            self._written += len(line)
+
+    def close(self) -> None:
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+
+def capture_entry(
+    request: HttpRequest,
+    response: HttpResponse,
+    arrived_at: float,
+    latency: float,
+) -> dict[str, Any]:
+    """Build the capture entry for an answered request.
+
+    Args:
+        request: The incoming request
+        response: The response it was answered with
+        arrived_at: Arrival time as a Unix timestamp
+        latency: Seconds spent producing the response
+
+    Returns:
+        dict: JSON-serializable capture entry
+    """
+    entry: dict[str, Any] = {
+        "arrived_at": arrived_at,
+        "method": request.method,
+        "path": request.path,
+        "query": request.META.get("QUERY_STRING", ""),
+        "headers": {
+            name: value
+            for name, value in request.headers.items()
+            if name not in EXCLUDED_HEADERS
+        },
+        "status": response.status_code,
+        "latency_ms": round(latency * 1000, 3),
+    }
+    try:
+        entry["body"] = request.body.decode("utf-8")
+    except UnicodeDecodeError:
+        entry["body_base64"] = base64.b64encode(request.body).decode("ascii")
+    return entry
+
+
+class TrafficCaptureMiddleware:
+    """Capture webhook requests to rotating compressed JSONL files.
+
+    Unused, and removed from the middleware chain, unless
+    settings.WEBHOOK_CAPTURE["dir"] is set.
+    """
+
+    def __init__(
+        self,
+        get_response: Callable[[HttpRequest], HttpResponse],
+    ) -> None:
+        config = settings.WEBHOOK_CAPTURE
+        if not config["dir"]:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        self.path_prefix = config["path_prefix"]
+        self.writer = CaptureWriter(
+            directory=config["dir"],
+            max_bytes=config["max_bytes"],
+            max_seconds=config["max_seconds"],
+        )
+        atexit.register(self.writer.close)
+
+    def __call__(
+        self,
+        request: HttpRequest,
+    ) -> HttpResponse:
+        if not request.path.startswith(self.path_prefix):
+            return self.get_response(request)
+
+        arrived_at = time.time()
+        start = time.perf_counter()
+        # Read the body now; it can't be read after the view consumes the stream
+        _ = request.body
+        response = self.get_response(request)
+        latency = time.perf_counter() - start
+        self.writer.write(capture_entry(request, response, arrived_at, latency))
+        return response
@@ -0,0 +1,180 @@
+"""Daily challenges: one shared word per language per day.
+
+Every player who plays a language's daily challenge describes the same
+word, so rather than a word generation per game there is one per language
+per day. The word is kept in a DailyChallenge row on the default database
+and, in front of it, in the Django cache; `challenge_word` generates it on
+first use unless the `create_daily_challenges` command already has.
+
+Challenge sessions are ordinary GameSessions on their players' shards,
+marked with the day they played, and are ranked across shards by score,
+ties going to whoever finished first. Each player gets one attempt per
+language per day.
+"""
+
+import heapq
+import threading
+from datetime import date
+from datetime import datetime
+
+from django.conf import settings
+from django.core.cache import BaseCache
+from django.core.cache import caches
+from django.db import IntegrityError
+from django.db import transaction
+from django.db.models import Q
+from django.db.models import QuerySet
+from django.utils import timezone
+
+from charades.game.ai_utils import get_random_word
+from charades.game.metrics import CHALLENGE_WORDS
+from charades.game.models import DailyChallenge
+from charades.game.models import GameSession
+from charades.game.models import Player
+from charades.game.sharding import shards
+
+# One generation per language at a time per process, so a rush of players
+# at the start of the day doesn't all generate the word
+_locks: dict[str, threading.Lock] = {}
+_locks_lock = threading.Lock()
+
+
+def _cache() -> BaseCache:
+    return caches[settings.DAILY_CHALLENGE["cache"]]
+
+
+def _key(
+    day: date,
+    language_code: str,
+) -> str:
+    return f"charades:challenge:{day.isoformat()}:{language_code.lower()}"
+
+
+def challenge_word(
+    language_code: str,
+    day: date | None = None,
+) -> str:
+    """Get a day's challenge word in a language, generating it on first use.
+
+    Args:
+        language_code: Two-letter ISO 639-1 language code
+        day: Local date of the challenge, today if None
+
+    Returns:
+        str: The challenge word
+    """
+    day = day or timezone.localdate()
+    cache = _cache()
+    key = _key(day, language_code)
+    if (word := cache.get(key)) is not None:
+        CHALLENGE_WORDS.labels(outcome="cached").inc()
+        return word
+
+    with _locks_lock:
+        lock = _locks.setdefault(language_code.lower(), threading.Lock())
+    with lock:
+        challenge = DailyChallenge.objects.filter(
+            day=day,
+            language=language_code,
+        ).first()
+        if challenge is not None:
+            CHALLENGE_WORDS.labels(outcome="stored").inc()
+        else:
+            word = get_random_word(language_code.upper())
+            try:
+                # A savepoint, in case the caller is in a transaction
+                with transaction.atomic(using="default"):
+                    challenge = DailyChallenge.objects.create(
+                        day=day,
+                        language=language_code,
+                        word=word,
+                    )
+            except IntegrityError:
+                # Another process generated it first; use its word instead
+                challenge = DailyChallenge.objects.get(day=day, language=language_code)
+            CHALLENGE_WORDS.labels(outcome="generated").inc()
+    cache.set(key, challenge.word, timeout=settings.DAILY_CHALLENGE["ttl"])
+    return challenge.word
+
+
+def challenge_sessions(
+    using: str,
+    language_code: str,
+    day: date,
+) -> QuerySet[GameSession]:
+    """A shard's completed sessions of a challenge."""
+    return GameSession.objects.using(using).filter(
+        challenge_on=day,
+        language=language_code,
+        status="completed",
+        score__isnull=False,
+    )
+
+
+def challenge_rank(
+    session: GameSession,
+) -> tuple[int, int]:
+    """Get a completed challenge session's place among all submissions.
+
+    Args:
+        session: A completed session with challenge_on set
+
+    Returns:
+        tuple: (rank, starting at 1, number of submissions)
+    """
+    ahead = Q(score__gt=session.score) | Q(
+        score=session.score,
+        completed_at__lt=session.completed_at,
+    )
+    rank = total = 0
+    for using in shards():
+        sessions = challenge_sessions(using, session.language, session.challenge_on)
+        rank += sessions.filter(ahead).count()
+        total += sessions.count()
+    return rank + 1, total
+
+
+def challenge_top(
+    language_code: str,
+    limit: int,
+    day: date | None = None,
+) -> list[tuple[str, int]]:
+    """Get the best submissions to a day's challenge.
+
+    Args:
+        language_code: Two-letter ISO 639-1 language code
+        limit: Most submissions returned
+        day: Local date of the challenge, today if None
+
+    Returns:
+        list: (phone number, score) pairs, best first
+    """
+    day = day or timezone.localdate()
+    per_shard: list[list[tuple[int, datetime, str]]] = [
+        [
+            (-score, completed_at, phone_number)
+            for score, completed_at, phone_number in challenge_sessions(
+                using,
+                language_code.lower(),
+                day,
+            )
+            .order_by("-score", "completed_at")
+            .values_list("score", "completed_at", "player__phone_number")[:limit]
+        ]
+        for using in shards()
+    ]
+    return [
+        (phone_number, -score) for score, _, phone_number in heapq.merge(*per_shard)
+    ][:limit]
+
+
+def played_challenge(
+    player: Player,
+    language_code: str,
+    day: date | None = None,
+) -> GameSession | None:
+    """Get a player's session of a day's challenge, if they started one."""
+    return player.gamesession_set.filter(
+        challenge_on=day or timezone.localdate(),
+        language=language_code,
+    ).first()
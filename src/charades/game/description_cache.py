@@ -0,0 +1,396 @@
+"""Near-duplicate cache of description evaluations.
+
+Players describing the same word often send nearly the same text, like
+"it is a red fruit" and "It's a red fruit!", and each would cost an LLM
+evaluation. This cache keeps recent evaluations per (word, language) and
+reuses the score and feedback of one whose description is similar enough.
+
+Descriptions are casefolded, stripped of accents and punctuation, and cut
+into overlapping character n-grams. A MinHash signature of the n-grams is
+split into bands for locality-sensitive hashing: descriptions sharing any
+band are candidates, and a candidate is reused if the Jaccard similarity of
+the two n-gram sets reaches settings.DESCRIPTION_CACHE["threshold"].
+Character n-grams barely tell "not a fruit" from "a fruit", so descriptions
+are only reused for each other if they also use the same negation words.
+The word lists err on the broad side, since a word wrongly taken for a
+negation only costs an LLM call; negations they miss, like Persian verb
+prefixes, are left to the sampled verification below.
+
+Each word keeps its most recently used `max_per_word` evaluations, and the
+cache its most recently used `max_words` words. A sample of hits,
+`verify_rate`, is evaluated anyway and the difference between the cached
+and the fresh score is recorded, so the threshold can be tuned against the
+score drift it causes.
+"""
+
+import hashlib
+import random
+import re
+import threading
+from array import array
+from collections import Counter
+from collections import OrderedDict
+from collections.abc import Callable
+from dataclasses import dataclass
+
+from django.conf import settings
+
+from charades.game.languages import normalize
+from charades.game.metrics import DESCRIPTION_CACHE
+from charades.game.metrics import DESCRIPTION_CACHE_DEVIATION
+
+# Permutations are (a * x + b) mod this prime, over 61-bit n-gram hashes
+_PRIME = (1 << 61) - 1
+_NOT_WORD = re.compile(r"[\W_]+")
+# Normalized words that negate, in the supported languages; "n't" and "n'"
+# leave the words "t" and "n" behind once punctuation is gone
+_NEGATION_WORDS = frozenset(
+    normalize(word)
+    for word in (
+        # English
+        "not no never none nothing nobody neither nor cannot without t "
+        # Spanish, Portuguese and Italian
+        "nunca nada nadie ni sin nao nem nenhum sem non mai niente senza "
+        # French
+        "ne n pas jamais rien personne aucun aucune sans "
+        # German
+        "nicht kein keine keinen keinem keiner keines nie niemals nichts ohne "
+        # Russian
+        "не нет ни никогда ничего без "
+        # Persian and Bengali
+        "نه نیست بدون না নয় নেই"
+    ).split()
+)
+# Negations written without spaces around them, in Chinese, Japanese and Korean
+_NEGATION_MARKS = tuple("不 没 沒 无 無 别 別 ない ません 않 못 없".split())
+
+
+def shingles(
+    description: str,
+    size: int,
+) -> array:
+    """Hash the character n-grams of a normalized description.
+
+    Args:
+        description: The player's description
+        size: Characters per n-gram
+
+    Returns:
+        array: Sorted, distinct 61-bit n-gram hashes
+    """
+    text = _NOT_WORD.sub(" ", normalize(description)).strip()
+    grams = {text[i : i + size] for i in range(max(len(text) - size + 1, 1))}
+    return array(
+        "Q",
+        sorted(
+            int.from_bytes(
+                hashlib.blake2b(gram.encode(), digest_size=8).digest(),
+            )
+            & _PRIME
+            for gram in grams
+        ),
+    )
+
+
+def negations(
+    description: str,
+) -> frozenset[str]:
+    """Find the negation words and marks a description uses.
+
+    Args:
+        description: The player's description
+
+    Returns:
+        frozenset: Normalized negation words and marks found
+    """
+    text = _NOT_WORD.sub(" ", normalize(description))
+    found = _NEGATION_WORDS.intersection(text.split())
+    return found.union(mark for mark in _NEGATION_MARKS if mark in text)
+
+
+def jaccard(
+    first: array,
+    second: array,
+) -> float:
+    """Jaccard similarity of two n-gram hash sets."""
+    a, b = set(first), set(second)
+    union = len(a | b)
+    return len(a & b) / union if union else 1.0
+
+
+@dataclass
+class _Entry:
+    shingles: array
+    negations: frozenset[str]
+    bands: tuple[int, ...]
+    score: int
+    feedback: str
+
+
+class _WordIndex:
+    """LSH index over one word's cached evaluations, least recent first."""
+
+    def __init__(self) -> None:
+        self.entries: OrderedDict[int, _Entry] = OrderedDict()
+        self.buckets: dict[int, set[int]] = {}
+
+    def candidates(
+        self,
+        bands: tuple[int, ...],
+    ) -> set[int]:
+        found: set[int] = set()
+        for band in bands:
+            found |= self.buckets.get(band, set())
+        return found
+
+    def add(
+        self,
+        entry_id: int,
+        entry: _Entry,
+    ) -> None:
+        self.entries[entry_id] = entry
+        for band in entry.bands:
+            self.buckets.setdefault(band, set()).add(entry_id)
+
+    def evict_oldest(self) -> None:
+        entry_id, entry = self.entries.popitem(last=False)
+        for band in entry.bands:
+            bucket = self.buckets[band]
+            bucket.discard(entry_id)
+            if not bucket:
+                del self.buckets[band]
+
+
+class DescriptionCache:
+    """Reuses evaluations of near-duplicate descriptions of the same word."""
+
+    def __init__(
+        self,
+        ngram: int = 3,
+        num_perm: int = 64,
+        bands: int = 32,
+        max_per_word: int = 200,
+        max_words: int = 500,
+        rng: random.Random | None = None,
+    ) -> None:
+        """Initialize an empty cache.
+
+        Args:
+            ngram: Characters per n-gram
+            num_perm: MinHash permutations; a multiple of bands
+            bands: LSH bands the signature is split into; more bands find
+                less similar candidates
+            max_per_word: Evaluations kept per (word, language)
+            max_words: (word, language) pairs kept
+            rng: Random source for sampling verifications
+        """
+        if num_perm % bands:
+            raise ValueError("num_perm must be a multiple of bands")
+        self.ngram = ngram
+        self.bands = bands
+        self.rows = num_perm // bands
+        self.max_per_word = max_per_word
+        self.max_words = max_words
+        # Fixed seed, so signatures mean the same thing in every process
+        permutations = random.Random(0)
+        self._permutations = [
+            (permutations.randrange(1, _PRIME), permutations.randrange(_PRIME))
+            for _ in range(num_perm)
+        ]
+        self._rng = rng or random.Random()
+        self._words: OrderedDict[tuple[str, str], _WordIndex] = OrderedDict()
+        self._next_id = 0
+        self._lock = threading.Lock()
+        self.counts: Counter[str] = Counter()
+        self.deviation_total = 0
+
+    @classmethod
+    def from_settings(cls) -> "DescriptionCache":
+        config = settings.DESCRIPTION_CACHE
+        return cls(
+            ngram=config["ngram"],
+            num_perm=config["num_perm"],
+            bands=config["bands"],
+            max_per_word=config["max_per_word"],
+            max_words=config["max_words"],
+        )
+
+    def _band_keys(
+        self,
+        grams: array,
+    ) -> tuple[int, ...]:
+        signature = [
+            min((a * x + b) % _PRIME for x in grams) for a, b in self._permutations
+        ]
+        return tuple(
+            hash((band, *signature[band * self.rows : (band + 1) * self.rows]))
+            for band in range(self.bands)
+        )
+
+    def _key(
+        self,
+        word: str,
+        language: str,
+    ) -> tuple[str, str]:
+        return normalize(word), language.lower()
+
+    def lookup(
+        self,
+        word: str,
+        language: str,
+        description: str,
+    ) -> tuple[int, str, float] | None:
+        """Find the evaluation of the most similar cached description.
+
+        Args:
+            word: The target word being described
+            language: ISO 639-1 language code
+            description: The player's description
+
+        Returns:
+            tuple | None: (score, feedback, similarity), or None if no cached
+                description with the same negations reaches the threshold
+        """
+        grams = shingles(description, self.ngram)
+        negated = negations(description)
+        bands = self._band_keys(grams)
+        threshold = settings.DESCRIPTION_CACHE["threshold"]
+        with self._lock:
+            index = self._words.get(self._key(word, language))
+            if index is None:
+                return None
+            best_id, best = None, 0.0
+            for entry_id in index.candidates(bands):
+                entry = index.entries[entry_id]
+                if entry.negations != negated:
+                    continue
+                similarity = jaccard(grams, entry.shingles)
+                if similarity > best:
+                    best_id, best = entry_id, similarity
+            if best_id is None or best < threshold:
+                return None
+            index.entries.move_to_end(best_id)
+            self._words.move_to_end(self._key(word, language))
+            entry = index.entries[best_id]
+            return entry.score, entry.feedback, best
+
+    def store(
+        self,
+        word: str,
+        language: str,
+        description: str,
+        score: int,
+        feedback: str,
+    ) -> None:
+        """Cache a description's evaluation.
+
+        Replaces the evaluation of a cached description similar enough to be
+        reused for it, rather than adding another.
+
+        Args:
+            word: The target word being described
+            language: ISO 639-1 language code
+            description: The player's description
+            score: Score from 0-100
+            feedback: Feedback on the description
+        """
+        grams = shingles(description, self.ngram)
+        negated = negations(description)
+        bands = self._band_keys(grams)
+        threshold = settings.DESCRIPTION_CACHE["threshold"]
+        key = self._key(word, language)
+        with self._lock:
+            index = self._words.get(key)
+            if index is None:
+                index = self._words[key] = _WordIndex()
+                while len(self._words) > self.max_words:
+                    self._words.popitem(last=False)
+            else:
+                self._words.move_to_end(key)
+            for entry_id in index.candidates(bands):
+                entry = index.entries[entry_id]
+                if (
+                    entry.negations == negated
+                    and jaccard(grams, entry.shingles) >= threshold
+                ):
+                    entry.score, entry.feedback = score, feedback
+                    index.entries.move_to_end(entry_id)
+                    return
+            self._next_id += 1
+            index.add(self._next_id, _Entry(grams, negated, bands, score, feedback))
+            while len(index.entries) > self.max_per_word:
+                index.evict_oldest()
+
+    def evaluate(
+        self,
+        word: str,
+        description: str,
+        language: str,
+        evaluate: Callable[[], tuple[int, str]],
+    ) -> tuple[int, str]:
+        """Evaluate a description, reusing a near-duplicate's evaluation.
+
+        Args:
+            word: The target word being described
+            description: The player's description
+            language: ISO 639-1 language code
+            evaluate: Evaluates the description with the LLM
+
+        Returns:
+            tuple: (score 0-100, feedback string)
+        """
+        config = settings.DESCRIPTION_CACHE
+        if not config["enabled"]:
+            return evaluate()
+
+        cached = self.lookup(word, language, description)
+        if cached is not None and self._rng.random() >= config["verify_rate"]:
+            self._count("hit")
+            return cached[0], cached[1]
+
+        score, feedback = evaluate()
+        if cached is None:
+            self._count("miss")
+        else:
+            deviation = abs(score - cached[0])
+            self._count("verified")
+            DESCRIPTION_CACHE_DEVIATION.observe(deviation)
+            with self._lock:
+                self.deviation_total += deviation
+        self.store(word, language, description, score, feedback)
+        return score, feedback
+
+    def _count(
+        self,
+        outcome: str,
+    ) -> None:
+        DESCRIPTION_CACHE.labels(outcome=outcome).inc()
+        with self._lock:
+            self.counts[outcome] += 1
+
+    def stats(self) -> dict[str, float]:
+        """Report this process's hit rate and mean sampled score deviation.
+
+        Returns:
+            dict: 'lookups', 'hit_rate' (hits and verified hits over lookups)
+                and 'mean_deviation' (points, over verified hits)
+        """
+        with self._lock:
+            hits = self.counts["hit"] + self.counts["verified"]
+            lookups = hits + self.counts["miss"]
+            verified = self.counts["verified"]
+            return {
+                "lookups": lookups,
+                "hit_rate": hits / lookups if lookups else 0.0,
+                "mean_deviation": (
+                    self.deviation_total / verified if verified else 0.0
+                ),
+            }
+
+    def clear(self) -> None:
+        """Forget every cached evaluation."""
+        with self._lock:
+            self._words.clear()
+
+
+description_cache = DescriptionCache.from_settings()
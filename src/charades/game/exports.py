@@ -0,0 +1,206 @@
+"""Streaming exports of game sessions for analysis.
+
+Sessions are read from every shard, through replicas where there are any,
+as plain tuples with `.iterator(chunk_size=...)`, encoded one row at a time
+and handed out in compressed or uncompressed blocks of about FLUSH_BYTES.
+Nothing holds more than a chunk of rows and a block of output, so memory use
+doesn't grow with the table. Both the `/exports/sessions` view and the
+`export_sessions` command are built on `stream_sessions`.
+
+Players are identified by id only, keeping phone numbers out of the dumps.
+"""
+
+import csv
+import io
+import json
+import zlib
+from collections.abc import Iterable
+from collections.abc import Iterator
+from collections.abc import Mapping
+from datetime import datetime
+from datetime import time
+from itertools import chain
+
+from django.conf import settings
+from django.db.models import QuerySet
+from django.utils import timezone
+from django.utils.dateparse import parse_date
+from django.utils.dateparse import parse_datetime
+
+from charades.game.models import GameSession
+from charades.game.replicas import REPLICA
+from charades.game.replicas import read_alias
+from charades.game.replicas import read_from
+from charades.game.sharding import shards
+
+FIELDS = [
+    "id",
+    "player_id",
+    "word",
+    "language",
+    "status",
+    "score",
+    "user_description",
+    "feedback",
+    "started_at",
+    "completed_at",
+]
+FORMATS = ("jsonl", "csv")
+STATUSES = [status for status, _ in GameSession.STATUS_CHOICES]
+FLUSH_BYTES = 64 * 1024
+
+
+def parse_moment(
+    value: str,
+) -> datetime:
+    """Parse an ISO 8601 date or datetime, dates meaning local midnight.
+
+    Raises:
+        ValueError: If the value is neither
+    """
+    moment = parse_datetime(value)
+    if moment is None:
+        day = parse_date(value)
+        if day is None:
+            raise ValueError(f"Not an ISO 8601 date or datetime: {value!r}")
+        moment = datetime.combine(day, time.min)
+    if timezone.is_naive(moment):
+        moment = timezone.make_aware(moment)
+    return moment
+
+
+def parse_filters(
+    params: Mapping[str, str],
+) -> dict:
+    """Turn export options into GameSession filters.
+
+    Args:
+        params: Any of 'since' and 'until' (ISO 8601 dates or datetimes,
+            bounding started_at, until exclusive), 'language' and 'status'
+
+    Returns:
+        dict: Keyword arguments for QuerySet.filter
+
+    Raises:
+        ValueError: If an option is invalid
+    """
+    filters = {}
+    if params.get("since"):
+        filters["started_at__gte"] = parse_moment(params["since"])
+    if params.get("until"):
+        filters["started_at__lt"] = parse_moment(params["until"])
+    if params.get("language"):
+        if params["language"].upper() not in settings.SUPPORTED_LANGUAGES:
+            raise ValueError(
+                "Language must be one of "
+                f"{', '.join(sorted(settings.SUPPORTED_LANGUAGES)).lower()}",
+            )
+        filters["language"] = params["language"].lower()
+    if params.get("status"):
+        if params["status"] not in STATUSES:
+            raise ValueError(f"Status must be one of {', '.join(STATUSES)}")
+        filters["status"] = params["status"]
+    return filters
+
+
+def session_querysets(
+    filters: dict,
+) -> list[QuerySet]:
+    """Build one queryset of session rows per shard, in id order.
+
+    Each queryset is pinned to its shard, or one of its replicas, up front,
+    so streaming them later doesn't depend on the routing context.
+    """
+    with read_from(REPLICA):
+        aliases = [read_alias(alias) for alias in shards()]
+    return [
+        GameSession.objects.using(alias)
+        .filter(**filters)
+        .order_by("pk")
+        .values_list(*FIELDS)
+        for alias in aliases
+    ]
+
+
+def _plain(
+    value: object,
+) -> object:
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return value
+
+
+def encode_jsonl(
+    rows: Iterable[tuple],
+) -> Iterator[str]:
+    """Encode rows as JSON objects, one per line."""
+    for row in rows:
+        record = dict(zip(FIELDS, map(_plain, row)))
+        yield f"{json.dumps(record, ensure_ascii=False)}\n"
+
+
+def encode_csv(
+    rows: Iterable[tuple],
+) -> Iterator[str]:
+    """Encode rows as CSV lines, after a header line."""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    for row in chain([FIELDS], rows):
+        writer.writerow(map(_plain, row))
+        yield buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
+
+
+def stream_sessions(
+    filters: dict,
+    format: str = "jsonl",
+    compress: bool = False,
+    chunk_size: int = 2000,
+) -> Iterator[bytes]:
+    """Stream matching game sessions as an export file.
+
+    Args:
+        filters: GameSession filters, see parse_filters
+        format: 'jsonl' or 'csv'
+        compress: Gzip the output
+        chunk_size: Rows per database round trip
+
+    Yields:
+        bytes: Consecutive blocks of the file
+    """
+    rows = chain.from_iterable(
+        queryset.iterator(chunk_size=chunk_size)
+        for queryset in session_querysets(filters)
+    )
+    lines = encode_csv(rows) if format == "csv" else encode_jsonl(rows)
+    # wbits=31 writes a gzip header and trailer around the deflate stream
+    compressor = zlib.compressobj(wbits=31) if compress else None
+
+    block: list[bytes] = []
+    size = 0
+    for line in lines:
+        data = line.encode()
+        block.append(data)
+        size += len(data)
+        if size >= FLUSH_BYTES:
+            data = b"".join(block)
+            block, size = [], 0
+            if compressor is None:
+                yield data
+            elif compressed := compressor.compress(data):
+                yield compressed
+    data = b"".join(block)
+    if compressor is not None:
+        data = compressor.compress(data) + compressor.flush()
+    if data:
+        yield data
+
+
+def export_filename(
+    format: str,
+    compress: bool,
+) -> str:
+    """Name for an export file made now."""
+    stamp = timezone.now().strftime("%Y%m%dT%H%M%SZ")
+    return f"sessions-{stamp}.{format}{'.gz' if compress else ''}"
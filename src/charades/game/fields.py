@@ -0,0 +1,124 @@
+"""Model fields storing short strings as small integer codes.
+
+Columns like a session's status or language repeat a handful of short
+strings over millions of rows. These fields keep them strings everywhere in
+Python, in model attributes, filters like `filter(status="active")`,
+`values_list()` and forms, while the database stores a 2-byte code, which
+makes rows and indexes on them smaller and comparisons cheaper.
+"""
+
+from abc import ABC
+from abc import abstractmethod
+from typing import Any
+
+from django.db import models
+
+
+class StringCodeField(models.SmallIntegerField, ABC):
+    """Base for string values stored as small integer codes."""
+
+    @abstractmethod
+    def encode(
+        self,
+        value: str,
+    ) -> int:
+        """Get the code stored for a value.
+
+        Raises:
+            ValueError: If the value has no code
+        """
+        pass
+
+    @abstractmethod
+    def decode(
+        self,
+        code: int,
+    ) -> str:
+        """Get the value a stored code stands for."""
+        pass
+
+    def from_db_value(
+        self,
+        value: int | None,
+        expression: Any,
+        connection: Any,
+    ) -> str | None:
+        return None if value is None else self.decode(value)
+
+    def to_python(
+        self,
+        value: Any,
+    ) -> str | None:
+        if value is None or isinstance(value, str):
+            return value
+        return self.decode(int(value))
+
+    def get_prep_value(
+        self,
+        value: Any,
+    ) -> int | None:
+        if isinstance(value, str):
+            return self.encode(value)
+        return super().get_prep_value(value)
+
+
+class ChoiceCodeField(StringCodeField):
+    """One of a fixed set of strings, coded by its position in `choices`.
+
+    Only ever append to the choices: codes are positions, starting at 1.
+    """
+
+    def __init__(
+        self,
+        *args,
+        choices: list[tuple[str, str]],
+        **kwargs,
+    ) -> None:
+        super().__init__(*args, choices=choices, **kwargs)
+        self._codes = {value: code for code, (value, _) in enumerate(choices, 1)}
+        self._values = {code: value for value, code in self._codes.items()}
+
+    def encode(
+        self,
+        value: str,
+    ) -> int:
+        try:
+            return self._codes[value]
+        except KeyError:
+            raise ValueError(
+                f"Field '{self.name}' expected one of {', '.join(self._codes)}"
+                f" but got {value!r}.",
+            ) from None
+
+    def decode(
+        self,
+        code: int,
+    ) -> str:
+        return self._values[code]
+
+
+class LanguageCodeField(StringCodeField):
+    """A lowercase ISO 639-1 code, coded arithmetically from its letters.
+
+    Every two-letter code has a code of its own (1 to 676), so supporting a
+    new language needs no migration.
+    """
+
+    def encode(
+        self,
+        value: str,
+    ) -> int:
+        value = value.lower()
+        if len(value) != 2 or not all("a" <= letter <= "z" for letter in value):
+            raise ValueError(
+                f"Field '{self.name}' expected a two-letter language code"
+                f" but got {value!r}.",
+            )
+        return (ord(value[0]) - ord("a")) * 26 + ord(value[1]) - ord("a") + 1
+
+    def decode(
+        self,
+        code: int,
+    ) -> str:
+        first, second = divmod(code - 1, 26)
+        return chr(ord("a") + first) + chr(ord("a") + second)
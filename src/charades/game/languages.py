@@ -0,0 +1,166 @@
+"""Recognize which language a player asked for, by text or by voice.
+
+Players pick a language by texting a code like "ES", or by saying or typing
+its name: "Spanish", "español", "Spanish please", "Korean." The matcher is
+built once from settings.SUPPORTED_LANGUAGES and shared by the SMS and voice
+paths. Matching tries, in order:
+
+1. The whole message as an ISO code, e.g. "es"
+2. The whole message as a language name, e.g. "spanish" or "español"
+3. Each word as a language name, e.g. "spanish please"
+4. Each word as a close misspelling or mishearing of a name, e.g. "spanich"
+
+Codes are only accepted on their own, since "it", "de" and "en" are also
+ordinary words. When words name more than one language the message is
+ambiguous and nothing matches.
+"""
+
+import difflib
+import re
+import unicodedata
+
+from django.conf import settings
+
+from charades.game.metrics import LANGUAGE_MATCHES
+
+# Names players use besides the English name in SUPPORTED_LANGUAGES: the name
+# in the language itself, common transliterations, and country names
+LANGUAGE_ALIASES: dict[str, list[str]] = {
+    "BN": ["বাংলা", "bangla", "bangladesh"],
+    "DE": ["deutsch", "germany"],
+    "EN": [],
+    "ES": ["español", "castellano", "spain", "mexico"],
+    "FA": ["فارسی", "farsi", "iran"],
+    "FR": ["français", "france"],
+    "IT": ["italiano", "italy"],
+    "JA": ["日本語", "nihongo", "japan"],
+    "KO": ["한국어", "hangugeo", "korea"],
+    "PT": ["português", "portugal", "brazil"],
+    "RU": ["русский", "russkiy", "russia"],
+    "ZH": ["中文", "普通话", "mandarin", "zhongwen", "china"],
+}
+
+# Words shorter than this are never fuzzy matched, to keep "it" or "in" from
+# being read as a language
+FUZZY_MIN_LENGTH = 4
+FUZZY_CUTOFF = 0.8
+
+_TOKEN = re.compile(r"\w+")
+
+
+def normalize(
+    text: str,
+) -> str:
+    """Casefold and strip accents, so 'Español' and 'espanol' compare equal.
+
+    Letters in other scripts, like CJK or Cyrillic, are kept.
+    """
+    decomposed = unicodedata.normalize("NFKD", text.casefold())
+    return "".join(c for c in decomposed if not unicodedata.combining(c))
+
+
+class LanguageMatcher:
+    """Index of language codes, names and aliases."""
+
+    def __init__(
+        self,
+        languages: dict[str, str],
+        aliases: dict[str, list[str]] | None = None,
+    ) -> None:
+        """Precompute the lookup tables.
+
+        Args:
+            languages: Language code to English name, e.g. {'ES': 'Spanish'}
+            aliases: Language code to other names for the language
+        """
+        aliases = aliases if aliases is not None else LANGUAGE_ALIASES
+        self.codes = {normalize(code): code for code in languages}
+        self.names: dict[str, str] = {}
+        for code, name in languages.items():
+            for alias in [name, *aliases.get(code, [])]:
+                self.names[normalize(alias)] = code
+        self._fuzzy_names = [
+            name for name in self.names if len(name) >= FUZZY_MIN_LENGTH
+        ]
+
+    def _match_tokens(
+        self,
+        tokens: list[str],
+        fuzzy: bool,
+    ) -> str | None:
+        found = set()
+        for token in tokens:
+            if token in self.names:
+                found.add(self.names[token])
+            elif fuzzy and len(token) >= FUZZY_MIN_LENGTH:
+                close = difflib.get_close_matches(
+                    token,
+                    self._fuzzy_names,
+                    n=1,
+                    cutoff=FUZZY_CUTOFF,
+                )
+                if close:
+                    found.add(self.names[close[0]])
+        return found.pop() if len(found) == 1 else None
+
+    def match_with_method(
+        self,
+        text: str,
+    ) -> tuple[str | None, str]:
+        """Find the language a message asks for, and how it was found.
+
+        Args:
+            text: SMS body or speech recognition result
+
+        Returns:
+            tuple: (language code or None, one of 'code', 'name', 'token',
+                'fuzzy' or 'none')
+        """
+        tokens = _TOKEN.findall(normalize(text))
+        if not tokens:
+            return None, "none"
+        phrase = " ".join(tokens)
+        if phrase in self.codes:
+            return self.codes[phrase], "code"
+        if phrase in self.names:
+            return self.names[phrase], "name"
+        if code := self._match_tokens(tokens, fuzzy=False):
+            return code, "token"
+        if code := self._match_tokens(tokens, fuzzy=True):
+            return code, "fuzzy"
+        return None, "none"
+
+    def match(
+        self,
+        text: str,
+    ) -> str | None:
+        """Find the language a message asks for.
+
+        Args:
+            text: SMS body or speech recognition result
+
+        Returns:
+            str | None: Uppercase language code, e.g. 'ES', or None
+        """
+        return self.match_with_method(text)[0]
+
+
+language_matcher = LanguageMatcher(settings.SUPPORTED_LANGUAGES)
+
+
+def match_language(
+    text: str,
+    channel: str,
+) -> str | None:
+    """Match a message to a supported language and count how it matched.
+
+    Args:
+        text: SMS body or speech recognition result
+        channel: 'sms' or 'voice', for metrics
+
+    Returns:
+        str | None: Uppercase language code, e.g. 'ES', or None
+    """
+    code, method = language_matcher.match_with_method(text)
+    LANGUAGE_MATCHES.labels(channel=channel, method=method).inc()
+    return code
@@ -0,0 +1,463 @@
+"""In-memory ranked leaderboards for the game module.
+
+Scores are held per (window, language) in indexable skip lists, so rank and
+top-k lookups cost O(log n) instead of an ORDER BY over aggregated scores.
+Each process builds its indexes from the database on first use (or in
+`warmup`), applies its own session completions incrementally, and rebuilds
+on a background thread every LEADERBOARD_REFRESH_SECONDS to pick up
+completions handled by other workers; lookups never wait for a rebuild.
+"""
+
+import logging
+import random
+import threading
+import time
+from datetime import date
+from datetime import datetime
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import close_old_connections
+from django.db.models import Sum
+from django.utils import timezone
+
+from charades.game.models import GameSession
+from charades.game.models import PlayerStats
+from charades.game.sharding import shards
+
+logger = logging.getLogger(__name__)
+
+ALL_TIME = "all"
+THIS_WEEK = "week"
+WINDOWS = (ALL_TIME, THIS_WEEK)
+
+# Language key for rankings across all languages, matching PlayerStats
+ALL_LANGUAGES = PlayerStats.ALL_LANGUAGES
+
+
+class _Node:
+    __slots__ = ("key", "next", "width")
+
+    def __init__(
+        self,
+        key: tuple[int, int],
+        levels: int,
+    ) -> None:
+        self.key = key
+        self.next: list[_Node | None] = [None] * levels
+        # Number of level-0 steps each link skips over
+        self.width = [1] * levels
+
+
+class RankedIndex:
+    """Indexable skip list of player points ordered best-first.
+
+    Entries are keyed by (-points, player_id) so iteration yields the highest
+    scores first with ties broken by player id.
+    """
+
+    MAX_LEVELS = 24
+
+    def __init__(self) -> None:
+        # The head's key is never compared, only the keys of nodes after it
+        self._head = _Node((0, 0), self.MAX_LEVELS)
+        self._points: dict[int, int] = {}
+
+    def __len__(self) -> int:
+        return len(self._points)
+
+    def _find_chain(
+        self,
+        key: tuple[int, int],
+    ) -> tuple[list[_Node], list[int]]:
+        """Find the rightmost node before key on each level.
+
+        Returns:
+            tuple: (predecessor per level, level-0 steps taken on each level)
+        """
+        chain: list[_Node] = [self._head] * self.MAX_LEVELS
+        steps = [0] * self.MAX_LEVELS
+        node = self._head
+        for level in reversed(range(self.MAX_LEVELS)):
+            while (nxt := node.next[level]) is not None and nxt.key < key:
+                steps[level] += node.width[level]
+                node = nxt
+            chain[level] = node
+        return chain, steps
+
+    def _insert(
+        self,
+        key: tuple[int, int],
+    ) -> None:
+        chain, steps_at_level = self._find_chain(key)
+        levels = 1
+        while levels < self.MAX_LEVELS and random.random() < 0.5:
+            levels += 1
+
+        node = _Node(key, levels)
+        steps = 0
+        for level in range(levels):
+            prev = chain[level]
+            node.next[level] = prev.next[level]
+            prev.next[level] = node
+            node.width[level] = prev.width[level] - steps
+            prev.width[level] = steps + 1
+            steps += steps_at_level[level]
+        for level in range(levels, self.MAX_LEVELS):
+            chain[level].width[level] += 1
+
+    def _remove(
+        self,
+        key: tuple[int, int],
+    ) -> None:
+        chain, _ = self._find_chain(key)
+        node = chain[0].next[0]
+        if node is None or node.key != key:
+            raise KeyError(key)
+
+        for level in range(len(node.next)):
+            prev = chain[level]
+            prev.width[level] += node.width[level] - 1
+            prev.next[level] = node.next[level]
+        for level in range(len(node.next), self.MAX_LEVELS):
+            chain[level].width[level] -= 1
+
+    def set(
+        self,
+        player_id: int,
+        points: int,
+    ) -> None:
+        """Set a player's points, replacing any previous entry."""
+        previous = self._points.get(player_id)
+        if previous == points:
+            return
+        if previous is not None:
+            self._remove((-previous, player_id))
+        self._insert((-points, player_id))
+        self._points[player_id] = points
+
+    def add(
+        self,
+        player_id: int,
+        points: int,
+    ) -> None:
+        """Add points to a player's current total."""
+        self.set(player_id, self._points.get(player_id, 0) + points)
+
+    def points(
+        self,
+        player_id: int,
+    ) -> int | None:
+        """Get a player's points, or None if they are not ranked."""
+        return self._points.get(player_id)
+
+    def rank(
+        self,
+        player_id: int,
+    ) -> int | None:
+        """Get a player's 1-based rank, with tied players sharing a rank.
+
+        Returns:
+            int | None: Rank, or None if the player is not ranked
+        """
+        points = self._points.get(player_id)
+        if points is None:
+            return None
+        # Player ids are positive, so this sorts before every tied entry
+        _, steps = self._find_chain((-points, -1))
+        return sum(steps) + 1
+
+    def top(
+        self,
+        limit: int,
+    ) -> list[tuple[int, int]]:
+        """Get the highest ranked players.
+
+        Args:
+            limit: Maximum number of entries to return
+
+        Returns:
+            list: (player_id, points) pairs, best first
+        """
+        entries: list[tuple[int, int]] = []
+        node = self._head.next[0]
+        while node is not None and len(entries) < limit:
+            negative_points, player_id = node.key
+            entries.append((player_id, -negative_points))
+            node = node.next[0]
+        return entries
+
+
+def week_start(
+    day: date,
+) -> date:
+    """Get the Monday starting the week containing day."""
+    return day - timedelta(days=day.weekday())
+
+
+class Leaderboard:
+    """Per-process leaderboards by time window and language."""
+
+    # Sessions completed this long before a rebuild starts may still be
+    # committing, so the rebuild remembers them to skip their late records
+    RECORD_MARGIN = timedelta(minutes=5)
+
+    def __init__(
+        self,
+        refresh_seconds: float,
+    ) -> None:
+        """Initialize an empty leaderboard.
+
+        Args:
+            refresh_seconds: Maximum age of the indexes before a rebuild
+        """
+        self.refresh_seconds = refresh_seconds
+        self._lock = threading.RLock()
+        # Held for a whole rebuild, so two never overlap
+        self._rebuild_lock = threading.Lock()
+        self._indexes: dict[tuple[str, str], RankedIndex] = {}
+        self._built_at: float | None = None
+        self._week_start: date | None = None
+        # Ids of sessions already counted, so recording one again does nothing
+        self._recorded: set[int] = set()
+        # Sessions recorded while a rebuild runs, replayed onto its indexes
+        self._pending: list[tuple[int, int, str, int, datetime]] | None = None
+        self._thread: threading.Thread | None = None
+
+    def _index(
+        self,
+        window: str,
+        language: str,
+    ) -> RankedIndex:
+        key = (window, language)
+        if key not in self._indexes:
+            self._indexes[key] = RankedIndex()
+        return self._indexes[key]
+
+    def rebuild(self) -> None:
+        """Rebuild every index from the database.
+
+        The new indexes are built without holding the lock, so rank and top
+        lookups keep being served from the old ones meanwhile. Sessions
+        recorded during the build are replayed onto the new indexes unless
+        the build already read them.
+        """
+        with self._rebuild_lock:
+            self._rebuild()
+
+    def _rebuild(self) -> None:
+        started_at = timezone.now()
+        current_week = week_start(timezone.localdate(started_at))
+        week_started_at = timezone.make_aware(
+            datetime.combine(current_week, datetime.min.time()),
+        )
+        with self._lock:
+            self._pending = []
+        indexes: dict[tuple[str, str], RankedIndex] = {}
+        counted: set[int] = set()
+        try:
+            for using in shards():
+                self._load(indexes, using, week_started_at)
+            # Read after the scores: a session committing in between is
+            # skipped until the next rebuild rather than counted twice
+            for using in shards():
+                counted.update(
+                    GameSession.objects.using(using)
+                    .filter(completed_at__gte=started_at - self.RECORD_MARGIN)
+                    .values_list("id", flat=True),
+                )
+        except BaseException:
+            with self._lock:
+                self._pending = None
+            raise
+
+        with self._lock:
+            pending, self._pending = self._pending or [], None
+            self._indexes = indexes
+            self._recorded = counted
+            self._week_start = current_week
+            self._built_at = time.monotonic()
+            for record in pending:
+                self._apply(*record)
+
+    def _load(
+        self,
+        indexes: dict[tuple[str, str], RankedIndex],
+        using: str,
+        week_started_at: datetime,
+    ) -> None:
+        """Add one shard's players to the indexes."""
+
+        def index(
+            window: str,
+            language: str,
+        ) -> RankedIndex:
+            return indexes.setdefault((window, language), RankedIndex())
+
+        # All-time points are already aggregated per language in PlayerStats
+        for player_id, language, total_score in (
+            PlayerStats.objects.using(using)
+            .filter(games_played__gt=0)
+            .values_list("player_id", "language", "total_score")
+        ):
+            index(ALL_TIME, language).set(player_id, total_score)
+
+        for row in (
+            GameSession.objects.using(using)
+            .filter(
+                status="completed",
+                score__isnull=False,
+                completed_at__gte=week_started_at,
+            )
+            .values("player_id", "language")
+            .annotate(points=Sum("score"))
+        ):
+            player_id = row["player_id"]
+            index(THIS_WEEK, row["language"].lower()).set(
+                player_id,
+                row["points"],
+            )
+            index(THIS_WEEK, ALL_LANGUAGES).add(player_id, row["points"])
+
+    def _ensure_fresh(self) -> None:
+        """Build on first use, and refresh stale indexes in the background."""
+        if self._built_at is None:
+            with self._rebuild_lock:
+                # Unless another request built them while this one waited
+                if self._built_at is None:
+                    self._rebuild()
+            return
+
+        current_week = week_start(timezone.localdate())
+        with self._lock:
+            if self._week_start != current_week:
+                # A new week starts empty; the refresh adds other workers' games
+                for key in [key for key in self._indexes if key[0] == THIS_WEEK]:
+                    del self._indexes[key]
+                self._week_start = current_week
+                self._built_at = 0.0
+            if time.monotonic() - (self._built_at or 0.0) < self.refresh_seconds:
+                return
+            if self._thread is not None and self._thread.is_alive():
+                return
+            self._thread = threading.Thread(
+                target=self._refresh,
+                name="leaderboard-refresh",
+                daemon=True,
+            )
+            self._thread.start()
+
+    def _refresh(self) -> None:
+        try:
+            self.rebuild()
+        except Exception as e:
+            logger.error(f"Failed to refresh the leaderboard: {e}")
+        finally:
+            close_old_connections()
+
+    def _apply(
+        self,
+        session_id: int,
+        player_id: int,
+        language: str,
+        score: int,
+        completed_at: datetime,
+    ) -> None:
+        if session_id in self._recorded:
+            return
+        self._recorded.add(session_id)
+        windows = [ALL_TIME]
+        if week_start(timezone.localdate(completed_at)) == self._week_start:
+            windows.append(THIS_WEEK)
+        for window in windows:
+            for key in (ALL_LANGUAGES, language.lower()):
+                self._index(window, key).add(player_id, score)
+
+    def record(
+        self,
+        session_id: int,
+        player_id: int,
+        language: str,
+        score: int,
+        completed_at: datetime,
+    ) -> None:
+        """Apply a completed game to the indexes.
+
+        Does nothing before the first build, since the build will read the
+        completed game from the database, and for a game already counted.
+
+        Args:
+            session_id: Id of the completed GameSession
+            player_id: Id of the player who completed the game
+            language: ISO 639-1 language code of the game
+            score: Score from 0-100 for the game
+            completed_at: When the game was completed
+        """
+        record = (session_id, player_id, language, score, completed_at)
+        with self._lock:
+            if self._built_at is None:
+                return
+            if self._pending is not None:
+                self._pending.append(record)
+            self._apply(*record)
+
+    def record_session(
+        self,
+        session: GameSession,
+    ) -> None:
+        """Apply a completed GameSession to the indexes."""
+        if session.score is None or session.completed_at is None:
+            return
+        self.record(
+            session_id=session.pk,
+            player_id=session.player_id,  # type: ignore[attr-defined]
+            language=session.language,
+            score=session.score,
+            completed_at=session.completed_at,
+        )
+
+    def rank(
+        self,
+        player_id: int,
+        window: str = ALL_TIME,
+        language: str = ALL_LANGUAGES,
+    ) -> tuple[int | None, int, int | None]:
+        """Get a player's standing on a leaderboard.
+
+        Args:
+            player_id: Id of the player
+            window: Time window, one of WINDOWS
+            language: ISO 639-1 language code, or ALL_LANGUAGES
+
+        Returns:
+            tuple: (rank or None, number of ranked players, points or None)
+        """
+        self._ensure_fresh()
+        with self._lock:
+            index = self._index(window, language.lower())
+            return index.rank(player_id), len(index), index.points(player_id)
+
+    def top(
+        self,
+        limit: int,
+        window: str = ALL_TIME,
+        language: str = ALL_LANGUAGES,
+    ) -> list[tuple[int, int]]:
+        """Get the highest ranked players on a leaderboard.
+
+        Args:
+            limit: Maximum number of entries to return
+            window: Time window, one of WINDOWS
+            language: ISO 639-1 language code, or ALL_LANGUAGES
+
+        Returns:
+            list: (player_id, points) pairs, best first
+        """
+        self._ensure_fresh()
+        with self._lock:
+            return self._index(window, language.lower()).top(limit)
+
+
+leaderboard = Leaderboard(
+    refresh_seconds=settings.LEADERBOARD_REFRESH_SECONDS,
+)
@@ -1,11 +1,30 @@
 """Game logic for handling user interactions."""
 
+from collections.abc import Callable
+
 from django.conf import settings
 from django.db import transaction
+from django.utils import timezone
 
+from charades.game.ai import ledger
 from charades.game.ai_utils import evaluate_description
 from charades.game.ai_utils import get_random_word
+from charades.game.challenges import challenge_rank
+from charades.game.challenges import challenge_top
+from charades.game.challenges import challenge_word
+from charades.game.challenges import played_challenge
+from charades.game.leaderboard import ALL_LANGUAGES
+from charades.game.leaderboard import ALL_TIME
+from charades.game.leaderboard import THIS_WEEK
+from charades.game.leaderboard import leaderboard
+from charades.game.languages import match_language
+from charades.game.metrics import COMMANDS
 from charades.game.models import Player
+from charades.game.models import PlayerStats
+from charades.game.prefetch import prefetcher
+from charades.game.sharding import database_for
+from charades.game.sharding import shard_for
+from charades.game.sharding import shards
 from charades.game.utils import create_twiml_response
 from charades.game.utils import MESSAGES
 
@@ -22,7 +41,7 @@ def handle_opt_in(
         dict with twiml and code for response
     """
     try:
-        with transaction.atomic():
+        with transaction.atomic(using=shard_for(phone_number)):
             player, created = Player.get_or_create_player(phone_number)
 
             if not created and player.is_active:
@@ -58,7 +77,7 @@ def handle_opt_out(
         dict with twiml and code for response
     """
     try:
-        with transaction.atomic():
+        with transaction.atomic(using=shard_for(phone_number)):
             player, _ = Player.get_or_create_player(phone_number)
 
             # End any active game sessions
@@ -87,7 +106,7 @@ def handle_game_message(
     This function:
     1. Checks if player has an active game session
     2. If yes, treats message as a word description
-    3. If no, checks if message is a valid language code
+    3. If no, checks if message names a language, e.g. 'es' or 'Spanish'
     4. If neither, provides guidance on how to play
 
     Args:
@@ -103,13 +122,16 @@ def handle_game_message(
 
         if active_session:
             # Player has active game - treat message as word description
+            COMMANDS.labels(command="description").inc()
             return handle_word_description(player, message)
 
-        # No active game - check if message is a language code
-        if len(message) == 2 and message.upper() in settings.SUPPORTED_LANGUAGES:
-            return handle_language_selection(player, message)
+        # No active game - check if message names a language
+        if language_code := match_language(message, channel="sms"):
+            COMMANDS.labels(command="language").inc()
+            return handle_language_selection(player, language_code)
 
         # Neither - provide guidance
+        COMMANDS.labels(command="unrecognized").inc()
         return {
             "twiml": create_twiml_response(MESSAGES["how_to_play"]),
             "code": 200,
@@ -136,18 +158,25 @@ def handle_language_selection(
         dict with twiml and code for response
     """
     try:
-        with transaction.atomic():
+        # Outside the transaction, as it may wait for a prefetch in progress
+        prefetched = prefetcher.take(player.pk, language_code)
+
+        # Captured LLM calls are submitted after the transaction commits
+        using = database_for(player)
+        with ledger.capture() as llm_calls, transaction.atomic(using=using):
             # End any existing active sessions
             player.end_active_sessions()
 
-            # Get a random word in the selected language
-            word = get_random_word(language_code)
+            # Use the word prefetched for the player, or get a random one
+            word = prefetched or get_random_word(language_code)
 
             # Create new game session
-            _ = player.gamesession_set.create(
+            session = player.gamesession_set.create(
                 word=word,
                 language=language_code.lower(),
             )
+            llm_calls.session_id = session.pk
+            llm_calls.database = session._state.db
 
             return {
                 "twiml": create_twiml_response(
@@ -165,21 +194,138 @@ def handle_language_selection(
         }
 
 
+def handle_challenge(
+    player: Player,
+    language_code: str,
+) -> dict:
+    """Start today's daily challenge in a language.
+
+    Every player gets the same word, and one attempt per language per day.
+
+    Args:
+        player: The Player instance
+        language_code: Two-letter ISO 639-1 language code (e.g. 'EN', 'KO')
+
+    Returns:
+        dict with twiml and code for response
+    """
+    try:
+        language = settings.SUPPORTED_LANGUAGES[language_code.upper()]
+        played = played_challenge(player, language_code)
+        if played is not None and played.status == "completed":
+            rank, total = challenge_rank(played)
+            return {
+                "twiml": create_twiml_response(
+                    MESSAGES["challenge_played"].format(
+                        language=language,
+                        score=played.score,
+                        rank=rank,
+                        total=total,
+                    ),
+                ),
+                "code": 200,
+            }
+        if played is not None and played.status != "active":
+            return {
+                "twiml": create_twiml_response(
+                    MESSAGES["challenge_forfeited"].format(language=language),
+                ),
+                "code": 200,
+            }
+
+        if played is None:
+            # The shared word, generated at most once, outside the transaction
+            word = challenge_word(language_code)
+            with transaction.atomic(using=database_for(player)):
+                player.end_active_sessions()
+                player.gamesession_set.create(
+                    word=word,
+                    language=language_code.lower(),
+                    challenge_on=timezone.localdate(),
+                )
+        else:
+            word = played.word
+        return {
+            "twiml": create_twiml_response(
+                MESSAGES["challenge_new_game"].format(
+                    language=language,
+                    word=word,
+                    code=language_code.upper(),
+                ),
+            ),
+            "code": 200,
+        }
+    except Exception as e:
+        return {
+            "twiml": create_twiml_response(f"Failed to start challenge: {str(e)}"),
+            "code": 400,
+        }
+
+
+def handle_challenge_top(
+    language_code: str,
+) -> dict:
+    """Report the best submissions to today's challenge in a language.
+
+    Args:
+        language_code: Two-letter ISO 639-1 language code (e.g. 'EN', 'KO')
+
+    Returns:
+        dict with twiml and code for response
+    """
+    try:
+        language = settings.SUPPORTED_LANGUAGES[language_code.upper()]
+        entries = challenge_top(language_code, settings.LEADERBOARD_TOP_SIZE)
+        if not entries:
+            return {
+                "twiml": create_twiml_response(
+                    MESSAGES["challenge_top_empty"].format(
+                        language=language,
+                        code=language_code.upper(),
+                    ),
+                ),
+                "code": 200,
+            }
+        lines = "".join(
+            MESSAGES["challenge_top_line"].format(
+                rank=position,
+                player=mask_phone_number(phone_number),
+                score=score,
+            )
+            for position, (phone_number, score) in enumerate(entries, start=1)
+        )
+        return {
+            "twiml": create_twiml_response(
+                MESSAGES["challenge_top"].format(language=language, lines=lines),
+            ),
+            "code": 200,
+        }
+    except Exception as e:
+        return {
+            "twiml": create_twiml_response(f"Failed to load challenge: {str(e)}"),
+            "code": 400,
+        }
+
+
 def handle_word_description(
     player: Player,
     description: str,
+    should_complete: Callable[[], bool] | None = None,
 ) -> dict:
     """Handle a player's attempt to describe their word.
 
     Args:
         player: The Player instance
         description: The player's description of their word
+        should_complete: Called once the description is scored; if it
+            returns False the game is left active and the score discarded
 
     Returns:
         dict with twiml and code for response
     """
     try:
-        with transaction.atomic():
+        using = database_for(player)
+        with ledger.capture() as llm_calls, transaction.atomic(using=using):
             # Get active session
             session = player.gamesession_set.filter(status="active").first()
             if not session:
@@ -187,6 +333,8 @@ def handle_word_description(
                     "twiml": create_twiml_response(MESSAGES["no_active_game"]),
                     "code": 200,
                 }
+            llm_calls.session_id = session.pk
+            llm_calls.database = session._state.db
 
             # Evaluate description using OpenAI
             score, feedback = evaluate_description(
@@ -195,25 +343,267 @@ def handle_word_description(
                 language=session.language,
             )
 
+            if should_complete is not None and not should_complete():
+                return {
+                    "twiml": create_twiml_response(MESSAGES["description_discarded"]),
+                    "code": 409,
+                }
+
             # Complete the session with score
             session.complete(
                 score=score,
                 description=description,
                 feedback=feedback,
             )
+            transaction.on_commit(
+                lambda: leaderboard.record_session(session),
+                using=using,
+            )
+            # Players usually go again straight away; have their next word ready
+            transaction.on_commit(
+                lambda: prefetcher.prefetch(
+                    player.phone_number,
+                    player_id=player.pk,
+                ),
+                using=using,
+            )
 
+            message = MESSAGES["game_complete"].format(
+                score=score,
+                feedback=feedback,
+            )
+            if session.challenge_on is not None:
+                rank, total = challenge_rank(session)
+                message += MESSAGES["challenge_rank"].format(
+                    language=settings.SUPPORTED_LANGUAGES[session.language.upper()],
+                    rank=rank,
+                    total=total,
+                )
+            return {
+                "twiml": create_twiml_response(message),
+                "code": 200,
+            }
+    except Exception as e:
+        return {
+            "twiml": create_twiml_response(f"Failed to evaluate description: {str(e)}"),
+            "code": 400,
+        }
+
+
+def handle_stats(
+    player: Player,
+) -> dict:
+    """Report a player's aggregate stats.
+
+    Reads only the PlayerStats rows for the player, never session history.
+
+    Args:
+        player: The Player instance
+
+    Returns:
+        dict with twiml and code for response
+    """
+    try:
+        rows = {
+            stats.language: stats
+            for stats in PlayerStats.objects.using(database_for(player))
+            .filter(player=player)
+            .order_by(
+                "-games_played",
+                "language",
+            )
+        }
+        totals = rows.pop(PlayerStats.ALL_LANGUAGES, None)
+        if totals is None or not totals.games_played:
+            return {
+                "twiml": create_twiml_response(MESSAGES["no_stats"]),
+                "code": 200,
+            }
+
+        languages = "".join(
+            MESSAGES["stats_language"].format(
+                language=settings.SUPPORTED_LANGUAGES.get(
+                    stats.language.upper(),
+                    stats.language.upper(),
+                ),
+                games_played=stats.games_played,
+                mean_score=stats.mean_score,
+            )
+            for stats in rows.values()
+        )
+        return {
+            "twiml": create_twiml_response(
+                MESSAGES["stats"].format(
+                    games_played=totals.games_played,
+                    mean_score=totals.mean_score,
+                    best_score=totals.best_score,
+                    current_streak=totals.streak_on(timezone.localdate()),
+                    best_streak=totals.best_streak,
+                    languages=languages,
+                ),
+            ),
+            "code": 200,
+        }
+    except Exception as e:
+        return {
+            "twiml": create_twiml_response(f"Failed to load stats: {str(e)}"),
+            "code": 400,
+        }
+
+
+LEADERBOARD_WINDOW_NAMES = {
+    ALL_TIME: "All-time",
+    THIS_WEEK: "This week",
+}
+
+
+def parse_leaderboard_filters(
+    args: list[str],
+) -> tuple[str, str | None] | None:
+    """Parse the optional arguments of the RANK and TOP commands.
+
+    Args:
+        args: Words following the command, e.g. ['es', 'week']
+
+    Returns:
+        tuple | None: (language, window or None if not given), or None if
+            args are not filters
+    """
+    language = ALL_LANGUAGES
+    window = None
+    for arg in args:
+        if arg == THIS_WEEK:
+            window = THIS_WEEK
+        elif arg.upper() in settings.SUPPORTED_LANGUAGES:
+            language = arg.lower()
+        else:
+            return None
+    return language, window
+
+
+def leaderboard_scope(
+    language: str,
+    window: str = ALL_TIME,
+) -> str:
+    """Describe which leaderboard is shown, e.g. ' in Spanish this week'."""
+    scope = ""
+    if language:
+        scope += f" in {settings.SUPPORTED_LANGUAGES[language.upper()]}"
+    if window == THIS_WEEK:
+        scope += " this week"
+    return scope
+
+
+def mask_phone_number(
+    phone_number: str,
+) -> str:
+    """Hide all but the last four digits of a phone number."""
+    return f"***{phone_number[-4:]}"
+
+
+def handle_rank(
+    player: Player,
+    language: str,
+    window: str | None = None,
+) -> dict:
+    """Report a player's leaderboard rank, all-time and weekly by default.
+
+    Args:
+        player: The Player instance
+        language: ISO 639-1 language code, or ALL_LANGUAGES
+        window: Only report this time window, or both if None
+
+    Returns:
+        dict with twiml and code for response
+    """
+    try:
+        lines = ""
+        for window in (window,) if window else (ALL_TIME, THIS_WEEK):
+            rank, total, points = leaderboard.rank(
+                player.pk,
+                window=window,
+                language=language,
+            )
+            if rank is None:
+                lines += MESSAGES["rank_unranked"].format(
+                    window=LEADERBOARD_WINDOW_NAMES[window],
+                )
+            else:
+                lines += MESSAGES["rank_line"].format(
+                    window=LEADERBOARD_WINDOW_NAMES[window],
+                    rank=rank,
+                    total=total,
+                    points=points,
+                )
+        return {
+            "twiml": create_twiml_response(
+                MESSAGES["rank"].format(
+                    scope=leaderboard_scope(language),
+                    lines=lines,
+                ),
+            ),
+            "code": 200,
+        }
+    except Exception as e:
+        return {
+            "twiml": create_twiml_response(f"Failed to load rank: {str(e)}"),
+            "code": 400,
+        }
+
+
+def handle_top(
+    language: str,
+    window: str,
+) -> dict:
+    """Report the top players on a leaderboard.
+
+    Args:
+        language: ISO 639-1 language code, or ALL_LANGUAGES
+        window: Leaderboard time window
+
+    Returns:
+        dict with twiml and code for response
+    """
+    try:
+        scope = leaderboard_scope(language, window)
+        entries = leaderboard.top(
+            settings.LEADERBOARD_TOP_SIZE,
+            window=window,
+            language=language,
+        )
+        if not entries:
             return {
                 "twiml": create_twiml_response(
-                    MESSAGES["game_complete"].format(
-                        score=score,
-                        feedback=feedback,
-                    ),
+                    MESSAGES["top_empty"].format(scope=scope),
                 ),
                 "code": 200,
             }
+
+        # Players may be on any shard
+        phone_numbers = {}
+        for using in shards():
+            phone_numbers.update(
+                Player.objects.using(using)
+                .filter(pk__in=[player_id for player_id, _ in entries])
+                .values_list("pk", "phone_number"),
+            )
+        lines = "".join(
+            MESSAGES["top_line"].format(
+                rank=position,
+                player=mask_phone_number(phone_numbers.get(player_id, "")),
+                points=points,
+            )
+            for position, (player_id, points) in enumerate(entries, start=1)
+        )
+        return {
+            "twiml": create_twiml_response(
+                MESSAGES["top"].format(scope=scope, lines=lines),
+            ),
+            "code": 200,
+        }
     except Exception as e:
         return {
-            "twiml": create_twiml_response(f"Failed to evaluate description: {str(e)}"),
+            "twiml": create_twiml_response(f"Failed to load leaderboard: {str(e)}"),
             "code": 400,
         }
 
@@ -229,7 +619,8 @@ def handle_player_command(
     2. For other commands:
         a. Gets or creates player
         b. Verifies player is opted in
-        c. Routes to game message handler
+        c. Handles the STATS, RANK, TOP and DAILY commands
+        d. Routes to game message handler
 
     Args:
         phone_number: The player's phone number in E.164 format
@@ -243,8 +634,10 @@ def handle_player_command(
 
     # Handle opt-in/opt-out first
     if command == "langgang":
+        COMMANDS.labels(command="opt_in").inc()
         return handle_opt_in(phone_number)
     elif command == "optout":
+        COMMANDS.labels(command="opt_out").inc()
         return handle_opt_out(phone_number)
 
     # Get or create player for other commands
@@ -252,10 +645,38 @@ def handle_player_command(
 
     # Check if player is opted in
     if not player.is_active:
+        COMMANDS.labels(command="not_opted_in").inc()
         return {
             "twiml": create_twiml_response(MESSAGES["not_opted_in"]),
             "code": 200,
         }
 
+    match command.split():
+        case ["stats"]:
+            COMMANDS.labels(command="stats").inc()
+            return handle_stats(player)
+        case ["rank", *args] if filters := parse_leaderboard_filters(args):
+            COMMANDS.labels(command="rank").inc()
+            return handle_rank(player, language=filters[0], window=filters[1])
+        case ["top", *args] if filters := parse_leaderboard_filters(args):
+            COMMANDS.labels(command="top").inc()
+            return handle_top(language=filters[0], window=filters[1] or ALL_TIME)
+        case ["daily", "top", code] if code.upper() in settings.SUPPORTED_LANGUAGES:
+            COMMANDS.labels(command="challenge_top").inc()
+            return handle_challenge_top(code)
+        case ["daily", code] if code.upper() in settings.SUPPORTED_LANGUAGES:
+            COMMANDS.labels(command="challenge").inc()
+            return handle_challenge(player, code)
+        case ["daily", *_] if not player.gamesession_set.filter(
+            status="active",
+        ).exists():
+            # During a game, anything else starting with "daily" is a
+            # description, like "daily newspaper you read"
+            COMMANDS.labels(command="unrecognized").inc()
+            return {
+                "twiml": create_twiml_response(MESSAGES["challenge_how_to"]),
+                "code": 200,
+            }
+
     # Handle the game message
     return handle_game_message(player, command)
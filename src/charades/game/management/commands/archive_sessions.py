@@ -0,0 +1,70 @@
+"""Management command to move old finished sessions to the archive."""
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.core.management.base import CommandError
+from django.core.management.base import CommandParser
+
+from charades.game.archive import session_archive
+
+
+class Command(BaseCommand):
+    help = (
+        "Move completed and timed out sessions older than a number of days"
+        " into compressed, date-partitioned archive files."
+    )
+
+    def add_arguments(
+        self,
+        parser: CommandParser,
+    ) -> None:
+        parser.add_argument(
+            "--days",
+            type=int,
+            default=settings.SESSION_ARCHIVE["after_days"],
+            help="Archive sessions started more than this many days ago",
+        )
+        parser.add_argument(
+            "--chunk-size",
+            type=int,
+            default=settings.SESSION_ARCHIVE["chunk_size"],
+            help="Sessions copied, then deleted, per transaction",
+        )
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Only report how many sessions would be archived",
+        )
+        parser.add_argument(
+            "--verify",
+            action="store_true",
+            help="Check archived files against the manifest instead",
+        )
+
+    def handle(
+        self,
+        *args,
+        **options,
+    ) -> None:
+        archive = session_archive()
+        if options["verify"]:
+            bad = archive.verify()
+            for file in bad:
+                self.stderr.write(f"Missing or corrupt: {file}")
+            if bad:
+                raise CommandError(f"{len(bad)} archive files failed verification")
+            self.stdout.write(self.style.SUCCESS("All archive files verified"))
+            return
+
+        try:
+            archived = archive.archive(
+                after_days=options["days"],
+                chunk_size=options["chunk_size"],
+                dry_run=options["dry_run"],
+            )
+        except ValueError as e:
+            raise CommandError(str(e)) from e
+        verb = "Would archive" if options["dry_run"] else "Archived"
+        self.stdout.write(
+            self.style.SUCCESS(f"{verb} {archived} sessions to {archive.directory}"),
+        )
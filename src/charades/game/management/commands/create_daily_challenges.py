@@ -0,0 +1,44 @@
+"""Management command to generate a day's challenge words ahead of time."""
+
+from datetime import date
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.core.management.base import CommandParser
+from django.utils import timezone
+
+from charades.game.challenges import challenge_word
+
+
+class Command(BaseCommand):
+    help = (
+        "Generate the daily challenge word for every supported language, so"
+        " the first players of the day don't wait for it. Run it shortly"
+        " after midnight, or with --day for a day ahead."
+    )
+
+    def add_arguments(
+        self,
+        parser: CommandParser,
+    ) -> None:
+        parser.add_argument(
+            "--day",
+            type=date.fromisoformat,
+            default=None,
+            help="Local date to generate words for, YYYY-MM-DD (default today)",
+        )
+
+    def handle(
+        self,
+        *args,
+        **options,
+    ) -> None:
+        day = options["day"] or timezone.localdate()
+        for language_code, language in settings.SUPPORTED_LANGUAGES.items():
+            word = challenge_word(language_code, day=day)
+            self.stdout.write(f"{day} {language}: {word}")
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"{len(settings.SUPPORTED_LANGUAGES)} challenges ready for {day}",
+            ),
+        )
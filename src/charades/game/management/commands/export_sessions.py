@@ -0,0 +1,77 @@
+"""Management command to dump game sessions for analysis."""
+
+import sys
+
+from django.core.management.base import BaseCommand
+from django.core.management.base import CommandError
+from django.core.management.base import CommandParser
+
+from charades.game.exports import FORMATS
+from charades.game.exports import STATUSES
+from charades.game.exports import parse_filters
+from charades.game.exports import stream_sessions
+
+
+class Command(BaseCommand):
+    help = "Stream game sessions to a JSONL or CSV file, in constant memory."
+
+    def add_arguments(
+        self,
+        parser: CommandParser,
+    ) -> None:
+        parser.add_argument(
+            "--output",
+            default="-",
+            help="File to write, or - for standard output (the default)",
+        )
+        parser.add_argument("--format", choices=FORMATS, default="jsonl")
+        parser.add_argument(
+            "--gzip",
+            action="store_true",
+            help="Compress the output",
+        )
+        parser.add_argument(
+            "--since",
+            help="Only sessions started on or after this ISO 8601 date or time",
+        )
+        parser.add_argument(
+            "--until",
+            help="Only sessions started before this ISO 8601 date or time",
+        )
+        parser.add_argument("--language", help="Only this ISO 639-1 language")
+        parser.add_argument("--status", choices=STATUSES)
+        parser.add_argument(
+            "--chunk-size",
+            type=int,
+            default=2000,
+            help="Rows per database round trip",
+        )
+
+    def handle(
+        self,
+        *args,
+        **options,
+    ) -> None:
+        try:
+            filters = parse_filters(options)
+        except ValueError as e:
+            raise CommandError(str(e)) from e
+
+        blocks = stream_sessions(
+            filters,
+            format=options["format"],
+            compress=options["gzip"],
+            chunk_size=options["chunk_size"],
+        )
+        if options["output"] == "-":
+            for block in blocks:
+                sys.stdout.buffer.write(block)
+            sys.stdout.buffer.flush()
+            return
+
+        written = 0
+        with open(options["output"], "wb") as output:
+            for block in blocks:
+                output.write(block)
+                written += len(block)
+        self.stderr.write(f"Wrote {written} bytes to {options['output']}")
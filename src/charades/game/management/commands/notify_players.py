@@ -0,0 +1,46 @@
+"""Management command to queue a message to every opted in player."""
+
+from django.core.management.base import BaseCommand
+from django.core.management.base import CommandError
+from django.core.management.base import CommandParser
+
+from charades.game.outbound import notify_active_players
+
+
+class Command(BaseCommand):
+    help = (
+        "Queue an SMS to every opted in player, to be sent by the send_outbound worker."
+    )
+
+    def add_arguments(
+        self,
+        parser: CommandParser,
+    ) -> None:
+        parser.add_argument("body", help="Message text")
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=1000,
+            help="Messages inserted per database round trip",
+        )
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Only report how many players would be messaged",
+        )
+
+    def handle(
+        self,
+        *args,
+        **options,
+    ) -> None:
+        try:
+            queued = notify_active_players(
+                options["body"],
+                batch_size=options["batch_size"],
+                dry_run=options["dry_run"],
+            )
+        except ValueError as e:
+            raise CommandError(str(e)) from e
+        verb = "Would queue" if options["dry_run"] else "Queued"
+        self.stdout.write(self.style.SUCCESS(f"{verb} {queued} messages"))
@@ -0,0 +1,42 @@
+"""Management command to read archived sessions back as JSONL."""
+
+import json
+from datetime import date
+
+from django.core.management.base import BaseCommand
+from django.core.management.base import CommandParser
+from django.core.serializers.json import DjangoJSONEncoder
+
+from charades.game.archive import session_archive
+
+
+class Command(BaseCommand):
+    help = "Print archived sessions by player or start day, one JSON per line."
+
+    def add_arguments(
+        self,
+        parser: CommandParser,
+    ) -> None:
+        parser.add_argument("--player", type=int, help="Only this player id")
+        parser.add_argument(
+            "--since",
+            type=date.fromisoformat,
+            help="Only sessions started on or after this UTC day",
+        )
+        parser.add_argument(
+            "--until",
+            type=date.fromisoformat,
+            help="Only sessions started before this UTC day",
+        )
+
+    def handle(
+        self,
+        *args,
+        **options,
+    ) -> None:
+        for record in session_archive().sessions(
+            player_id=options["player"],
+            since=options["since"],
+            until=options["until"],
+        ):
+            self.stdout.write(json.dumps(record, cls=DjangoJSONEncoder))
@@ -0,0 +1,45 @@
+"""Management command to move players onto the shards they map to."""
+
+from django.core.management.base import BaseCommand
+from django.core.management.base import CommandParser
+
+from charades.game.sharding import rebalance
+
+
+class Command(BaseCommand):
+    help = (
+        "Move players whose phone number maps to another shard, e.g. after"
+        " adding a database to DATABASE_SHARDS. Run with traffic stopped."
+    )
+
+    def add_arguments(
+        self,
+        parser: CommandParser,
+    ) -> None:
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Only report how many players would move",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=500,
+            help="Players read per database round trip",
+        )
+
+    def handle(
+        self,
+        *args,
+        **options,
+    ) -> None:
+        moved = rebalance(
+            dry_run=options["dry_run"],
+            batch_size=options["batch_size"],
+        )
+        verb = "Would move" if options["dry_run"] else "Moved"
+        for (source, target), count in sorted(moved.items()):
+            self.stdout.write(f"{verb} {count} players from {source} to {target}")
+        self.stdout.write(
+            self.style.SUCCESS(f"{verb} {sum(moved.values())} players in total"),
+        )
@@ -0,0 +1,51 @@
+"""Management command to backfill player stats from game history."""
+
+from django.core.management.base import BaseCommand
+from django.core.management.base import CommandError
+from django.core.management.base import CommandParser
+
+from charades.game.archive import session_archive
+from charades.game.models import PlayerStats
+
+
+class Command(BaseCommand):
+    help = "Rebuild PlayerStats aggregates from completed game sessions."
+
+    def add_arguments(
+        self,
+        parser: CommandParser,
+    ) -> None:
+        parser.add_argument(
+            "--player",
+            action="append",
+            type=int,
+            dest="player_ids",
+            help="Only rebuild this player id (may be repeated)",
+        )
+        parser.add_argument(
+            "--chunk-size",
+            type=int,
+            default=2000,
+            help="Rows per database round trip",
+        )
+        parser.add_argument(
+            "--ignore-archive",
+            action="store_true",
+            help="Rebuild even though archived sessions will be left out",
+        )
+
+    def handle(
+        self,
+        *args,
+        **options,
+    ) -> None:
+        if not options["ignore_archive"] and next(session_archive().entries(), None):
+            raise CommandError(
+                "Some sessions are archived and would be dropped from the"
+                " stats; pass --ignore-archive to rebuild anyway",
+            )
+        written = PlayerStats.rebuild(
+            player_ids=options["player_ids"],
+            chunk_size=options["chunk_size"],
+        )
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt {written} player stats rows"))
@@ -0,0 +1,92 @@
+"""Management command running the outbound message worker."""
+
+import signal
+import threading
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.core.management.base import CommandParser
+
+from charades.game.outbound import OutboundWorker
+from charades.game.senders import build_sender
+
+
+class Command(BaseCommand):
+    help = (
+        "Send queued outbound messages as they fall due, within the rate"
+        " limits in settings.OUTBOUND_MESSAGES."
+    )
+
+    def add_arguments(
+        self,
+        parser: CommandParser,
+    ) -> None:
+        config = settings.OUTBOUND_MESSAGES
+        parser.add_argument(
+            "--once",
+            action="store_true",
+            help="Send the messages due now, then exit",
+        )
+        parser.add_argument(
+            "--sender",
+            default=config["sender"],
+            choices=["twilio", "stub"],
+            help="Sender messages go through",
+        )
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=config["workers"],
+            help="Sends in flight at once",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=config["batch_size"],
+            help="Messages claimed per shard and database round trip",
+        )
+        parser.add_argument(
+            "--report-seconds",
+            type=float,
+            default=60.0,
+            help="How often throughput and queue depth are logged",
+        )
+
+    def handle(
+        self,
+        *args,
+        **options,
+    ) -> None:
+        worker = OutboundWorker(
+            sender=build_sender(options["sender"]),
+            workers=options["workers"],
+            batch_size=options["batch_size"],
+        )
+        if options["once"]:
+            start = time.monotonic()
+            worker.run_once()
+            elapsed = time.monotonic() - start
+            self.stdout.write(
+                ", ".join(
+                    f"{count} {outcome}"
+                    for outcome, count in sorted(worker.totals.items())
+                )
+                or "Nothing due",
+            )
+            if worker.totals["sent"]:
+                self.stdout.write(f"{worker.totals['sent'] / elapsed:.1f} messages/s")
+        else:
+            stop = threading.Event()
+            signal.signal(signal.SIGTERM, lambda *_: stop.set())
+            try:
+                worker.run(stop, report_seconds=options["report_seconds"])
+            except KeyboardInterrupt:
+                pass
+        depth = worker.report_queue_depth()
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"{depth['due']} due, {depth['sending']} sending,"
+                f" {depth['scheduled']} scheduled",
+            ),
+        )
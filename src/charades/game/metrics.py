@@ -0,0 +1,225 @@
+"""Prometheus metrics for the game module.
+
+When the PROMETHEUS_MULTIPROC_DIR environment variable points at a writable
+directory, prometheus_client stores samples there so every gunicorn worker's
+metrics are aggregated by the /metrics endpoint. The directory must be emptied
+before the server starts, and gunicorn should call `child_exit` from its
+`child_exit` hook so dead workers' gauges are discarded.
+"""
+
+import os
+import time
+from collections.abc import Callable
+from collections.abc import Iterator
+from contextlib import ExitStack
+from contextlib import contextmanager
+from typing import Any
+
+from django.conf import settings
+from django.db import connections
+from django.http import HttpRequest
+from django.http import HttpResponse
+from prometheus_client import CONTENT_TYPE_LATEST
+from prometheus_client import CollectorRegistry
+from prometheus_client import Counter
+from prometheus_client import Gauge
+from prometheus_client import Histogram
+from prometheus_client import REGISTRY
+from prometheus_client import generate_latest
+from prometheus_client import multiprocess
+
+# Webhook stages are mostly sub-second, LLM calls can take several seconds
+LATENCY_BUCKETS = (
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+    30.0,
+)
+
+REQUEST_SECONDS = Histogram(
+    "charades_request_seconds",
+    "Time spent handling a request, by route",
+    ["route"],
+    buckets=LATENCY_BUCKETS,
+)
+STAGE_SECONDS = Histogram(
+    "charades_stage_seconds",
+    "Time spent in each stage of webhook handling",
+    ["stage"],
+    buckets=LATENCY_BUCKETS,
+)
+LLM_CALL_SECONDS = Histogram(
+    "charades_llm_call_seconds",
+    "Time spent in a single LLM provider call",
+    ["operation", "provider", "outcome"],
+    buckets=LATENCY_BUCKETS,
+)
+LLM_IN_FLIGHT = Gauge(
+    "charades_llm_in_flight",
+    "LLM calls in progress, by provider entry",
+    ["provider"],
+    multiprocess_mode="livesum",
+)
+LLM_FALLBACKS = Counter(
+    "charades_llm_fallbacks",
+    "LLM calls retried on another provider after a failure",
+    ["operation"],
+)
+ERRORS = Counter(
+    "charades_errors",
+    "Requests answered with an error status, by route",
+    ["route"],
+)
+LANGUAGE_MATCHES = Counter(
+    "charades_language_matches",
+    "Language selection attempts by channel and how they matched; 'none'"
+    " means the player was reprompted",
+    ["channel", "method"],
+)
+WORD_PREFETCH = Counter(
+    "charades_word_prefetch",
+    "Prefetched words by outcome: generated, reserved from the pool or failed"
+    " in the background; hit, pooled, returned or miss when a game starts",
+    ["outcome"],
+)
+VOICE_EVALUATION_SECONDS = Histogram(
+    "charades_voice_evaluation_seconds",
+    "Seconds from a caller's description to first audio (the hold message),"
+    " to the evaluation finishing, and to the score being spoken",
+    ["phase"],
+    buckets=LATENCY_BUCKETS,
+)
+VOICE_RESULT_POLLS = Counter(
+    "charades_voice_result_polls",
+    "Voice result endpoint requests, by whether the result was ready",
+    ["outcome"],
+)
+OUTBOUND_MESSAGES = Counter(
+    "charades_outbound_messages",
+    "Outbound message send attempts by outcome: sent, retried, failed,"
+    " deferred by the per-number rate limit or skipped for an opted out player",
+    ["outcome"],
+)
+OUTBOUND_SEND_SECONDS = Histogram(
+    "charades_outbound_send_seconds",
+    "Time spent in a single outbound message send, by outcome",
+    ["outcome"],
+    buckets=LATENCY_BUCKETS,
+)
+OUTBOUND_QUEUE_DEPTH = Gauge(
+    "charades_outbound_queue_depth",
+    "Queued outbound messages, by whether they are due yet",
+    ["state"],
+    multiprocess_mode="livemostrecent",
+)
+DESCRIPTION_CACHE = Counter(
+    "charades_description_cache",
+    "Description evaluations by near-duplicate cache outcome: hit, miss, or"
+    " verified (a hit evaluated anyway to measure score deviation)",
+    ["outcome"],
+)
+DESCRIPTION_CACHE_DEVIATION = Histogram(
+    "charades_description_cache_score_deviation",
+    "Points between a cached score and a fresh evaluation of the"
+    " near-duplicate description, on verified hits",
+    buckets=(0, 1, 2, 5, 10, 15, 20, 30, 50, 100),
+)
+CHALLENGE_WORDS = Counter(
+    "charades_challenge_words",
+    "Daily challenge word lookups, by where the word came from: the cache,"
+    " the database, or generated by the LLM",
+    ["outcome"],
+)
+COMMANDS = Counter(
+    "charades_commands",
+    "Player commands handled, by command type",
+    ["command"],
+)
+
+
+@contextmanager
+def stage(
+    name: str,
+) -> Iterator[None]:
+    """Time a block of code as a webhook stage.
+
+    Args:
+        name: Stage label, e.g. 'form_parse' or 'twiml_render'
+    """
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        STAGE_SECONDS.labels(stage=name).observe(time.perf_counter() - start)
+
+
+def _time_query(
+    execute: Callable[..., Any],
+    sql: str,
+    params: Any,
+    many: bool,
+    context: dict[str, Any],
+) -> Any:
+    with stage("db"):
+        return execute(sql, params, many, context)
+
+
+class MetricsMiddleware:
+    """Record request latency, errors and database time for each request."""
+
+    def __init__(
+        self,
+        get_response: Callable[[HttpRequest], HttpResponse],
+    ) -> None:
+        self.get_response = get_response
+
+    def __call__(
+        self,
+        request: HttpRequest,
+    ) -> HttpResponse:
+        start = time.perf_counter()
+        # Time queries on every shard and replica, not just the default
+        with ExitStack() as stack:
+            for alias in settings.DATABASES:
+                stack.enter_context(connections[alias].execute_wrapper(_time_query))
+            response = self.get_response(request)
+
+        # Label by route pattern rather than path to keep cardinality bounded
+        match = request.resolver_match
+        route = match.route if match is not None else "unmatched"
+        REQUEST_SECONDS.labels(route=route).observe(time.perf_counter() - start)
+        if response.status_code >= 400:
+            ERRORS.labels(route=route).inc()
+        return response
+
+
+def render_metrics() -> tuple[bytes, str]:
+    """Render all metrics in the Prometheus text format.
+
+    Returns:
+        tuple: (metrics payload, content type)
+    """
+    if "PROMETHEUS_MULTIPROC_DIR" in os.environ:
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+        return generate_latest(registry), CONTENT_TYPE_LATEST
+    return generate_latest(REGISTRY), CONTENT_TYPE_LATEST
+
+
+def child_exit(
+    server: Any,
+    worker: Any,
+) -> None:
+    """Gunicorn child_exit hook discarding an exited worker's live gauges."""
+    if "PROMETHEUS_MULTIPROC_DIR" in os.environ:
+        multiprocess.mark_process_dead(worker.pid)
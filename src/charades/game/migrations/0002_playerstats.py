@@ -0,0 +1,99 @@
+# Generated by Django 5.1.5 on 2026-10-19 04:55
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("game", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="PlayerStats",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "language",
+                    models.CharField(
+                        blank=True,
+                        default="",
+                        help_text="ISO 639-1 language code, or blank for all languages",
+                        max_length=2,
+                    ),
+                ),
+                (
+                    "games_played",
+                    models.PositiveIntegerField(
+                        default=0, help_text="Number of completed game sessions"
+                    ),
+                ),
+                (
+                    "total_score",
+                    models.PositiveIntegerField(
+                        default=0,
+                        help_text="Sum of scores across completed game sessions",
+                    ),
+                ),
+                (
+                    "best_score",
+                    models.IntegerField(
+                        blank=True, help_text="Highest score achieved", null=True
+                    ),
+                ),
+                (
+                    "current_streak",
+                    models.PositiveIntegerField(
+                        default=0,
+                        help_text="Consecutive days with at least one completed game",
+                    ),
+                ),
+                (
+                    "best_streak",
+                    models.PositiveIntegerField(
+                        default=0, help_text="Longest run of consecutive days played"
+                    ),
+                ),
+                (
+                    "last_played_on",
+                    models.DateField(
+                        blank=True,
+                        help_text="Local date of the most recently completed game",
+                        null=True,
+                    ),
+                ),
+                (
+                    "updated_at",
+                    models.DateTimeField(
+                        auto_now=True, help_text="When these stats were last updated"
+                    ),
+                ),
+                (
+                    "player",
+                    models.ForeignKey(
+                        help_text="Player these stats belong to",
+                        on_delete=django.db.models.deletion.CASCADE,
+                        to="game.player",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name_plural": "player stats",
+                "constraints": [
+                    models.UniqueConstraint(
+                        fields=("player", "language"),
+                        name="unique_player_stats_language",
+                    )
+                ],
+            },
+        ),
+    ]
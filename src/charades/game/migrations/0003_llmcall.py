@@ -0,0 +1,113 @@
+# Generated by Django 5.1.5 on 2026-10-19 05:02
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("game", "0002_playerstats"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="LLMCall",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "operation",
+                    models.CharField(
+                        help_text="Operation performed, e.g. 'evaluation'",
+                        max_length=30,
+                    ),
+                ),
+                (
+                    "provider",
+                    models.CharField(
+                        help_text="Provider that handled the call", max_length=30
+                    ),
+                ),
+                (
+                    "model",
+                    models.CharField(
+                        blank=True,
+                        help_text="Model reported by the provider",
+                        max_length=100,
+                    ),
+                ),
+                (
+                    "prompt_tokens",
+                    models.PositiveIntegerField(
+                        blank=True,
+                        help_text="Input tokens billed for the call",
+                        null=True,
+                    ),
+                ),
+                (
+                    "completion_tokens",
+                    models.PositiveIntegerField(
+                        blank=True,
+                        help_text="Output tokens billed for the call",
+                        null=True,
+                    ),
+                ),
+                (
+                    "cached_tokens",
+                    models.PositiveIntegerField(
+                        blank=True,
+                        help_text="Input tokens served from the prompt cache",
+                        null=True,
+                    ),
+                ),
+                (
+                    "latency_ms",
+                    models.PositiveIntegerField(
+                        help_text="Wall-clock duration of the call in milliseconds"
+                    ),
+                ),
+                (
+                    "outcome",
+                    models.CharField(
+                        choices=[
+                            ("success", "Success"),
+                            ("fallback", "Success via fallback"),
+                            ("parse_failure", "Parse failure"),
+                            ("error", "Error"),
+                        ],
+                        help_text="How the call ended",
+                        max_length=15,
+                    ),
+                ),
+                (
+                    "created_at",
+                    models.DateTimeField(
+                        db_index=True,
+                        default=django.utils.timezone.now,
+                        help_text="When the call was made",
+                    ),
+                ),
+                (
+                    "session",
+                    models.ForeignKey(
+                        blank=True,
+                        help_text="Game session the call was made for, if any",
+                        null=True,
+                        on_delete=django.db.models.deletion.SET_NULL,
+                        to="game.gamesession",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "LLM call",
+            },
+        ),
+    ]
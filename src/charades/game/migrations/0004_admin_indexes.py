@@ -0,0 +1,28 @@
+# Generated by Django 5.1.5 on 2026-10-19 05:54
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("game", "0003_llmcall"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="gamesession",
+            index=models.Index(
+                fields=["started_at", "id"], name="game_session_started_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="gamesession",
+            index=models.Index(fields=["word"], name="game_session_word_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="player",
+            index=models.Index(
+                fields=["created_at", "id"], name="game_player_created_idx"
+            ),
+        ),
+    ]
@@ -0,0 +1,150 @@
+# Stores GameSession.status and .language as small integer codes. Existing
+# rows are converted in batches of BATCH_SIZE, each in its own transaction,
+# so a large table is never locked for the whole conversion.
+
+import charades.game.fields
+from django.db import migrations, models, transaction
+from django.db.models import Case, Value, When
+
+BATCH_SIZE = 10_000
+
+STATUS_CODES = {"active": 1, "completed": 2, "timeout": 3}
+
+
+def language_code(language):
+    first, second = language.lower()
+    return (ord(first) - ord("a")) * 26 + ord(second) - ord("a") + 1
+
+
+def batches(queryset):
+    """Yield (first pk, last pk) ranges of BATCH_SIZE rows."""
+    last = 0
+    while True:
+        batch = queryset.filter(pk__gt=last).order_by("pk").values_list("pk", flat=True)
+        first = batch.first()
+        if first is None:
+            return
+        boundary = batch[BATCH_SIZE - 1 : BATCH_SIZE].first()
+        yield first, boundary
+        if boundary is None:
+            return
+        last = boundary
+
+
+def convert(apps, schema_editor, source, target, mappings):
+    GameSession = apps.get_model("game", "GameSession")
+    using = schema_editor.connection.alias
+    sessions = GameSession.objects.using(using)
+    values = {
+        f"{field}{target}": Case(
+            *[
+                When(**{f"{field}{source}": value}, then=Value(converted))
+                for value, converted in mapping.items()
+            ],
+        )
+        for field, mapping in mappings(sessions).items()
+    }
+    for first, last in batches(sessions):
+        rows = sessions.filter(pk__gte=first)
+        if last is not None:
+            rows = rows.filter(pk__lte=last)
+        with transaction.atomic(using=using):
+            rows.update(**values)
+
+
+def encode(apps, schema_editor):
+    def mappings(sessions):
+        languages = sessions.values_list("language", flat=True).distinct()
+        return {
+            "status": STATUS_CODES,
+            "language": {language: language_code(language) for language in languages},
+        }
+
+    convert(apps, schema_editor, "", "_code", mappings)
+
+
+def decode(apps, schema_editor):
+    def mappings(sessions):
+        codes = sessions.values_list("language_code", flat=True).distinct()
+        return {
+            "status": {code: status for status, code in STATUS_CODES.items()},
+            "language": {
+                code: chr(ord("a") + (code - 1) // 26) + chr(ord("a") + (code - 1) % 26)
+                for code in codes
+            },
+        }
+
+    convert(apps, schema_editor, "_code", "", mappings)
+
+
+class Migration(migrations.Migration):
+    # Each batch commits on its own
+    atomic = False
+
+    dependencies = [
+        ("game", "0004_admin_indexes"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="gamesession",
+            name="status_code",
+            field=models.SmallIntegerField(null=True),
+        ),
+        migrations.AddField(
+            model_name="gamesession",
+            name="language_code",
+            field=models.SmallIntegerField(null=True),
+        ),
+        # So migrating back can add it again empty, before refilling it
+        migrations.AlterField(
+            model_name="gamesession",
+            name="language",
+            field=models.CharField(max_length=2, null=True),
+        ),
+        migrations.RunPython(encode, decode),
+        migrations.RemoveField(
+            model_name="gamesession",
+            name="status",
+        ),
+        migrations.RemoveField(
+            model_name="gamesession",
+            name="language",
+        ),
+        migrations.RenameField(
+            model_name="gamesession",
+            old_name="status_code",
+            new_name="status",
+        ),
+        migrations.RenameField(
+            model_name="gamesession",
+            old_name="language_code",
+            new_name="language",
+        ),
+        migrations.AlterField(
+            model_name="gamesession",
+            name="language",
+            field=charades.game.fields.LanguageCodeField(
+                help_text="ISO 639-1 language code (e.g., 'es' for Spanish)"
+            ),
+        ),
+        migrations.AlterField(
+            model_name="gamesession",
+            name="status",
+            field=charades.game.fields.ChoiceCodeField(
+                choices=[
+                    ("active", "Active"),
+                    ("completed", "Completed"),
+                    ("timeout", "Timeout"),
+                ],
+                default="active",
+                help_text="Current status of the game session",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="gamesession",
+            index=models.Index(
+                fields=["player", "status"], name="game_session_player_status_idx"
+            ),
+        ),
+    ]
@@ -0,0 +1,111 @@
+# Generated by Django 5.1.5 on 2026-10-19 06:13
+
+import charades.game.fields
+import django.db.models.deletion
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("game", "0005_coded_status_and_language"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="OutboundMessage",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "to_number",
+                    models.CharField(
+                        help_text="Recipient phone number in E.164 format",
+                        max_length=20,
+                    ),
+                ),
+                ("body", models.TextField(help_text="Message text")),
+                (
+                    "status",
+                    charades.game.fields.ChoiceCodeField(
+                        choices=[
+                            ("queued", "Queued"),
+                            ("sent", "Sent"),
+                            ("failed", "Failed"),
+                        ],
+                        default="queued",
+                        help_text="Whether the message is waiting, sent or given up on",
+                    ),
+                ),
+                (
+                    "attempts",
+                    models.PositiveSmallIntegerField(
+                        default=0, help_text="Sends tried so far"
+                    ),
+                ),
+                (
+                    "next_attempt_at",
+                    models.DateTimeField(
+                        default=django.utils.timezone.now,
+                        help_text="When a queued message is next due to be sent",
+                    ),
+                ),
+                (
+                    "claim",
+                    models.CharField(
+                        blank=True,
+                        help_text="Token of the worker batch sending the message",
+                        max_length=32,
+                    ),
+                ),
+                (
+                    "provider_id",
+                    models.CharField(
+                        blank=True,
+                        help_text="Sender's id for the sent message, e.g. a Twilio SID",
+                        max_length=64,
+                    ),
+                ),
+                (
+                    "error",
+                    models.TextField(blank=True, help_text="Why the last send failed"),
+                ),
+                (
+                    "created_at",
+                    models.DateTimeField(
+                        default=django.utils.timezone.now,
+                        help_text="When the message was queued",
+                    ),
+                ),
+                (
+                    "sent_at",
+                    models.DateTimeField(
+                        blank=True, help_text="When the message was sent", null=True
+                    ),
+                ),
+                (
+                    "player",
+                    models.ForeignKey(
+                        help_text="Player the message is sent to",
+                        on_delete=django.db.models.deletion.CASCADE,
+                        to="game.player",
+                    ),
+                ),
+            ],
+            options={
+                "indexes": [
+                    models.Index(
+                        fields=["status", "next_attempt_at"],
+                        name="game_outbound_due_idx",
+                    )
+                ],
+            },
+        ),
+    ]
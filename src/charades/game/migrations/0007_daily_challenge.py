@@ -0,0 +1,73 @@
+# Generated by Django 5.1.5 on 2026-10-19 06:18
+
+import charades.game.fields
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("game", "0006_outbound_message"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="DailyChallenge",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "day",
+                    models.DateField(help_text="Local date the challenge is played on"),
+                ),
+                (
+                    "language",
+                    charades.game.fields.LanguageCodeField(
+                        help_text="ISO 639-1 language code (e.g., 'es' for Spanish)"
+                    ),
+                ),
+                (
+                    "word",
+                    models.CharField(
+                        help_text="The word to be described", max_length=100
+                    ),
+                ),
+                (
+                    "created_at",
+                    models.DateTimeField(
+                        default=django.utils.timezone.now,
+                        help_text="When the word was generated",
+                    ),
+                ),
+            ],
+        ),
+        migrations.AddField(
+            model_name="gamesession",
+            name="challenge_on",
+            field=models.DateField(
+                blank=True,
+                help_text="Day of the daily challenge played, if any",
+                null=True,
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="gamesession",
+            index=models.Index(
+                fields=["challenge_on", "language", "score"],
+                name="game_session_challenge_idx",
+            ),
+        ),
+        migrations.AddConstraint(
+            model_name="dailychallenge",
+            constraint=models.UniqueConstraint(
+                fields=("day", "language"), name="unique_daily_challenge_language"
+            ),
+        ),
+    ]
@@ -1,12 +1,23 @@
+from datetime import date
+from datetime import timedelta
+
 from django.core.validators import MinValueValidator
 from django.core.validators import MaxValueValidator
 from django.db import models
+from django.db import transaction
 from django.utils import timezone
 
+from charades.game.fields import ChoiceCodeField
+from charades.game.fields import LanguageCodeField
+from charades.game.sharding import shard_for
+from charades.game.sharding import shards
+
 
 class Player(models.Model):
-    # Reverse relationship to GameSession
+    # Reverse relationships
     gamesession_set: "models.Manager[GameSession]"
+    playerstats_set: "models.Manager[PlayerStats]"
+    outboundmessage_set: "models.Manager[OutboundMessage]"
 
     phone_number = models.CharField(
         max_length=20,
@@ -32,6 +43,15 @@ class Player(models.Model):
         help_text="When the player record was created",
     )
 
+    class Meta:
+        indexes = [
+            # Admin date drill-down and newest-first keyset paging
+            models.Index(
+                fields=["created_at", "id"],
+                name="game_player_created_idx",
+            ),
+        ]
+
     def __str__(self) -> str:
         return self.phone_number
 
@@ -61,7 +81,9 @@ class Player(models.Model):
         Returns:
             tuple: (Player instance, bool indicating if player was created)
         """
-        return cls.objects.get_or_create(phone_number=phone_number)
+        return cls.objects.using(shard_for(phone_number)).get_or_create(
+            phone_number=phone_number,
+        )
 
     def end_active_sessions(self) -> None:
         """End all active game sessions for this player."""
@@ -72,6 +94,9 @@ class Player(models.Model):
 
 
 class GameSession(models.Model):
+    # Reverse relationship to LLMCall
+    llmcall_set: "models.Manager[LLMCall]"
+
     STATUS_CHOICES = [
         ("active", "Active"),
         ("completed", "Completed"),
@@ -87,8 +112,7 @@ class GameSession(models.Model):
         max_length=100,
         help_text="The word to be described",
     )
-    language = models.CharField(
-        max_length=2,
+    language = LanguageCodeField(
         help_text="ISO 639-1 language code (e.g., 'es' for Spanish)",
     )
     user_description = models.TextField(
@@ -107,8 +131,7 @@ class GameSession(models.Model):
         blank=True,
         help_text="AI-generated feedback on the user's description",
     )
-    status = models.CharField(
-        max_length=10,
+    status = ChoiceCodeField(
         choices=STATUS_CHOICES,
         default="active",
         help_text="Current status of the game session",
@@ -122,6 +145,35 @@ class GameSession(models.Model):
         blank=True,
         help_text="When the game session was completed or timed out",
     )
+    challenge_on = models.DateField(
+        null=True,
+        blank=True,
+        help_text="Day of the daily challenge played, if any",
+    )
+
+    class Meta:
+        indexes = [
+            # Admin date drill-down and newest-first keyset paging
+            models.Index(
+                fields=["started_at", "id"],
+                name="game_session_started_idx",
+            ),
+            # Admin prefix search on the word
+            models.Index(
+                fields=["word"],
+                name="game_session_word_idx",
+            ),
+            # A player's active session, looked up on every message
+            models.Index(
+                fields=["player", "status"],
+                name="game_session_player_status_idx",
+            ),
+            # Daily challenge rankings, best score first
+            models.Index(
+                fields=["challenge_on", "language", "score"],
+                name="game_session_challenge_idx",
+            ),
+        ]
 
     def __str__(self) -> str:
         return f"{self.player} - {self.word} ({self.status})"
@@ -144,10 +196,393 @@ class GameSession(models.Model):
         self.score = score
         self.user_description = description
         self.feedback = feedback
-        self.save()
+        # Stats must never drift from the sessions they summarize
+        with transaction.atomic(using=self._state.db):
+            self.save()
+            PlayerStats.record_session(self)
 
     def timeout(self) -> None:
         """Mark the game session as timed out."""
         self.status = "timeout"
         self.completed_at = timezone.now()
         self.save()
+
+
+class DailyChallenge(models.Model):
+    """The word everyone playing a day's challenge in a language describes.
+
+    Not tied to a player, so it lives on the default database; sessions
+    playing it, on their players' shards, refer to it by day and language.
+    """
+
+    day = models.DateField(
+        help_text="Local date the challenge is played on",
+    )
+    language = LanguageCodeField(
+        help_text="ISO 639-1 language code (e.g., 'es' for Spanish)",
+    )
+    word = models.CharField(
+        max_length=100,
+        help_text="The word to be described",
+    )
+    created_at = models.DateTimeField(
+        default=timezone.now,
+        help_text="When the word was generated",
+    )
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["day", "language"],
+                name="unique_daily_challenge_language",
+            ),
+        ]
+
+    def __str__(self) -> str:
+        return f"{self.day} {self.language}: {self.word}"
+
+
+class PlayerStats(models.Model):
+    """Incrementally maintained score aggregates for a player.
+
+    Each player has one row per language they have played plus a totals row
+    whose language is blank, so stats lookups never scan session history.
+    """
+
+    ALL_LANGUAGES = ""
+
+    player = models.ForeignKey(
+        Player,
+        on_delete=models.CASCADE,
+        help_text="Player these stats belong to",
+    )
+    language = models.CharField(
+        max_length=2,
+        blank=True,
+        default=ALL_LANGUAGES,
+        help_text="ISO 639-1 language code, or blank for all languages",
+    )
+    games_played = models.PositiveIntegerField(
+        default=0,
+        help_text="Number of completed game sessions",
+    )
+    total_score = models.PositiveIntegerField(
+        default=0,
+        help_text="Sum of scores across completed game sessions",
+    )
+    best_score = models.IntegerField(
+        null=True,
+        blank=True,
+        help_text="Highest score achieved",
+    )
+    current_streak = models.PositiveIntegerField(
+        default=0,
+        help_text="Consecutive days with at least one completed game",
+    )
+    best_streak = models.PositiveIntegerField(
+        default=0,
+        help_text="Longest run of consecutive days played",
+    )
+    last_played_on = models.DateField(
+        null=True,
+        blank=True,
+        help_text="Local date of the most recently completed game",
+    )
+    updated_at = models.DateTimeField(
+        auto_now=True,
+        help_text="When these stats were last updated",
+    )
+
+    class Meta:
+        verbose_name_plural = "player stats"
+        constraints = [
+            models.UniqueConstraint(
+                fields=["player", "language"],
+                name="unique_player_stats_language",
+            ),
+        ]
+
+    def __str__(self) -> str:
+        return f"{self.player} - {self.language or 'all'}"
+
+    @property
+    def mean_score(self) -> float:
+        """Average score across completed games."""
+        if not self.games_played:
+            return 0.0
+        return self.total_score / self.games_played
+
+    def streak_on(
+        self,
+        today: date,
+    ) -> int:
+        """Current streak as of a day, 0 if it lapsed since the last game.
+
+        Args:
+            today: Local date to read the streak on
+
+        Returns:
+            int: Consecutive days played up to today or yesterday
+        """
+        if self.last_played_on is None:
+            return 0
+        if self.last_played_on < today - timedelta(days=1):
+            return 0
+        return self.current_streak
+
+    def add_result(
+        self,
+        score: int,
+        played_on: date,
+    ) -> None:
+        """Fold a completed game into these stats without saving.
+
+        Args:
+            score: Score from 0-100 for the completed game
+            played_on: Local date the game was completed
+        """
+        self.games_played += 1
+        self.total_score += score
+        if self.best_score is None or score > self.best_score:
+            self.best_score = score
+
+        if self.last_played_on is None or played_on > self.last_played_on:
+            if self.last_played_on == played_on - timedelta(days=1):
+                self.current_streak += 1
+            else:
+                self.current_streak = 1
+            self.last_played_on = played_on
+        self.best_streak = max(self.best_streak, self.current_streak)
+
+    @classmethod
+    def record_session(
+        cls,
+        session: "GameSession",
+    ) -> None:
+        """Add a completed session to its player's totals and language stats.
+
+        Must be called inside the transaction that completes the session.
+
+        Args:
+            session: The completed GameSession
+        """
+        if session.score is None or session.completed_at is None:
+            return
+
+        played_on = timezone.localdate(session.completed_at)
+        # On the player's shard, with the session
+        objects = cls.objects.using(session._state.db).select_for_update()
+        for language in (cls.ALL_LANGUAGES, session.language.lower()):
+            stats, _ = objects.get_or_create(
+                player_id=session.player_id,  # type: ignore[attr-defined]
+                language=language,
+            )
+            stats.add_result(session.score, played_on)
+            stats.save()
+
+    @classmethod
+    def rebuild(
+        cls,
+        player_ids: list[int] | None = None,
+        chunk_size: int = 2000,
+    ) -> int:
+        """Recompute stats from completed game sessions on every shard.
+
+        Sessions are streamed in player order so only one player's rows are
+        held in memory at a time.
+
+        Args:
+            player_ids: Only rebuild these players, or all players when None
+            chunk_size: Number of rows per database round trip
+
+        Returns:
+            int: Number of stats rows written
+        """
+        return sum(
+            cls._rebuild_shard(using, player_ids, chunk_size) for using in shards()
+        )
+
+    @classmethod
+    def _rebuild_shard(
+        cls,
+        using: str,
+        player_ids: list[int] | None,
+        chunk_size: int,
+    ) -> int:
+        sessions = GameSession.objects.using(using).filter(
+            status="completed",
+            score__isnull=False,
+            completed_at__isnull=False,
+        )
+        existing = cls.objects.using(using).all()
+        if player_ids is not None:
+            sessions = sessions.filter(player_id__in=player_ids)
+            existing = existing.filter(player_id__in=player_ids)
+
+        written = 0
+        pending: list[PlayerStats] = []
+        current: dict[str, PlayerStats] = {}
+        current_player_id = None
+        with transaction.atomic(using=using):
+            existing.delete()
+            for player_id, language, score, completed_at in (
+                sessions.order_by("player_id", "completed_at")
+                .values_list("player_id", "language", "score", "completed_at")
+                .iterator(chunk_size=chunk_size)
+            ):
+                if player_id != current_player_id:
+                    pending.extend(current.values())
+                    current = {}
+                    current_player_id = player_id
+                    if len(pending) >= chunk_size:
+                        PlayerStats.objects.using(using).bulk_create(pending)
+                        written += len(pending)
+                        pending = []
+
+                played_on = timezone.localdate(completed_at)
+                for key in (cls.ALL_LANGUAGES, language.lower()):
+                    if key not in current:
+                        current[key] = PlayerStats(player_id=player_id, language=key)
+                    current[key].add_result(score, played_on)
+
+            pending.extend(current.values())
+            PlayerStats.objects.using(using).bulk_create(pending)
+            written += len(pending)
+        return written
+
+
+class LLMCall(models.Model):
+    """A single call to an LLM provider, with its token usage and latency."""
+
+    OUTCOME_CHOICES = [
+        ("success", "Success"),
+        ("fallback", "Success via fallback"),
+        ("parse_failure", "Parse failure"),
+        ("error", "Error"),
+    ]
+
+    session = models.ForeignKey(
+        GameSession,
+        null=True,
+        blank=True,
+        on_delete=models.SET_NULL,
+        help_text="Game session the call was made for, if any",
+    )
+    operation = models.CharField(
+        max_length=30,
+        help_text="Operation performed, e.g. 'evaluation'",
+    )
+    provider = models.CharField(
+        max_length=30,
+        help_text="Provider that handled the call",
+    )
+    model = models.CharField(
+        max_length=100,
+        blank=True,
+        help_text="Model reported by the provider",
+    )
+    prompt_tokens = models.PositiveIntegerField(
+        null=True,
+        blank=True,
+        help_text="Input tokens billed for the call",
+    )
+    completion_tokens = models.PositiveIntegerField(
+        null=True,
+        blank=True,
+        help_text="Output tokens billed for the call",
+    )
+    cached_tokens = models.PositiveIntegerField(
+        null=True,
+        blank=True,
+        help_text="Input tokens served from the prompt cache",
+    )
+    latency_ms = models.PositiveIntegerField(
+        help_text="Wall-clock duration of the call in milliseconds",
+    )
+    outcome = models.CharField(
+        max_length=15,
+        choices=OUTCOME_CHOICES,
+        help_text="How the call ended",
+    )
+    created_at = models.DateTimeField(
+        default=timezone.now,
+        db_index=True,
+        help_text="When the call was made",
+    )
+
+    class Meta:
+        verbose_name = "LLM call"
+
+    def __str__(self) -> str:
+        return f"{self.provider} {self.operation} ({self.outcome})"
+
+
+class OutboundMessage(models.Model):
+    """An SMS queued to be pushed to a player, see charades.game.outbound."""
+
+    STATUS_CHOICES = [
+        ("queued", "Queued"),
+        ("sent", "Sent"),
+        ("failed", "Failed"),
+    ]
+
+    player = models.ForeignKey(
+        Player,
+        on_delete=models.CASCADE,
+        help_text="Player the message is sent to",
+    )
+    to_number = models.CharField(
+        max_length=20,
+        help_text="Recipient phone number in E.164 format",
+    )
+    body = models.TextField(
+        help_text="Message text",
+    )
+    status = ChoiceCodeField(
+        choices=STATUS_CHOICES,
+        default="queued",
+        help_text="Whether the message is waiting, sent or given up on",
+    )
+    attempts = models.PositiveSmallIntegerField(
+        default=0,
+        help_text="Sends tried so far",
+    )
+    next_attempt_at = models.DateTimeField(
+        default=timezone.now,
+        help_text="When a queued message is next due to be sent",
+    )
+    claim = models.CharField(
+        max_length=32,
+        blank=True,
+        help_text="Token of the worker batch sending the message",
+    )
+    provider_id = models.CharField(
+        max_length=64,
+        blank=True,
+        help_text="Sender's id for the sent message, e.g. a Twilio SID",
+    )
+    error = models.TextField(
+        blank=True,
+        help_text="Why the last send failed",
+    )
+    created_at = models.DateTimeField(
+        default=timezone.now,
+        help_text="When the message was queued",
+    )
+    sent_at = models.DateTimeField(
+        null=True,
+        blank=True,
+        help_text="When the message was sent",
+    )
+
+    class Meta:
+        indexes = [
+            # Due messages, claimed by workers in the order they fell due
+            models.Index(
+                fields=["status", "next_attempt_at"],
+                name="game_outbound_due_idx",
+            ),
+        ]
+
+    def __str__(self) -> str:
+        return f"{self.to_number} ({self.status})"
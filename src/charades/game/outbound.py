@@ -0,0 +1,483 @@
+"""Durable, rate-limited outbound SMS.
+
+Replies to players go out in webhook responses. Anything pushed to them
+outside a reply, like a notice to every active player, is queued as an
+OutboundMessage row on the player's shard, so queueing costs a request one
+insert, and sent later by the `send_outbound` worker.
+
+The worker claims due messages from every shard in batches and sends them
+from a thread pool through the sender in settings.OUTBOUND_MESSAGES. Two
+token bucket limits apply: one per recipient number, which defers a message
+that would go over it, and one for the whole account, which paces sends.
+Sends that fail in a way worth retrying are tried again with exponential
+backoff, up to max_attempts.
+
+A claim is a lease: a message claimed by a worker that dies is sent by
+another once lease_seconds have passed, so delivery is at least once.
+"""
+
+import logging
+import threading
+import time
+import uuid
+from collections import Counter
+from collections import OrderedDict
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import close_old_connections
+from django.db.models import Count
+from django.db.models import Q
+from django.utils import timezone
+
+from charades.game.metrics import OUTBOUND_MESSAGES
+from charades.game.metrics import OUTBOUND_QUEUE_DEPTH
+from charades.game.metrics import OUTBOUND_SEND_SECONDS
+from charades.game.models import OutboundMessage
+from charades.game.models import Player
+from charades.game.senders import MessageSender
+from charades.game.senders import SendError
+from charades.game.senders import build_sender
+from charades.game.sharding import shards
+
+logger = logging.getLogger(__name__)
+
+# Twilio's limit; longer bodies are rejected rather than split
+MAX_BODY_LENGTH = 1600
+
+
+class TokenBucket:
+    """Tokens refilled at a steady rate, up to a burst capacity."""
+
+    def __init__(
+        self,
+        rate: float,
+        capacity: float,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        """Initialize a full bucket.
+
+        Args:
+            rate: Tokens added per second
+            capacity: Most tokens held, i.e. the burst allowed
+            clock: Monotonic time source in seconds
+        """
+        self.rate = rate
+        self.capacity = capacity
+        self._clock = clock
+        self._tokens = capacity
+        self._updated = clock()
+        self._lock = threading.Lock()
+
+    def _refill(self) -> None:
+        now = self._clock()
+        elapsed = now - self._updated
+        self._tokens = min(self.capacity, self._tokens + elapsed * self.rate)
+        self._updated = now
+
+    def try_take(self) -> float:
+        """Take a token if one is available.
+
+        Returns:
+            float: 0 if a token was taken, else seconds until one will be
+        """
+        with self._lock:
+            self._refill()
+            if self._tokens >= 1:
+                self._tokens -= 1
+                return 0.0
+            return (1 - self._tokens) / self.rate
+
+    def reserve(self) -> float:
+        """Take a token, borrowing against the refill if none is available.
+
+        Returns:
+            float: Seconds to wait before using the token
+        """
+        with self._lock:
+            self._refill()
+            self._tokens -= 1
+            return max(0.0, -self._tokens / self.rate)
+
+
+class RateLimiter:
+    """Account-wide and per-number send limits."""
+
+    def __init__(
+        self,
+        account_rate: float,
+        account_burst: float,
+        number_rate: float,
+        number_burst: float,
+        max_numbers: int,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        """Initialize the limiter with full buckets.
+
+        Args:
+            account_rate: Messages per second across all numbers
+            account_burst: Messages allowed at once above account_rate
+            number_rate: Messages per second to any one number
+            number_burst: Messages allowed at once above number_rate
+            max_numbers: Numbers whose buckets are remembered
+            clock: Monotonic time source in seconds
+        """
+        self.account = TokenBucket(account_rate, account_burst, clock)
+        self.number_rate = number_rate
+        self.number_burst = number_burst
+        self.max_numbers = max_numbers
+        self._clock = clock
+        self._numbers: OrderedDict[str, TokenBucket] = OrderedDict()
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_settings(cls) -> "RateLimiter":
+        config = settings.OUTBOUND_MESSAGES
+        return cls(
+            account_rate=config["account_rate"],
+            account_burst=config["account_burst"],
+            number_rate=config["number_rate"],
+            number_burst=config["number_burst"],
+            max_numbers=config["max_numbers"],
+        )
+
+    def number_wait(
+        self,
+        to_number: str,
+    ) -> float:
+        """Take a send to a number if it is under its limit.
+
+        Returns:
+            float: 0 if the send can go now, else seconds until it can
+        """
+        with self._lock:
+            bucket = self._numbers.get(to_number)
+            if bucket is None:
+                bucket = TokenBucket(self.number_rate, self.number_burst, self._clock)
+                self._numbers[to_number] = bucket
+                while len(self._numbers) > self.max_numbers:
+                    self._numbers.popitem(last=False)
+            else:
+                self._numbers.move_to_end(to_number)
+        return bucket.try_take()
+
+    def account_wait(self) -> float:
+        """Reserve a send against the account limit.
+
+        Returns:
+            float: Seconds to wait before sending
+        """
+        return self.account.reserve()
+
+
+def enqueue(
+    player: Player,
+    body: str,
+    delay: timedelta | None = None,
+) -> OutboundMessage:
+    """Queue a message to a player.
+
+    Args:
+        player: The Player instance
+        body: Message text
+        delay: How long to wait before sending, or None to send it now
+
+    Returns:
+        OutboundMessage: The queued message, on the player's shard
+
+    Raises:
+        ValueError: If the body is empty or too long for one message
+    """
+    if not body or len(body) > MAX_BODY_LENGTH:
+        raise ValueError(f"Message must be 1 to {MAX_BODY_LENGTH} characters")
+    now = timezone.now()
+    return player.outboundmessage_set.create(
+        to_number=player.phone_number,
+        body=body,
+        next_attempt_at=now + delay if delay is not None else now,
+    )
+
+
+def notify_active_players(
+    body: str,
+    batch_size: int = 1000,
+    dry_run: bool = False,
+) -> int:
+    """Queue a message to every opted in player, on every shard.
+
+    Args:
+        body: Message text
+        batch_size: Messages inserted per database round trip
+        dry_run: Only count the players who would be messaged
+
+    Returns:
+        int: Messages queued, or that would be queued
+
+    Raises:
+        ValueError: If the body is empty or too long for one message
+    """
+    if not body or len(body) > MAX_BODY_LENGTH:
+        raise ValueError(f"Message must be 1 to {MAX_BODY_LENGTH} characters")
+    queued = 0
+    now = timezone.now()
+    for using in shards():
+        players = (
+            Player.objects.using(using)
+            .filter(is_active=True)
+            .order_by("pk")
+            .values_list("pk", "phone_number")
+        )
+        last = 0
+        while batch := list(players.filter(pk__gt=last)[:batch_size]):
+            if not dry_run:
+                OutboundMessage.objects.using(using).bulk_create(
+                    [
+                        OutboundMessage(
+                            player_id=player_id,
+                            to_number=phone_number,
+                            body=body,
+                            next_attempt_at=now,
+                            created_at=now,
+                        )
+                        for player_id, phone_number in batch
+                    ],
+                )
+            queued += len(batch)
+            last = batch[-1][0]
+    return queued
+
+
+def queue_depth() -> dict[str, int]:
+    """Count queued messages on every shard.
+
+    Returns:
+        dict: 'due' to be sent now, 'sending' claimed by a worker and
+            'scheduled' for later, by retry backoff or a rate limit
+    """
+    now = timezone.now()
+    depth: Counter[str] = Counter()
+    for using in shards():
+        depth.update(
+            OutboundMessage.objects.using(using)
+            .filter(status="queued")
+            .aggregate(
+                due=Count("pk", filter=Q(next_attempt_at__lte=now)),
+                sending=Count("pk", filter=Q(next_attempt_at__gt=now) & ~Q(claim="")),
+                scheduled=Count("pk", filter=Q(next_attempt_at__gt=now, claim="")),
+            ),
+        )
+    return {state: depth[state] for state in ("due", "sending", "scheduled")}
+
+
+class OutboundWorker:
+    """Claims due messages from every shard and sends them concurrently."""
+
+    def __init__(
+        self,
+        sender: MessageSender | None = None,
+        limiter: RateLimiter | None = None,
+        workers: int | None = None,
+        batch_size: int | None = None,
+    ) -> None:
+        """Initialize the worker, defaulting to settings.OUTBOUND_MESSAGES.
+
+        Args:
+            sender: Sender messages go through
+            limiter: Rate limits sends are held to
+            workers: Sends in flight at once; with 1, messages are sent on
+                the calling thread
+            batch_size: Messages claimed per shard and database round trip
+        """
+        config = settings.OUTBOUND_MESSAGES
+        self.sender = sender or build_sender(config["sender"])
+        self.limiter = limiter or RateLimiter.from_settings()
+        self.workers = workers or config["workers"]
+        self.batch_size = batch_size or config["batch_size"]
+        self.totals: Counter[str] = Counter()
+        self.started_at = time.monotonic()
+
+    def claim(
+        self,
+        using: str,
+        limit: int,
+    ) -> list[OutboundMessage]:
+        """Claim a shard's messages that are due, oldest first.
+
+        Args:
+            using: Database alias of the shard
+            limit: Most messages claimed
+
+        Returns:
+            list: The claimed messages, with their players
+        """
+        now = timezone.now()
+        due = OutboundMessage.objects.using(using).filter(
+            status="queued",
+            next_attempt_at__lte=now,
+        )
+        pks = list(
+            due.order_by("next_attempt_at", "pk").values_list("pk", flat=True)[:limit],
+        )
+        if not pks:
+            return []
+        token = uuid.uuid4().hex
+        # Messages another worker claimed in the meantime are no longer due
+        due.filter(pk__in=pks).update(
+            claim=token,
+            next_attempt_at=now
+            + timedelta(seconds=settings.OUTBOUND_MESSAGES["lease_seconds"]),
+        )
+        return list(
+            OutboundMessage.objects.using(using)
+            .filter(pk__in=pks, claim=token)
+            .select_related("player"),
+        )
+
+    def deliver(
+        self,
+        message: OutboundMessage,
+    ) -> str:
+        """Send a claimed message, within the rate limits.
+
+        Args:
+            message: A message claimed by this worker
+
+        Returns:
+            str: Outcome: sent, retried, failed, deferred or skipped
+        """
+        config = settings.OUTBOUND_MESSAGES
+        # Only while the claim is still ours, not another worker's
+        claimed = OutboundMessage.objects.using(message._state.db).filter(
+            pk=message.pk,
+            claim=message.claim,
+        )
+        if not message.player.is_active:
+            claimed.update(status="failed", error="Player opted out")
+            OUTBOUND_MESSAGES.labels(outcome="skipped").inc()
+            return "skipped"
+        wait = self.limiter.number_wait(message.to_number)
+        if wait:
+            claimed.update(
+                next_attempt_at=timezone.now() + timedelta(seconds=wait),
+                claim="",
+            )
+            OUTBOUND_MESSAGES.labels(outcome="deferred").inc()
+            return "deferred"
+
+        time.sleep(self.limiter.account_wait())
+        start = time.perf_counter()
+        try:
+            provider_id = self.sender.send(message.to_number, message.body)
+        except SendError as e:
+            attempts = message.attempts + 1
+            if e.retryable and attempts < config["max_attempts"]:
+                outcome = "retried"
+                backoff = config["backoff_seconds"] * 2 ** (attempts - 1)
+                claimed.update(
+                    attempts=attempts,
+                    next_attempt_at=timezone.now() + timedelta(seconds=backoff),
+                    claim="",
+                    error=str(e),
+                )
+            else:
+                outcome = "failed"
+                claimed.update(attempts=attempts, status="failed", error=str(e))
+            logger.warning(f"Outbound message {message.pk} {outcome}: {str(e)}")
+        else:
+            outcome = "sent"
+            claimed.update(
+                attempts=message.attempts + 1,
+                status="sent",
+                provider_id=provider_id,
+                sent_at=timezone.now(),
+                error="",
+            )
+        OUTBOUND_SEND_SECONDS.labels(outcome=outcome).observe(
+            time.perf_counter() - start,
+        )
+        OUTBOUND_MESSAGES.labels(outcome=outcome).inc()
+        return outcome
+
+    def _run(
+        self,
+        message: OutboundMessage,
+    ) -> str:
+        try:
+            return self.deliver(message)
+        except Exception as e:
+            # Left claimed, so it is retried when the lease runs out
+            logger.error(f"Failed to deliver outbound message {message.pk}: {e}")
+            return "error"
+        finally:
+            close_old_connections()
+
+    def run_once(self) -> Counter[str]:
+        """Send every message that is due, on every shard.
+
+        Messages retried or deferred during the run are left for a later one.
+
+        Returns:
+            Counter: Messages handled, by outcome
+        """
+        outcomes: Counter[str] = Counter()
+        executor = None
+        try:
+            while claimed := [
+                message
+                for using in shards()
+                for message in self.claim(using, self.batch_size)
+            ]:
+                if self.workers == 1:
+                    outcomes.update(map(self._run, claimed))
+                    continue
+                if executor is None:
+                    executor = ThreadPoolExecutor(
+                        max_workers=self.workers,
+                        thread_name_prefix="outbound",
+                    )
+                outcomes.update(executor.map(self._run, claimed))
+        finally:
+            if executor is not None:
+                executor.shutdown()
+        self.totals.update(outcomes)
+        return outcomes
+
+    def throughput(self) -> float:
+        """Messages sent per second since the worker started."""
+        elapsed = time.monotonic() - self.started_at
+        return self.totals["sent"] / elapsed if elapsed > 0 else 0.0
+
+    def report_queue_depth(self) -> dict[str, int]:
+        """Publish the queue depth as a metric and return it."""
+        depth = queue_depth()
+        for state, count in depth.items():
+            OUTBOUND_QUEUE_DEPTH.labels(state=state).set(count)
+        return depth
+
+    def run(
+        self,
+        stop: threading.Event,
+        report_seconds: float = 60.0,
+    ) -> None:
+        """Send messages as they fall due until stopped.
+
+        Args:
+            stop: Set to stop after the current run
+            report_seconds: How often throughput and queue depth are logged
+        """
+        poll_seconds = settings.OUTBOUND_MESSAGES["poll_seconds"]
+        next_report = time.monotonic()
+        while not stop.is_set():
+            outcomes = self.run_once()
+            if time.monotonic() >= next_report:
+                depth = self.report_queue_depth()
+                logger.info(
+                    f"Outbound: {self.totals['sent']} sent"
+                    f" ({self.throughput():.1f}/s), {self.totals['failed']} failed,"
+                    f" {depth['due']} due, {depth['scheduled']} scheduled",
+                )
+                next_report = time.monotonic() + report_seconds
+            if not outcomes:
+                stop.wait(poll_seconds)
@@ -0,0 +1,227 @@
+"""Admin pagination for tables too large to count or page by offset.
+
+`KeysetPaginator` never runs an unbounded COUNT(*): unfiltered lists are
+counted from the database's table statistics and filtered ones only up to
+`max_exact_count` rows. Pages after the first are found by seeking past the
+last row shown, on an indexed timestamp with the primary key breaking ties,
+rather than by OFFSET, which reads and throws away every earlier row.
+
+`KeysetChangeList` uses it while the list is in its default newest-first
+order, with "Next" links carrying the last row's position in the `after`
+query parameter. Lists sorted by another column fall back to page numbers.
+"""
+
+from datetime import datetime
+
+from django.contrib.admin.views.main import ORDER_VAR
+from django.contrib.admin.views.main import ChangeList
+from django.core.paginator import Paginator
+from django.db import connections
+from django.db import models
+from django.db.models import Q
+from django.db.models import QuerySet
+from django.http import HttpRequest
+from django.utils.functional import cached_property
+
+CURSOR_VAR = "after"
+
+
+def estimate_rows(
+    model: type[models.Model],
+    using: str,
+) -> int | None:
+    """Estimate a table's row count from the database's statistics.
+
+    Args:
+        model: Model whose table to estimate
+        using: Database alias
+
+    Returns:
+        int | None: Estimated rows, or None without statistics, e.g. on
+            SQLite before ANALYZE has run
+    """
+    connection = connections[using]
+    table = model._meta.db_table
+    with connection.cursor() as cursor:
+        if connection.vendor == "postgresql":
+            cursor.execute(
+                "SELECT reltuples::bigint FROM pg_class WHERE oid = %s::regclass",
+                [table],
+            )
+        elif connection.vendor == "sqlite":
+            cursor.execute(
+                "SELECT 1 FROM sqlite_master WHERE name = 'sqlite_stat1'",
+            )
+            if cursor.fetchone() is None:
+                return None
+            # The first number of each index's stat is the table's row count
+            cursor.execute(
+                "SELECT stat FROM sqlite_stat1 WHERE tbl = %s LIMIT 1",
+                [table],
+            )
+        else:
+            return None
+        row = cursor.fetchone()
+    if row is None:
+        return None
+    estimate = int(str(row[0]).split()[0])
+    # Postgres reports -1 for tables never vacuumed or analyzed
+    return estimate if estimate >= 0 else None
+
+
+def encode_cursor(
+    value: datetime,
+    pk: int,
+) -> str:
+    """Encode a row's position for the `after` query parameter."""
+    return f"{value.isoformat()}_{pk}"
+
+
+def decode_cursor(
+    cursor: str,
+) -> tuple[datetime, int] | None:
+    """Decode an `after` query parameter, or None if it's malformed."""
+    value, _, pk = cursor.rpartition("_")
+    try:
+        return datetime.fromisoformat(value), int(pk)
+    except ValueError:
+        return None
+
+
+class KeysetPaginator(Paginator):
+    """Paginator with bounded counting and seeking by a timestamp."""
+
+    max_exact_count = 10_000
+
+    def __init__(
+        self,
+        object_list: QuerySet,
+        per_page: int,
+        orphans: int = 0,
+        allow_empty_first_page: bool = True,
+        keyset_field: str = "created_at",
+    ) -> None:
+        """Initialize the paginator.
+
+        Args:
+            object_list: Queryset ordered by keyset_field then pk, descending
+            per_page: Rows per page
+            orphans: Passed to Paginator, for page number paging
+            allow_empty_first_page: Passed to Paginator
+            keyset_field: Indexed timestamp field pages are seeked on
+        """
+        super().__init__(object_list, per_page, orphans, allow_empty_first_page)
+        self.queryset = object_list
+        self.keyset_field = keyset_field
+        self.count_is_estimate = False
+
+    @cached_property
+    def count(self) -> int:
+        queryset = self.queryset
+        if not queryset.query.has_filters():
+            estimate = estimate_rows(queryset.model, queryset.db)
+            if estimate is not None and estimate > self.max_exact_count:
+                self.count_is_estimate = True
+                return estimate
+        count = queryset[: self.max_exact_count + 1].count()
+        if count > self.max_exact_count:
+            self.count_is_estimate = True
+            return self.max_exact_count
+        return count
+
+    def page_after(
+        self,
+        cursor: tuple[datetime, int] | None,
+    ) -> tuple[list[models.Model], str | None]:
+        """Get the page of rows after a position.
+
+        Args:
+            cursor: (keyset_field value, pk) of the last row of the previous
+                page, or None for the first page
+
+        Returns:
+            tuple: (rows, cursor of the next page or None on the last page)
+        """
+        queryset = self.queryset
+        field = self.keyset_field
+        if cursor is not None:
+            value, pk = cursor
+            # A range on the index, rather than an OR of two conditions
+            queryset = queryset.filter(**{f"{field}__lte": value}).filter(
+                Q(**{f"{field}__lt": value}) | Q(pk__lt=pk),
+            )
+        rows = list(queryset[: self.per_page + 1])
+        if len(rows) <= self.per_page:
+            return rows, None
+        rows = rows[: self.per_page]
+        last = rows[-1]
+        return rows, encode_cursor(getattr(last, field), last.pk)
+
+
+class KeysetChangeList(ChangeList):
+    """Change list paging by keyset while in its default order."""
+
+    def __init__(
+        self,
+        request: HttpRequest,
+        *args,
+        **kwargs,
+    ) -> None:
+        # Set before ChangeList.__init__, which gets the results
+        self.cursor = request.GET.get(CURSOR_VAR)
+        self.next_cursor: str | None = None
+        super().__init__(request, *args, **kwargs)
+        # Not a filter, and links to other filters and orders restart paging
+        self.params.pop(CURSOR_VAR, None)
+        self.filter_params.pop(CURSOR_VAR, None)
+
+    def get_filters_params(
+        self,
+        params: dict | None = None,
+    ) -> dict:
+        lookup_params = super().get_filters_params(params)
+        lookup_params.pop(CURSOR_VAR, None)
+        return lookup_params
+
+    @property
+    def keyset(self) -> bool:
+        """Whether the list is paged by keyset rather than page number."""
+        return ORDER_VAR not in self.params
+
+    def get_results(
+        self,
+        request: HttpRequest,
+    ) -> None:
+        if not self.keyset:
+            super().get_results(request)
+            self.count_is_estimate = self.paginator.count_is_estimate
+            return
+
+        # Rather than ChangeList.get_results, so only page_after reads rows
+        paginator = self.model_admin.get_paginator(
+            request,
+            self.queryset,
+            self.list_per_page,
+        )
+        assert isinstance(paginator, KeysetPaginator)
+        cursor = decode_cursor(self.cursor) if self.cursor else None
+        self.result_list, self.next_cursor = paginator.page_after(cursor)
+        self.result_count = paginator.count
+        self.count_is_estimate = paginator.count_is_estimate
+        self.show_full_result_count = self.model_admin.show_full_result_count
+        self.full_result_count = (
+            self.root_queryset.count() if self.show_full_result_count else None
+        )
+        self.show_admin_actions = not self.show_full_result_count or bool(
+            self.full_result_count,
+        )
+        self.multi_page = cursor is not None or self.next_cursor is not None
+        # Showing every row of a huge table is never what anyone wants
+        self.can_show_all = False
+        self.paginator = paginator
+
+    def get_next_url(self) -> str:
+        return self.get_query_string({CURSOR_VAR: self.next_cursor})
+
+    def get_first_url(self) -> str:
+        return self.get_query_string(remove=[CURSOR_VAR])
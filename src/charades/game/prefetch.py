@@ -0,0 +1,296 @@
+"""Speculative next-word prefetch.
+
+Most players start another game in the same language as soon as one ends,
+and generating the word costs an LLM round trip while they wait. As soon as
+a game completes, or a call is answered, the prefetcher predicts the
+player's next language from their recent sessions and generates a word for
+it on a background thread. The word is kept in the Django cache for
+settings.WORD_PREFETCH["ttl"] seconds, and starting a game in that language
+takes it instead of calling the LLM.
+
+A prefetched word the player doesn't use, because they picked another
+language, is returned to a small per-language pool. Pooled words serve the
+next game started in that language, or the next prefetch predicting it, and
+expire with the cache entry if nobody does.
+
+With several workers, configure a shared cache backend in CACHES so a word
+prefetched by one worker can be taken by another.
+"""
+
+import logging
+import threading
+from collections import Counter
+from concurrent.futures import Future
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.core.cache import BaseCache
+from django.core.cache import caches
+from django.db import close_old_connections
+
+from charades.game.ai import llm_manager
+from charades.game.metrics import WORD_PREFETCH
+from charades.game.models import GameSession
+from charades.game.models import Player
+from charades.game.sharding import shard_for
+
+logger = logging.getLogger(__name__)
+
+
+def predict_language(
+    player_id: int,
+    history: int,
+    using: str | None = None,
+) -> str | None:
+    """Predict the language of a player's next game.
+
+    The most common language among the player's recent sessions wins, with
+    ties going to the language played most recently.
+
+    Args:
+        player_id: Player primary key
+        history: Number of recent sessions considered
+        using: Database alias of the player's shard
+
+    Returns:
+        str | None: Uppercase language code, or None for a new player
+    """
+    recent = list(
+        GameSession.objects.using(using)
+        .filter(player_id=player_id)
+        .order_by("-started_at")
+        .values_list("language", flat=True)[:history],
+    )
+    if not recent:
+        return None
+    counts = Counter(recent)
+    # max() keeps the first of equal counts, i.e. the most recent
+    return max(recent, key=lambda language: counts[language]).upper()
+
+
+class WordPrefetcher:
+    """Generates each player's likely next word ahead of time."""
+
+    def __init__(self) -> None:
+        self._executor: ThreadPoolExecutor | None = None
+        # Prefetches in progress by player, with the language predicted
+        self._pending: dict[int, tuple[str, Future]] = {}
+        self._lock = threading.Lock()
+
+    @property
+    def cache(self) -> BaseCache:
+        return caches[settings.WORD_PREFETCH["cache"]]
+
+    @staticmethod
+    def player_key(
+        player_id: int,
+    ) -> str:
+        return f"charades:prefetch:player:{player_id}"
+
+    @staticmethod
+    def pool_key(
+        language_code: str,
+    ) -> str:
+        return f"charades:prefetch:pool:{language_code.upper()}"
+
+    def prefetch(
+        self,
+        phone_number: str,
+        player_id: int | None = None,
+    ) -> None:
+        """Start generating a player's likely next word.
+
+        Runs on a background thread unless settings.WORD_PREFETCH["background"]
+        is off. Does nothing if the player already has a word prefetched or
+        being prefetched. Given the player's id, the language is predicted up
+        front, so a game starting in another language needn't wait for it.
+
+        Args:
+            phone_number: Player phone number
+            player_id: Player primary key, if already looked up
+        """
+        config = settings.WORD_PREFETCH
+        if not config["enabled"]:
+            return
+        if not config["background"]:
+            self._prefetch(phone_number, player_id)
+            return
+
+        language_code = None
+        if player_id is not None:
+            with self._lock:
+                if player_id in self._pending:
+                    return
+            language_code = predict_language(
+                player_id,
+                history=config["history"],
+                using=shard_for(phone_number),
+            )
+            if language_code is None:
+                return
+
+        with self._lock:
+            if player_id is not None and player_id in self._pending:
+                return
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=config["workers"],
+                    thread_name_prefix="word-prefetch",
+                )
+            future = self._executor.submit(
+                self._run,
+                phone_number,
+                player_id,
+                language_code,
+            )
+            if player_id is not None and language_code is not None:
+                self._pending[player_id] = (language_code, future)
+        if player_id is not None:
+            # Outside the lock: a finished future runs the callback right away
+            future.add_done_callback(lambda _: self._forget(player_id))
+
+    def _forget(
+        self,
+        player_id: int,
+    ) -> None:
+        with self._lock:
+            self._pending.pop(player_id, None)
+
+    def _run(
+        self,
+        phone_number: str,
+        player_id: int | None,
+        language_code: str | None,
+    ) -> None:
+        try:
+            self._prefetch(phone_number, player_id, language_code)
+        except Exception as e:
+            logger.error(f"Failed to prefetch word: {str(e)}")
+        finally:
+            close_old_connections()
+
+    def _prefetch(
+        self,
+        phone_number: str,
+        player_id: int | None,
+        language_code: str | None = None,
+    ) -> None:
+        using = shard_for(phone_number)
+        if player_id is None:
+            player_id = (
+                Player.objects.using(using)
+                .filter(phone_number=phone_number)
+                .values_list("pk", flat=True)
+                .first()
+            )
+            if player_id is None:
+                return
+
+        cache = self.cache
+        key = self.player_key(player_id)
+        if cache.get(key) is not None:
+            return
+        if language_code is None:
+            language_code = predict_language(
+                player_id,
+                history=settings.WORD_PREFETCH["history"],
+                using=using,
+            )
+        if language_code is None:
+            return
+
+        if word := self._pop_pool(language_code):
+            WORD_PREFETCH.labels(outcome="reserved").inc()
+        else:
+            try:
+                word = llm_manager.get_random_word(language_code)
+            except Exception:
+                WORD_PREFETCH.labels(outcome="failed").inc()
+                raise
+            WORD_PREFETCH.labels(outcome="generated").inc()
+        cache.set(
+            key,
+            (language_code, word),
+            timeout=settings.WORD_PREFETCH["ttl"],
+        )
+
+    def _pop_pool(
+        self,
+        language_code: str,
+    ) -> str | None:
+        # Read-modify-write without a lock: a race can at worst hand the same
+        # word to two players or drop one, neither of which matters
+        key = self.pool_key(language_code)
+        words = self.cache.get(key)
+        if not words:
+            return None
+        word = words.pop()
+        self.cache.set(key, words, timeout=settings.WORD_PREFETCH["ttl"])
+        return word
+
+    def _return_to_pool(
+        self,
+        language_code: str,
+        word: str,
+    ) -> None:
+        key = self.pool_key(language_code)
+        words = self.cache.get(key) or []
+        if len(words) >= settings.WORD_PREFETCH["pool_size"]:
+            return
+        words.append(word)
+        self.cache.set(key, words, timeout=settings.WORD_PREFETCH["ttl"])
+        WORD_PREFETCH.labels(outcome="returned").inc()
+
+    def take(
+        self,
+        player_id: int,
+        language_code: str,
+    ) -> str | None:
+        """Take a prefetched word for a game the player is starting.
+
+        Waits for a prefetch this process still has in progress for the
+        player in that language, for up to
+        settings.WORD_PREFETCH["wait_seconds"], since it started before any
+        new LLM call would. Call it outside transactions, so none is held
+        open while waiting.
+
+        Args:
+            player_id: Player primary key
+            language_code: Language of the game being started
+
+        Returns:
+            str | None: A word, or None if none was prefetched
+        """
+        config = settings.WORD_PREFETCH
+        if not config["enabled"]:
+            return None
+        language_code = language_code.upper()
+
+        with self._lock:
+            predicted_language, pending = self._pending.get(player_id, (None, None))
+        if pending is not None and predicted_language == language_code:
+            try:
+                pending.result(timeout=config["wait_seconds"])
+            except Exception:
+                # Timed out, or failed and was logged by the prefetch thread
+                pass
+
+        cache = self.cache
+        key = self.player_key(player_id)
+        entry = cache.get(key)
+        if entry is not None:
+            cache.delete(key)
+            prefetched_language, word = entry
+            if prefetched_language == language_code:
+                WORD_PREFETCH.labels(outcome="hit").inc()
+                return word
+            self._return_to_pool(prefetched_language, word)
+
+        if word := self._pop_pool(language_code):
+            WORD_PREFETCH.labels(outcome="pooled").inc()
+            return word
+        WORD_PREFETCH.labels(outcome="miss").inc()
+        return None
+
+
+prefetcher = WordPrefetcher()
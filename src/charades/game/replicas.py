@@ -0,0 +1,220 @@
+"""Send read-only admin and reporting traffic to database replicas.
+
+Webhooks are latency critical and read what they just wrote, so they always
+use the primaries. Admin pages, stats reports and exports only read, can
+tolerate a little replication lag, and are the heaviest queries, so they go
+to the replicas in settings.DATABASE_REPLICAS when there are any.
+
+Where reads go is decided per request, or per block of code, and kept in a
+context variable:
+
+- `ReplicaRoutingMiddleware` reads from replicas for GET requests under
+  settings.DATABASE_REPLICA_ROUTING["paths"]. Staff can ask for either with
+  the X-Read-From header ("primary" or "replica"), anyone for the primary.
+- `read_from(REPLICA)` does the same for reporting code and commands.
+
+Once a request or block writes anything, its remaining reads go to the
+primary, and a browser that wrote keeps reading from primaries for
+DATABASE_REPLICA_ROUTING["sticky_seconds"] so it sees its own changes.
+
+Queries pinned to a database with `.using()` skip routers, so code that
+visits every shard should pass its alias through `read_alias`.
+"""
+
+import random
+from collections.abc import Callable
+from collections.abc import Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import Any
+
+from django.conf import settings
+from django.db import models
+from django.http import HttpRequest
+from django.http import HttpResponse
+
+from charades.game.sharding import ShardRouter
+
+PRIMARY = "primary"
+REPLICA = "replica"
+
+HEADER = "X-Read-From"
+STICKY_COOKIE = "charades_read_primary"
+
+
+@dataclass
+class _Routing:
+    read_from: str
+    wrote: bool = False
+
+
+_routing: ContextVar[_Routing | None] = ContextVar("charades_routing", default=None)
+
+
+@contextmanager
+def read_from(
+    preference: str,
+) -> Iterator[None]:
+    """Read from primaries or replicas within a block.
+
+    Args:
+        preference: PRIMARY or REPLICA
+    """
+    token = _routing.set(_Routing(preference))
+    try:
+        yield
+    finally:
+        _routing.reset(token)
+
+
+def primary_for(
+    alias: str,
+) -> str:
+    """Get the primary database a database alias replicates, or the alias."""
+    for primary, replicas in settings.DATABASE_REPLICAS.items():
+        if alias in replicas:
+            return primary
+    return alias
+
+
+def read_alias(
+    alias: str,
+) -> str:
+    """Get the database to read a database's rows from in this context.
+
+    Args:
+        alias: Database alias of a primary
+
+    Returns:
+        str: One of its replicas when reading from replicas and nothing has
+            been written yet, otherwise the alias itself
+    """
+    routing = _routing.get()
+    if routing is None or routing.read_from != REPLICA or routing.wrote:
+        return alias
+    replicas = settings.DATABASE_REPLICAS.get(alias)
+    return random.choice(replicas) if replicas else alias
+
+
+def _instance_alias(
+    **hints: Any,
+) -> str | None:
+    instance = hints.get("instance")
+    return instance._state.db if instance is not None else None
+
+
+class ReplicaRouter:
+    """Route reads to replicas and writes to primaries.
+
+    Sits in front of ShardRouter and asks it which primary a model instance
+    belongs on.
+    """
+
+    shards = ShardRouter()
+
+    def db_for_read(
+        self,
+        model: type[models.Model],
+        **hints: Any,
+    ) -> str | None:
+        alias = (
+            self.shards.db_for_read(model, **hints)
+            or _instance_alias(**hints)
+            or "default"
+        )
+        return read_alias(primary_for(alias))
+
+    def db_for_write(
+        self,
+        model: type[models.Model],
+        **hints: Any,
+    ) -> str | None:
+        routing = _routing.get()
+        if routing is not None:
+            routing.wrote = True
+        # An instance read from a replica is saved to its primary
+        alias = self.shards.db_for_write(model, **hints) or _instance_alias(**hints)
+        return primary_for(alias) if alias is not None else None
+
+    def allow_relation(
+        self,
+        obj1: models.Model,
+        obj2: models.Model,
+        **hints: Any,
+    ) -> bool | None:
+        if obj1._state.db is None or obj2._state.db is None:
+            return None
+        return primary_for(obj1._state.db) == primary_for(obj2._state.db) or None
+
+    def allow_migrate(
+        self,
+        db: str,
+        app_label: str,
+        model_name: str | None = None,
+        **hints: Any,
+    ) -> bool | None:
+        # Replicas get their schema from their primary
+        if primary_for(db) != db:
+            return False
+        return None
+
+
+class ReplicaRoutingMiddleware:
+    """Choose primaries or replicas for each request's reads."""
+
+    def __init__(
+        self,
+        get_response: Callable[[HttpRequest], HttpResponse],
+    ) -> None:
+        self.get_response = get_response
+
+    @staticmethod
+    def reporting(
+        request: HttpRequest,
+    ) -> bool:
+        """Whether a request is to a page that may read from replicas."""
+        paths = settings.DATABASE_REPLICA_ROUTING["paths"]
+        return request.path.startswith(tuple(paths))
+
+    def preference(
+        self,
+        request: HttpRequest,
+    ) -> str:
+        """Decide where a request reads from."""
+        override = request.headers.get(HEADER, "").lower()
+        if override == PRIMARY:
+            return PRIMARY
+        user = getattr(request, "user", None)
+        if override == REPLICA and user is not None and user.is_staff:
+            return REPLICA
+        if request.method not in ("GET", "HEAD") or STICKY_COOKIE in request.COOKIES:
+            return PRIMARY
+        return REPLICA if self.reporting(request) else PRIMARY
+
+    def __call__(
+        self,
+        request: HttpRequest,
+    ) -> HttpResponse:
+        routing = _Routing(self.preference(request))
+        token = _routing.set(routing)
+        try:
+            response = self.get_response(request)
+        finally:
+            _routing.reset(token)
+
+        sticky_seconds = settings.DATABASE_REPLICA_ROUTING["sticky_seconds"]
+        if (
+            routing.wrote
+            and sticky_seconds
+            and settings.DATABASE_REPLICAS
+            and self.reporting(request)
+        ):
+            response.set_cookie(
+                STICKY_COOKIE,
+                "1",
+                max_age=sticky_seconds,
+                httponly=True,
+                samesite="Lax",
+            )
+        return response
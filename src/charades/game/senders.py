@@ -0,0 +1,180 @@
+"""Senders delivering outbound SMS, chosen by settings.OUTBOUND_MESSAGES.
+
+The Twilio sender posts to Twilio's REST API with the TWILIO_* credentials;
+the stub sender only logs and remembers what it was asked to send, for
+development, tests and benchmarks. Both must be safe to call from several
+threads at once.
+"""
+
+import itertools
+import logging
+import threading
+import time
+from abc import ABC
+from abc import abstractmethod
+from typing import Any
+
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+
+class SendError(Exception):
+    """A message could not be sent."""
+
+    def __init__(
+        self,
+        message: str,
+        retryable: bool = True,
+    ) -> None:
+        """Initialize the error.
+
+        Args:
+            message: What went wrong
+            retryable: Whether sending the message again later may succeed
+        """
+        super().__init__(message)
+        self.retryable = retryable
+
+
+class MessageSender(ABC):
+    """Abstract base class for message senders."""
+
+    # Short identifier used in logs
+    name: str
+
+    @abstractmethod
+    def send(
+        self,
+        to_number: str,
+        body: str,
+    ) -> str:
+        """Send an SMS.
+
+        Args:
+            to_number: Recipient phone number in E.164 format
+            body: Message text
+
+        Returns:
+            str: The provider's id for the message
+
+        Raises:
+            SendError: If the message was not sent
+        """
+        pass
+
+
+class StubSender(MessageSender):
+    """Logs messages instead of sending them."""
+
+    name = "stub"
+
+    def __init__(
+        self,
+        latency: float = 0.0,
+    ) -> None:
+        """Initialize the sender.
+
+        Args:
+            latency: Seconds each send takes, to stand in for the API call
+        """
+        self.latency = latency
+        self.sent: list[tuple[str, str]] = []
+        self._ids = itertools.count(1)
+        self._lock = threading.Lock()
+
+    def send(
+        self,
+        to_number: str,
+        body: str,
+    ) -> str:
+        if self.latency:
+            time.sleep(self.latency)
+        with self._lock:
+            self.sent.append((to_number, body))
+            message_id = f"stub-{next(self._ids)}"
+        logger.info(f"Stub SMS {message_id} to {to_number}: {body}")
+        return message_id
+
+
+class TwilioSender(MessageSender):
+    """Sends messages through Twilio's REST API."""
+
+    name = "twilio"
+
+    def __init__(
+        self,
+        account_sid: str,
+        auth_token: str,
+        from_number: str,
+    ) -> None:
+        """Initialize the sender; the Twilio client is built on first send.
+
+        Args:
+            account_sid: Twilio account SID
+            auth_token: Twilio auth token
+            from_number: Twilio phone number messages are sent from
+        """
+        if not (account_sid and auth_token and from_number):
+            raise ValueError("Twilio credentials and phone number are required")
+        self.account_sid = account_sid
+        self.auth_token = auth_token
+        self.from_number = from_number
+        self._client: Any = None
+        self._lock = threading.Lock()
+
+    @property
+    def client(self) -> Any:
+        if self._client is None:
+            with self._lock:
+                if self._client is None:
+                    from twilio.rest import Client
+
+                    self._client = Client(self.account_sid, self.auth_token)
+        return self._client
+
+    def send(
+        self,
+        to_number: str,
+        body: str,
+    ) -> str:
+        from twilio.base.exceptions import TwilioRestException
+
+        try:
+            message = self.client.messages.create(
+                to=to_number,
+                from_=self.from_number,
+                body=body,
+            )
+        except TwilioRestException as e:
+            # Throttled or a Twilio outage; anything else, like an invalid or
+            # unsubscribed number, fails the same way every time
+            raise SendError(
+                f"Twilio error {e.code} ({e.status}): {e.msg}",
+                retryable=e.status == 429 or e.status >= 500,
+            ) from e
+        except Exception as e:
+            raise SendError(f"Twilio request failed: {str(e)}") from e
+        return message.sid
+
+
+def build_sender(
+    name: str,
+) -> MessageSender:
+    """Construct a sender by name.
+
+    Args:
+        name: "twilio" or "stub"
+
+    Returns:
+        MessageSender: The sender
+    """
+    if name == "twilio":
+        return TwilioSender(
+            account_sid=settings.TWILIO_ACCOUNT_SID,
+            auth_token=settings.TWILIO_AUTH_TOKEN,
+            from_number=settings.TWILIO_PHONE_NUMBER,
+        )
+    if name == "stub":
+        return StubSender()
+    raise ValueError(f"Unknown message sender: {name}")
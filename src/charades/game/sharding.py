@@ -0,0 +1,320 @@
+"""Spread players and their games over several databases.
+
+All game traffic is keyed by a player's phone number and no game spans two
+players, so each player's rows (Player, GameSession, PlayerStats,
+OutboundMessage and the LLMCall rows of their sessions) live together on one
+of the databases in settings.DATABASE_SHARDS. The shard is chosen by
+rendezvous hashing of the phone number: every shard scores the number and the
+highest score wins, so adding a shard only moves the players it now wins,
+about 1/N of them.
+
+`ShardRouter` sends reads and writes of a model instance to its player's
+shard. Queries that start from a model class rather than an instance can't
+be routed by Django, so code looking players up by phone number goes
+through `Player.get_or_create_player` or `shard_for`, and code reading
+across players queries every shard.
+
+Each shard allocates ids from its own range of settings.SHARD_ID_SPAN ids,
+by position in DATABASE_SHARDS, so ids stay unique across shards and
+in-memory indexes keyed by id, like the leaderboard, keep working. Only ever
+append to DATABASE_SHARDS. After adding a shard, migrate it and run the
+`rebalance_shards` command with traffic stopped to move players to the
+shards they now map to.
+"""
+
+import hashlib
+import logging
+from collections import Counter
+from typing import Any
+
+from django.apps import AppConfig
+from django.conf import settings
+from django.db import connections
+from django.db import models
+from django.db import transaction
+
+logger = logging.getLogger(__name__)
+
+SHARDED_APP = "game"
+
+
+def shards() -> list[str]:
+    """Database aliases players are spread over."""
+    return settings.DATABASE_SHARDS
+
+
+def shard_for(
+    phone_number: str,
+) -> str:
+    """Get the database alias a phone number's player lives on.
+
+    Args:
+        phone_number: The phone number in E.164 format
+
+    Returns:
+        str: Database alias
+    """
+    aliases = shards()
+    if len(aliases) == 1:
+        return aliases[0]
+    return max(
+        aliases,
+        key=lambda alias: hashlib.blake2b(
+            f"{alias}:{phone_number}".encode(),
+            digest_size=8,
+        ).digest(),
+    )
+
+
+def database_for(
+    instance: models.Model,
+) -> str | None:
+    """Get the database alias a player, or one of their rows, belongs on.
+
+    Uses the database the instance was loaded from or saved to, then its
+    player's, then its player's phone number.
+
+    Returns:
+        str | None: Database alias, or None if it can't be told
+    """
+    if instance._state.db is not None:
+        return instance._state.db
+    phone_number = getattr(instance, "phone_number", None)
+    if phone_number:
+        return shard_for(phone_number)
+    # Only follow relations already loaded, never query for them
+    for name in ("player", "session"):
+        descriptor = getattr(type(instance), name, None)
+        if descriptor is not None and descriptor.is_cached(instance):
+            related = getattr(instance, name)
+            if related is not None:
+                return database_for(related)
+    return None
+
+
+class ShardRouter:
+    """Route game models to their player's shard.
+
+    Everything else, and game rows not tied to a player, stays on the
+    default database.
+    """
+
+    def _route(
+        self,
+        model: type[models.Model],
+        **hints: Any,
+    ) -> str | None:
+        if model._meta.app_label != SHARDED_APP:
+            return None
+        instance = hints.get("instance")
+        if instance is None:
+            return None
+        return database_for(instance)
+
+    def db_for_read(
+        self,
+        model: type[models.Model],
+        **hints: Any,
+    ) -> str | None:
+        return self._route(model, **hints)
+
+    def db_for_write(
+        self,
+        model: type[models.Model],
+        **hints: Any,
+    ) -> str | None:
+        return self._route(model, **hints)
+
+    def allow_relation(
+        self,
+        obj1: models.Model,
+        obj2: models.Model,
+        **hints: Any,
+    ) -> bool | None:
+        return obj1._state.db == obj2._state.db or None
+
+    def allow_migrate(
+        self,
+        db: str,
+        app_label: str,
+        model_name: str | None = None,
+        **hints: Any,
+    ) -> bool | None:
+        if db == "default":
+            return None
+        if db in shards():
+            return app_label == SHARDED_APP
+        return None
+
+
+def id_range(
+    alias: str,
+) -> tuple[int, int]:
+    """Get the first and last id a shard allocates."""
+    index = shards().index(alias)
+    return index * settings.SHARD_ID_SPAN + 1, (index + 1) * settings.SHARD_ID_SPAN
+
+
+def sharded_models() -> list[type[models.Model]]:
+    """Models whose rows are spread over the shards."""
+    from django.apps import apps
+
+    return list(apps.get_app_config(SHARDED_APP).get_models())
+
+
+def reset_id_sequences(
+    alias: str,
+) -> None:
+    """Point a shard's id sequences at the next free id in its own range.
+
+    Needed after migrating a new shard, and after rows keeping their ids
+    were copied in from another shard, since SQLite advances a table's
+    sequence past any id inserted.
+
+    Args:
+        alias: Database alias of the shard
+    """
+    if alias not in shards():
+        return
+    first, last = id_range(alias)
+    connection = connections[alias]
+    with connection.cursor() as cursor:
+        for model in sharded_models():
+            table = connection.ops.quote_name(model._meta.db_table)
+            cursor.execute(
+                f"SELECT MAX(id) FROM {table} WHERE id BETWEEN %s AND %s",
+                [first, last],
+            )
+            current = cursor.fetchone()[0]
+            if connection.vendor == "sqlite":
+                seq = current if current is not None else first - 1
+                cursor.execute(
+                    "UPDATE sqlite_sequence SET seq = %s WHERE name = %s",
+                    [seq, model._meta.db_table],
+                )
+                if cursor.rowcount == 0:
+                    cursor.execute(
+                        "INSERT INTO sqlite_sequence (name, seq) VALUES (%s, %s)",
+                        [model._meta.db_table, seq],
+                    )
+            elif connection.vendor == "postgresql":
+                cursor.execute(
+                    "SELECT setval(pg_get_serial_sequence(%s, 'id'), %s, %s)",
+                    [
+                        model._meta.db_table,
+                        current if current is not None else first,
+                        current is not None,
+                    ],
+                )
+            else:
+                logger.warning(
+                    f"Can't set id ranges on {connection.vendor} shard {alias}",
+                )
+                return
+
+
+def reset_id_sequences_after_migrate(
+    sender: AppConfig,
+    using: str,
+    **kwargs: Any,
+) -> None:
+    """post_migrate handler giving newly migrated shards their id range."""
+    if sender.label == SHARDED_APP and len(shards()) > 1:
+        reset_id_sequences(using)
+
+
+def move_player(
+    player_id: int,
+    source: str,
+    target: str,
+) -> None:
+    """Move a player's rows from one shard to another, keeping their ids.
+
+    Rows are written to the target before being deleted from the source, so
+    an interrupted move leaves a copy behind on the target, which the next
+    move of the player replaces.
+
+    Args:
+        player_id: Player primary key
+        source: Database alias the player is on
+        target: Database alias to move the player to
+
+    Raises:
+        ValueError: If another player with the same phone number exists on
+            the target, e.g. created by traffic during the rebalance
+    """
+    from charades.game.models import GameSession
+    from charades.game.models import LLMCall
+    from charades.game.models import OutboundMessage
+    from charades.game.models import Player
+    from charades.game.models import PlayerStats
+
+    player = Player.objects.using(source).get(pk=player_id)
+    sessions = list(GameSession.objects.using(source).filter(player_id=player_id))
+    stats = list(PlayerStats.objects.using(source).filter(player_id=player_id))
+    calls = list(LLMCall.objects.using(source).filter(session__player_id=player_id))
+    messages = list(OutboundMessage.objects.using(source).filter(player_id=player_id))
+
+    with transaction.atomic(using=target):
+        if (
+            Player.objects.using(target)
+            .filter(phone_number=player.phone_number)
+            .exclude(pk=player_id)
+            .exists()
+        ):
+            raise ValueError(
+                f"Player {player_id} has a namesake on {target}; merge them first",
+            )
+        # Left behind by an interrupted move
+        LLMCall.objects.using(target).filter(pk__in=[c.pk for c in calls]).delete()
+        Player.objects.using(target).filter(pk=player_id).delete()
+
+        Player.objects.using(target).bulk_create([player])
+        GameSession.objects.using(target).bulk_create(sessions)
+        PlayerStats.objects.using(target).bulk_create(stats)
+        LLMCall.objects.using(target).bulk_create(calls)
+        OutboundMessage.objects.using(target).bulk_create(messages)
+
+    with transaction.atomic(using=source):
+        LLMCall.objects.using(source).filter(pk__in=[c.pk for c in calls]).delete()
+        Player.objects.using(source).filter(pk=player_id).delete()
+
+
+def rebalance(
+    dry_run: bool = False,
+    batch_size: int = 500,
+) -> Counter[tuple[str, str]]:
+    """Move every player whose phone number maps to another shard.
+
+    Args:
+        dry_run: Only count the players that would move
+        batch_size: Players read per database round trip
+
+    Returns:
+        Counter: Players moved (or to move) per (source, target) pair;
+            players that can't be moved are logged and left in place
+    """
+    from charades.game.models import Player
+
+    moved: Counter[tuple[str, str]] = Counter()
+    for source in shards():
+        misplaced = [
+            (player_id, target)
+            for player_id, phone_number in Player.objects.using(source)
+            .order_by("pk")
+            .values_list("pk", "phone_number")
+            .iterator(chunk_size=batch_size)
+            if (target := shard_for(phone_number)) != source
+        ]
+        for player_id, target in misplaced:
+            if not dry_run:
+                try:
+                    move_player(player_id, source, target)
+                except ValueError as e:
+                    logger.error(str(e))
+                    continue
+            moved[(source, target)] += 1
+    if not dry_run:
+        for alias in {target for _, target in moved}:
+            reset_id_sequences(alias)
+    return moved
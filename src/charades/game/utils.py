@@ -4,6 +4,8 @@ from twilio.twiml.messaging_response import MessagingResponse
 from twilio.twiml.voice_response import VoiceResponse
 from twilio.twiml.voice_response import Gather
 
+from charades.game.metrics import stage
+
 
 def create_twiml_response(message: str) -> str:
     """Create a TwiML response with the given message.
@@ -14,9 +16,10 @@ def create_twiml_response(message: str) -> str:
     Returns:
         str: The TwiML response as a string
     """
-    response = MessagingResponse()
-    response.message(message)
-    return str(response)
+    with stage("twiml_render"):
+        response = MessagingResponse()
+        response.message(message)
+        return str(response)
 
 
 def create_voice_response(
@@ -32,27 +35,53 @@ def create_voice_response(
     Returns:
         str: The TwiML response as a string
     """
-    response = VoiceResponse()
+    with stage("twiml_render"):
+        response = VoiceResponse()
+
+        # Add brief pause for better speech flow
+        message = message.replace("\n", ". ")
+
+        if gather_speech:
+            gather = Gather(
+                input="speech",
+                timeout=5,
+                action="/api/webhooks/twilio/voice/gather",
+                method="POST",
+            )
+            gather.say(message)
+            response.append(gather)
 
-    # Add brief pause for better speech flow
-    message = message.replace("\n", ". ")
+            # If no input received, redirect back to voice endpoint
+            response.redirect("/api/webhooks/twilio/voice")
+        else:
+            response.say(message)
 
-    if gather_speech:
-        gather = Gather(
-            input="speech",
-            timeout=5,
-            action="/api/webhooks/twilio/voice/gather",
-            method="POST",
-        )
-        gather.say(message)
-        response.append(gather)
+        return str(response)
+
+
+def create_hold_response(
+    message: str = "",
+    pause_seconds: int = 1,
+) -> str:
+    """Create a TwiML voice response that waits for a voice evaluation.
 
-        # If no input received, redirect back to voice endpoint
-        response.redirect("/api/webhooks/twilio/voice")
-    else:
-        response.say(message)
+    Speaks the message, if any, pauses, then redirects to the voice result
+    endpoint, which answers with the result or another hold response.
 
-    return str(response)
+    Args:
+        message: The message to speak before pausing
+        pause_seconds: Seconds to pause before redirecting
+
+    Returns:
+        str: The TwiML response as a string
+    """
+    with stage("twiml_render"):
+        response = VoiceResponse()
+        if message:
+            response.say(message)
+        response.pause(length=pause_seconds)
+        response.redirect("/api/webhooks/twilio/voice/result")
+        return str(response)
 
 
 # Message templates
@@ -89,7 +118,11 @@ MESSAGES = {
         "   - ZH (Chinese)\n"
         "2. I'll give you a word to describe\n"
         "3. Send your description and I'll evaluate it!\n\n"
-        "Or reply OPTOUT to stop playing."
+        "Reply DAILY and a language code (e.g. DAILY ES) to play today's "
+        "challenge, where everyone gets the same word.\n\n"
+        "Reply STATS, RANK or TOP to see how you're doing "
+        "(add a language code or WEEK to narrow it down), "
+        "or OPTOUT to stop playing."
     ),
     "not_opted_in": (
         "You're not currently opted in to LangGang Charades. "
@@ -100,6 +133,9 @@ MESSAGES = {
         "Your word is: {word}\n"
         "Please describe this word in {language}. I'll evaluate your description!"
     ),
+    "description_discarded": (
+        "Your description came too late to be scored. Please describe your word again."
+    ),
     "no_active_game": (
         "You don't have an active game! Send a language code "
         "(e.g. EN for English or KO for Korean) to start playing."
@@ -113,6 +149,51 @@ MESSAGES = {
         "Sorry, that language code isn't supported yet. "
         "Try: EN (English) or KO (Korean)"
     ),
+    "stats": (
+        "Your LangGang stats 📊\n"
+        "Games played: {games_played}\n"
+        "Average score: {mean_score:.0f}/100\n"
+        "Best score: {best_score}/100\n"
+        "Streak: {current_streak} day(s) (best {best_streak})"
+        "{languages}"
+    ),
+    "stats_language": "\n{language}: {games_played} games, avg {mean_score:.0f}",
+    "rank": "Your LangGang ranking{scope} 🏆{lines}",
+    "rank_line": "\n{window}: #{rank} of {total} ({points} pts)",
+    "rank_unranked": "\n{window}: not ranked yet",
+    "top": "Top players{scope} 🏆{lines}",
+    "top_line": "\n{rank}. {player} - {points} pts",
+    "top_empty": "Nobody has finished a game{scope} yet. Be the first!",
+    "challenge_new_game": (
+        "Today's {language} challenge! 🌟\n"
+        "Everyone gets the same word: {word}\n"
+        "Describe it in {language}, you get one try. "
+        "Reply DAILY TOP {code} to see the leaders."
+    ),
+    "challenge_rank": "\nToday's {language} challenge: #{rank} of {total} 🏆",
+    "challenge_played": (
+        "You've already played today's {language} challenge: {score}/100, "
+        "#{rank} of {total}. Come back tomorrow for a new word!"
+    ),
+    "challenge_forfeited": (
+        "You've already used your try at today's {language} challenge. "
+        "Come back tomorrow for a new word!"
+    ),
+    "challenge_top": "Today's {language} challenge 🏆{lines}",
+    "challenge_top_line": "\n{rank}. {player} - {score}/100",
+    "challenge_top_empty": (
+        "Nobody has finished today's {language} challenge yet. "
+        "Reply DAILY {code} to be the first!"
+    ),
+    "challenge_how_to": (
+        "Reply DAILY and a language code (e.g. DAILY ES) to play today's "
+        "challenge, where everyone gets the same word. "
+        "DAILY TOP ES shows today's leaders."
+    ),
+    "no_stats": (
+        "You haven't finished any games yet! Send a language code "
+        "(e.g. EN for English or KO for Korean) to start playing."
+    ),
 }
 
 VOICE_MESSAGES = {
@@ -131,6 +212,13 @@ VOICE_MESSAGES = {
         "Take your time, I'll listen to your description."
     ),
     "no_input": ("I didn't hear anything. Please try speaking again."),
+    "evaluating": ("Thanks! Let me think about your description."),
+    "evaluation_lost": (
+        "Sorry, I lost track of your description. Please describe your word again."
+    ),
+    "evaluation_timeout": (
+        "Sorry, that took too long to score. Please describe your word again."
+    ),
     "game_complete": (
         "Thanks for your description! "
         "Your score is {score} out of 100. "
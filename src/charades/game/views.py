@@ -1,3 +1,101 @@
-# from django.shortcuts import render
+"""Plain Django views for the game module."""
 
-# Create your views here.
+from django.conf import settings
+from django.contrib.admin.views.decorators import staff_member_required
+from django.contrib.auth.decorators import permission_required
+from django.db import DatabaseError
+from django.db import connection
+from django.http import HttpRequest
+from django.http import HttpResponse
+from django.http import JsonResponse
+from django.http import StreamingHttpResponse
+from django.http.response import HttpResponseBase
+
+from charades.game.ai import llm_manager
+from charades.game.exports import FORMATS
+from charades.game.exports import export_filename
+from charades.game.exports import parse_filters
+from charades.game.exports import stream_sessions
+from charades.game.metrics import render_metrics
+
+EXPORT_CONTENT_TYPES = {
+    "jsonl": "application/x-ndjson",
+    "csv": "text/csv; charset=utf-8",
+}
+
+
+def metrics(
+    request: HttpRequest,
+) -> HttpResponse:
+    """Expose Prometheus metrics in the text exposition format."""
+    payload, content_type = render_metrics()
+    return HttpResponse(payload, content_type=content_type)
+
+
+def ready(
+    request: HttpRequest,
+) -> JsonResponse:
+    """Report whether this worker can serve games.
+
+    The worker is ready when the database answers and at least one LLM
+    provider is reachable. Provider probes are reused for
+    settings.LLM_HTTP["probe_ttl"] seconds, so frequent readiness checks
+    don't each make a request to every provider.
+    """
+    # Imported here so loading the URLconf doesn't import httpx
+    from charades.game.ai.transport import pool_state
+
+    try:
+        connection.ensure_connection()
+        database = True
+    except DatabaseError:
+        database = False
+
+    providers = llm_manager.check_providers(
+        timeout=settings.LLM_HTTP["probe_timeout"],
+        max_age=settings.LLM_HTTP["probe_ttl"],
+    )
+    is_ready = database and any(provider["reachable"] for provider in providers)
+    return JsonResponse(
+        {
+            "ready": is_ready,
+            "database": database,
+            "providers": providers,
+            "http_pool": pool_state(),
+        },
+        status=200 if is_ready else 503,
+    )
+
+
+@staff_member_required
+@permission_required("game.view_gamesession", raise_exception=True)
+def export_sessions(
+    request: HttpRequest,
+) -> HttpResponseBase:
+    """Stream game sessions as a JSONL or CSV download.
+
+    Query parameters: 'since', 'until', 'language' and 'status' filter the
+    sessions, see charades.game.exports.parse_filters; 'format' is 'jsonl'
+    (the default) or 'csv'; 'gzip', with any value, compresses the file.
+    """
+    export_format = request.GET.get("format", "jsonl")
+    if export_format not in FORMATS:
+        return JsonResponse(
+            {"error": f"Format must be one of {', '.join(FORMATS)}"},
+            status=400,
+        )
+    try:
+        filters = parse_filters(request.GET)
+    except ValueError as e:
+        return JsonResponse({"error": str(e)}, status=400)
+
+    compress = "gzip" in request.GET
+    response = StreamingHttpResponse(
+        stream_sessions(filters, format=export_format, compress=compress),
+        content_type=(
+            "application/gzip" if compress else EXPORT_CONTENT_TYPES[export_format]
+        ),
+    )
+    filename = export_filename(export_format, compress)
+    response["Content-Disposition"] = f'attachment; filename="{filename}"'
+    return response
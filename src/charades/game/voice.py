@@ -0,0 +1,213 @@
+"""Voice description evaluation off the webhook request path.
+
+Evaluating a description takes an LLM call, long enough for a caller to sit
+in silence and for Twilio's webhook timeout to be at risk. Instead the gather
+webhook starts the evaluation on a background thread and answers at once
+with a short message, a pause and a redirect to the result endpoint. The
+result endpoint speaks the score once it is ready, or pauses and redirects
+back to itself until it is.
+
+Evaluations are tracked by CallSid in the Django cache, so the result can be
+served by whichever worker Twilio's redirect reaches; with several workers
+CACHES must point at a shared backend. An evaluation that runs past the
+timeout is cancelled, and only completes its game if it got there first.
+"""
+
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.core.cache import BaseCache
+from django.core.cache import caches
+from django.db import close_old_connections
+
+from charades.game.logic import handle_word_description
+from charades.game.metrics import VOICE_EVALUATION_SECONDS
+from charades.game.models import Player
+from charades.game.utils import MESSAGES
+from charades.game.utils import create_twiml_response
+
+logger = logging.getLogger(__name__)
+
+PENDING = "pending"
+DONE = "done"
+COMPLETED = "completed"
+CANCELLED = "cancelled"
+
+
+class VoiceEvaluations:
+    """Runs voice description evaluations and holds their results."""
+
+    def __init__(self) -> None:
+        self._executor: ThreadPoolExecutor | None = None
+        self._lock = threading.Lock()
+
+    @property
+    def cache(self) -> BaseCache:
+        return caches[settings.VOICE_EVALUATION["cache"]]
+
+    @staticmethod
+    def key(
+        call_sid: str,
+    ) -> str:
+        return f"charades:voice:evaluation:{call_sid}"
+
+    def _claim(
+        self,
+        call_sid: str,
+        started_at: float,
+        outcome: str,
+    ) -> bool:
+        """Settle whether an evaluation completes its game or is cancelled.
+
+        The first of COMPLETED and CANCELLED to be claimed for an evaluation
+        wins; cache.add() makes that atomic across workers.
+        """
+        return self.cache.add(
+            f"{self.key(call_sid)}:{started_at}:outcome",
+            outcome,
+            timeout=settings.VOICE_EVALUATION["ttl"],
+        )
+
+    def start(
+        self,
+        call_sid: str,
+        player: Player,
+        description: str,
+    ) -> None:
+        """Start evaluating a caller's description.
+
+        Runs on a background thread unless
+        settings.VOICE_EVALUATION["background"] is off. A repeated gather for
+        a call whose evaluation is still pending doesn't start another.
+
+        Args:
+            call_sid: Twilio CallSid of the call
+            player: The Player instance
+            description: The caller's speech recognition result
+        """
+        config = settings.VOICE_EVALUATION
+        state = {"status": PENDING, "started_at": time.time()}
+        # add() only succeeds if nothing is pending for the call yet
+        if not self.cache.add(self.key(call_sid), state, timeout=config["ttl"]):
+            existing = self.cache.get(self.key(call_sid))
+            if existing is not None and existing["status"] == PENDING:
+                return
+            self.cache.set(self.key(call_sid), state, timeout=config["ttl"])
+
+        if not config["background"]:
+            self._evaluate(call_sid, player, description, state["started_at"])
+            return
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=config["workers"],
+                    thread_name_prefix="voice-evaluation",
+                )
+        self._executor.submit(
+            self._run,
+            call_sid,
+            player,
+            description,
+            state["started_at"],
+        )
+
+    def _run(
+        self,
+        call_sid: str,
+        player: Player,
+        description: str,
+        started_at: float,
+    ) -> None:
+        try:
+            self._evaluate(call_sid, player, description, started_at)
+        finally:
+            close_old_connections()
+
+    def _evaluate(
+        self,
+        call_sid: str,
+        player: Player,
+        description: str,
+        started_at: float,
+    ) -> None:
+        discarded = False
+
+        def should_complete() -> bool:
+            nonlocal discarded
+            discarded = not self._claim(call_sid, started_at, COMPLETED)
+            return not discarded
+
+        try:
+            result = handle_word_description(player, description, should_complete)
+        except Exception as e:
+            logger.error(f"Voice evaluation for {call_sid} failed: {str(e)}")
+            result = {
+                "twiml": create_twiml_response(MESSAGES["error_generic"]),
+                "code": 400,
+            }
+        if discarded:
+            # Timed out; the caller was asked for a new description, which
+            # may already be pending under the same key
+            logger.info(f"Discarded late voice evaluation for {call_sid}")
+            return
+        VOICE_EVALUATION_SECONDS.labels(phase="evaluation").observe(
+            time.time() - started_at,
+        )
+        self.cache.set(
+            self.key(call_sid),
+            {
+                "status": DONE,
+                "started_at": started_at,
+                "twiml": result["twiml"],
+                "code": result["code"],
+            },
+            timeout=settings.VOICE_EVALUATION["ttl"],
+        )
+
+    def get(
+        self,
+        call_sid: str,
+    ) -> dict | None:
+        """Get the state of a call's evaluation.
+
+        Args:
+            call_sid: Twilio CallSid of the call
+
+        Returns:
+            dict | None: 'status' and 'started_at' (epoch seconds), plus
+                'twiml' and 'code' of the game response once done; None if
+                no evaluation is known for the call
+        """
+        return self.cache.get(self.key(call_sid))
+
+    def cancel(
+        self,
+        call_sid: str,
+        started_at: float,
+    ) -> bool:
+        """Stop an overdue evaluation from completing its game.
+
+        Args:
+            call_sid: Twilio CallSid of the call
+            started_at: 'started_at' of the evaluation's state
+
+        Returns:
+            bool: False if it is already completing, so its result will come
+        """
+        if not self._claim(call_sid, started_at, CANCELLED):
+            return False
+        self.finish(call_sid)
+        return True
+
+    def finish(
+        self,
+        call_sid: str,
+    ) -> None:
+        """Forget a call's evaluation once its result has been spoken."""
+        self.cache.delete(self.key(call_sid))
+
+
+voice_evaluations = VoiceEvaluations()
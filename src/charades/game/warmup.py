@@ -0,0 +1,33 @@
+"""Optional warmup for serving workers.
+
+Providers and the leaderboard are built lazily, so the first request a worker
+handles pays for importing the LLM SDKs, building their clients, connecting
+to the provider APIs and loading rankings. Serving workers can do that work
+before taking traffic instead: call `warmup()` once per worker, e.g. from
+gunicorn's `post_worker_init` hook with
+`post_worker_init = charades.game.warmup.post_worker_init`.
+"""
+
+import logging
+import time
+from typing import Any
+
+from charades.game import ai
+from charades.game.leaderboard import leaderboard
+
+logger = logging.getLogger(__name__)
+
+
+def warmup() -> None:
+    """Build LLM provider clients, open their connections and load rankings."""
+    start = time.perf_counter()
+    ai.warmup()
+    leaderboard.rebuild()
+    logger.info(f"Worker warmed up in {time.perf_counter() - start:.2f}s")
+
+
+def post_worker_init(
+    worker: Any,
+) -> None:
+    """Gunicorn post_worker_init hook warming up each new worker."""
+    warmup()
@@ -0,0 +1,108 @@
+"""Tests for recording and replaying LLM cassettes."""
+
+import json
+from unittest.mock import patch
+
+import pytest
+
+from charades.game.ai.cassette import CassetteMissError
+from charades.game.ai.cassette import RecordingProvider
+from charades.game.ai.cassette import ReplayProvider
+from charades.game.ai.fake import FakeProvider
+from charades.game.ai.manager import LLMProviderManager
+from charades.game.logic import handle_word_description
+from charades.game.models import GameSession
+from charades.game.models import LLMCall
+from charades.game.models import Player
+
+
+@pytest.fixture(autouse=True)
+def synchronous_ledger(settings):
+    """Write ledger records immediately instead of on a background thread."""
+    settings.LLM_LEDGER_BACKGROUND = False
+
+
+@pytest.fixture
+def cassette(tmp_path):
+    """Fixture recording a few fake provider calls to a cassette."""
+    path = tmp_path / "calls.jsonl"
+    recorder = RecordingProvider(
+        FakeProvider(latency="fixed", latency_ms=5),
+        path,
+    )
+    words = [recorder.get_random_word("es") for _ in range(3)]
+    evaluation = recorder.evaluate_description("apple", "una fruta roja", "es")
+    return path, words, evaluation
+
+
+class TestCassette:
+    """Tests for cassette round trips."""
+
+    def test_cassette_is_jsonl(self, cassette):
+        """Test that each call is one JSON line with latency and usage."""
+        path, _, _ = cassette
+        entries = [json.loads(line) for line in path.read_text().splitlines()]
+
+        assert [entry["operation"] for entry in entries] == [
+            "word_generation",
+            "word_generation",
+            "word_generation",
+            "evaluation",
+        ]
+        assert all(entry["latency_ms"] >= 5 for entry in entries)
+        assert entries[-1]["usage"] is None
+
+    def test_replay_in_recorded_order(self, cassette):
+        """Test that repeated requests replay their recordings in order."""
+        path, words, evaluation = cassette
+        replay = ReplayProvider(path, replay_latency=False)
+
+        assert len(replay) == 4
+        assert [replay.get_random_word("es") for _ in range(3)] == words
+        assert replay.evaluate_description("apple", "una fruta roja", "es") == (
+            evaluation
+        )
+
+    def test_replay_miss(self, cassette):
+        """Test that unrecorded requests raise."""
+        path, _, _ = cassette
+        replay = ReplayProvider(path, replay_latency=False)
+
+        with pytest.raises(CassetteMissError):
+            replay.evaluate_description("apple", "something else", "es")
+
+    def test_replay_parse_failure(self, tmp_path):
+        """Test that recorded parse failures replay as parse failures."""
+        path = tmp_path / "malformed.jsonl"
+        recorder = RecordingProvider(
+            FakeProvider(latency="fixed", latency_ms=0, malformed_rate=1.0),
+            path,
+        )
+        with pytest.raises(json.JSONDecodeError):
+            recorder.evaluate_description("apple", "roja", "es")
+
+        with pytest.raises(json.JSONDecodeError):
+            ReplayProvider(path, replay_latency=False).evaluate_description(
+                "apple",
+                "roja",
+                "es",
+            )
+
+    @pytest.mark.django_db
+    def test_word_description_from_cassette(self, cassette):
+        """Test handle_word_description end to end on replayed traffic."""
+        path, _, (score, feedback) = cassette
+        replay = ReplayProvider(path, replay_latency=False)
+        player = Player.objects.create(phone_number="+12065550177", is_active=True)
+        session = GameSession.objects.create(player=player, word="apple", language="es")
+
+        with patch(
+            "charades.game.ai_utils.llm_manager",
+            LLMProviderManager(primary=replay, fallback=replay),
+        ):
+            response = handle_word_description(player, "una fruta roja")
+
+        assert response["code"] == 200
+        session.refresh_from_db()
+        assert (session.score, session.feedback) == (score, feedback)
+        assert LLMCall.objects.get(session=session).provider == "replay"
@@ -0,0 +1,77 @@
+"""Tests for the fake LLM provider."""
+
+import json
+import statistics
+
+import pytest
+
+from charades.game.ai.fake import FakeProvider
+from charades.game.ai.fake import FakeProviderError
+from charades.game.ai.fake import WORDS
+from charades.game.ai.manager import LLMProviderManager
+
+
+@pytest.fixture(autouse=True)
+def synchronous_ledger(settings):
+    """Write ledger records immediately instead of on a background thread."""
+    settings.LLM_LEDGER_BACKGROUND = False
+
+
+def instant_provider(**kwargs) -> FakeProvider:
+    """Build a fake provider that does not sleep."""
+    return FakeProvider(latency="fixed", latency_ms=0, **kwargs)
+
+
+class TestFakeProvider:
+    """Tests for deterministic fake responses."""
+
+    def test_words_are_deterministic(self):
+        """Test that providers with the same seed produce the same words."""
+        first = instant_provider(seed=3)
+        second = instant_provider(seed=3)
+
+        words = [first.get_random_word("es") for _ in range(5)]
+        assert words == [second.get_random_word("ES") for _ in range(5)]
+        assert set(words) <= set(WORDS)
+
+    def test_scores_depend_only_on_input(self):
+        """Test that evaluation is a pure function of its inputs."""
+        provider = instant_provider()
+        result = provider.evaluate_description("apple", "una fruta roja", "es")
+
+        assert result == instant_provider(seed=99).evaluate_description(
+            "apple",
+            "una fruta roja",
+            "es",
+        )
+        assert 0 <= result[0] <= 100
+
+    def test_malformed_json(self):
+        """Test that malformed responses fail to parse."""
+        provider = instant_provider(malformed_rate=1.0)
+        with pytest.raises(json.JSONDecodeError):
+            provider.evaluate_description("apple", "una fruta", "es")
+
+    def test_failure_rate(self):
+        """Test that simulated failures raise."""
+        provider = instant_provider(failure_rate=1.0)
+        with pytest.raises(FakeProviderError):
+            provider.get_random_word("es")
+
+    @pytest.mark.parametrize("latency", ["lognormal", "heavy_tail"])
+    def test_latency_median(self, latency):
+        """Test that sampled latencies center on the configured median."""
+        provider = FakeProvider(latency=latency, latency_ms=100, seed=1)
+        samples = [provider.sample_latency_ms() for _ in range(2000)]
+
+        assert 85 < statistics.median(samples) < 115
+        assert min(samples) > 0
+
+    @pytest.mark.django_db
+    def test_manager_falls_back(self):
+        """Test that the manager falls back when the fake primary fails."""
+        manager = LLMProviderManager(
+            primary=instant_provider(failure_rate=1.0),
+            fallback=instant_provider(),
+        )
+        assert manager.get_random_word("ko") in WORDS
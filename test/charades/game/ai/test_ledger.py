@@ -0,0 +1,119 @@
+"""Tests for the LLM call ledger."""
+
+import json
+
+import pytest
+
+from charades.game.ai import ledger
+from charades.game.ai.base import LLMProvider
+from charades.game.ai.manager import LLMProviderManager
+from charades.game.models import GameSession
+from charades.game.models import LLMCall
+from charades.game.models import Player
+
+
+class StubProvider(LLMProvider):
+    """Provider returning canned results and reporting fixed usage."""
+
+    def __init__(
+        self,
+        name: str,
+        error: Exception | None = None,
+    ) -> None:
+        self.name = name
+        self.error = error
+
+    def get_random_word(
+        self,
+        language_code: str,
+    ) -> str:
+        ledger.note_usage(
+            model=f"{self.name}-model", prompt_tokens=12, completion_tokens=2
+        )
+        if self.error:
+            raise self.error
+        return "gato"
+
+    def evaluate_description(
+        self,
+        word: str,
+        description: str,
+        language: str,
+    ) -> tuple[int, str]:
+        ledger.note_usage(
+            model=f"{self.name}-model",
+            prompt_tokens=200,
+            completion_tokens=40,
+            cached_tokens=128,
+        )
+        if self.error:
+            raise self.error
+        return 80, "Good"
+
+
+@pytest.fixture(autouse=True)
+def synchronous_ledger(settings):
+    """Write ledger records immediately instead of on a background thread."""
+    settings.LLM_LEDGER_BACKGROUND = False
+
+
+@pytest.fixture
+def session():
+    """Fixture for an active game session."""
+    player = Player.objects.create(phone_number="+12065550111")
+    return GameSession.objects.create(player=player, word="gato", language="es")
+
+
+@pytest.mark.django_db
+class TestLedger:
+    """Tests for recording LLM calls."""
+
+    def test_capture_links_calls_to_session(self, session):
+        """Test that captured calls are written with usage and session."""
+        manager = LLMProviderManager(
+            primary=StubProvider("primary"),
+            fallback=StubProvider("fallback"),
+        )
+        with ledger.capture(session_id=session.pk):
+            manager.evaluate_description("gato", "un animal", "es")
+
+        call = LLMCall.objects.get()
+        assert call.session == session
+        assert call.operation == "evaluation"
+        assert call.provider == "primary"
+        assert call.model == "primary-model"
+        assert call.outcome == "success"
+        assert (call.prompt_tokens, call.completion_tokens, call.cached_tokens) == (
+            200,
+            40,
+            128,
+        )
+
+    def test_fallback_and_parse_failure_outcomes(self, session):
+        """Test outcomes when the primary returns unparseable output."""
+        manager = LLMProviderManager(
+            primary=StubProvider("primary", error=json.JSONDecodeError("x", "", 0)),
+            fallback=StubProvider("fallback"),
+        )
+        with ledger.capture() as llm_calls:
+            manager.get_random_word("es")
+            llm_calls.session_id = session.pk
+
+        outcomes = dict(
+            LLMCall.objects.filter(session=session).values_list("provider", "outcome"),
+        )
+        assert outcomes == {"primary": "parse_failure", "fallback": "fallback"}
+
+    def test_uncaptured_calls_are_still_recorded(self):
+        """Test that calls outside a capture are written without a session."""
+        manager = LLMProviderManager(
+            primary=StubProvider("primary", error=RuntimeError("down")),
+            fallback=StubProvider("fallback", error=RuntimeError("down")),
+        )
+        with pytest.raises(RuntimeError):
+            manager.get_random_word("es")
+
+        assert list(LLMCall.objects.values_list("session", "outcome")) == [
+            (None, "error"),
+            (None, "error"),
+        ]
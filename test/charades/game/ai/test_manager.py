@@ -0,0 +1,175 @@
+"""Tests for load balancing and fallback across LLM providers."""
+
+import random
+
+import pytest
+from prometheus_client import REGISTRY
+
+from charades.game.ai.fake import FakeProvider
+from charades.game.ai.fake import FakeProviderError
+from charades.game.ai.manager import LLMCapacityError
+from charades.game.ai.manager import LLMProviderManager
+from charades.game.ai.registry import LazyProvider
+from charades.game.ai.registry import ProviderEntry
+from charades.game.ai.registry import build_entries
+
+
+@pytest.fixture(autouse=True)
+def synchronous_ledger(settings):
+    """Write ledger records immediately instead of on a background thread."""
+    settings.LLM_LEDGER_BACKGROUND = False
+
+
+class CountingProvider(FakeProvider):
+    """Instant fake provider that counts its calls."""
+
+    def __init__(self, **kwargs) -> None:
+        super().__init__(latency="fixed", latency_ms=0, **kwargs)
+        self.calls = 0
+
+    def get_random_word(self, language_code: str) -> str:
+        self.calls += 1
+        return super().get_random_word(language_code)
+
+
+def entry(name: str, weight: float = 1.0, **kwargs) -> ProviderEntry:
+    """Build an entry around a counting provider."""
+    failure_rate = kwargs.pop("failure_rate", 0)
+    return ProviderEntry(
+        name=name,
+        provider=CountingProvider(failure_rate=failure_rate),
+        weight=weight,
+        **kwargs,
+    )
+
+
+def calls(provider_entry: ProviderEntry) -> int:
+    """Count the calls an entry's provider received."""
+    assert isinstance(provider_entry.provider, CountingProvider)
+    return provider_entry.provider.calls
+
+
+@pytest.mark.django_db
+class TestLLMProviderManager:
+    """Tests for choosing providers."""
+
+    def test_spreads_by_weight(self):
+        """Test that first attempts follow entry weights."""
+        heavy, light, standby = entry("heavy", 3), entry("light", 1), entry("s", 0)
+        manager = LLMProviderManager(
+            entries=[heavy, light, standby],
+            rng=random.Random(1),
+        )
+        for _ in range(400):
+            manager.get_random_word("es")
+
+        assert calls(standby) == 0
+        assert 0.65 < calls(heavy) / 400 < 0.85
+        assert calls(heavy) + calls(light) == 400
+
+    def test_falls_back_in_order(self):
+        """Test that failures move on to the next entry in pool order."""
+        failing = entry("failing", failure_rate=1)
+        first, second = entry("first", 0), entry("second", 0)
+        manager = LLMProviderManager(entries=[failing, first, second])
+
+        manager.get_random_word("es")
+
+        assert (calls(failing), calls(first), calls(second)) == (1, 1, 0)
+
+    def test_raises_last_error_when_all_fail(self):
+        """Test that the error surfaces once every entry has failed."""
+        manager = LLMProviderManager(
+            entries=[entry("a", failure_rate=1), entry("b", 0, failure_rate=1)],
+        )
+        with pytest.raises(FakeProviderError):
+            manager.get_random_word("es")
+
+    def test_counts_only_fallbacks_that_run(self):
+        """Test that a failure with nothing left to try isn't a fallback."""
+
+        def fallbacks() -> float:
+            value = REGISTRY.get_sample_value(
+                "charades_llm_fallbacks_total",
+                {"operation": "word_generation"},
+            )
+            return value or 0.0
+
+        before = fallbacks()
+        LLMProviderManager(
+            entries=[entry("failing", failure_rate=1), entry("standby", 0)],
+        ).get_random_word("es")
+        assert fallbacks() == before + 1
+
+        with pytest.raises(FakeProviderError):
+            LLMProviderManager(
+                entries=[entry("failing", failure_rate=1)],
+            ).get_random_word("es")
+        assert fallbacks() == before + 1
+
+    def test_skips_entries_at_capacity(self):
+        """Test that a saturated entry is passed over."""
+        busy, spare = entry("busy", max_concurrency=1), entry("spare", 0)
+        manager = LLMProviderManager(entries=[busy, spare])
+        assert busy.acquire()
+
+        manager.get_random_word("es")
+        busy.release()
+
+        assert (calls(busy), calls(spare)) == (0, 1)
+
+    def test_waits_for_capacity(self):
+        """Test that a call fails once no slot frees up in time."""
+        busy = entry("busy", max_concurrency=1)
+        manager = LLMProviderManager(entries=[busy], queue_timeout=0.01)
+        assert busy.acquire()
+
+        with pytest.raises(LLMCapacityError):
+            manager.get_random_word("es")
+
+    def test_unhealthy_entry_cools_down(self):
+        """Test that repeated failures take an entry out of rotation."""
+        failing = entry("failing", failure_rate=1, failure_threshold=2)
+        standby = entry("standby", 0)
+        manager = LLMProviderManager(entries=[failing, standby])
+
+        for _ in range(4):
+            manager.get_random_word("es")
+
+        assert not failing.is_healthy()
+        assert (calls(failing), calls(standby)) == (2, 4)
+
+
+class TestBuildEntries:
+    """Tests for building the pool from settings."""
+
+    def test_builds_lazy_entries(self, monkeypatch):
+        """Test names, weights, caps and API keys from configuration."""
+        monkeypatch.setenv("SECOND_OPENAI_KEY", "sk-second")
+        entries = build_entries(
+            [
+                {"provider": "openai", "model": "gpt-4o", "max_concurrency": 4},
+                {"provider": "openai", "api_key_env": "SECOND_OPENAI_KEY"},
+                {"provider": "anthropic", "name": "claude", "weight": 0},
+            ],
+        )
+
+        assert [e.name for e in entries] == ["openai", "openai-2", "claude"]
+        assert [e.weight for e in entries] == [1.0, 1.0, 0]
+        assert entries[0].max_concurrency == 4
+        assert all(isinstance(e.provider, LazyProvider) for e in entries)
+        providers = [e.provider for e in entries]
+        assert isinstance(providers[0], LazyProvider)
+        assert isinstance(providers[1], LazyProvider)
+        assert providers[0].options == {"model": "gpt-4o"}
+        assert providers[1].options == {"api_key": "sk-second"}
+
+    def test_rejects_duplicate_names(self):
+        """Test that explicit names must be unique."""
+        with pytest.raises(ValueError):
+            build_entries(
+                [
+                    {"provider": "fake", "name": "x"},
+                    {"provider": "openai", "name": "x"},
+                ],
+            )
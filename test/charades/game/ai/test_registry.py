@@ -0,0 +1,50 @@
+"""Tests for the lazy LLM provider registry."""
+
+import pytest
+
+from charades.game.ai.cassette import RecordingProvider
+from charades.game.ai.fake import FakeProvider
+from charades.game.ai.registry import LazyProvider
+from charades.game.ai.registry import build_provider
+
+
+@pytest.fixture
+def instant_fake(settings):
+    """Make settings-built fake providers respond without sleeping."""
+    settings.FAKE_LLM = {**settings.FAKE_LLM, "latency": "fixed", "latency_ms": 0}
+
+
+class TestLazyProvider:
+    """Tests for deferred provider construction."""
+
+    def test_unknown_provider(self):
+        """Test that a misconfigured provider fails at startup."""
+        with pytest.raises(ValueError):
+            LazyProvider("nonexistent")
+
+    def test_builds_on_first_call(self, instant_fake):
+        """Test that nothing is constructed until the provider is used."""
+        provider = LazyProvider("fake")
+        assert provider.name == "fake"
+        assert not provider.is_built
+
+        word = provider.get_random_word("es")
+
+        assert provider.is_built
+        assert isinstance(provider.provider, FakeProvider)
+        assert word == FakeProvider(latency_ms=0).get_random_word("es")
+
+    def test_builds_once(self, instant_fake):
+        """Test that the built provider is reused."""
+        provider = LazyProvider("fake")
+        assert provider.provider is provider.provider
+
+    def test_build_provider_records_when_configured(self, settings, tmp_path):
+        """Test that a cassette record path wraps the provider."""
+        settings.LLM_CASSETTE = {
+            **settings.LLM_CASSETTE,
+            "record_path": str(tmp_path / "calls.jsonl"),
+        }
+        provider = build_provider("fake")
+        assert isinstance(provider, RecordingProvider)
+        assert provider.name == "fake"
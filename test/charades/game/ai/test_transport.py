@@ -0,0 +1,134 @@
+"""Tests for the shared provider HTTP transport and readiness checks."""
+
+import threading
+from http.server import BaseHTTPRequestHandler
+from http.server import ThreadingHTTPServer
+from unittest.mock import patch
+
+import pytest
+from django.test import Client
+
+from charades.game.ai import transport
+from charades.game.ai.fake import FakeProvider
+from charades.game.ai.manager import LLMProviderManager
+from charades.game.ai.registry import ProviderEntry
+from charades.game.ai.transport import pool_state
+from charades.game.ai.transport import probe
+from charades.game.ai.transport import warm_connections
+
+
+class APIRootHandler(BaseHTTPRequestHandler):
+    """Answers like an API root: 404 for everything, over keep-alive."""
+
+    protocol_version = "HTTP/1.1"
+
+    def do_HEAD(self):
+        self.send_response(404)
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture(autouse=True)
+def forget_probes():
+    """Don't reuse probes of ports from earlier tests."""
+    transport._probes.clear()
+    yield
+    transport._probes.clear()
+
+
+@pytest.fixture
+def api_url():
+    """Run a local stand-in for a provider API."""
+    server = ThreadingHTTPServer(("127.0.0.1", 0), APIRootHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_address[1]}/v1"
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def unreachable_url():
+    """A URL nothing listens on."""
+    server = ThreadingHTTPServer(("127.0.0.1", 0), APIRootHandler)
+    port = server.server_address[1]
+    server.server_close()
+    return f"http://127.0.0.1:{port}/v1"
+
+
+class NetworkProvider(FakeProvider):
+    """Instant fake provider that claims an API root."""
+
+    def __init__(self, base_url: str) -> None:
+        super().__init__(latency="fixed", latency_ms=0)
+        self.base_url = base_url
+
+
+class TestTransport:
+    """Tests for probing and warming pooled connections."""
+
+    def test_probe(self, api_url, unreachable_url):
+        """Test that any HTTP answer counts as reachable."""
+        assert probe(api_url)[0]
+        assert not probe(unreachable_url, timeout=1)[0]
+
+    def test_recent_probe_reused(self, unreachable_url):
+        """Test that a probe within max_age isn't repeated."""
+        assert not probe(unreachable_url, timeout=1)[0]
+
+        with patch("charades.game.ai.transport.get_http_client") as mock_client:
+            assert not probe(unreachable_url, timeout=1, max_age=60)[0]
+            mock_client.assert_not_called()
+
+            probe(unreachable_url, timeout=1)
+            mock_client.assert_called_once()
+
+    def test_warm_connections_fill_pool(self, api_url):
+        """Test that warmup makes requests and returns every connection."""
+        assert warm_connections([api_url, api_url], connections_per_host=2) == {
+            api_url: True,
+        }
+
+        state = pool_state()
+        origin = api_url.removesuffix("/v1")
+        assert state["initialized"]
+        assert state["origins"][origin]["requests"] >= 2
+        assert state["origins"][origin]["active"] == 0
+
+
+@pytest.mark.django_db
+class TestReadyEndpoint:
+    """Tests for the readiness endpoint."""
+
+    def test_ready(self, api_url, unreachable_url):
+        """Test that one reachable provider is enough to be ready."""
+        manager = LLMProviderManager(
+            entries=[
+                ProviderEntry(name="down", provider=NetworkProvider(unreachable_url)),
+                ProviderEntry(name="up", provider=NetworkProvider(api_url)),
+            ],
+        )
+        with patch("charades.game.views.llm_manager", manager):
+            response = Client().get("/ready")
+
+        assert response.status_code == 200
+        data = response.json()
+        assert data["ready"] and data["database"]
+        assert [p["reachable"] for p in data["providers"]] == [False, True]
+        assert data["http_pool"]["initialized"]
+
+    def test_not_ready(self, unreachable_url):
+        """Test that the worker is not ready with no reachable provider."""
+        manager = LLMProviderManager(
+            entries=[
+                ProviderEntry(name="down", provider=NetworkProvider(unreachable_url)),
+            ],
+        )
+        with patch("charades.game.views.llm_manager", manager):
+            response = Client().get("/ready")
+
+        assert response.status_code == 503
+        assert not response.json()["ready"]
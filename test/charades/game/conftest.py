@@ -1 +1,27 @@
 """Shared test fixtures for game tests."""
+
+import pytest
+
+
+@pytest.fixture(autouse=True)
+def no_word_prefetch(settings):
+    """Keep tests from generating words on background threads."""
+    settings.WORD_PREFETCH = {**settings.WORD_PREFETCH, "enabled": False}
+
+
+@pytest.fixture(autouse=True)
+def single_shard(settings):
+    """Keep every player on the default database unless a test opts in."""
+    settings.DATABASE_SHARDS = ["default"]
+
+
+@pytest.fixture(autouse=True)
+def no_replicas(settings):
+    """Read from the default database unless a test opts in to replicas."""
+    settings.DATABASE_REPLICAS = {}
+
+
+@pytest.fixture(autouse=True)
+def no_description_cache(settings):
+    """Evaluate every description unless a test opts in to the cache."""
+    settings.DESCRIPTION_CACHE = {**settings.DESCRIPTION_CACHE, "enabled": False}
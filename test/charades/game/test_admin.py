@@ -0,0 +1,240 @@
+"""Tests for the game admin."""
+
+from datetime import timedelta
+from typing import cast
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from charades.game.admin import GameSessionAdmin
+from charades.game.models import GameSession
+from charades.game.models import LLMCall
+from charades.game.models import Player
+from charades.game.pagination import KeysetPaginator
+from charades.game.pagination import decode_cursor
+from charades.game.pagination import encode_cursor
+from charades.game.pagination import estimate_rows
+
+SESSIONS_URL = "/admin/game/gamesession/"
+PLAYERS_URL = "/admin/game/player/"
+LLM_CALLS_URL = "/admin/game/llmcall/"
+
+
+@pytest.fixture
+def sessions():
+    """Fixture for 5 sessions by 5 players, a minute apart, newest last."""
+    start = timezone.now() - timedelta(hours=1)
+    return [
+        GameSession.objects.create(
+            player=Player.objects.create(phone_number=f"+1206555010{i}"),
+            word=word,
+            language="es",
+            started_at=start + timedelta(minutes=i),
+        )
+        for i, word in enumerate(["gato", "perro", "gallina", "casa", "gata"])
+    ]
+
+
+def listed_words(response) -> list[str]:
+    """Words of the sessions on a change list page."""
+    return [session.word for session in response.context["cl"].result_list]
+
+
+class TestCursor:
+    """Tests for encoding keyset positions."""
+
+    def test_round_trip(self):
+        """Test that a position survives the query string."""
+        started_at = timezone.now()
+
+        assert decode_cursor(encode_cursor(started_at, 42)) == (started_at, 42)
+
+    def test_malformed(self):
+        """Test that a tampered position is ignored."""
+        assert decode_cursor("yesterday_1") is None
+        assert decode_cursor("garbage") is None
+
+
+@pytest.mark.django_db
+class TestKeysetPaginator:
+    """Tests for keyset paging and bounded counts."""
+
+    def test_pages_follow_on(self, sessions):
+        """Test that each page seeks past the last row of the previous one."""
+        paginator = KeysetPaginator(
+            GameSession.objects.order_by("-started_at", "-id"),
+            per_page=2,
+            keyset_field="started_at",
+        )
+        words = []
+        cursor = None
+        while True:
+            rows, next_cursor = paginator.page_after(cursor)
+            words.append([cast(GameSession, row).word for row in rows])
+            if next_cursor is None:
+                break
+            cursor = decode_cursor(next_cursor)
+
+        assert words == [["gata", "casa"], ["gallina", "perro"], ["gato"]]
+
+    def test_ties_broken_by_id(self, sessions):
+        """Test that rows started at the same time are neither lost nor repeated."""
+        GameSession.objects.update(started_at=timezone.now())
+        paginator = KeysetPaginator(
+            GameSession.objects.order_by("-started_at", "-id"),
+            per_page=3,
+            keyset_field="started_at",
+        )
+        first, cursor = paginator.page_after(None)
+        assert cursor is not None
+        second, _ = paginator.page_after(decode_cursor(cursor))
+
+        assert {row.pk for row in first + second} == {s.pk for s in sessions}
+
+    def test_count_is_bounded(self, sessions):
+        """Test that counting stops at max_exact_count."""
+        paginator = KeysetPaginator(
+            GameSession.objects.filter(language="es").order_by("-started_at"),
+            per_page=2,
+        )
+        paginator.max_exact_count = 3
+
+        assert paginator.count == 3
+        assert paginator.count_is_estimate
+
+    def test_estimate_from_statistics(self, sessions):
+        """Test that table statistics stand in for counting every row."""
+        assert estimate_rows(GameSession, "default") is None
+
+        with connection.cursor() as cursor:
+            cursor.execute("ANALYZE")
+
+        assert estimate_rows(GameSession, "default") == 5
+
+
+@pytest.mark.django_db
+class TestGameSessionAdmin:
+    """Tests for the game session change list."""
+
+    def test_players_loaded_with_sessions(
+        self,
+        admin_client,
+        sessions,
+        django_assert_max_num_queries,
+    ):
+        """Test that showing each session's player takes no extra queries."""
+        admin_client.get(SESSIONS_URL)
+        with django_assert_max_num_queries(8):
+            response = admin_client.get(SESSIONS_URL)
+
+        assert response.status_code == 200
+        assert b"+12065550104" in response.content
+
+    def test_keyset_pages(self, admin_client, sessions, monkeypatch):
+        """Test that the Next link continues after the last session shown."""
+        monkeypatch.setattr(GameSessionAdmin, "list_per_page", 3)
+        response = admin_client.get(SESSIONS_URL)
+        cl = response.context["cl"]
+        assert listed_words(response) == ["gata", "casa", "gallina"]
+        assert cl.get_next_url().encode() in response.content
+
+        response = admin_client.get(SESSIONS_URL + cl.get_next_url())
+
+        assert listed_words(response) == ["perro", "gato"]
+        assert response.context["cl"].next_cursor is None
+
+    def test_search_by_word_prefix(self, admin_client, sessions):
+        """Test that words are searched by prefix."""
+        response = admin_client.get(SESSIONS_URL, {"q": "ga"})
+
+        assert listed_words(response) == ["gata", "gallina", "gato"]
+
+    def test_search_by_phone_number_prefix(self, admin_client, sessions):
+        """Test that phone numbers are found with or without the plus."""
+        for term in ("+12065550102", "12065550102"):
+            response = admin_client.get(SESSIONS_URL, {"q": term})
+
+            assert listed_words(response) == ["gallina"]
+
+    def test_sorted_by_column(self, admin_client, sessions):
+        """Test that sorting by another column falls back to page numbers."""
+        response = admin_client.get(SESSIONS_URL, {"o": "2"})
+
+        assert not response.context["cl"].keyset
+        assert listed_words(response) == ["casa", "gallina", "gata", "gato", "perro"]
+
+    def test_date_filter(self, admin_client, sessions):
+        """Test that sessions are filtered by date range without date scans."""
+        GameSession.objects.filter(pk=sessions[0].pk).update(
+            started_at=timezone.now() - timedelta(days=30),
+        )
+        # As in the filter's "Past 7 days" link
+        today = timezone.localtime().replace(hour=0, minute=0, second=0, microsecond=0)
+        with CaptureQueriesContext(connection) as queries:
+            response = admin_client.get(
+                SESSIONS_URL,
+                {
+                    "started_at__gte": str(today - timedelta(days=7)),
+                    "started_at__lt": str(today + timedelta(days=1)),
+                },
+            )
+
+        assert listed_words(response) == ["gata", "casa", "gallina", "perro"]
+        assert not any("DISTINCT" in query["sql"] for query in queries)
+
+    def test_rows_read_once(self, admin_client, sessions, monkeypatch):
+        """Test that a keyset page reads its rows with a single query."""
+        monkeypatch.setattr(GameSessionAdmin, "list_per_page", 3)
+        with CaptureQueriesContext(connection) as queries:
+            admin_client.get(SESSIONS_URL)
+
+        row_queries = [
+            query
+            for query in queries
+            if query["sql"].startswith('SELECT "game_gamesession"."id"')
+        ]
+        assert len(row_queries) == 1
+
+
+@pytest.mark.django_db
+class TestPlayerAdmin:
+    """Tests for the player change list."""
+
+    def test_search_by_phone_number_prefix(self, admin_client, sessions):
+        """Test that players are found by phone number prefix."""
+        Player.objects.create(phone_number="+442071234567")
+
+        response = admin_client.get(PLAYERS_URL, {"q": "+1206"})
+
+        assert response.context["cl"].result_count == 5
+        assert b"About" not in response.content
+
+
+@pytest.mark.django_db
+class TestLLMCallAdmin:
+    """Tests for the LLM call summary."""
+
+    def test_daily_summary(self, admin_client):
+        """Test that calls and tokens are summed and percentiles estimated."""
+        LLMCall.objects.bulk_create(
+            LLMCall(
+                operation="evaluation",
+                provider="openai",
+                outcome="success",
+                latency_ms=latency_ms,
+                prompt_tokens=10,
+                completion_tokens=None if latency_ms % 2 else 5,
+            )
+            for latency_ms in range(1, 1001)
+        )
+
+        response = admin_client.get(LLM_CALLS_URL)
+
+        [row] = response.context["daily_summary"]
+        assert row["provider"] == "openai"
+        assert row["calls"] == 1000
+        assert (row["prompt_tokens"], row["completion_tokens"]) == (10000, 2500)
+        assert row["p50_ms"] == pytest.approx(500, rel=0.05)
+        assert row["p95_ms"] == pytest.approx(950, rel=0.05)
@@ -0,0 +1,210 @@
+"""Tests for archiving old sessions to compressed files."""
+
+import gzip
+import io
+from datetime import UTC
+from datetime import date
+from datetime import datetime
+from unittest.mock import patch
+
+import pytest
+from django.core.management import call_command
+from django.core.management.base import CommandError
+
+from charades.game.archive import SessionArchive
+from charades.game.models import GameSession
+from charades.game.models import LLMCall
+from charades.game.models import Player
+from charades.game.models import PlayerStats
+
+
+@pytest.fixture
+def archive(tmp_path, settings):
+    """Fixture for an empty archive, also the configured one."""
+    settings.SESSION_ARCHIVE = {**settings.SESSION_ARCHIVE, "dir": tmp_path}
+    return SessionArchive(tmp_path)
+
+
+@pytest.fixture
+def players():
+    """Fixture for two players."""
+    return [
+        Player.objects.create(phone_number="+12065550100"),
+        Player.objects.create(phone_number="+12065550101"),
+    ]
+
+
+def make_session(
+    player: Player,
+    started_at: datetime,
+    status: str = "completed",
+) -> GameSession:
+    """Create a finished session started at a given time."""
+    return GameSession.objects.create(
+        player=player,
+        word="gato",
+        language="es",
+        status=status,
+        score=80 if status == "completed" else None,
+        started_at=started_at,
+        completed_at=started_at,
+    )
+
+
+@pytest.fixture
+def old_sessions(players):
+    """Fixture for finished sessions on two days last year, and recent ones."""
+    first, second = players
+    return [
+        make_session(first, datetime(2025, 3, 1, 10, tzinfo=UTC)),
+        make_session(second, datetime(2025, 3, 1, 23, tzinfo=UTC), "timeout"),
+        make_session(first, datetime(2025, 3, 2, 9, tzinfo=UTC)),
+    ]
+
+
+@pytest.mark.django_db
+class TestArchive:
+    """Tests for moving sessions into the archive."""
+
+    def test_moves_old_finished_sessions(self, archive, old_sessions, players):
+        """Test that only old finished sessions leave the database."""
+        recent = make_session(players[0], datetime.now(UTC))
+        active = make_session(players[0], datetime(2025, 1, 1, tzinfo=UTC), "active")
+
+        assert archive.archive(after_days=30, chunk_size=2) == 3
+
+        assert set(GameSession.objects.values_list("pk", flat=True)) == {
+            recent.pk,
+            active.pk,
+        }
+        entries = list(archive.entries())
+        assert [(entry["day"], entry["rows"]) for entry in entries] == [
+            ("2025-03-01", 2),
+            ("2025-03-02", 1),
+        ]
+        assert entries[0]["player_ids"] == [p.pk for p in players]
+        assert archive.verify() == []
+
+    def test_keeps_stats_and_llm_calls(self, archive, old_sessions):
+        """Test that aggregates and LLM call history outlive the sessions."""
+        PlayerStats.rebuild()
+        LLMCall.objects.create(
+            operation="evaluation",
+            provider="openai",
+            outcome="success",
+            latency_ms=100,
+            session=old_sessions[0],
+        )
+
+        archive.archive(after_days=30)
+
+        assert (
+            PlayerStats.objects.get(
+                player=old_sessions[0].player,
+                language="",
+            ).games_played
+            == 2
+        )
+        assert LLMCall.objects.get().session is None
+
+    def test_dry_run(self, archive, old_sessions):
+        """Test that a dry run only counts."""
+        assert archive.archive(after_days=30, dry_run=True) == 3
+        assert GameSession.objects.count() == 3
+        assert list(archive.entries()) == []
+
+    def test_refuses_recent_cutoff(self, archive):
+        """Test that this week's sessions can't be archived."""
+        with pytest.raises(ValueError):
+            archive.archive(after_days=3)
+
+    def test_recovers_interrupted_move(self, archive, old_sessions):
+        """Test that a crash before the manifest is written is finished later."""
+        with (
+            patch.object(SessionArchive, "_record", side_effect=OSError),
+            pytest.raises(OSError),
+        ):
+            archive.archive(after_days=30)
+        assert list(archive.entries()) == []
+
+        assert archive.archive(after_days=30) == 0
+
+        assert not GameSession.objects.exists()
+        assert sum(entry["rows"] for entry in archive.entries()) == 3
+        assert len(list(archive.sessions())) == 3
+
+    def test_verify_detects_corruption(self, archive, old_sessions):
+        """Test that a damaged part file fails verification."""
+        archive.archive(after_days=30)
+        entry = next(archive.entries())
+        (archive.directory / entry["file"]).write_bytes(gzip.compress(b"{}\n"))
+
+        assert archive.verify() == [entry["file"]]
+
+
+@pytest.mark.django_db
+class TestArchiveReader:
+    """Tests for reading archived sessions back."""
+
+    @pytest.fixture(autouse=True)
+    def archived(self, archive, old_sessions):
+        archive.archive(after_days=30)
+
+    def test_by_player(self, archive, players):
+        """Test that a player's sessions are read back with their fields."""
+        sessions = list(archive.sessions(player_id=players[0].pk))
+
+        assert [s["started_at"].day for s in sessions] == [1, 2]
+        assert sessions[0]["score"] == 80
+        assert sessions[0]["word"] == "gato"
+
+    def test_by_day(self, archive, players):
+        """Test that only partitions for the requested days are read."""
+        with patch.object(
+            SessionArchive,
+            "_read_part",
+            wraps=archive._read_part,
+        ) as read_part:
+            sessions = list(
+                archive.sessions(since=date(2025, 3, 2), until=date(2025, 3, 3)),
+            )
+
+        assert len(sessions) == 1
+        assert read_part.call_count == 1
+
+    def test_skips_partitions_without_player(self, archive, players):
+        """Test that partitions the player has no sessions in aren't opened."""
+        with patch.object(
+            SessionArchive,
+            "_read_part",
+            wraps=archive._read_part,
+        ) as read_part:
+            sessions = list(archive.sessions(player_id=players[1].pk))
+
+        assert [s["status"] for s in sessions] == ["timeout"]
+        assert read_part.call_count == 1
+
+    def test_query_command(self, players):
+        """Test that the command prints matching sessions as JSON lines."""
+        out = io.StringIO()
+        call_command("query_archive", player=players[1].pk, stdout=out)
+
+        assert out.getvalue().count("\n") == 1
+        assert '"timeout"' in out.getvalue()
+
+    def test_rebuild_refuses_to_drop_archived_sessions(self):
+        """Test that stats aren't rebuilt from the database alone by mistake."""
+        with pytest.raises(CommandError):
+            call_command("rebuild_player_stats")
+
+        call_command("rebuild_player_stats", ignore_archive=True, stdout=io.StringIO())
+
+
+@pytest.mark.django_db
+def test_archive_command(archive, old_sessions):
+    """Test that the command archives with the configured settings."""
+    out = io.StringIO()
+    call_command("archive_sessions", days=30, stdout=out)
+
+    assert "Archived 3 sessions" in out.getvalue()
+    call_command("archive_sessions", verify=True, stdout=out)
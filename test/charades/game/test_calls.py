@@ -0,0 +1,119 @@
+"""Tests for voice call state."""
+
+import uuid
+from unittest.mock import patch
+from urllib.parse import urlencode
+
+import pytest
+from django.core.cache import cache
+from django.test import Client
+
+from charades.game.calls import CallState
+from charades.game.calls import CallStateStore
+from charades.game.models import GameSession
+from charades.game.models import Player
+
+PHONE_NUMBER = "+12065550143"
+
+
+@pytest.fixture(autouse=True)
+def empty_cache(settings):
+    """Start from an empty cache, evaluating voice descriptions inline."""
+    settings.VOICE_EVALUATION = {**settings.VOICE_EVALUATION, "background": False}
+    cache.clear()
+    yield
+    cache.clear()
+
+
+@pytest.fixture
+def call_sid():
+    """A CallSid no other test has used."""
+    return f"CA{uuid.uuid4().hex}"
+
+
+def gather(client, call_sid, speech):
+    return client.post(
+        "/api/webhooks/twilio/voice/gather",
+        data=urlencode(
+            {"CallSid": call_sid, "From": PHONE_NUMBER, "SpeechResult": speech},
+        ),
+        content_type="application/x-www-form-urlencoded",
+    )
+
+
+@pytest.mark.django_db
+class TestCallStateStore:
+    """Tests for storing call state."""
+
+    def test_changes_seen_by_other_workers(self):
+        """Test that a game ended on one worker is over on every worker."""
+        worker_a, worker_b = CallStateStore(), CallStateStore()
+        playing = CallState(player_id=1, phone_number=PHONE_NUMBER, session_id=7)
+        worker_a.set("CA1", playing)
+        assert worker_a.get("CA1") == playing
+
+        worker_b.set("CA1", playing.with_session(None))
+
+        assert worker_a.get("CA1") == CallState(
+            player_id=1,
+            phone_number=PHONE_NUMBER,
+        )
+
+    def test_forget(self):
+        """Test that forgotten calls are unknown to every process."""
+        store = CallStateStore()
+        store.set("CA1", CallState(player_id=1, phone_number=PHONE_NUMBER))
+        store.forget("CA1")
+
+        assert store.get("CA1") is None
+        assert CallStateStore().get("CA1") is None
+
+    def test_load(self, call_sid, django_assert_num_queries):
+        """Test that the database is read on the first turn only."""
+        player = Player.objects.create(phone_number=PHONE_NUMBER)
+        session = GameSession.objects.create(player=player, word="gato", language="es")
+        store = CallStateStore()
+
+        state = store.load(call_sid, PHONE_NUMBER)
+        assert state == CallState(
+            player_id=player.pk,
+            phone_number=PHONE_NUMBER,
+            session_id=session.pk,
+        )
+        with django_assert_num_queries(0):
+            assert store.load(call_sid, PHONE_NUMBER) == state
+
+
+@pytest.mark.django_db
+class TestVoiceCallState:
+    """Tests for call state across the turns of a voice call."""
+
+    @patch("charades.game.api.get_random_word", return_value="gato")
+    def test_turns_skip_player_lookup(
+        self,
+        mock_get_word,
+        call_sid,
+        django_assert_num_queries,
+    ):
+        """Test that later turns only query to change the game."""
+        client = Client()
+        gather(client, call_sid, "Spanish")
+        session = GameSession.objects.get(player__phone_number=PHONE_NUMBER)
+
+        with (
+            patch("charades.game.voice.handle_word_description") as mock_describe,
+            django_assert_num_queries(0),
+        ):
+            mock_describe.return_value = {"twiml": "Score: 85", "code": 200}
+            gather(client, call_sid, "Un animal que dice miau")
+        assert mock_describe.call_args.args[0].pk == session.player.pk
+
+        # After the score is spoken the next turn picks a language again
+        client.post(
+            "/api/webhooks/twilio/voice/result",
+            data=urlencode({"CallSid": call_sid, "From": PHONE_NUMBER}),
+            content_type="application/x-www-form-urlencoded",
+        )
+        gather(client, call_sid, "Korean")
+
+        assert GameSession.objects.get(status="active").language == "ko"
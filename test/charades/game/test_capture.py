@@ -0,0 +1,96 @@
+"""Tests for webhook traffic capture."""
+
+import gzip
+import json
+from urllib.parse import urlencode
+
+import pytest
+from django.test import Client
+
+from charades.game.capture import CaptureWriter
+
+
+def read_entries(directory):
+    """Read every captured entry, including from files still open."""
+    entries = []
+    for path in sorted(directory.glob("*.jsonl.gz")):
+        with gzip.open(path, "rt", encoding="utf-8") as capture:
+            try:
+                for line in capture:
+                    entries.append(json.loads(line))
+            except EOFError:
+                pass
+    return entries
+
+
+class TestCaptureWriter:
+    """Tests for the rotating capture writer."""
+
+    def test_rotates_by_size(self, tmp_path):
+        """Test that a new file is started once the size limit is reached."""
+        writer = CaptureWriter(tmp_path, max_bytes=150, max_seconds=3600)
+        for i in range(5):
+            writer.write({"i": i, "padding": "x" * 60})
+        writer.close()
+
+        # Each entry is about 80 bytes, so every file holds two
+        assert len(list(tmp_path.glob("*.jsonl.gz"))) == 3
+        assert [entry["i"] for entry in read_entries(tmp_path)] == list(range(5))
+
+    def test_entries_readable_before_close(self, tmp_path):
+        """Test that flushed entries can be read while the file is open."""
+        writer = CaptureWriter(tmp_path, max_bytes=10**6, max_seconds=3600)
+        writer.write({"i": 1})
+
+        path = next(tmp_path.glob("*.jsonl.gz"))
+        with gzip.open(path, "rt", encoding="utf-8") as capture:
+            line = capture.readline()
+        writer.close()
+
+        assert json.loads(line) == {"i": 1}
+
+
+@pytest.mark.django_db
+class TestTrafficCaptureMiddleware:
+    """Tests for capturing webhook requests."""
+
+    def test_captures_webhooks_only(self, settings, tmp_path):
+        """Test that webhook requests are captured with their response."""
+        settings.WEBHOOK_CAPTURE = {
+            "dir": str(tmp_path),
+            "path_prefix": "/api/webhooks/",
+            "max_bytes": 10**6,
+            "max_seconds": 3600,
+        }
+        client = Client()
+        body = urlencode(
+            {
+                "MessageSid": "SM123",
+                "MessageStatus": "delivered",
+                "AccountSid": "AC123",
+                "From": "+1234567890",
+                "To": "+1987654321",
+            },
+        )
+        client.post(
+            "/api/webhooks/twilio/status",
+            data=body,
+            content_type="application/x-www-form-urlencoded",
+            headers={"X-Twilio-Signature": "abc", "Authorization": "Basic secret"},
+        )
+        client.post(
+            "/api/test/player-command",
+            data={"phone_number": "+1234567890", "command": "help"},
+            content_type="application/json",
+        )
+
+        entries = read_entries(tmp_path)
+        assert len(entries) == 1
+        entry = entries[0]
+        assert entry["method"] == "POST"
+        assert entry["path"] == "/api/webhooks/twilio/status"
+        assert entry["body"] == body
+        assert entry["status"] == 200
+        assert entry["headers"]["X-Twilio-Signature"] == "abc"
+        assert "Authorization" not in entry["headers"]
+        assert entry["latency_ms"] > 0
@@ -0,0 +1,186 @@
+"""Tests for daily challenges."""
+
+from datetime import date
+from unittest.mock import patch
+
+import pytest
+from django.core.cache import cache
+from django.core.management import call_command
+from django.utils import timezone
+
+from charades.game.challenges import challenge_rank
+from charades.game.challenges import challenge_top
+from charades.game.challenges import challenge_word
+from charades.game.logic import handle_player_command
+from charades.game.models import DailyChallenge
+from charades.game.models import GameSession
+from charades.game.models import Player
+
+
+@pytest.fixture(autouse=True)
+def empty_cache():
+    """Start every test with no cached challenge words."""
+    cache.clear()
+    yield
+    cache.clear()
+
+
+@pytest.fixture
+def random_word():
+    """Stub out word generation."""
+    with patch(
+        "charades.game.challenges.get_random_word",
+        return_value="gato",
+    ) as mock_get_word:
+        yield mock_get_word
+
+
+@pytest.fixture
+def players():
+    """Fixture for three opted in players."""
+    players = []
+    for number in range(3):
+        player = Player.objects.create(phone_number=f"+1206555016{number}")
+        player.opt_in()
+        players.append(player)
+    return players
+
+
+def play(
+    player: Player,
+    score: int,
+) -> GameSession:
+    """Play today's Spanish challenge to a score."""
+    with patch(
+        "charades.game.logic.evaluate_description",
+        return_value=(score, "Good"),
+    ):
+        handle_player_command(player.phone_number, "daily es")
+        handle_player_command(player.phone_number, "un animal pequeño")
+    return player.gamesession_set.get(challenge_on=timezone.localdate())
+
+
+@pytest.mark.django_db
+class TestChallengeWord:
+    """Tests for generating and caching challenge words."""
+
+    def test_generated_once(self, random_word):
+        """Test that a day's word is generated once, then reused."""
+        assert challenge_word("ES") == "gato"
+        assert challenge_word("es") == "gato"
+
+        random_word.assert_called_once_with("ES")
+        assert DailyChallenge.objects.get().language == "es"
+
+    def test_stored_word_survives_cache(self, random_word):
+        """Test that a word is read back from the database once evicted."""
+        challenge_word("es")
+        cache.clear()
+        random_word.return_value = "perro"
+
+        assert challenge_word("es") == "gato"
+        random_word.assert_called_once()
+
+    def test_per_language_and_day(self, random_word):
+        """Test that each language and day has its own word."""
+        challenge_word("es")
+        challenge_word("ko")
+        challenge_word("es", day=date(2025, 1, 1))
+
+        assert random_word.call_count == 3
+        assert DailyChallenge.objects.count() == 3
+
+    def test_command(self, random_word, capsys, settings):
+        """Test that every supported language's word is generated ahead."""
+        call_command("create_daily_challenges", "--day", "2025-01-02")
+
+        assert random_word.call_count == len(settings.SUPPORTED_LANGUAGES)
+        assert "12 challenges ready for 2025-01-02" in capsys.readouterr().out
+
+
+@pytest.mark.django_db
+class TestChallengeGames:
+    """Tests for playing and ranking challenges."""
+
+    def test_everyone_gets_the_same_word(self, players, random_word):
+        """Test that the word is shared and generated once for everyone."""
+        for player in players:
+            response = handle_player_command(player.phone_number, "DAILY ES")
+            assert "gato" in response["twiml"]
+
+        random_word.assert_called_once()
+        assert set(GameSession.objects.values_list("word", "challenge_on")) == {
+            ("gato", timezone.localdate()),
+        }
+
+    def test_ranked_on_completion(self, players, random_word):
+        """Test that a finished challenge reports its rank."""
+        play(players[0], 60)
+        with patch(
+            "charades.game.logic.evaluate_description",
+            return_value=(80, "Great"),
+        ):
+            handle_player_command(players[1].phone_number, "daily es")
+            response = handle_player_command(players[1].phone_number, "un gato")
+
+        assert "Today's Spanish challenge: #1 of 2" in response["twiml"]
+
+    def test_one_try_per_day(self, players, random_word):
+        """Test that a finished challenge can't be played again."""
+        play(players[0], 70)
+
+        response = handle_player_command(players[0].phone_number, "daily es")
+        assert "already played today's Spanish challenge: 70/100" in response["twiml"]
+        assert players[0].gamesession_set.count() == 1
+
+    def test_abandoned_challenge_is_forfeited(self, players, random_word):
+        """Test that leaving a challenge for another game uses up the try."""
+        handle_player_command(players[0].phone_number, "daily es")
+        handle_player_command(players[0].phone_number, "daily ko")
+
+        response = handle_player_command(players[0].phone_number, "daily es")
+        assert "already used your try" in response["twiml"]
+
+    def test_rank_and_top(self, players, random_word):
+        """Test that ties go to whoever finished first."""
+        first = play(players[0], 80)
+        second = play(players[1], 80)
+        play(players[2], 90)
+
+        assert challenge_rank(first) == (2, 3)
+        assert challenge_rank(second) == (3, 3)
+        assert challenge_top("es", limit=2) == [
+            (players[2].phone_number, 90),
+            (players[0].phone_number, 80),
+        ]
+
+    def test_top_command(self, players, random_word):
+        """Test the DAILY TOP command."""
+        response = handle_player_command(players[0].phone_number, "daily top es")
+        assert "Nobody has finished today's Spanish challenge" in response["twiml"]
+
+        play(players[0], 75)
+        response = handle_player_command(players[1].phone_number, "daily top es")
+        assert "1. ***0160 - 75/100" in response["twiml"]
+
+    def test_usage(self, players):
+        """Test that DAILY without a supported language explains itself."""
+        response = handle_player_command(players[0].phone_number, "daily xx")
+
+        assert "DAILY ES" in response["twiml"]
+
+    def test_description_during_game(self, players):
+        """Test that a description starting with "daily" is evaluated."""
+        GameSession.objects.create(player=players[0], word="periódico", language="es")
+
+        with patch(
+            "charades.game.logic.evaluate_description",
+            return_value=(90, "Good"),
+        ) as mock_evaluate:
+            response = handle_player_command(
+                players[0].phone_number,
+                "daily newspaper you read",
+            )
+
+        mock_evaluate.assert_called_once()
+        assert "DAILY ES" not in response["twiml"]
@@ -0,0 +1,205 @@
+"""Tests for the near-duplicate description evaluation cache."""
+
+import random
+from unittest.mock import MagicMock
+from unittest.mock import patch
+
+import pytest
+
+from charades.game.ai_utils import evaluate_description
+from charades.game.description_cache import DescriptionCache
+from charades.game.description_cache import jaccard
+from charades.game.description_cache import negations
+from charades.game.description_cache import shingles
+
+
+@pytest.fixture(autouse=True)
+def description_cache_enabled(settings):
+    """Turn the cache on, never verifying hits."""
+    settings.DESCRIPTION_CACHE = {
+        **settings.DESCRIPTION_CACHE,
+        "enabled": True,
+        "threshold": 0.7,
+        "verify_rate": 0.0,
+    }
+
+
+@pytest.fixture
+def cache():
+    """Fixture for a cache holding one evaluation of a red fruit."""
+    cache = DescriptionCache()
+    cache.store("apple", "en", "it is a red fruit", 80, "Good")
+    return cache
+
+
+def evaluation(
+    score: int = 50,
+) -> MagicMock:
+    return MagicMock(return_value=(score, "Fresh"))
+
+
+class TestShingles:
+    """Tests for n-gram similarity."""
+
+    def test_normalized(self):
+        """Test that case, accents and punctuation don't matter."""
+        assert shingles("Una FRUTA, ¡rojá!", 3) == shingles("una fruta roja", 3)
+
+    def test_similarity(self):
+        """Test that near-identical descriptions are similar, others not."""
+        red_fruit = shingles("it is a red fruit", 3)
+
+        assert jaccard(red_fruit, shingles("It's a red fruit!", 3)) > 0.7
+        assert jaccard(red_fruit, shingles("you bake pies with it", 3)) < 0.2
+
+    def test_short_description(self):
+        """Test that descriptions shorter than an n-gram still hash."""
+        assert len(shingles("ok", 3)) == 1
+
+    def test_negations(self):
+        """Test that negation words are found, whatever the punctuation."""
+        assert negations("It isn't a red fruit") == {"t"}
+        assert negations("Ce n'est pas un légume") == {"n", "pas"}
+        assert negations("不是水果") == {"不"}
+        assert negations("it is a red fruit") == set()
+
+
+class TestDescriptionCache:
+    """Tests for reusing evaluations."""
+
+    def test_near_duplicate_hits(self, cache):
+        """Test that a near-identical description reuses the evaluation."""
+        evaluate = evaluation()
+
+        result = cache.evaluate("apple", "It's a red fruit!", "en", evaluate)
+
+        assert result == (80, "Good")
+        evaluate.assert_not_called()
+        assert cache.stats()["hit_rate"] == 1.0
+
+    def test_different_description_misses(self, cache):
+        """Test that a different description is evaluated and cached."""
+        evaluate = evaluation(60)
+
+        assert cache.evaluate("apple", "you bake pies with it", "en", evaluate) == (
+            60,
+            "Fresh",
+        )
+        cached = cache.lookup("apple", "en", "You bake pies with it.")
+        assert cached is not None
+        assert cached[0] == 60
+
+    def test_negation_misses(self, cache):
+        """Test that a negated description isn't matched to the plain one."""
+        evaluate = evaluation(10)
+
+        assert cache.lookup("apple", "en", "it is not a red fruit") is None
+        assert cache.evaluate("apple", "it is not a red fruit", "en", evaluate) == (
+            10,
+            "Fresh",
+        )
+        # Both evaluations are kept
+        cached = cache.lookup("apple", "en", "it is a red fruit")
+        assert cached is not None
+        assert cached[0] == 80
+
+    def test_scoped_by_word_and_language(self, cache):
+        """Test that evaluations are only reused for the same word."""
+        assert cache.lookup("cherry", "en", "it is a red fruit") is None
+        assert cache.lookup("apple", "es", "it is a red fruit") is None
+        assert cache.lookup("Apple", "EN", "it is a red fruit") is not None
+
+    def test_threshold(self, cache, settings):
+        """Test that the similarity threshold is configurable."""
+        settings.DESCRIPTION_CACHE = {**settings.DESCRIPTION_CACHE, "threshold": 0.9}
+
+        assert cache.lookup("apple", "en", "It's a red fruit!") is None
+        assert cache.lookup("apple", "en", "It is a red fruit.") is not None
+
+    def test_verification_measures_deviation(self, cache, settings):
+        """Test that sampled hits are evaluated and their deviation recorded."""
+        settings.DESCRIPTION_CACHE = {**settings.DESCRIPTION_CACHE, "verify_rate": 1}
+        evaluate = evaluation(70)
+
+        result = cache.evaluate("apple", "It's a red fruit!", "en", evaluate)
+
+        assert result == (70, "Fresh")
+        assert cache.stats() == {
+            "lookups": 1,
+            "hit_rate": 1.0,
+            "mean_deviation": 10.0,
+        }
+        # The fresh evaluation replaces the cached one
+        cached = cache.lookup("apple", "en", "it is a red fruit")
+        assert cached is not None
+        assert cached[0] == 70
+
+    def test_lru_per_word(self):
+        """Test that each word keeps only its most recently used evaluations."""
+        cache = DescriptionCache(max_per_word=2)
+        cache.store("apple", "en", "it is a red fruit", 80, "Good")
+        cache.store("apple", "en", "you bake pies with it", 70, "Good")
+        cache.lookup("apple", "en", "it is a red fruit")
+        cache.store("apple", "en", "grows on trees in orchards", 60, "Good")
+
+        assert cache.lookup("apple", "en", "it is a red fruit") is not None
+        assert cache.lookup("apple", "en", "you bake pies with it") is None
+
+    def test_lru_words(self):
+        """Test that only the most recently used words are kept."""
+        cache = DescriptionCache(max_words=1)
+        cache.store("apple", "en", "it is a red fruit", 80, "Good")
+        cache.store("cherry", "en", "a small red fruit", 80, "Good")
+
+        assert cache.lookup("apple", "en", "it is a red fruit") is None
+
+    def test_lsh_finds_similar_among_many(self):
+        """Test that banding finds a near duplicate among unrelated entries."""
+        cache = DescriptionCache(max_per_word=1000)
+        rng = random.Random(1)
+        for _ in range(300):
+            words = " ".join("".join(rng.choices("abcdefghij", k=5)) for _ in range(4))
+            cache.store("apple", "en", words, 10, "Noise")
+        cache.store("apple", "en", "it is a red fruit", 80, "Good")
+
+        cached = cache.lookup("apple", "en", "It's a red fruit!")
+        assert cached is not None
+        assert cached[0] == 80
+
+    def test_disabled(self, cache, settings):
+        """Test that a disabled cache evaluates every description."""
+        settings.DESCRIPTION_CACHE = {**settings.DESCRIPTION_CACHE, "enabled": False}
+        evaluate = evaluation()
+
+        assert cache.evaluate("apple", "it is a red fruit", "en", evaluate)[0] == 50
+        evaluate.assert_called_once()
+
+    def test_failed_evaluations_not_cached(self, cache):
+        """Test that an evaluation error is raised and nothing is cached."""
+        evaluate = MagicMock(side_effect=RuntimeError("LLM down"))
+
+        with pytest.raises(RuntimeError):
+            cache.evaluate("apple", "you bake pies with it", "en", evaluate)
+        assert cache.lookup("apple", "en", "you bake pies with it") is None
+
+
+class TestEvaluateDescription:
+    """Tests for the cache in front of the LLM."""
+
+    def test_second_near_duplicate_skips_llm(self):
+        """Test that evaluate_description calls the LLM once for both."""
+        with (
+            patch(
+                "charades.game.ai_utils.description_cache",
+                DescriptionCache(),
+            ),
+            patch(
+                "charades.game.ai_utils.llm_manager.evaluate_description",
+                return_value=(80, "Good"),
+            ) as mock_evaluate,
+        ):
+            evaluate_description("apple", "it is a red fruit", "en")
+            result = evaluate_description("apple", "It's a red fruit!", "en")
+
+        assert result == (80, "Good")
+        mock_evaluate.assert_called_once_with("apple", "it is a red fruit", "en")
@@ -0,0 +1,173 @@
+"""Tests for streaming game session exports."""
+
+import csv
+import gzip
+import io
+import json
+from datetime import datetime
+from datetime import timedelta
+
+import pytest
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.utils import timezone
+
+from charades.game import exports
+from charades.game.exports import parse_filters
+from charades.game.exports import stream_sessions
+from charades.game.models import GameSession
+from charades.game.models import Player
+
+EXPORT_URL = "/exports/sessions"
+
+
+@pytest.fixture
+def sessions():
+    """Fixture for a completed Spanish game yesterday and an active Korean one."""
+    player = Player.objects.create(phone_number="+12065550100")
+    completed = GameSession.objects.create(
+        player=player,
+        word="gato",
+        language="es",
+        started_at=timezone.now() - timedelta(days=1),
+    )
+    completed.complete(score=80, description="a small pet", feedback="Good")
+    active = GameSession.objects.create(player=player, word="고양이", language="ko")
+    return [completed, active]
+
+
+def read_jsonl(
+    data: bytes,
+) -> list[dict]:
+    """Parse a JSONL export."""
+    return [json.loads(line) for line in data.decode().splitlines()]
+
+
+class TestParseFilters:
+    """Tests for turning export options into filters."""
+
+    def test_dates(self):
+        """Test that dates mean local midnight and datetimes are kept."""
+        filters = parse_filters(
+            {"since": "2026-01-02", "until": "2026-01-03T12:00:00+00:00"},
+        )
+
+        assert filters["started_at__gte"] == timezone.make_aware(
+            datetime(2026, 1, 2),
+        )
+        assert filters["started_at__lt"].hour == 12
+
+    def test_language_and_status(self):
+        """Test that languages are matched in lowercase."""
+        assert parse_filters({"language": "ES", "status": "completed"}) == {
+            "language": "es",
+            "status": "completed",
+        }
+
+    @pytest.mark.parametrize(
+        "params",
+        [{"since": "last week"}, {"status": "won"}, {"language": "english"}],
+    )
+    def test_invalid(self, params):
+        """Test that invalid options are rejected."""
+        with pytest.raises(ValueError):
+            parse_filters(params)
+
+
+@pytest.mark.django_db
+class TestStreamSessions:
+    """Tests for encoding session exports."""
+
+    def test_jsonl(self, sessions):
+        """Test that every session is exported, in id order."""
+        records = read_jsonl(b"".join(stream_sessions({})))
+
+        assert [record["id"] for record in records] == [s.pk for s in sessions]
+        assert records[0]["score"] == 80
+        assert records[0]["started_at"] == sessions[0].started_at.isoformat()
+        assert records[1]["word"] == "고양이"
+        assert "phone_number" not in records[0]
+
+    def test_csv(self, sessions):
+        """Test that CSV exports start with a header."""
+        data = b"".join(stream_sessions({"status": "active"}, format="csv"))
+        rows = list(csv.DictReader(io.StringIO(data.decode())))
+
+        assert [row["word"] for row in rows] == ["고양이"]
+        assert rows[0]["score"] == ""
+
+    def test_gzip(self, sessions, monkeypatch):
+        """Test that compressed exports are flushed in blocks."""
+        monkeypatch.setattr(exports, "FLUSH_BYTES", 10)
+        blocks = list(stream_sessions({}, compress=True, chunk_size=1))
+
+        assert len(blocks) > 1
+        assert len(read_jsonl(gzip.decompress(b"".join(blocks)))) == 2
+
+    def test_empty(self):
+        """Test that an empty export is an empty file."""
+        assert b"".join(stream_sessions({})) == b""
+
+
+@pytest.mark.django_db
+class TestExportView:
+    """Tests for the export endpoint."""
+
+    def test_requires_staff(self, client):
+        """Test that anonymous users are sent to log in."""
+        response = client.get(EXPORT_URL)
+
+        assert response.status_code == 302
+        assert "/admin/login/" in response["Location"]
+
+    def test_requires_permission(self, client):
+        """Test that staff without access to sessions are refused."""
+        client.force_login(User.objects.create(username="staff", is_staff=True))
+
+        assert client.get(EXPORT_URL).status_code == 403
+
+    def test_streams_export(self, admin_client, sessions):
+        """Test that filtered sessions are streamed as a download."""
+        response = admin_client.get(EXPORT_URL, {"language": "es", "gzip": "1"})
+
+        assert response.streaming
+        assert response["Content-Type"] == "application/gzip"
+        assert ".jsonl.gz" in response["Content-Disposition"]
+        data = gzip.decompress(b"".join(response.streaming_content))
+        assert [record["word"] for record in read_jsonl(data)] == ["gato"]
+
+    @pytest.mark.parametrize(
+        "params",
+        [{"format": "xml"}, {"until": "soon"}, {"language": "english"}],
+    )
+    def test_invalid_options(self, admin_client, params):
+        """Test that invalid options are a bad request."""
+        response = admin_client.get(EXPORT_URL, params)
+
+        assert response.status_code == 400
+        assert "error" in response.json()
+
+
+@pytest.mark.django_db
+class TestExportCommand:
+    """Tests for the export_sessions command."""
+
+    def test_writes_file(self, sessions, tmp_path):
+        """Test that the command writes the export to a file."""
+        output = tmp_path / "sessions.csv"
+        call_command(
+            "export_sessions",
+            output=str(output),
+            format="csv",
+            since=timezone.localdate().isoformat(),
+            stderr=io.StringIO(),
+        )
+
+        rows = list(csv.DictReader(output.open(encoding="utf-8")))
+        assert [row["word"] for row in rows] == ["고양이"]
+
+    def test_invalid_date(self):
+        """Test that invalid options are reported."""
+        with pytest.raises(CommandError):
+            call_command("export_sessions", since="whenever")
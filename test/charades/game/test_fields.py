@@ -0,0 +1,102 @@
+"""Tests for fields storing strings as small integer codes."""
+
+import pytest
+from django.db import connection
+
+from charades.game.fields import StringCodeField
+from charades.game.models import GameSession
+from charades.game.models import Player
+
+
+@pytest.fixture
+def player():
+    """Fixture for a player with an active Spanish game and a completed one."""
+    player = Player.objects.create(phone_number="+12065550130")
+    GameSession.objects.create(player=player, word="gato", language="es")
+    GameSession.objects.create(
+        player=player,
+        word="고양이",
+        language="ko",
+        status="completed",
+    )
+    return player
+
+
+def code_field(
+    name: str,
+) -> StringCodeField:
+    field = GameSession._meta.get_field(name)
+    assert isinstance(field, StringCodeField)
+    return field
+
+
+def raw_codes() -> list[tuple[int, int]]:
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT language, status FROM game_gamesession ORDER BY id")
+        return cursor.fetchall()
+
+
+class TestFieldCodes:
+    """Tests for encoding and decoding values."""
+
+    def test_language_round_trip(self):
+        """Test that every two-letter code survives encoding."""
+        field = code_field("language")
+
+        assert field.encode("aa") == 1
+        assert field.encode("zz") == 676
+        assert field.encode("ES") == field.encode("es")
+        assert field.decode(field.encode("ko")) == "ko"
+
+    def test_status_codes_are_positions(self):
+        """Test that status codes follow the order of the choices."""
+        field = code_field("status")
+
+        assert [field.encode(s) for s in ("active", "completed", "timeout")] == [
+            1,
+            2,
+            3,
+        ]
+        assert field.decode(3) == "timeout"
+
+    @pytest.mark.parametrize(
+        ("name", "value"),
+        [("language", "spanish"), ("language", "e1"), ("status", "paused")],
+    )
+    def test_invalid_value(self, name, value):
+        """Test that values without a code are rejected."""
+        with pytest.raises(ValueError, match=name):
+            code_field(name).encode(value)
+
+
+@pytest.mark.django_db
+class TestCodedColumns:
+    """Tests for coded columns through the ORM."""
+
+    def test_stored_as_codes(self, player):
+        """Test that the database holds codes and the ORM strings."""
+        assert raw_codes() == [(123, 1), (275, 2)]
+
+        session = GameSession.objects.get(word="gato")
+        assert (session.language, session.status) == ("es", "active")
+
+    def test_filters_take_strings(self, player):
+        """Test that lookups encode their string arguments."""
+        assert player.gamesession_set.get(status="active").word == "gato"
+        assert GameSession.objects.filter(language__in=["ko", "fr"]).count() == 1
+        assert not GameSession.objects.filter(status="timeout").exists()
+
+    def test_values_are_strings(self, player):
+        """Test that values() and values_list() decode codes."""
+        assert list(
+            GameSession.objects.order_by("pk").values_list("language", "status"),
+        ) == [("es", "active"), ("ko", "completed")]
+        assert GameSession.objects.values("status").get(word="gato") == {
+            "status": "active",
+        }
+
+    def test_update_takes_strings(self, player):
+        """Test that updates encode their values."""
+        player.gamesession_set.filter(status="active").update(status="timeout")
+
+        assert raw_codes() == [(123, 3), (275, 2)]
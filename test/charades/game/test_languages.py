@@ -0,0 +1,53 @@
+"""Tests for language recognition."""
+
+import pytest
+
+from charades.game.languages import LanguageMatcher
+from charades.game.languages import language_matcher
+from charades.game.languages import normalize
+
+
+class TestLanguageMatcher:
+    """Tests for matching messages to supported languages."""
+
+    def test_normalize(self):
+        """Test that case and accents are ignored, other scripts kept."""
+        assert normalize("Español") == "espanol"
+        assert normalize("FRANÇAIS") == "francais"
+        assert normalize("日本語") == "日本語"
+
+    @pytest.mark.parametrize(
+        "text, code, method",
+        [
+            ("es", "ES", "code"),
+            ("KO.", "KO", "code"),
+            ("Spanish", "ES", "name"),
+            ("Korean.", "KO", "name"),
+            ("español", "ES", "name"),
+            ("Espanol", "ES", "name"),
+            ("한국어", "KO", "name"),
+            ("日本語", "JA", "name"),
+            ("Spanish please.", "ES", "token"),
+            ("I want to play in French", "FR", "token"),
+            ("Spanich.", "ES", "fuzzy"),
+            ("Koreans", "KO", "fuzzy"),
+        ],
+    )
+    def test_match(self, text, code, method):
+        """Test codes, names, aliases, words in sentences and misspellings."""
+        assert language_matcher.match_with_method(text) == (code, method)
+
+    @pytest.mark.parametrize(
+        "text",
+        ["", "...", "hello", "it is", "what do I do", "Spanish or French"],
+    )
+    def test_no_match(self, text):
+        """Test that short words, unrelated and ambiguous messages don't match."""
+        assert language_matcher.match_with_method(text) == (None, "none")
+
+    def test_custom_languages(self):
+        """Test that the matcher only knows the languages it is given."""
+        matcher = LanguageMatcher({"EN": "English"}, aliases={"EN": ["inglés"]})
+
+        assert matcher.match("ingles") == "EN"
+        assert matcher.match("Spanish") is None
@@ -0,0 +1,153 @@
+"""Tests for the in-memory leaderboard."""
+
+import random
+from unittest.mock import patch
+
+import pytest
+from django.utils import timezone
+
+from charades.game.leaderboard import Leaderboard
+from charades.game.leaderboard import RankedIndex
+from charades.game.leaderboard import THIS_WEEK
+from charades.game.leaderboard import leaderboard
+from charades.game.logic import handle_player_command
+from charades.game.models import GameSession
+from charades.game.models import Player
+
+
+def expected_rank(points: dict[int, int], player_id: int) -> int:
+    """Compute a competition rank the slow way."""
+    return sum(1 for value in points.values() if value > points[player_id]) + 1
+
+
+class TestRankedIndex:
+    """Tests for the indexable skip list."""
+
+    def test_matches_sorted_reference(self):
+        """Test rank and top against a brute force reference."""
+        rng = random.Random(7)
+        index = RankedIndex()
+        reference: dict[int, int] = {}
+        for _ in range(500):
+            player_id = rng.randint(1, 60)
+            points = rng.randint(0, 40)
+            index.add(player_id, points)
+            reference[player_id] = reference.get(player_id, 0) + points
+
+        assert len(index) == len(reference)
+        for player_id in reference:
+            assert index.rank(player_id) == expected_rank(reference, player_id)
+        expected_top = sorted(
+            reference.items(),
+            key=lambda item: (-item[1], item[0]),
+        )[:10]
+        assert index.top(10) == expected_top
+
+    def test_ties_share_rank(self):
+        """Test that tied players share a rank."""
+        index = RankedIndex()
+        index.set(1, 50)
+        index.set(2, 70)
+        index.set(3, 50)
+
+        assert index.rank(2) == 1
+        assert index.rank(1) == 2
+        assert index.rank(3) == 2
+        assert index.rank(4) is None
+
+
+@pytest.mark.django_db
+class TestLeaderboard:
+    """Tests for building and updating leaderboards."""
+
+    @pytest.fixture
+    def players(self):
+        """Fixture for three players with completed games."""
+        players = [
+            Player.objects.create(phone_number=f"+1206555010{i}", is_active=True)
+            for i in range(3)
+        ]
+        for player, score, language in zip(players, [40, 90, 60], ["es", "es", "ko"]):
+            session = GameSession.objects.create(
+                player=player,
+                word="test",
+                language=language,
+            )
+            session.complete(score=score, description="d", feedback="f")
+        return players
+
+    def test_rebuild_and_record(self, players):
+        """Test ranks after a rebuild and an incremental update."""
+        board = Leaderboard(refresh_seconds=3600)
+
+        assert board.rank(players[1].pk) == (1, 3, 90)
+        assert board.rank(players[0].pk, language="es") == (2, 2, 40)
+        assert board.rank(players[2].pk, window=THIS_WEEK) == (2, 3, 60)
+
+        board.record(1000, players[0].pk, "es", 80, timezone.now())
+
+        assert board.rank(players[0].pk) == (1, 3, 120)
+        assert board.top(2, language="es") == [
+            (players[0].pk, 120),
+            (players[1].pk, 90),
+        ]
+
+    def test_record_session_once(self, players):
+        """Test that recording a session twice, or after a rebuild, counts once."""
+        board = Leaderboard(refresh_seconds=3600)
+        board.rebuild()
+        session = GameSession.objects.create(
+            player=players[0],
+            word="test",
+            language="es",
+        )
+        session.complete(score=30, description="d", feedback="f")
+
+        # A rebuild after the commit already reads the session
+        board.rebuild()
+        board.record_session(session)
+        board.record_session(session)
+
+        assert board.rank(players[0].pk) == (2, 3, 70)
+
+    def test_records_during_rebuild_are_kept(self, players):
+        """Test that a session recorded while a rebuild runs isn't lost."""
+        board = Leaderboard(refresh_seconds=3600)
+        board.rebuild()
+        load = board._load
+
+        def load_and_record(*args):
+            load(*args)
+            board.record(1000, players[0].pk, "es", 80, timezone.now())
+
+        with patch.object(board, "_load", side_effect=load_and_record):
+            board.rebuild()
+
+        assert board.rank(players[0].pk) == (1, 3, 120)
+
+    def test_stale_indexes_refresh_in_background(self, players):
+        """Test that lookups on stale indexes don't wait for a rebuild."""
+        board = Leaderboard(refresh_seconds=0)
+        board.rebuild()
+
+        with patch.object(board, "_refresh") as mock_refresh:
+            assert board.rank(players[1].pk) == (1, 3, 90)
+            assert board._thread is not None
+            board._thread.join()
+
+        mock_refresh.assert_called_once()
+
+    def test_rank_and_top_commands(self, players):
+        """Test the RANK and TOP SMS commands."""
+        leaderboard.rebuild()
+        response = handle_player_command(players[2].phone_number, "rank")
+        assert "All-time: #2 of 3 (60 pts)" in response["twiml"]
+        assert "This week: #2 of 3 (60 pts)" in response["twiml"]
+
+        response = handle_player_command(players[2].phone_number, "rank week")
+        assert "This week: #2 of 3" in response["twiml"]
+        assert "All-time" not in response["twiml"]
+
+        response = handle_player_command(players[2].phone_number, "top ko week")
+        assert "Top players in Korean this week" in response["twiml"]
+        assert "1. ***0102 - 60 pts" in response["twiml"]
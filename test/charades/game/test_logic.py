@@ -1,17 +1,21 @@
 """Tests for game logic functions."""
 
+from datetime import timedelta
 from unittest.mock import patch
 
 import pytest
 from django.conf import settings
+from django.utils import timezone
 
 from charades.game.logic import handle_game_message, handle_player_command
 from charades.game.logic import handle_language_selection
 from charades.game.logic import handle_opt_in
 from charades.game.logic import handle_opt_out
+from charades.game.logic import handle_stats
 from charades.game.logic import handle_word_description
 from charades.game.models import GameSession
 from charades.game.models import Player
+from charades.game.models import PlayerStats
 from charades.game.utils import MESSAGES
 from charades.game.utils import create_twiml_response
 
@@ -201,6 +205,14 @@ class TestGameMessageLogic:
             mock_handle_lang.assert_called_once_with(active_player, "EN")
             assert response == {"code": 200, "twiml": "test response"}
 
+    def test_handle_language_name(self, active_player):
+        """Test handling a language named in a sentence."""
+        with patch("charades.game.logic.handle_language_selection") as mock_handle_lang:
+            mock_handle_lang.return_value = {"code": 200, "twiml": "test response"}
+            handle_game_message(active_player, "Spanish please")
+
+            mock_handle_lang.assert_called_once_with(active_player, "ES")
+
     def test_handle_invalid_message(self, active_player):
         """Test handling an invalid message (no active game, not a language code)."""
         response = handle_game_message(active_player, "invalid")
@@ -273,6 +285,21 @@ class TestWordDescriptionLogic:
         assert active_game_session.user_description == "test description"
         assert active_game_session.feedback == "Good job!"
 
+    @patch("charades.game.logic.evaluate_description", return_value=(85, "Good"))
+    def test_discarded_description(
+        self, mock_evaluate, active_player, active_game_session
+    ):
+        """Test that a description may be discarded once scored."""
+        response = handle_word_description(
+            active_player,
+            "test description",
+            should_complete=lambda: False,
+        )
+
+        assert response["code"] == 409
+        active_game_session.refresh_from_db()
+        assert active_game_session.status == "active"
+
     def test_no_active_game(self, active_player):
         """Test handling a description when there's no active game."""
         response = handle_word_description(active_player, "test description")
@@ -290,6 +317,46 @@ class TestWordDescriptionLogic:
             assert "Failed to evaluate description" in response["twiml"]
 
 
+@pytest.mark.django_db
+class TestStatsLogic:
+    """Tests for the STATS command."""
+
+    def test_no_stats(self, active_player):
+        """Test reporting stats before any game is completed."""
+        response = handle_stats(active_player)
+
+        assert response["code"] == 200
+        assert response["twiml"] == create_twiml_response(MESSAGES["no_stats"])
+
+    def test_stats_after_game(self, active_player, active_game_session):
+        """Test reporting stats after completing a game."""
+        active_game_session.complete(score=85, description="d", feedback="f")
+        response = handle_player_command(active_player.phone_number, "STATS")
+
+        assert response["code"] == 200
+        assert "Games played: 1" in response["twiml"]
+        assert "Best score: 85/100" in response["twiml"]
+        assert "English: 1 games, avg 85" in response["twiml"]
+
+    def test_stats_reads_only_aggregates(self, active_player, active_game_session):
+        """Test that stats come from PlayerStats rather than sessions."""
+        active_game_session.complete(score=85, description="d", feedback="f")
+        PlayerStats.objects.filter(player=active_player).update(best_score=99)
+        response = handle_stats(active_player)
+
+        assert "Best score: 99/100" in response["twiml"]
+
+    def test_lapsed_streak(self, active_player, active_game_session):
+        """Test that a streak not extended since before yesterday shows 0."""
+        active_game_session.complete(score=85, description="d", feedback="f")
+        PlayerStats.objects.filter(player=active_player).update(
+            last_played_on=timezone.localdate() - timedelta(days=2),
+        )
+        response = handle_stats(active_player)
+
+        assert "Streak: 0 day(s) (best 1)" in response["twiml"]
+
+
 @pytest.mark.django_db
 class TestPlayerCommandLogic:
     """Integration tests for player command handling logic."""
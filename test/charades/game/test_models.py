@@ -0,0 +1,113 @@
+"""Tests for game models."""
+
+from datetime import date
+from datetime import timedelta
+
+import pytest
+from django.utils import timezone
+
+from charades.game.models import GameSession
+from charades.game.models import Player
+from charades.game.models import PlayerStats
+
+
+@pytest.fixture
+def player():
+    """Fixture for test player."""
+    return Player.objects.create(phone_number="+12065550100")
+
+
+def complete_session(
+    player: Player,
+    score: int,
+    language: str = "es",
+) -> GameSession:
+    """Create and complete a game session for the player."""
+    session = GameSession.objects.create(
+        player=player,
+        word="test",
+        language=language,
+    )
+    session.complete(score=score, description="desc", feedback="ok")
+    return session
+
+
+class TestPlayerStatsAddResult:
+    """Tests for folding results into PlayerStats."""
+
+    def test_streak_counts_consecutive_days(self):
+        """Test that consecutive days extend the streak."""
+        stats = PlayerStats()
+        day = date(2025, 1, 1)
+        stats.add_result(50, day)
+        stats.add_result(70, day)
+        stats.add_result(90, day + timedelta(days=1))
+
+        assert stats.games_played == 3
+        assert stats.best_score == 90
+        assert stats.mean_score == 70
+        assert stats.current_streak == 2
+        assert stats.best_streak == 2
+
+    def test_streak_resets_after_gap(self):
+        """Test that a missed day resets the current streak."""
+        stats = PlayerStats()
+        day = date(2025, 1, 1)
+        stats.add_result(50, day)
+        stats.add_result(50, day + timedelta(days=1))
+        stats.add_result(50, day + timedelta(days=3))
+
+        assert stats.current_streak == 1
+        assert stats.best_streak == 2
+
+    def test_streak_lapses_when_read(self):
+        """Test that a streak without a game yesterday or today reads as 0."""
+        stats = PlayerStats()
+        day = date(2025, 1, 1)
+        stats.add_result(50, day)
+        stats.add_result(50, day + timedelta(days=1))
+
+        assert stats.streak_on(day + timedelta(days=1)) == 2
+        assert stats.streak_on(day + timedelta(days=2)) == 2
+        assert stats.streak_on(day + timedelta(days=3)) == 0
+        assert PlayerStats().streak_on(day) == 0
+
+
+@pytest.mark.django_db
+class TestPlayerStatsRecording:
+    """Tests for maintaining PlayerStats as sessions complete."""
+
+    def test_complete_updates_totals_and_language(self, player):
+        """Test that completing a session updates both stats rows."""
+        complete_session(player, 80, language="es")
+        complete_session(player, 60, language="ko")
+
+        totals = PlayerStats.objects.get(player=player, language="")
+        assert totals.games_played == 2
+        assert totals.total_score == 140
+        assert totals.best_score == 80
+        assert totals.current_streak == 1
+        assert totals.last_played_on == timezone.localdate()
+
+        spanish = PlayerStats.objects.get(player=player, language="es")
+        assert spanish.games_played == 1
+        assert spanish.best_score == 80
+
+    def test_rebuild_matches_incremental(self, player):
+        """Test that a rebuild reproduces the incrementally maintained rows."""
+        complete_session(player, 80, language="es")
+        complete_session(player, 40, language="es")
+        GameSession.objects.create(player=player, word="x", language="es")
+        expected = {
+            stats.language: (stats.games_played, stats.total_score, stats.best_score)
+            for stats in PlayerStats.objects.filter(player=player)
+        }
+
+        PlayerStats.objects.all().delete()
+        written = PlayerStats.rebuild()
+
+        assert written == 2
+        assert {
+            stats.language: (stats.games_played, stats.total_score, stats.best_score)
+            for stats in PlayerStats.objects.filter(player=player)
+        } == expected
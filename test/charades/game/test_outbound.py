@@ -0,0 +1,349 @@
+"""Tests for queueing and sending outbound messages."""
+
+import threading
+from datetime import timedelta
+from unittest.mock import MagicMock
+
+import pytest
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.db import DatabaseError
+from django.utils import timezone
+from twilio.base.exceptions import TwilioRestException
+
+from charades.game.models import OutboundMessage
+from charades.game.models import Player
+from charades.game.outbound import OutboundWorker
+from charades.game.outbound import RateLimiter
+from charades.game.outbound import TokenBucket
+from charades.game.outbound import enqueue
+from charades.game.outbound import notify_active_players
+from charades.game.outbound import queue_depth
+from charades.game.senders import SendError
+from charades.game.senders import StubSender
+from charades.game.senders import TwilioSender
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class FailingSender(StubSender):
+    """Stub sender failing every send with the given error."""
+
+    def __init__(
+        self,
+        error: SendError,
+    ) -> None:
+        super().__init__()
+        self.error = error
+
+    def send(
+        self,
+        to_number: str,
+        body: str,
+    ) -> str:
+        raise self.error
+
+
+def limiter(
+    number_burst: float = 10,
+    clock: FakeClock | None = None,
+) -> RateLimiter:
+    return RateLimiter(
+        account_rate=1000,
+        account_burst=1000,
+        number_rate=0.1,
+        number_burst=number_burst,
+        max_numbers=100,
+        clock=clock or FakeClock(),
+    )
+
+
+@pytest.fixture
+def players():
+    """Fixture for two opted in players and one opted out."""
+    players = []
+    for number in range(3):
+        player = Player.objects.create(phone_number=f"+1206555014{number}")
+        player.opt_in()
+        players.append(player)
+    players[2].opt_out()
+    return players
+
+
+class TestTokenBucket:
+    """Tests for the token bucket."""
+
+    def test_burst_then_rate(self):
+        """Test that a full bucket allows a burst, then refills at the rate."""
+        clock = FakeClock()
+        bucket = TokenBucket(rate=2, capacity=3, clock=clock)
+
+        assert [bucket.try_take() for _ in range(3)] == [0, 0, 0]
+        assert bucket.try_take() == 0.5
+        clock.now = 0.5
+        assert bucket.try_take() == 0
+
+    def test_reserve_borrows(self):
+        """Test that reservations past the burst are spaced at the rate."""
+        bucket = TokenBucket(rate=10, capacity=1, clock=FakeClock())
+
+        assert [bucket.reserve() for _ in range(3)] == [0, 0.1, 0.2]
+
+    def test_capacity_caps_refill(self):
+        """Test that an idle bucket holds no more than its capacity."""
+        clock = FakeClock()
+        bucket = TokenBucket(rate=1, capacity=2, clock=clock)
+        clock.now = 100
+
+        assert [bucket.try_take() for _ in range(3)] == [0, 0, 1]
+
+    def test_numbers_limited_separately(self):
+        """Test that each number has its own bucket."""
+        rate_limiter = limiter(number_burst=1)
+
+        assert rate_limiter.number_wait("+12065550140") == 0
+        assert rate_limiter.number_wait("+12065550141") == 0
+        assert rate_limiter.number_wait("+12065550140") == 10
+
+
+@pytest.mark.django_db
+class TestQueue:
+    """Tests for queueing messages."""
+
+    def test_enqueue(self, players):
+        """Test that a message is queued to the player's number."""
+        message = enqueue(players[0], "New words this week!")
+
+        assert message.status == "queued"
+        assert message.to_number == players[0].phone_number
+        assert queue_depth() == {"due": 1, "sending": 0, "scheduled": 0}
+
+    def test_enqueue_later(self, players):
+        """Test that a delayed message is scheduled."""
+        enqueue(players[0], "Reminder", delay=timedelta(hours=1))
+
+        assert queue_depth() == {"due": 0, "sending": 0, "scheduled": 1}
+
+    @pytest.mark.parametrize("body", ["", "x" * 1601])
+    def test_invalid_body(self, players, body):
+        """Test that empty and overlong messages are rejected."""
+        with pytest.raises(ValueError):
+            enqueue(players[0], body)
+
+    def test_notify_active_players(self, players):
+        """Test that only opted in players are messaged, in batches."""
+        assert notify_active_players("Hello", batch_size=1, dry_run=True) == 2
+        assert not OutboundMessage.objects.exists()
+
+        assert notify_active_players("Hello", batch_size=1) == 2
+        assert set(OutboundMessage.objects.values_list("to_number", flat=True)) == {
+            players[0].phone_number,
+            players[1].phone_number,
+        }
+
+    def test_notify_command(self, players, capsys):
+        """Test the notify_players command."""
+        call_command("notify_players", "Hello")
+
+        assert "Queued 2 messages" in capsys.readouterr().out
+        with pytest.raises(CommandError):
+            call_command("notify_players", "")
+
+
+@pytest.mark.django_db
+class TestOutboundWorker:
+    """Tests for sending queued messages."""
+
+    def test_sends_due_messages(self, players):
+        """Test that due messages are sent and recorded."""
+        enqueue(players[0], "Hello")
+        enqueue(players[1], "Later", delay=timedelta(hours=1))
+        sender = StubSender()
+        worker = OutboundWorker(sender=sender, limiter=limiter(), workers=1)
+
+        assert worker.run_once() == {"sent": 1}
+        assert sender.sent == [(players[0].phone_number, "Hello")]
+        message = OutboundMessage.objects.get(status="sent")
+        assert message.provider_id == "stub-1"
+        assert message.attempts == 1
+        assert message.sent_at is not None
+
+    def test_skips_opted_out_players(self, players):
+        """Test that players who opted out since queueing aren't messaged."""
+        enqueue(players[2], "Hello")
+        sender = StubSender()
+        worker = OutboundWorker(sender=sender, limiter=limiter(), workers=1)
+
+        assert worker.run_once() == {"skipped": 1}
+        assert not sender.sent
+        assert OutboundMessage.objects.get().status == "failed"
+
+    def test_defers_over_number_limit(self, players):
+        """Test that messages over a number's limit are deferred, not sent."""
+        for body in ("One", "Two"):
+            enqueue(players[0], body)
+        sender = StubSender()
+        worker = OutboundWorker(
+            sender=sender,
+            limiter=limiter(number_burst=1),
+            workers=1,
+        )
+
+        assert worker.run_once() == {"sent": 1, "deferred": 1}
+        deferred = OutboundMessage.objects.get(status="queued")
+        assert deferred.claim == ""
+        assert deferred.next_attempt_at > timezone.now() + timedelta(seconds=9)
+
+    def test_retries_with_backoff(self, players, settings):
+        """Test that retryable failures back off, then fail the message."""
+        settings.OUTBOUND_MESSAGES = {
+            **settings.OUTBOUND_MESSAGES,
+            "max_attempts": 2,
+            "backoff_seconds": 60,
+        }
+        enqueue(players[0], "Hello")
+        worker = OutboundWorker(
+            sender=FailingSender(SendError("Throttled")),
+            limiter=limiter(),
+            workers=1,
+        )
+
+        assert worker.run_once() == {"retried": 1}
+        message = OutboundMessage.objects.get()
+        assert message.attempts == 1
+        assert message.next_attempt_at > timezone.now() + timedelta(seconds=59)
+
+        OutboundMessage.objects.update(next_attempt_at=timezone.now())
+        assert worker.run_once() == {"failed": 1}
+        message = OutboundMessage.objects.get()
+        assert (message.status, message.error) == ("failed", "Throttled")
+
+    def test_permanent_failure(self, players):
+        """Test that a failure that can't succeed later isn't retried."""
+        enqueue(players[0], "Hello")
+        worker = OutboundWorker(
+            sender=FailingSender(SendError("Unsubscribed", retryable=False)),
+            limiter=limiter(),
+            workers=1,
+        )
+
+        assert worker.run_once() == {"failed": 1}
+        assert OutboundMessage.objects.get().attempts == 1
+
+    def test_delivery_error_leaves_message_claimed(self, players):
+        """Test that an error delivering one message doesn't end the run."""
+        enqueue(players[0], "Hello")
+        worker = OutboundWorker(sender=StubSender(), limiter=limiter(), workers=1)
+        worker.deliver = MagicMock(side_effect=DatabaseError("database is locked"))
+
+        assert worker.run_once() == {"error": 1}
+        assert OutboundMessage.objects.get().claim != ""
+
+    def test_claimed_messages_are_left_alone(self, players):
+        """Test that a message claimed by another worker isn't sent twice."""
+        enqueue(players[0], "Hello")
+        worker = OutboundWorker(sender=StubSender(), limiter=limiter(), workers=1)
+        assert len(worker.claim("default", 10)) == 1
+
+        assert worker.claim("default", 10) == []
+        assert queue_depth() == {"due": 0, "sending": 1, "scheduled": 0}
+
+    def test_send_command(self, players, capsys):
+        """Test that send_outbound --once reports outcomes and queue depth."""
+        enqueue(players[0], "Hello")
+        call_command("send_outbound", "--once", "--workers", "1")
+
+        out = capsys.readouterr().out
+        assert "1 sent" in out
+        assert "0 due, 0 sending, 0 scheduled" in out
+
+
+@pytest.mark.django_db(transaction=True)
+class TestConcurrentSends:
+    """Tests for sending from a thread pool."""
+
+    def test_each_message_sent_once(self, players):
+        """Test that concurrent sends deliver every message exactly once."""
+        notify_active_players("Hello")
+        for number in range(20):
+            enqueue(players[number % 2], f"Message {number}")
+        sender = StubSender()
+        worker = OutboundWorker(
+            sender=sender,
+            limiter=limiter(number_burst=100),
+            workers=4,
+            batch_size=5,
+        )
+
+        assert worker.run_once() == {"sent": 22}
+        assert len(sender.sent) == 22
+        assert OutboundMessage.objects.filter(status="sent").count() == 22
+
+    def test_run_until_stopped(self, players):
+        """Test that the worker loop sends messages and stops when asked."""
+        enqueue(players[0], "Hello")
+        stop = threading.Event()
+        sender = StubSender()
+        worker = OutboundWorker(sender=sender, limiter=limiter(), workers=2)
+        thread = threading.Thread(target=worker.run, args=(stop,))
+        thread.start()
+        try:
+            for _ in range(50):
+                if sender.sent:
+                    break
+                stop.wait(0.1)
+        finally:
+            stop.set()
+            thread.join(5)
+
+        assert sender.sent == [(players[0].phone_number, "Hello")]
+        assert not thread.is_alive()
+
+
+class TestTwilioSender:
+    """Tests for sending through Twilio."""
+
+    @pytest.fixture
+    def sender(self):
+        sender = TwilioSender("AC123", "token", "+12065550100")
+        sender._client = MagicMock()
+        return sender
+
+    def test_send(self, sender):
+        """Test that messages are created from the configured number."""
+        sender.client.messages.create.return_value.sid = "SM123"
+
+        assert sender.send("+12065550140", "Hello") == "SM123"
+        sender.client.messages.create.assert_called_once_with(
+            to="+12065550140",
+            from_="+12065550100",
+            body="Hello",
+        )
+
+    @pytest.mark.parametrize(
+        ("status", "retryable"),
+        [(429, True), (503, True), (400, False)],
+    )
+    def test_errors(self, sender, status, retryable):
+        """Test that throttling and outages are retryable, bad requests not."""
+        sender.client.messages.create.side_effect = TwilioRestException(
+            status,
+            "https://api.twilio.com",
+            msg="Error",
+            code=21610,
+        )
+
+        with pytest.raises(SendError) as error:
+            sender.send("+12065550140", "Hello")
+        assert error.value.retryable is retryable
+
+    def test_requires_credentials(self):
+        """Test that a sender can't be built without credentials."""
+        with pytest.raises(ValueError):
+            TwilioSender("", "", "")
@@ -0,0 +1,206 @@
+"""Tests for next-word prefetch."""
+
+import threading
+import time
+from unittest.mock import patch
+
+import pytest
+from django.core.cache import cache
+
+from charades.game.logic import handle_language_selection
+from charades.game.logic import handle_word_description
+from charades.game.models import GameSession
+from charades.game.models import Player
+from charades.game.prefetch import WordPrefetcher
+from charades.game.prefetch import predict_language
+
+
+@pytest.fixture(autouse=True)
+def word_prefetch(settings):
+    """Prefetch on the calling thread, into an empty cache."""
+    settings.WORD_PREFETCH = {
+        **settings.WORD_PREFETCH,
+        "enabled": True,
+        "background": False,
+    }
+    cache.clear()
+    yield
+    cache.clear()
+
+
+@pytest.fixture
+def player():
+    """Fixture for an active player with Spanish and Korean games."""
+    player = Player.objects.create(phone_number="+12065550123")
+    player.opt_in()
+    for language in ("ko", "es", "es"):
+        GameSession.objects.create(
+            player=player,
+            word="test",
+            language=language,
+            status="completed",
+        )
+    return player
+
+
+@pytest.fixture
+def random_word():
+    """Stub out word generation."""
+    with patch(
+        "charades.game.prefetch.llm_manager.get_random_word",
+        return_value="gato",
+    ) as mock_get_word:
+        yield mock_get_word
+
+
+@pytest.mark.django_db
+class TestPredictLanguage:
+    """Tests for predicting a player's next language."""
+
+    def test_most_common(self, player):
+        """Test that the most played recent language is predicted."""
+        assert predict_language(player.pk, history=5) == "ES"
+
+    def test_ties_go_to_most_recent(self, player):
+        """Test that the latest language wins a tie."""
+        GameSession.objects.create(player=player, word="test", language="ko")
+
+        assert predict_language(player.pk, history=4) == "KO"
+
+    def test_new_player(self):
+        """Test that nothing is predicted without history."""
+        player = Player.objects.create(phone_number="+12065550124")
+
+        assert predict_language(player.pk, history=5) is None
+
+
+@pytest.mark.django_db
+class TestWordPrefetcher:
+    """Tests for prefetching and taking words."""
+
+    def test_prefetch_and_take(self, player, random_word):
+        """Test that a prefetched word is taken once, in its language."""
+        prefetcher = WordPrefetcher()
+        prefetcher.prefetch(player.phone_number, player_id=player.pk)
+
+        random_word.assert_called_once_with("ES")
+        assert prefetcher.take(player.pk, "es") == "gato"
+        assert prefetcher.take(player.pk, "es") is None
+
+    def test_prefetch_by_phone_number(self, player, random_word):
+        """Test that callers are looked up by phone number."""
+        prefetcher = WordPrefetcher()
+        prefetcher.prefetch(player.phone_number)
+        prefetcher.prefetch("+12065550199")
+
+        random_word.assert_called_once_with("ES")
+        assert prefetcher.take(player.pk, "ES") == "gato"
+
+    def test_unused_word_returns_to_pool(self, player, random_word):
+        """Test that a word for another language serves the next game in it."""
+        other = Player.objects.create(phone_number="+12065550125")
+        prefetcher = WordPrefetcher()
+        prefetcher.prefetch(player.phone_number, player_id=player.pk)
+
+        assert prefetcher.take(player.pk, "KO") is None
+        assert prefetcher.take(other.pk, "ES") == "gato"
+        assert prefetcher.take(other.pk, "ES") is None
+
+    def test_prefetch_reserves_pooled_word(self, player, random_word):
+        """Test that a pooled word is reserved instead of generating one."""
+        prefetcher = WordPrefetcher()
+        prefetcher._return_to_pool("ES", "perro")
+        prefetcher.prefetch(player.phone_number, player_id=player.pk)
+
+        random_word.assert_not_called()
+        assert prefetcher.take(player.pk, "ES") == "perro"
+
+    def test_disabled(self, player, random_word, settings):
+        """Test that nothing is prefetched or taken when disabled."""
+        settings.WORD_PREFETCH = {**settings.WORD_PREFETCH, "enabled": False}
+        prefetcher = WordPrefetcher()
+        prefetcher.prefetch(player.phone_number, player_id=player.pk)
+
+        random_word.assert_not_called()
+        assert prefetcher.take(player.pk, "ES") is None
+
+    def test_take_waits_for_background_prefetch(self, settings):
+        """Test that a game start waits for a prefetch in progress."""
+        settings.WORD_PREFETCH = {**settings.WORD_PREFETCH, "background": True}
+        generating = threading.Event()
+        release = threading.Event()
+
+        def slow_word(language_code):
+            generating.set()
+            release.wait(5)
+            return "gato"
+
+        prefetcher = WordPrefetcher()
+        with (
+            patch("charades.game.prefetch.predict_language", return_value="ES"),
+            patch(
+                "charades.game.prefetch.llm_manager.get_random_word",
+                side_effect=slow_word,
+            ),
+        ):
+            prefetcher.prefetch("+12065550123", player_id=1)
+            assert generating.wait(5)
+            threading.Timer(0.05, release.set).start()
+            assert prefetcher.take(1, "ES") == "gato"
+
+    def test_take_skips_prefetch_in_other_language(self, settings):
+        """Test that a game in another language doesn't wait for a prefetch."""
+        settings.WORD_PREFETCH = {**settings.WORD_PREFETCH, "background": True}
+        generating = threading.Event()
+        release = threading.Event()
+
+        def slow_word(language_code):
+            generating.set()
+            release.wait(5)
+            return "gato"
+
+        prefetcher = WordPrefetcher()
+        with (
+            patch("charades.game.prefetch.predict_language", return_value="ES"),
+            patch(
+                "charades.game.prefetch.llm_manager.get_random_word",
+                side_effect=slow_word,
+            ),
+        ):
+            prefetcher.prefetch("+12065550123", player_id=1)
+            assert generating.wait(5)
+            start = time.monotonic()
+            try:
+                assert prefetcher.take(1, "KO") is None
+                assert time.monotonic() - start < 1
+            finally:
+                release.set()
+
+
+@pytest.mark.django_db
+class TestPrefetchLogic:
+    """Tests for prefetching around games."""
+
+    def test_next_game_uses_prefetched_word(
+        self,
+        player,
+        random_word,
+        django_capture_on_commit_callbacks,
+    ):
+        """Test that completing a game prefetches the next game's word."""
+        GameSession.objects.create(player=player, word="casa", language="es")
+        with (
+            patch(
+                "charades.game.logic.evaluate_description",
+                return_value=(80, "Good"),
+            ),
+            django_capture_on_commit_callbacks(execute=True),
+        ):
+            handle_word_description(player, "a building people live in")
+
+        with patch("charades.game.logic.get_random_word") as mock_get_word:
+            response = handle_language_selection(player, "ES")
+
+        mock_get_word.assert_not_called()
+        assert response["code"] == 200
+        assert player.gamesession_set.get(status="active").word == "gato"
@@ -0,0 +1,138 @@
+"""Tests for routing reads to database replicas."""
+
+import pytest
+from django.contrib.auth.models import AnonymousUser
+from django.contrib.auth.models import User
+from django.http import HttpRequest
+from django.http import HttpResponse
+from django.test import RequestFactory
+
+from charades.game.models import Player
+from charades.game.replicas import HEADER
+from charades.game.replicas import PRIMARY
+from charades.game.replicas import REPLICA
+from charades.game.replicas import STICKY_COOKIE
+from charades.game.replicas import ReplicaRoutingMiddleware
+from charades.game.replicas import read_alias
+from charades.game.replicas import read_from
+
+
+@pytest.fixture(autouse=True)
+def replica(settings):
+    """Replicate the default database to the "replica" alias."""
+    settings.DATABASE_REPLICAS = {"default": ["replica"]}
+
+
+def read_database_view(
+    request: HttpRequest,
+) -> HttpResponse:
+    """View reporting where player reads go, writing first if asked."""
+    if "write" in request.GET:
+        Player.objects.create(phone_number="+12065550100")
+    return HttpResponse(Player.objects.all().db)
+
+
+def get_response(
+    request: HttpRequest,
+    user: User | AnonymousUser | None = None,
+) -> HttpResponse:
+    """Run a request through the middleware to read_database_view."""
+    request.user = user or AnonymousUser()
+    return ReplicaRoutingMiddleware(read_database_view)(request)
+
+
+class TestReadFrom:
+    """Tests for choosing where a block of code reads from."""
+
+    def test_primary_by_default(self):
+        """Test that reads go to primaries outside any preference."""
+        assert read_alias("default") == "default"
+        assert Player.objects.all().db == "default"
+
+    def test_replica(self):
+        """Test that reads go to a replica when asked."""
+        with read_from(REPLICA):
+            assert read_alias("default") == "replica"
+            assert Player.objects.all().db == "replica"
+
+    def test_database_without_replicas(self):
+        """Test that a database without replicas is read directly."""
+        with read_from(REPLICA):
+            assert read_alias("shard1") == "shard1"
+
+    @pytest.mark.django_db
+    def test_writes_stick_to_primary(self):
+        """Test that reads after a write see it, on the primary."""
+        with read_from(REPLICA):
+            player = Player.objects.create(phone_number="+12065550100")
+
+            assert player._state.db == "default"
+            assert Player.objects.all().db == "default"
+
+
+@pytest.mark.django_db(databases=["default", "replica"], transaction=True)
+class TestReplicaReads:
+    """Tests for reading rows through a replica."""
+
+    def test_read_and_save(self):
+        """Test that rows read from a replica are saved to its primary."""
+        Player.objects.create(phone_number="+12065550100")
+
+        with read_from(REPLICA):
+            player = Player.objects.get()
+            assert player._state.db == "replica"
+            player.opt_in()
+
+        assert player._state.db == "default"
+        assert Player.objects.get().is_active
+
+
+@pytest.mark.django_db
+class TestReplicaRoutingMiddleware:
+    """Tests for choosing where each request reads from."""
+
+    def test_admin_reads_from_replica(self, rf: RequestFactory):
+        """Test that admin pages read from replicas."""
+        response = get_response(rf.get("/admin/game/player/"))
+
+        assert response.content == b"replica"
+
+    def test_webhooks_read_from_primary(self, rf: RequestFactory):
+        """Test that other requests read from primaries."""
+        response = get_response(rf.get("/api/webhooks/twilio/sms"))
+
+        assert response.content == b"default"
+
+    def test_admin_writes(self, rf: RequestFactory):
+        """Test that admin changes read from primaries and stick to them."""
+        response = get_response(rf.post("/admin/game/player/add/"))
+        assert response.content == b"default"
+
+        response = get_response(rf.get("/admin/game/player/?write"))
+        assert response.content == b"default"
+        assert response.cookies[STICKY_COOKIE]["max-age"] == 10
+
+        request = rf.get("/admin/game/player/")
+        request.COOKIES[STICKY_COOKIE] = "1"
+        assert get_response(request).content == b"default"
+
+    def test_no_sticky_cookie_for_webhooks(self, rf: RequestFactory):
+        """Test that webhook replies don't carry the sticky cookie."""
+        response = get_response(rf.get("/api/webhooks/twilio/sms?write"))
+
+        assert STICKY_COOKIE not in response.cookies
+
+    def test_primary_override(self, rf: RequestFactory):
+        """Test that anyone can ask to read from primaries."""
+        request = rf.get("/admin/game/player/", headers={HEADER: PRIMARY})
+
+        assert get_response(request).content == b"default"
+
+    def test_replica_override_needs_staff(self, rf: RequestFactory):
+        """Test that only staff can send other requests to replicas."""
+        staff = User.objects.create(username="staff", is_staff=True)
+        request = rf.get("/api/stats", headers={HEADER: REPLICA})
+        assert get_response(request).content == b"default"
+
+        request = rf.get("/api/stats", headers={HEADER: REPLICA})
+        assert get_response(request, staff).content == b"replica"
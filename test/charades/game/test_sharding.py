@@ -0,0 +1,149 @@
+"""Tests for spreading players over database shards."""
+
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+
+from charades.game.models import GameSession
+from charades.game.models import Player
+from charades.game.models import PlayerStats
+from charades.game.sharding import id_range
+from charades.game.sharding import move_player
+from charades.game.sharding import rebalance
+from charades.game.sharding import shard_for
+
+# Where each number lands with DATABASE_SHARDS = ["default", "shard1"]
+DEFAULT_PHONE = "+12065550121"
+SHARD1_PHONE = "+12065550120"
+
+
+@pytest.fixture
+def two_shards(settings):
+    """Spread players over the default database and shard1."""
+    settings.DATABASE_SHARDS = ["default", "shard1"]
+
+
+def complete_session(
+    player: Player,
+    score: int,
+) -> GameSession:
+    """Create and complete a game session for the player."""
+    session = player.gamesession_set.create(word="test", language="es")
+    session.complete(score=score, description="desc", feedback="ok")
+    return session
+
+
+class TestShardFor:
+    """Tests for mapping phone numbers to shards."""
+
+    def test_single_shard(self):
+        """Test that everyone is on the only shard."""
+        assert shard_for(SHARD1_PHONE) == "default"
+
+    def test_stable_and_spread(self, two_shards):
+        """Test that numbers map consistently and to both shards."""
+        phones = [f"+1206555{i:04d}" for i in range(200)]
+        placement = [shard_for(phone) for phone in phones]
+
+        assert placement == [shard_for(phone) for phone in phones]
+        assert 60 < placement.count("shard1") < 140
+
+    def test_adding_shard_only_moves_to_it(self, settings):
+        """Test that a new shard only takes players, never reshuffles them."""
+        phones = [f"+1206555{i:04d}" for i in range(200)]
+        settings.DATABASE_SHARDS = ["default", "shard1"]
+        before = [shard_for(phone) for phone in phones]
+        settings.DATABASE_SHARDS = ["default", "shard1", "shard2"]
+        after = [shard_for(phone) for phone in phones]
+
+        assert all(new in (old, "shard2") for old, new in zip(before, after))
+
+
+@pytest.mark.django_db(databases=["default", "shard1"])
+class TestShardRouter:
+    """Tests for routing a player's rows to their shard."""
+
+    def test_player_rows_live_on_their_shard(self, two_shards):
+        """Test that a player and their games are written to one shard."""
+        player, created = Player.get_or_create_player(SHARD1_PHONE)
+        complete_session(player, 80)
+
+        assert created
+        assert player._state.db == "shard1"
+        assert not Player.objects.using("default").exists()
+        assert GameSession.objects.using("shard1").get().score == 80
+        assert PlayerStats.objects.using("shard1").get(language="").games_played == 1
+
+    def test_get_existing_player(self, two_shards):
+        """Test that a player is found again on their shard."""
+        player, _ = Player.get_or_create_player(DEFAULT_PHONE)
+        again, created = Player.get_or_create_player(DEFAULT_PHONE)
+
+        assert not created
+        assert again.pk == player.pk
+        assert again._state.db == "default"
+
+    def test_shards_allocate_disjoint_ids(self, two_shards):
+        """Test that ids come from each shard's own range."""
+        default_player, _ = Player.get_or_create_player(DEFAULT_PHONE)
+        shard1_player, _ = Player.get_or_create_player(SHARD1_PHONE)
+
+        first, last = id_range("shard1")
+        assert default_player.pk < first
+        assert first <= shard1_player.pk <= last
+
+
+@pytest.mark.django_db(databases=["default", "shard1"])
+class TestRebalance:
+    """Tests for moving players to the shards they map to."""
+
+    @pytest.fixture
+    def misplaced(self):
+        """A player with a game on the default database, before shard1."""
+        player, _ = Player.get_or_create_player(SHARD1_PHONE)
+        complete_session(player, 70)
+        return player
+
+    def test_move_player(self, misplaced, two_shards):
+        """Test that a player's rows move together and keep their ids."""
+        misplaced.outboundmessage_set.create(to_number=SHARD1_PHONE, body="Hi")
+        move_player(misplaced.pk, "default", "shard1")
+
+        moved = Player.objects.using("shard1").get(pk=misplaced.pk)
+        assert moved.gamesession_set.get().score == 70
+        assert moved.playerstats_set.get(language="").games_played == 1
+        assert moved.outboundmessage_set.get().body == "Hi"
+        assert not Player.objects.using("default").exists()
+        assert not GameSession.objects.using("default").exists()
+
+    def test_move_refuses_namesake(self, misplaced, two_shards):
+        """Test that a player created on the target meanwhile isn't clobbered."""
+        Player.get_or_create_player(SHARD1_PHONE)
+
+        with pytest.raises(ValueError):
+            move_player(misplaced.pk, "default", "shard1")
+        assert Player.objects.using("default").filter(pk=misplaced.pk).exists()
+
+    def test_rebalance(self, misplaced, two_shards):
+        """Test that only misplaced players move, and new ids stay in range."""
+        Player.objects.using("default").create(phone_number=DEFAULT_PHONE)
+
+        assert rebalance(dry_run=True) == {("default", "shard1"): 1}
+        assert Player.objects.using("default").count() == 2
+
+        assert rebalance() == {("default", "shard1"): 1}
+        assert Player.objects.using("default").count() == 1
+        assert rebalance() == {}
+
+        player, _ = Player.get_or_create_player("+12065550122")
+        assert player.pk >= id_range("shard1")[0]
+        assert player.pk != misplaced.pk
+
+    def test_command(self, misplaced, two_shards):
+        """Test that the command reports the players it moved."""
+        out = StringIO()
+        call_command("rebalance_shards", stdout=out)
+
+        assert "Moved 1 players from default to shard1" in out.getvalue()
+        assert Player.objects.using("shard1").filter(pk=misplaced.pk).exists()
@@ -0,0 +1,177 @@
+"""Tests for the voice hold and redirect evaluation flow."""
+
+import threading
+import time
+import uuid
+from unittest.mock import patch
+from urllib.parse import urlencode
+
+import pytest
+from django.core.cache import cache
+from django.test import Client
+
+from charades.game.models import GameSession
+from charades.game.models import Player
+from charades.game.utils import VOICE_MESSAGES
+
+PHONE_NUMBER = "+12065550142"
+
+
+@pytest.fixture(autouse=True)
+def voice_evaluation(settings):
+    """Evaluate on the calling thread, with an empty cache."""
+    settings.VOICE_EVALUATION = {**settings.VOICE_EVALUATION, "background": False}
+    cache.clear()
+    yield
+    cache.clear()
+
+
+@pytest.fixture
+def call_sid():
+    """A CallSid no other test has used."""
+    return f"CA{uuid.uuid4().hex}"
+
+
+@pytest.fixture
+def session():
+    """Fixture for a caller with an active game."""
+    player = Player.objects.create(phone_number=PHONE_NUMBER)
+    player.opt_in()
+    return GameSession.objects.create(player=player, word="gato", language="es")
+
+
+def gather(client, call_sid, speech="Un animal que dice miau"):
+    return client.post(
+        "/api/webhooks/twilio/voice/gather",
+        data=urlencode(
+            {"CallSid": call_sid, "From": PHONE_NUMBER, "SpeechResult": speech},
+        ),
+        content_type="application/x-www-form-urlencoded",
+    )
+
+
+def result(client, call_sid):
+    return client.post(
+        "/api/webhooks/twilio/voice/result",
+        data=urlencode({"CallSid": call_sid, "From": PHONE_NUMBER}),
+        content_type="application/x-www-form-urlencoded",
+    )
+
+
+@pytest.mark.django_db
+class TestVoiceEvaluation:
+    """Tests for evaluating voice descriptions off the request path."""
+
+    @patch("charades.game.logic.evaluate_description", return_value=(85, "Great"))
+    def test_hold_then_result(self, mock_evaluate, session, call_sid):
+        """Test that gather holds the caller and the result speaks the score."""
+        client = Client()
+
+        response = gather(client, call_sid)
+        assert response.status_code == 200
+        twiml = response.content.decode()
+        assert VOICE_MESSAGES["evaluating"] in twiml
+        assert "<Pause" in twiml
+        assert "/api/webhooks/twilio/voice/result</Redirect>" in twiml
+
+        response = result(client, call_sid)
+        twiml = response.content.decode()
+        assert "85" in twiml and "Great" in twiml
+        assert "<Gather" in twiml
+        session.refresh_from_db()
+        assert session.status == "completed"
+
+        # The result is only spoken once
+        assert (
+            VOICE_MESSAGES["evaluation_lost"]
+            in result(client, call_sid).content.decode()
+        )
+
+    def test_pending_then_timeout(self, session, settings, call_sid):
+        """Test that a slow evaluation redirects, then gives up."""
+        settings.VOICE_EVALUATION = {
+            **settings.VOICE_EVALUATION,
+            "background": True,
+            "timeout_seconds": 0.2,
+        }
+        release = threading.Event()
+        finished = threading.Event()
+        completed = []
+
+        def slow_evaluation(player, description, should_complete):
+            release.wait(5)
+            completed.append(should_complete())
+            finished.set()
+            return {"twiml": "Score: 85", "code": 200 if completed[0] else 409}
+
+        client = Client()
+        with patch(
+            "charades.game.voice.handle_word_description",
+            side_effect=slow_evaluation,
+        ):
+            assert (
+                VOICE_MESSAGES["evaluating"]
+                in gather(client, call_sid).content.decode()
+            )
+
+            twiml = result(client, call_sid).content.decode()
+            assert "<Say>" not in twiml
+            assert "/api/webhooks/twilio/voice/result</Redirect>" in twiml
+
+            time.sleep(0.3)
+            twiml = result(client, call_sid).content.decode()
+            assert VOICE_MESSAGES["evaluation_timeout"] in twiml
+            release.set()
+            assert finished.wait(5)
+
+        # The late evaluation may not complete the game, nor leave a result
+        assert completed == [False]
+        time.sleep(0.1)
+        assert (
+            VOICE_MESSAGES["evaluation_lost"]
+            in result(client, call_sid).content.decode()
+        )
+
+    def test_completing_evaluation_not_cancelled(self, session, settings, call_sid):
+        """Test that an overdue evaluation already completing is waited for."""
+        settings.VOICE_EVALUATION = {
+            **settings.VOICE_EVALUATION,
+            "background": True,
+            "timeout_seconds": 0.1,
+        }
+        completing = threading.Event()
+        release = threading.Event()
+
+        def completing_evaluation(player, description, should_complete):
+            assert should_complete()
+            completing.set()
+            release.wait(5)
+            return {"twiml": "Score: 85", "code": 200}
+
+        client = Client()
+        with patch(
+            "charades.game.voice.handle_word_description",
+            side_effect=completing_evaluation,
+        ):
+            gather(client, call_sid)
+            assert completing.wait(5)
+            time.sleep(0.2)
+
+            twiml = result(client, call_sid).content.decode()
+            assert VOICE_MESSAGES["evaluation_timeout"] not in twiml
+            assert "/api/webhooks/twilio/voice/result</Redirect>" in twiml
+            release.set()
+
+            for _ in range(50):
+                twiml = result(client, call_sid).content.decode()
+                if "85" in twiml:
+                    break
+                time.sleep(0.05)
+        assert "85" in twiml
+
+    def test_unknown_call(self, call_sid):
+        """Test that a result request without an evaluation reprompts."""
+        response = result(Client(), call_sid)
+
+        assert response.status_code == 200
+        assert VOICE_MESSAGES["evaluation_lost"] in response.content.decode()
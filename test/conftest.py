@@ -10,4 +10,8 @@ sys.path.append(src_dir)
 
 
 os.environ.setdefault("DJANGO_SETTINGS_MODULE", "charades.config.settings")
+# A second database for the sharding tests; other tests only use the first
+os.environ.setdefault("DATABASE_SHARD_COUNT", "2")
+# A replica of the default database, mirroring it, for the replica tests
+os.environ.setdefault("DATABASE_REPLICA_NAME", "replica.sqlite3")
 django.setup()
@@ -1,7 +1,70 @@
+from urllib.parse import urlencode
+
 import pytest
+from django.http import HttpRequest
+from django.http import HttpResponse
 from django.test import Client
+from django.test import RequestFactory
+from prometheus_client import REGISTRY
+
+from charades.game.metrics import MetricsMiddleware
+from charades.game.models import Player
 
 
 @pytest.fixture
 def client() -> Client:
     return Client()
+
+
+def incoming_sms_payload(
+    body: str,
+    phone_number: str = "+12065550123",
+) -> dict[str, str]:
+    """Build a Twilio incoming SMS webhook payload."""
+    return {
+        "MessageSid": "SM123",
+        "AccountSid": "AC123",
+        "From": phone_number,
+        "To": "+12065550000",
+        "Body": body,
+        "SmsMessageSid": "SM123",
+        "SmsSid": "SM123",
+    }
+
+
+# The player is on shard1, whose queries should be timed too
+@pytest.mark.django_db(databases=["default", "shard1"])
+def test_metrics_endpoint(client: Client) -> None:
+    """Test that webhook stages and commands show up in /metrics."""
+    response = client.post(
+        "/api/webhooks/twilio/incoming",
+        data=urlencode(incoming_sms_payload("langgang")),
+        content_type="application/x-www-form-urlencoded",
+    )
+    assert response.status_code == 200
+    assert "Failed" not in response.content.decode()
+
+    response = client.get("/metrics")
+    assert response.status_code == 200
+    body = response.content.decode()
+    assert 'charades_stage_seconds_count{stage="form_parse"}' in body
+    assert 'charades_stage_seconds_count{stage="schema_validation"}' in body
+    assert 'charades_stage_seconds_count{stage="twiml_render"}' in body
+    assert 'charades_stage_seconds_count{stage="db"}' in body
+    assert 'charades_commands_total{command="opt_in"}' in body
+    assert 'route="api/webhooks/twilio/incoming"' in body
+
+
+@pytest.mark.django_db(databases=["default", "shard1"])
+def test_metrics_time_queries_on_every_database() -> None:
+    """Test that queries on a shard other than the default are timed."""
+
+    def get_response(request: HttpRequest) -> HttpResponse:
+        Player.objects.using("shard1").count()
+        return HttpResponse()
+
+    sample = ("charades_stage_seconds_count", {"stage": "db"})
+    before = REGISTRY.get_sample_value(*sample) or 0.0
+    MetricsMiddleware(get_response)(RequestFactory().get("/"))
+
+    assert REGISTRY.get_sample_value(*sample) == before + 1